@@ -0,0 +1,7 @@
+import sys
+
+from alhirz.cli import main
+
+# الحماية ضرورية لأن عمليات الضغط الفرعية قد تستورد الوحدة الرئيسية
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,530 @@
+"""
+واجهة سطر الأوامر - python -m alhirz
+مسؤولية واحدة: تحويل أوامر الطرفية إلى استدعاءات للمنسق والمستودع دون استيراد Qt
+
+تُستورد وحدات المركز داخل كل أمر فقط حتى يبقى بدء التشغيل سريعاً.
+"""
+import argparse
+import signal
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from utils.config import DEFAULT_BACKUP_RETENTION
+
+
+def _print_progress(progress: int, message: str) -> None:
+    """عرض التقدم في سطر واحد على stderr"""
+    sys.stderr.write(f"\r[{progress:3d}%] {message[:70]:<70}")
+    sys.stderr.flush()
+
+
+def _end_progress() -> None:
+    sys.stderr.write("\n")
+
+
+class _Cancellation:
+    """تحويل Ctrl+C إلى إيقاف نظيف عبر is_running_check"""
+
+    def __init__(self):
+        self.running = True
+        signal.signal(signal.SIGINT, self._on_interrupt)
+        signal.signal(signal.SIGTERM, self._on_interrupt)
+
+    def _on_interrupt(self, signum, frame) -> None:
+        if not self.running:
+            raise KeyboardInterrupt
+        self.running = False
+        sys.stderr.write("\nجارٍ الإيقاف...\n")
+
+    def __call__(self) -> bool:
+        return self.running
+
+
+def _backup_profile(args):
+    """ملف التعريف المحدد بـ --backup-profile أو None"""
+    if not args.backup_profile:
+        return None
+    from core.backup_profiles import BackupProfileStore
+
+    return BackupProfileStore().require(args.backup_profile)
+
+
+def _repository(args):
+    from core.backup_repository import BackupRepository
+
+    if args.repo:
+        return BackupRepository(Path(args.repo).expanduser())
+    profile = _backup_profile(args)
+    return BackupRepository(profile.backup_dir if profile else None)
+
+
+def _resolve_backup(repository, name: Optional[str]) -> Optional[Path]:
+    """تحديد النسخة بالاسم أو المسار، أو أحدث نسخة عند عدم التحديد"""
+    backups = repository.get_backups_list()
+    if not name:
+        return backups[0] if backups else None
+
+    candidate = Path(name).expanduser()
+    if candidate.is_file():
+        return candidate
+    for backup in backups:
+        if backup.name == name or backup.stem == name:
+            return backup
+    return None
+
+
+def _orchestrator(repository, profile_mode: Optional[str] = None, backup_profile=None):
+    from core.async_engine import AsyncBackupOrchestrator
+    from core.profiling import create_run_profiler
+    from core.resource_governor import create_settings_governor
+    from core.run_metrics import create_metrics_store
+    from core.tracing import create_trace_recorder
+
+    compression = {}
+    if backup_profile is not None:
+        compression = {'codec': backup_profile.codec, 'compression_level': backup_profile.compression_level}
+    return AsyncBackupOrchestrator(repository=repository, governor=create_settings_governor(),
+                                   metrics_store=create_metrics_store(),
+                                   trace_recorder=create_trace_recorder(),
+                                   profiler=create_run_profiler(mode=profile_mode),
+                                   **compression)
+
+
+def _print_profile_paths(orchestrator) -> None:
+    for path in orchestrator.profiler.last_profile_paths:
+        print(f"تقرير القياس: {path}", file=sys.stderr)
+
+
+def cmd_backup(args) -> int:
+    from core.auto_backup import load_backup_selection
+
+    backup_profile = _backup_profile(args)
+    if backup_profile is not None:
+        saved_folders = [folder for folder in backup_profile.folder_paths if folder.is_dir()]
+        saved_exclusions = list(backup_profile.exclusions)
+    else:
+        saved_folders, saved_exclusions = load_backup_selection()
+    folders = [Path(folder).expanduser() for folder in args.folders] or saved_folders
+    exclusions = saved_exclusions + args.exclude
+    if not folders:
+        print("لا توجد مجلدات للنسخ.", file=sys.stderr)
+        return 2
+
+    repository = _repository(args)
+    orchestrator = _orchestrator(repository, args.profile, backup_profile)
+    if args.dry_run:
+        return _dry_run(orchestrator, folders, exclusions)
+    backup_filepath = repository.new_backup_path()
+    is_running = _Cancellation()
+
+    failed_files = orchestrator.create_incremental_backup(
+        folders, backup_filepath, exclusions, _print_progress, is_running)
+    _end_progress()
+    _print_profile_paths(orchestrator)
+
+    if not is_running():
+        print("تم إلغاء عملية النسخ الاحتياطي.", file=sys.stderr)
+        return 130
+    for path, reason in (failed_files or {}).items():
+        print(f"تعذر نسخ: {path} ({reason})", file=sys.stderr)
+    if backup_profile is not None:
+        report = orchestrator.apply_retention_policy(backup_profile.retention_policy)
+        if report.deleted_count:
+            print(report.summary(), file=sys.stderr)
+    if not backup_filepath.exists():
+        print("لم يتم العثور على ملفات جديدة لنسخها.")
+        return 0
+
+    size_mb = backup_filepath.stat().st_size / (1024 * 1024)
+    print(f"{backup_filepath}\t{size_mb:.2f} MB")
+    return 0
+
+
+def _dry_run(orchestrator, folders: List[Path], exclusions: List[str]) -> int:
+    """معاينة النسخة التالية: العدادات تتجدد على stderr والتقرير النهائي على stdout"""
+    from core.exceptions import BackupInterruptedError
+
+    def show_progress(report) -> None:
+        if not report.completed:
+            sys.stderr.write(f"\r{report.files_scanned} ملف فُحص، {report.files_to_backup} للنسخ "
+                             f"({report.bytes_to_backup / (1024 * 1024):.1f} MB)".ljust(70))
+            sys.stderr.flush()
+
+    try:
+        report = orchestrator.preview_backup(folders, exclusions, show_progress, _Cancellation())
+    except BackupInterruptedError:
+        _end_progress()
+        print("تم إلغاء المعاينة.", file=sys.stderr)
+        return 130
+    _end_progress()
+
+    print(report.summary())
+    for dry_run_file in report.largest:
+        print(f"{'+' if dry_run_file.is_new else '~'} {dry_run_file.path}\t{dry_run_file.size}")
+    return 0
+
+
+def cmd_exclusions(args) -> int:
+    from core.auto_backup import load_backup_selection
+    from core.exceptions import BackupInterruptedError
+    from core.exclusion_impact import ExclusionImpactAnalyzer
+    from core.file_scanner import FileScanner
+    from core.scan_cache import ScanIndex
+
+    saved_folders, saved_exclusions = load_backup_selection()
+    folders = [Path(folder).expanduser() for folder in args.folders] or saved_folders
+    exclusions = saved_exclusions + args.exclude
+    if not folders:
+        print("لا توجد مجلدات لفحصها.", file=sys.stderr)
+        return 2
+
+    # لا توجد ذاكرة فحص بين تشغيلات سطر الأوامر، فيُفحص القرص مرة واحدة وتُطبق عليه كل الأنماط
+    index = ScanIndex(folders)
+    try:
+        for directory in FileScanner().walk(folders, _Cancellation()):
+            index.add(directory)
+    except BackupInterruptedError:
+        print("تم إلغاء الفحص.", file=sys.stderr)
+        return 130
+
+    report = ExclusionImpactAnalyzer(index).analyze(exclusions)
+    for impact in sorted(report.patterns, key=lambda impact: -impact.bytes):
+        print(f"{impact.pattern}\t{impact.files}\t{impact.bytes}")
+    for suggestion in report.suggestions:
+        print(f"اقتراح: {suggestion.pattern}\t{suggestion.path}\t{suggestion.bytes}\t{suggestion.reason}")
+    print(report.summary(), file=sys.stderr)
+    return 0
+
+
+def cmd_restore(args) -> int:
+    repository = _repository(args)
+    backup_path = _resolve_backup(repository, args.backup)
+    if backup_path is None:
+        print("لم يتم العثور على النسخة المطلوبة.", file=sys.stderr)
+        return 2
+
+    orchestrator = _orchestrator(repository, args.profile)
+    is_running = _Cancellation()
+    result = orchestrator.restore_from_backup(backup_path, _print_progress, is_running,
+                                              args.only or None, args.overwrite)
+    _end_progress()
+    _print_profile_paths(orchestrator)
+    print(result)
+    return 0 if is_running() else 130
+
+
+def cmd_browse(args) -> int:
+    from core.archive_browser import open_catalog
+
+    repository = _repository(args)
+    backup_path = _resolve_backup(repository, args.backup)
+    if backup_path is None:
+        print("لم يتم العثور على النسخة المطلوبة.", file=sys.stderr)
+        return 2
+
+    catalog = open_catalog(backup_path)
+    if args.show:
+        try:
+            preview = catalog.read_preview(args.show)
+        except KeyError:
+            print(f"الملف غير موجود في النسخة: {args.show}", file=sys.stderr)
+            return 2
+        if preview.text is None:
+            print(f"ملف ثنائي ({preview.size} بايت).", file=sys.stderr)
+        else:
+            print(preview.text)
+            if preview.truncated:
+                print(f"… عُرض أول {len(preview.data)} بايت من {preview.size}.", file=sys.stderr)
+        return 0
+
+    entries = catalog.list_dir(args.path.strip("/"))
+    if not entries and args.path.strip("/"):
+        print(f"المجلد غير موجود في النسخة: {args.path}", file=sys.stderr)
+        return 2
+    for entry in entries:
+        if entry.is_dir:
+            print(f"{entry.name}/")
+        else:
+            modified = entry.modified.strftime('%Y-%m-%d %H:%M') if entry.modified else ""
+            print(f"{entry.name}\t{entry.size}\t{modified}")
+    return 0
+
+
+def cmd_diff(args) -> int:
+    from core.backup_diff import (BackupDiffer, BackupDiffReport, CHANGE_ADDED, CHANGE_MODIFIED,
+                                  CHANGE_REMOVED, format_size_delta)
+    from core.exceptions import CorruptedBackupError
+
+    repository = _repository(args)
+    old_backup = _resolve_backup(repository, args.old)
+    new_backup = _resolve_backup(repository, args.new)
+    if old_backup is None or new_backup is None:
+        print("لم يتم العثور على النسخة المطلوبة.", file=sys.stderr)
+        return 2
+
+    # التغييرات تُطبع أثناء الدمج ولا يُحفظ منها شيء - المجاميع فقط تبقى في الذاكرة
+    report = BackupDiffReport(old_backup, new_backup)
+    markers = {CHANGE_ADDED: "+", CHANGE_REMOVED: "-", CHANGE_MODIFIED: "~"}
+    try:
+        for entry in BackupDiffer(repository).iter_changes(old_backup, new_backup):
+            report.add(entry, max_entries=0)
+            if not args.summary:
+                delta = entry.size_delta
+                print(f"{markers[entry.change]} {entry.path}\t{'' if delta is None else format_size_delta(delta)}")
+    except CorruptedBackupError as e:
+        print(f"تعذرت قراءة سجل النسخة: {e}", file=sys.stderr)
+        return 1
+
+    if report.folders and not args.summary:
+        print()
+    for folder, totals in sorted(report.folders.items()):
+        print(f"{folder}/\t+{totals.added}\t-{totals.removed}\t~{totals.modified}\t"
+              f"{format_size_delta(totals.bytes_delta)}")
+    print(report.summary(), file=sys.stderr)
+    return 0
+
+
+def cmd_list(args) -> int:
+    from datetime import datetime
+
+    repository = _repository(args)
+    for info in repository.get_backups_info():
+        date = datetime.fromtimestamp(info.mtime).strftime('%Y-%m-%d %H:%M')
+        print(f"{info.name}\t{date}\t{info.size / (1024 * 1024):.2f} MB")
+    return 0
+
+
+def cmd_verify(args) -> int:
+    from core.backup_verifier import BackupVerifier
+    from core.exceptions import BackupInterruptedError
+
+    verifier = BackupVerifier(_repository(args))
+    is_running = _Cancellation()
+    try:
+        report = verifier.verify_all(
+            sample_percent=args.sample,
+            force=args.force,
+            progress_callback=_print_progress,
+            is_running_check=is_running
+        )
+    except BackupInterruptedError:
+        _end_progress()
+        print("تم إلغاء الفحص.", file=sys.stderr)
+        return 130
+    _end_progress()
+    print(report.summary())
+    return 1 if report.corrupted else 0
+
+
+def cmd_rotate(args) -> int:
+    from core.retention import RetentionPolicy
+
+    policy = RetentionPolicy(
+        keep_last=args.keep,
+        keep_daily=args.daily,
+        keep_weekly=args.weekly,
+        keep_monthly=args.monthly
+    )
+    from core.search_index import SearchIndex
+
+    repository = _repository(args)
+    report = repository.apply_retention_policy(policy)
+    # النسخ المحذوفة تخرج من فهرس البحث حتى لا تظهر في نتائج الواجهة
+    SearchIndex(repository).sync()
+    print(report.summary())
+    return 0
+
+
+def cmd_limits(args) -> int:
+    from utils.config_manager import ConfigurationManager
+
+    config_manager = ConfigurationManager()
+    updates = {
+        'io_read_limit_mb': args.read,
+        'io_write_limit_mb': args.write,
+        'cpu_limit_percent': args.cpu,
+    }
+    for key, value in updates.items():
+        if value is not None and not config_manager.update_setting(key, value):
+            print(f"قيمة غير صالحة: {key}={value}", file=sys.stderr)
+            return 2
+
+    settings = config_manager.load_settings()
+    print(f"read\t{settings.io_read_limit_mb} MB/s\n"
+          f"write\t{settings.io_write_limit_mb} MB/s\n"
+          f"cpu\t{settings.cpu_limit_percent}%")
+    return 0
+
+
+def _describe_profile(profile) -> str:
+    level = "افتراضي" if profile.compression_level is None else profile.compression_level
+    schedule = f"كل {profile.auto_backup_interval_hours} ساعة" if profile.auto_backup_interval_hours else "يدوي"
+    return (f"{profile.name}\t{profile.backup_dir}\n"
+            f"  folders\t{', '.join(profile.folders)}\n"
+            f"  codec\t{profile.codec} ({level})\n"
+            f"  keep\t{profile.keep_last} + daily {profile.keep_daily}, "
+            f"weekly {profile.keep_weekly}, monthly {profile.keep_monthly}\n"
+            f"  schedule\t{schedule}")
+
+
+def cmd_profiles_list(args) -> int:
+    from core.backup_profiles import BackupProfileStore
+
+    for profile in BackupProfileStore().list_profiles():
+        print(_describe_profile(profile))
+    return 0
+
+
+def cmd_profiles_set(args) -> int:
+    from core.backup_profiles import BackupProfile, BackupProfileStore
+    from core.exceptions import ValidationException
+
+    store = BackupProfileStore()
+    profile = store.get(args.name) or BackupProfile(args.name)
+    if args.folders:
+        profile.folders = [str(Path(folder).expanduser().absolute()) for folder in args.folders]
+    profile.exclusions += [pattern for pattern in args.exclude if pattern not in profile.exclusions]
+    updates = {
+        'destination': str(Path(args.dest).expanduser().absolute()) if args.dest else None,
+        'codec': args.codec,
+        'compression_level': args.level,
+        'keep_last': args.keep,
+        'keep_daily': args.daily,
+        'keep_weekly': args.weekly,
+        'keep_monthly': args.monthly,
+        'auto_backup_interval_hours': args.every,
+    }
+    for key, value in updates.items():
+        if value is not None:
+            setattr(profile, key, value)
+
+    try:
+        store.save(profile)
+    except ValidationException as e:
+        print(f"قيمة غير صالحة: {e.message}", file=sys.stderr)
+        return 2
+    print(_describe_profile(profile))
+    return 0
+
+
+def cmd_profiles_remove(args) -> int:
+    from core.backup_profiles import BackupProfileStore
+
+    if not BackupProfileStore().delete(args.name):
+        print(f"ملف التعريف غير موجود: {args.name}", file=sys.stderr)
+        return 2
+    return 0
+
+
+def _add_profile_argument(parser: argparse.ArgumentParser) -> None:
+    from utils.config import PROFILING_MODES
+
+    parser.add_argument('--profile', choices=PROFILING_MODES,
+                        help="قياس أداء هذا التشغيل (الافتراضي: profiling_mode في الإعدادات)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="alhirz", description="الحِرز - النسخ الاحتياطي من سطر الأوامر")
+    repository = parser.add_mutually_exclusive_group()
+    repository.add_argument('--repo', help="مجلد النسخ الاحتياطية (الافتراضي ~/.AlZanad/alhirz/backups)")
+    repository.add_argument('--backup-profile', metavar='NAME',
+                            help="العمل على مستودع ملف تعريف؛ مع backup تُستخدم مجلداته واستثناءاته وضغطه واحتفاظه")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    backup = commands.add_parser('backup', help="إنشاء نسخة تراكمية")
+    backup.add_argument('folders', nargs='*', help="المجلدات (الافتراضي: المجلدات المحددة في الواجهة)")
+    backup.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                        help="نمط استثناء إضافي (يمكن تكراره)")
+    backup.add_argument('--dry-run', action='store_true',
+                        help="عرض ما ستحتويه النسخة وحجمها المتوقع دون كتابة شيء")
+    _add_profile_argument(backup)
+    backup.set_defaults(handler=cmd_backup)
+
+    restore = commands.add_parser('restore', help="استرداد نسخة إلى مواقعها الأصلية")
+    restore.add_argument('backup', nargs='?', help="اسم النسخة أو مسارها (الافتراضي: الأحدث)")
+    restore.add_argument('--only', action='append', metavar='PATH',
+                         help="استرداد ملف أو مجلد محدد داخل النسخة فقط (يمكن تكراره)")
+    restore.add_argument('--overwrite', action='store_true', help="استبدال الملفات الموجودة بنسخها المحفوظة")
+    _add_profile_argument(restore)
+    restore.set_defaults(handler=cmd_restore)
+
+    browse = commands.add_parser('browse', help="عرض محتويات مجلد داخل نسخة دون استخراجها")
+    browse.add_argument('backup', nargs='?', help="اسم النسخة أو مسارها (الافتراضي: الأحدث)")
+    browse.add_argument('path', nargs='?', default="", help="المجلد داخل النسخة (الافتراضي: المستوى الأعلى)")
+    browse.add_argument('--show', metavar='FILE', help="عرض بداية محتوى ملف داخل النسخة")
+    browse.set_defaults(handler=cmd_browse)
+
+    exclusions = commands.add_parser('exclusions', help="عدد الملفات والحجم الذي يستبعده كل نمط، ومقترحات الاستبعاد")
+    exclusions.add_argument('folders', nargs='*', help="المجلدات (الافتراضي: المجلدات المحددة في الواجهة)")
+    exclusions.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                            help="نمط استثناء إضافي (يمكن تكراره)")
+    exclusions.set_defaults(handler=cmd_exclusions)
+
+    diff = commands.add_parser('diff', help="مقارنة نسختين من سجليهما دون قراءة بيانات الأرشيف")
+    diff.add_argument('old', help="النسخة الأقدم (اسمها أو مسارها)")
+    diff.add_argument('new', nargs='?', help="النسخة الأحدث (الافتراضي: الأحدث)")
+    diff.add_argument('--summary', action='store_true', help="عرض مجاميع المجلدات فقط دون قائمة الملفات")
+    diff.set_defaults(handler=cmd_diff)
+
+    listing = commands.add_parser('list', help="عرض النسخ المتاحة")
+    listing.set_defaults(handler=cmd_list)
+
+    verify = commands.add_parser('verify', help="فحص سلامة النسخ")
+    verify.add_argument('--sample', type=float, default=100.0, metavar='PERCENT',
+                        help="نسبة النسخ غير المتغيرة التي يُعاد فحصها")
+    verify.add_argument('--force', action='store_true', help="تجاهل نتائج الفحص المحفوظة")
+    verify.set_defaults(handler=cmd_verify)
+
+    rotate = commands.add_parser('rotate', help="تطبيق سياسة الاحتفاظ وحذف النسخ القديمة")
+    rotate.add_argument('--keep', type=int, default=DEFAULT_BACKUP_RETENTION, help="عدد أحدث النسخ المحتفظ بها")
+    rotate.add_argument('--daily', type=int, default=0, help="عدد النسخ اليومية")
+    rotate.add_argument('--weekly', type=int, default=0, help="عدد النسخ الأسبوعية")
+    rotate.add_argument('--monthly', type=int, default=0, help="عدد النسخ الشهرية")
+    rotate.set_defaults(handler=cmd_rotate)
+
+    limits = commands.add_parser('limits', help="عرض حدود الموارد أو تعديلها (تنطبق فوراً على العمليات الجارية)")
+    limits.add_argument('--read', type=int, metavar='MB', help="حد سرعة القراءة بالميجابايت/ثانية (0 بلا حد)")
+    limits.add_argument('--write', type=int, metavar='MB', help="حد سرعة الكتابة بالميجابايت/ثانية (0 بلا حد)")
+    limits.add_argument('--cpu', type=int, metavar='PERCENT', help="حصة المعالج لخيط الضغط (5-100)")
+    limits.set_defaults(handler=cmd_limits)
+
+    profiles = commands.add_parser('profiles', help="إدارة ملفات تعريف النسخ المستقلة")
+    profile_commands = profiles.add_subparsers(dest='profiles_command', required=True)
+
+    profiles_list = profile_commands.add_parser('list', help="عرض ملفات التعريف")
+    profiles_list.set_defaults(handler=cmd_profiles_list)
+
+    profiles_set = profile_commands.add_parser('set', help="إضافة ملف تعريف أو تعديل حقوله المحددة")
+    profiles_set.add_argument('name')
+    profiles_set.add_argument('folders', nargs='*', help="المجلدات (تستبدل المحفوظة)")
+    profiles_set.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                              help="نمط استثناء يُضاف إلى الاستثناءات الافتراضية (يمكن تكراره)")
+    profiles_set.add_argument('--dest', metavar='DIR',
+                              help="مجلد النسخ (الافتراضي ~/.AlZanad/alhirz/profile_backups/NAME)")
+    profiles_set.add_argument('--codec', help="خوارزمية الضغط: deflate أو stored أو bzip2 أو lzma")
+    profiles_set.add_argument('--level', type=int, help="مستوى الضغط 0-9")
+    profiles_set.add_argument('--keep', type=int, help="عدد أحدث النسخ المحتفظ بها")
+    profiles_set.add_argument('--daily', type=int, help="عدد النسخ اليومية")
+    profiles_set.add_argument('--weekly', type=int, help="عدد النسخ الأسبوعية")
+    profiles_set.add_argument('--monthly', type=int, help="عدد النسخ الشهرية")
+    profiles_set.add_argument('--every', type=int, metavar='HOURS',
+                              help="فترة النسخ في خدمة النسخ التلقائي (0 يدوي فقط)")
+    profiles_set.set_defaults(handler=cmd_profiles_set)
+
+    profiles_remove = profile_commands.add_parser('remove', help="حذف ملف تعريف (تبقى نسخه في وجهته)")
+    profiles_remove.add_argument('name')
+    profiles_remove.set_defaults(handler=cmd_profiles_remove)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print(f"خطأ: {e}", file=sys.stderr)
+        return 1
@@ -0,0 +1,6 @@
+"""
+قياسات الأداء - python -m benchmarks
+مسؤولية واحدة: قياس الفحص والنسخ والاسترداد على شجرة ملفات مصطنعة ثابتة ومقارنة النتائج بخط أساس محفوظ
+
+ليست اختبارات: لا تُشغل مع الاختبارات، ونتائجها تعتمد على الجهاز الذي قيست عليه.
+"""
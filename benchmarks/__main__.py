@@ -0,0 +1,127 @@
+"""
+تشغيل قياسات الأداء - python -m benchmarks
+مسؤولية واحدة: تحويل أوامر الطرفية إلى تشغيل مجموعة القياسات ومقارنة نتائجها
+
+رمز الخروج 1 يعني تراجعاً عن خط الأساس و2 مدخلات غير صالحة.
+"""
+import argparse
+import dataclasses
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from benchmarks.results import DEFAULT_THRESHOLD, compare_results, load_results, write_results
+from benchmarks.synthetic_tree import TREE_SPECS
+
+
+def _print_progress(message: str) -> None:
+    print(message, file=sys.stderr)
+
+
+def _compare(baseline_path: Path, results, threshold: float) -> int:
+    try:
+        report = compare_results(load_results(baseline_path), results, threshold)
+    except (OSError, ValueError) as e:
+        print(f"خطأ: {e}", file=sys.stderr)
+        return 2
+    print(report.summary(), file=sys.stderr)
+    return 1 if report.regressions else 0
+
+
+def cmd_run(args) -> int:
+    # الاستيراد هنا لأن المجموعة تحدد المجلد الرئيسي قبل استيراد وحدات المركز
+    from benchmarks.suite import BenchmarkSuite
+
+    if args.repeat < 1:
+        print("عدد التكرارات يجب أن يكون 1 على الأقل.", file=sys.stderr)
+        return 2
+    spec = TREE_SPECS[args.size]
+    if args.seed is not None:
+        spec = dataclasses.replace(spec, seed=args.seed)
+
+    if args.workdir:
+        workdir = Path(args.workdir).expanduser()
+        if workdir.exists() and any(workdir.iterdir()):
+            print(f"مجلد القياس ليس فارغاً: {workdir}", file=sys.stderr)
+            return 2
+        workdir.mkdir(parents=True, exist_ok=True)
+    else:
+        workdir = Path(tempfile.mkdtemp(prefix="alhirz_bench_"))
+
+    try:
+        results = BenchmarkSuite(workdir, spec, args.engine, args.repeat, _print_progress).run()
+    finally:
+        if args.keep:
+            print(f"مجلد القياس: {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        write_results(results, Path(args.output).expanduser())
+        print(f"النتائج: {args.output}", file=sys.stderr)
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+    for name, metric in results['results'].items():
+        print(f"{name:<22}{metric['seconds']:>9.3f}s  {metric['files_per_second'] or 0:>10.0f} ملف/ث"
+              f"  {metric['mb_per_second'] or 0:>8.1f} MB/s", file=sys.stderr)
+
+    if args.baseline:
+        return _compare(Path(args.baseline).expanduser(), results, args.threshold)
+    return 0
+
+
+def cmd_compare(args) -> int:
+    try:
+        current = load_results(Path(args.current).expanduser())
+    except (OSError, ValueError) as e:
+        print(f"خطأ: {e}", file=sys.stderr)
+        return 2
+    return _compare(Path(args.baseline).expanduser(), current, args.threshold)
+
+
+def _add_threshold_argument(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"نسبة الزيادة في الزمن التي تُعد تراجعاً (الافتراضي {DEFAULT_THRESHOLD})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from benchmarks.suite import ENGINES
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="قياسات أداء الحِرز")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="إنشاء شجرة مصطنعة وقياس الفحص والنسخ والاسترداد")
+    run.add_argument('--size', choices=sorted(TREE_SPECS), default="small", help="حجم الشجرة المصطنعة")
+    run.add_argument('--seed', type=int, help="بذرة أخرى للشجرة (لا تُقارن النتائج إلا بنفس البذرة)")
+    run.add_argument('--repeat', type=int, default=3, help="عدد التكرارات - يُحفظ أفضل زمن لكل قياس")
+    run.add_argument('--engine', choices=ENGINES, default=ENGINES[0], help="محرك النسخ")
+    run.add_argument('--output', '-o', help="ملف JSON للنتائج (الافتراضي stdout)")
+    run.add_argument('--baseline', help="مقارنة النتائج بخط أساس محفوظ بعد القياس")
+    run.add_argument('--workdir', help="مجلد فارغ للشجرة والنسخ بدل مجلد مؤقت")
+    run.add_argument('--keep', action='store_true', help="إبقاء مجلد القياس بعد الانتهاء")
+    _add_threshold_argument(run)
+    run.set_defaults(handler=cmd_run)
+
+    compare = commands.add_parser('compare', help="مقارنة ملف نتائج بخط أساس وكشف التراجع")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    _add_threshold_argument(compare)
+    compare.set_defaults(handler=cmd_compare)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        return 130
+
+
+# الحماية ضرورية لأن عمليات الضغط الفرعية قد تستورد الوحدة الرئيسية
+if __name__ == "__main__":
+    sys.exit(main())
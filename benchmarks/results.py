@@ -0,0 +1,102 @@
+"""
+نتائج القياس
+مسؤولية واحدة: حفظ نتائج القياس وقراءتها ومقارنتها بخط أساس لكشف التراجع في الأداء
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List
+
+# نسبة الزيادة في الزمن التي تُعد تراجعاً
+DEFAULT_THRESHOLD = 0.10
+# فرق الزمن الذي لا يُعد تراجعاً مهما كانت نسبته - القياسات القصيرة جداً يغلب عليها الضجيج
+MIN_REGRESSION_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class MetricComparison:
+    """زمن قياس واحد في خط الأساس وفي التشغيل الحالي - Value Object"""
+    name: str
+    baseline_seconds: float
+    current_seconds: float
+    regressed: bool
+
+    @property
+    def ratio(self) -> float:
+        return self.current_seconds / self.baseline_seconds if self.baseline_seconds else 1.0
+
+
+@dataclass
+class ComparisonReport:
+    """نتيجة مقارنة تشغيل بخط الأساس"""
+    threshold: float
+    metrics: List[MetricComparison] = field(default_factory=list)
+    # قياسات في أحد الملفين فقط - تظهر عند إضافة قياس جديد أو حذفه
+    missing: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> List[MetricComparison]:
+        return [metric for metric in self.metrics if metric.regressed]
+
+    def summary(self) -> str:
+        """جدول نصي بالمقارنة"""
+        lines = [f"{'القياس':<22}{'الأساس':>10}{'الحالي':>10}{'التغير':>9}"]
+        for metric in self.metrics:
+            marker = "  تراجع" if metric.regressed else ""
+            lines.append(f"{metric.name:<22}{metric.baseline_seconds:>9.3f}s{metric.current_seconds:>9.3f}s"
+                         f"{(metric.ratio - 1) * 100:>+8.1f}%{marker}")
+        lines.extend(f"غير موجود في أحد الملفين: {name}" for name in self.missing)
+        lines.extend(f"تنبيه: {warning}" for warning in self.warnings)
+        if self.regressions:
+            lines.append(f"{len(self.regressions)} قياس أبطأ من خط الأساس بأكثر من {self.threshold:.0%}.")
+        else:
+            lines.append("لا تراجع في الأداء.")
+        return "\n".join(lines)
+
+
+def write_results(results: Dict[str, Any], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8')
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """قراءة ملف نتائج - ValueError إذا لم يكن ملف نتائج قياس"""
+    try:
+        results = json.loads(path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"ملف نتائج غير صالح: {path}") from e
+    if not isinstance(results, dict) or 'results' not in results or 'tree' not in results:
+        raise ValueError(f"ملف نتائج غير صالح: {path}")
+    return results
+
+
+def compare_results(baseline: Dict[str, Any],
+                    current: Dict[str, Any],
+                    threshold: float = DEFAULT_THRESHOLD,
+                    min_seconds: float = MIN_REGRESSION_SECONDS) -> ComparisonReport:
+    """مقارنة أفضل زمن لكل قياس - ValueError إذا قيس التشغيلان على شجرتين مختلفتين"""
+    if baseline['tree'].get('spec') != current['tree'].get('spec'):
+        raise ValueError("خط الأساس والتشغيل الحالي قيسا على شجرتين مختلفتين (الحجم أو البذرة)")
+
+    report = ComparisonReport(threshold)
+    baseline_environment = baseline.get('environment', {})
+    current_environment = current.get('environment', {})
+    for key in ('engine', 'platform', 'cpu_count', 'python'):
+        if baseline_environment.get(key) != current_environment.get(key):
+            report.warnings.append(f"{key} مختلف: {baseline_environment.get(key)} ← {current_environment.get(key)}")
+
+    baseline_metrics = baseline['results']
+    current_metrics = current['results']
+    for name, baseline_metric in baseline_metrics.items():
+        current_metric = current_metrics.get(name)
+        if current_metric is None:
+            report.missing.append(name)
+            continue
+        baseline_seconds = baseline_metric['seconds']
+        current_seconds = current_metric['seconds']
+        regressed = (current_seconds > baseline_seconds * (1 + threshold)
+                     and current_seconds - baseline_seconds > min_seconds)
+        report.metrics.append(MetricComparison(name, baseline_seconds, current_seconds, regressed))
+    report.missing.extend(name for name in current_metrics if name not in baseline_metrics)
+    return report
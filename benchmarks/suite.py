@@ -0,0 +1,192 @@
+"""
+مجموعة قياسات الأداء
+مسؤولية واحدة: تشغيل الفحص والنسخ التراكمي والاسترداد على شجرة مصطنعة وقياس زمن كل منها
+
+المسارات في utils.config تُحسب من المجلد الرئيسي عند الاستيراد، فتُستورد وحدات المركز
+داخل الدوال فقط بعد توجيه HOME إلى مجلد القياس بـ use_home.
+"""
+import os
+import platform
+import shutil
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic_tree import GeneratedTree, TreeSpec, generate_tree, modify_files
+
+SUITE_VERSION = 1
+# نسبة الملفات المعدلة في قياس النسخ التراكمي بعد تغيير بسيط
+CHANGE_FRACTION = 0.01
+ENGINES = ("pipelined", "sequential")
+
+
+@dataclass
+class Measurement:
+    """زمن عملية واحدة في كل تكرار - الأفضل هو الأقل تأثراً بضجيج الجهاز فتُقارن به النتائج"""
+    name: str
+    files: int
+    bytes: int
+    samples: List[float] = field(default_factory=list)
+
+    @property
+    def seconds(self) -> float:
+        return min(self.samples)
+
+    def to_dict(self) -> Dict[str, Any]:
+        seconds = self.seconds
+        return {
+            'seconds': round(seconds, 4),
+            'samples': [round(sample, 4) for sample in self.samples],
+            'files': self.files,
+            'bytes': self.bytes,
+            'files_per_second': round(self.files / seconds, 1) if seconds else None,
+            'mb_per_second': round(self.bytes / (1024 * 1024) / seconds, 2) if seconds and self.bytes else None,
+        }
+
+
+def use_home(home: Path) -> None:
+    """توجيه المجلد الرئيسي إلى مجلد القياس - يجب أن يسبق أول استيراد لوحدات المركز"""
+    config = sys.modules.get('utils.config')
+    if config is not None and Path(config.HOME_DIR) != home:
+        raise RuntimeError("utils.config استُورد قبل تحديد مجلد القياس")
+    os.environ['HOME'] = str(home)
+    os.environ['USERPROFILE'] = str(home)
+
+
+class BenchmarkSuite:
+    """قياس الفحص ثم النسخ الأول والنسخ دون تغيير والنسخ بعد تعديل 1% ثم الاسترداد الكامل
+
+    كل تكرار ينسخ إلى مستودع جديد، والاسترداد يعيد الملفات المنسوخة إلى حالتها قبل
+    التعديل مع بقاء الملفات المستبعدة، فيقيس كل تكرار نفس العمل بالضبط.
+    """
+
+    def __init__(self,
+                 workdir: Path,
+                 spec: TreeSpec,
+                 engine: str = "pipelined",
+                 repeat: int = 3,
+                 progress: Callable[[str], None] = None):
+        self.workdir = workdir
+        self.home = workdir / "home"
+        self.spec = spec
+        self.engine = engine
+        self.repeat = repeat
+        self.progress = progress or (lambda message: None)
+
+    def run(self) -> Dict[str, Any]:
+        """إنشاء الشجرة وتشغيل القياسات وإرجاع النتائج بصيغة قابلة للحفظ كـ JSON"""
+        self.home.mkdir(parents=True, exist_ok=True)
+        use_home(self.home)
+
+        self.progress(f"إنشاء الشجرة المصطنعة ({self.spec.name})...")
+        started = time.perf_counter()
+        tree = generate_tree(self.home, self.spec)
+        self.progress(f"أُنشئ {tree.file_count} ملف ({tree.total_bytes / (1024 * 1024):.1f} MB) "
+                      f"و{tree.excluded_files} ملف مستبعد في {time.perf_counter() - started:.1f} ثانية")
+
+        measurements = [self._measure_scan(tree)]
+        measurements.extend(self._measure_backup_and_restore(tree))
+        return {
+            'suite_version': SUITE_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'environment': {
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'engine': self.engine,
+                'repeat': self.repeat,
+            },
+            'tree': tree.to_dict(),
+            'results': {measurement.name: measurement.to_dict() for measurement in measurements},
+        }
+
+    def _measure_scan(self, tree: GeneratedTree) -> Measurement:
+        from core.file_scanner import FileScanner
+        from utils.config import DEFAULT_EXCLUSIONS
+
+        measurement = Measurement("scan_files", tree.file_count, tree.total_bytes)
+        scanner = FileScanner()
+        for repetition in range(self.repeat):
+            self.progress(f"فحص الملفات ({repetition + 1}/{self.repeat})...")
+            started = time.perf_counter()
+            files = scanner.scan_files(tree.folders, DEFAULT_EXCLUSIONS)
+            measurement.samples.append(time.perf_counter() - started)
+            _expect(len(files) == tree.file_count,
+                    f"الفحص وجد {len(files)} ملف والمتوقع {tree.file_count}")
+        return measurement
+
+    def _measure_backup_and_restore(self, tree: GeneratedTree) -> List[Measurement]:
+        cold = Measurement("backup_cold", tree.file_count, tree.total_bytes)
+        unchanged = Measurement("backup_unchanged", tree.file_count, 0)
+        changed = Measurement("backup_changed_1pct", 0, 0)
+        restore = Measurement("restore_full", tree.file_count, tree.total_bytes)
+
+        for repetition in range(self.repeat):
+            step = f"({repetition + 1}/{self.repeat})"
+            repository_dir = self.workdir / "repositories" / f"run_{repetition}"
+            orchestrator = self._orchestrator(repository_dir)
+
+            self.progress(f"النسخ الأول {step}...")
+            cold_path = self._backup(orchestrator, tree, cold)
+            _expect(cold_path.exists(), "النسخ الأول لم ينتج أرشيفاً")
+
+            self.progress(f"النسخ دون تغيير {step}...")
+            unchanged_path = self._backup(orchestrator, tree, unchanged)
+            _expect(not unchanged_path.exists(), "النسخ دون تغيير أنتج أرشيفاً")
+
+            changed.files, changed.bytes = modify_files(tree, CHANGE_FRACTION, self.spec.seed)
+            self.progress(f"النسخ بعد تعديل {changed.files} ملف {step}...")
+            changed_path = self._backup(orchestrator, tree, changed)
+            _expect(changed_path.exists(), "النسخ بعد التعديل لم ينتج أرشيفاً")
+
+            self.progress(f"الاسترداد الكامل {step}...")
+            # تُحذف الملفات المنسوخة فقط؛ المستبعدة ليست في الأرشيف وتبقى لفحص التكرار التالي
+            for relative_path in tree.files:
+                os.unlink(tree.home / relative_path)
+            started = time.perf_counter()
+            result = orchestrator.restore_from_backup(cold_path, _ignore_progress, _always_running)
+            restore.samples.append(time.perf_counter() - started)
+            _expect(result is not None, "فشل الاسترداد")
+            restored = sum(len(files) for folder in tree.folders
+                           for _, _, files in os.walk(folder)) - tree.excluded_files
+            _expect(restored == tree.file_count, f"استُرد {restored} ملف والمتوقع {tree.file_count}")
+            shutil.rmtree(repository_dir)
+
+        return [cold, unchanged, changed, restore]
+
+    def _orchestrator(self, repository_dir: Path):
+        from core.async_engine import AsyncBackupOrchestrator
+        from core.backup_manager import BackupOrchestrator
+        from core.backup_repository import BackupRepository
+
+        orchestrator_class = AsyncBackupOrchestrator if self.engine == "pipelined" else BackupOrchestrator
+        return orchestrator_class(repository=BackupRepository(repository_dir))
+
+    @staticmethod
+    def _backup(orchestrator, tree: GeneratedTree, measurement: Measurement) -> Path:
+        from utils.config import DEFAULT_EXCLUSIONS
+
+        backup_filepath = orchestrator.repository.new_backup_path()
+        started = time.perf_counter()
+        failed_files = orchestrator.create_incremental_backup(
+            tree.folders, backup_filepath, DEFAULT_EXCLUSIONS, _ignore_progress, _always_running)
+        measurement.samples.append(time.perf_counter() - started)
+        _expect(not failed_files, f"تعذر نسخ {len(failed_files or {})} ملف")
+        return backup_filepath
+
+
+def _expect(condition: bool, message: str) -> None:
+    """القياس على نتيجة خاطئة لا قيمة له، فيتوقف بدل حفظ أرقام مضللة"""
+    if not condition:
+        raise RuntimeError(message)
+
+
+def _ignore_progress(progress: int, message: str) -> None:
+    pass
+
+
+def _always_running() -> bool:
+    return True
@@ -0,0 +1,232 @@
+"""
+شجرة ملفات مصطنعة للقياس
+مسؤولية واحدة: إنشاء مجلد رئيسي مصطنع ثابت المحتوى من بذرة واحدة، وتعديل نسبة محددة من ملفاته
+
+نفس المواصفة والبذرة تنتجان نفس الأسماء والأحجام والمحتوى وتواريخ التعديل على أي جهاز،
+فتبقى القياسات المتتالية قابلة للمقارنة. لا تعتمد على وحدات المركز حتى يمكن إنشاء الشجرة
+قبل تحديد المجلد الرئيسي الذي تستورده الوحدات.
+"""
+import os
+import random
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# أسماء بالعربية وبلغات أخرى ومسافات ورموز - ترميز الأسماء في الأرشيف وفي السجل جزء مما يُقاس
+DIRECTORY_NAMES = [
+    "تقارير", "فواتير", "مشروع التخرج", "صور العائلة", "الميزانية_السنوية", "رسائل",
+    "résumé", "Übersicht", "报告", "отчёты", "naïve café", "archive 2023", "📷 photos", "notes",
+]
+FILE_STEMS = [
+    "تقرير", "فاتورة", "ملاحظات", "محضر اجتماع", "قائمة_المهام", "عقد",
+    "draft", "naïve", "日記", "заметка", "señal", "résumé", "data", "📝 idea",
+]
+TEXT_WORDS = [
+    "النسخ", "الاحتياطي", "الملفات", "المجلد", "التقرير", "السنوي", "المشروع", "الميزانية",
+    "backup", "archive", "report", "budget", "project", "meeting", "2024", "total",
+]
+# أسماء تطابق قواعد الاستبعاد الافتراضية
+EXCLUDED_DIRECTORIES = ["node_modules", "__pycache__", ".git"]
+EXCLUDED_SUFFIXES = [".tmp", ".log", ".pyc", ".bak"]
+
+# تواريخ التعديل ثابتة حتى لا يختلف السجل بين تشغيلين
+BASE_MTIME = 1_600_000_000
+MODIFIED_MTIME_OFFSET = 3600
+HUGE_FILE_CHUNK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    """مواصفة الشجرة المصطنعة - Value Object"""
+    name: str
+    tiny_files: int
+    files_per_directory: int
+    medium_files: int
+    huge_files: int
+    huge_file_bytes: int
+    depth: int
+    excluded_files: int
+    tiny_max_bytes: int = 2048
+    medium_max_bytes: int = 2 * 1024 * 1024
+    seed: int = 2024
+
+
+TREE_SPECS: Dict[str, TreeSpec] = {
+    # بضع ثوانٍ - للتحقق السريع قبل الدمج
+    "small": TreeSpec("small", tiny_files=2_000, files_per_directory=40, medium_files=40,
+                      huge_files=2, huge_file_bytes=16 * 1024 * 1024, depth=24, excluded_files=600),
+    "medium": TreeSpec("medium", tiny_files=20_000, files_per_directory=50, medium_files=200,
+                       huge_files=3, huge_file_bytes=96 * 1024 * 1024, depth=40, excluded_files=5_000),
+    "large": TreeSpec("large", tiny_files=100_000, files_per_directory=60, medium_files=600,
+                      huge_files=4, huge_file_bytes=256 * 1024 * 1024, depth=48, excluded_files=20_000),
+}
+
+
+@dataclass
+class GeneratedTree:
+    """الشجرة بعد إنشائها - files هي الملفات التي يجب أن تدخل النسخة نسبة إلى المجلد الرئيسي"""
+    spec: TreeSpec
+    home: Path
+    folders: List[Path]
+    files: List[str] = field(default_factory=list)
+    total_bytes: int = 0
+    excluded_files: int = 0
+    excluded_bytes: int = 0
+    directories: int = 0
+
+    @property
+    def file_count(self) -> int:
+        return len(self.files)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """وصف الشجرة في ملف النتائج - المقارنة بين شجرتين مختلفتين لا معنى لها"""
+        return {
+            'spec': asdict(self.spec),
+            'folders': [folder.name for folder in self.folders],
+            'files': self.file_count,
+            'bytes': self.total_bytes,
+            'excluded_files': self.excluded_files,
+            'excluded_bytes': self.excluded_bytes,
+            'directories': self.directories,
+        }
+
+
+class _TreeWriter:
+    """كتابة ملفات الشجرة بترتيب ثابت من مولد عشوائي واحد"""
+
+    def __init__(self, tree: GeneratedTree):
+        self.tree = tree
+        self.rng = random.Random(tree.spec.seed)
+        self._created_directories = set()
+        self._mtime = BASE_MTIME
+
+    def write(self, relative_path: str, content: bytes, excluded: bool = False) -> None:
+        path = self.tree.home / relative_path
+        parent = path.parent
+        if parent not in self._created_directories:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._created_directories.add(parent)
+        path.write_bytes(content)
+        self._mtime += 7
+        os.utime(path, (self._mtime, self._mtime))
+        self._count(relative_path, len(content), excluded)
+
+    def write_chunks(self, relative_path: str, size: int, compressible: bool) -> None:
+        """ملف كبير يُكتب على دفعات حتى لا يُحمل كاملاً في الذاكرة"""
+        path = self.tree.home / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as file:
+            remaining = size
+            while remaining:
+                chunk_size = min(HUGE_FILE_CHUNK, remaining)
+                file.write(self.text(chunk_size) if compressible else self.rng.randbytes(chunk_size))
+                remaining -= chunk_size
+        self._mtime += 7
+        os.utime(path, (self._mtime, self._mtime))
+        self._count(relative_path, size, False)
+
+    def text(self, size: int) -> bytes:
+        """نص قابل للضغط بالحجم المطلوب بالضبط"""
+        if size <= 0:
+            return b""
+        words = " ".join(self.rng.choices(TEXT_WORDS, k=size // 6 + 1)).encode('utf-8')
+        while len(words) < size:
+            words += words
+        return words[:size]
+
+    def _count(self, relative_path: str, size: int, excluded: bool) -> None:
+        if excluded:
+            self.tree.excluded_files += 1
+            self.tree.excluded_bytes += size
+        else:
+            self.tree.files.append(relative_path)
+            self.tree.total_bytes += size
+
+    def finish(self) -> None:
+        self.tree.directories = len(self._created_directories)
+
+
+def generate_tree(home: Path, spec: TreeSpec) -> GeneratedTree:
+    """إنشاء الشجرة داخل home - يرفض الكتابة فوق مجلدات موجودة"""
+    folders = [home / "Documents", home / "Videos", home / "Projects"]
+    for folder in folders:
+        if folder.exists():
+            raise FileExistsError(f"المجلد موجود مسبقاً: {folder}")
+
+    tree = GeneratedTree(spec, home, folders)
+    writer = _TreeWriter(tree)
+    _write_tiny_files(writer, spec)
+    _write_medium_files(writer, spec)
+    _write_huge_files(writer, spec)
+    _write_deep_nesting(writer, spec)
+    _write_excluded_files(writer, spec)
+    writer.finish()
+    tree.files.sort()
+    return tree
+
+
+def _write_tiny_files(writer: _TreeWriter, spec: TreeSpec) -> None:
+    """ملفات نصية صغيرة كثيرة موزعة على ثلاثة مستويات من المجلدات"""
+    names = len(DIRECTORY_NAMES)
+    for index in range(spec.tiny_files):
+        directory = index // spec.files_per_directory
+        relative_dir = os.path.join("Documents", DIRECTORY_NAMES[directory % names],
+                                    DIRECTORY_NAMES[(directory // names) % names], f"{directory:05d}")
+        stem = FILE_STEMS[index % len(FILE_STEMS)]
+        # بعض الملفات فارغة تماماً
+        size = 0 if index % 97 == 0 else writer.rng.randint(1, spec.tiny_max_bytes)
+        writer.write(os.path.join(relative_dir, f"{stem}_{index}.txt"), writer.text(size))
+
+
+def _write_medium_files(writer: _TreeWriter, spec: TreeSpec) -> None:
+    """صور لا تنضغط وجداول تنضغط بأحجام متوسطة"""
+    for index in range(spec.medium_files):
+        size = writer.rng.randint(64 * 1024, spec.medium_max_bytes)
+        if index % 2:
+            writer.write(os.path.join("Documents", "صور العائلة", f"IMG_{index:04d}.jpg"), writer.rng.randbytes(size))
+        else:
+            writer.write(os.path.join("Documents", "الميزانية_السنوية", f"جدول_{index:04d}.csv"), writer.text(size))
+
+
+def _write_huge_files(writer: _TreeWriter, spec: TreeSpec) -> None:
+    """ملفات كبيرة قليلة: مقاطع فيديو لا تنضغط بالتناوب مع تفريغات قواعد بيانات تنضغط"""
+    for index in range(spec.huge_files):
+        compressible = index % 2 == 1
+        name = f"قاعدة_بيانات_{index}.sql" if compressible else f"فيديو العائلة {index}.mp4"
+        writer.write_chunks(os.path.join("Videos", name), spec.huge_file_bytes, compressible)
+
+
+def _write_deep_nesting(writer: _TreeWriter, spec: TreeSpec) -> None:
+    """سلسلة مجلدات عميقة بملف في كل مستوى"""
+    relative_dir = os.path.join("Projects", "عميق")
+    for level in range(spec.depth):
+        relative_dir = os.path.join(relative_dir, f"مستوى_{level:02d}")
+        writer.write(os.path.join(relative_dir, f"ملف_{level}.txt"), writer.text(writer.rng.randint(1, 256)))
+
+
+def _write_excluded_files(writer: _TreeWriter, spec: TreeSpec) -> None:
+    """ملفات داخل مجلدات مستبعدة وملفات بامتدادات مستبعدة - يمر عليها الفحص ولا تدخل النسخة"""
+    for index in range(spec.excluded_files):
+        kind = index % 5
+        if kind < len(EXCLUDED_DIRECTORIES):
+            relative_dir = os.path.join("Projects", "تطبيق", EXCLUDED_DIRECTORIES[kind], f"حزمة_{index % 50:02d}")
+            name = f"module_{index}.js"
+        else:
+            relative_dir = os.path.join("Documents", DIRECTORY_NAMES[index % len(DIRECTORY_NAMES)])
+            name = f"مؤقت_{index}{EXCLUDED_SUFFIXES[index % len(EXCLUDED_SUFFIXES)]}"
+        writer.write(os.path.join(relative_dir, name), writer.text(writer.rng.randint(1, 1024)), excluded=True)
+
+
+def modify_files(tree: GeneratedTree, fraction: float, seed: int) -> Tuple[int, int]:
+    """تعديل نسبة من الملفات المنسوخة بإضافة سطر وتقديم تاريخ تعديلها - يُرجع (العدد، الحجم بعد التعديل)"""
+    rng = random.Random(seed)
+    count = max(1, round(tree.file_count * fraction))
+    changed_bytes = 0
+    for relative_path in sorted(rng.sample(tree.files, count)):
+        path = tree.home / relative_path
+        mtime = path.stat().st_mtime
+        with open(path, 'ab') as file:
+            file.write(f"\nتعديل {seed}\n".encode('utf-8'))
+        os.utime(path, (mtime + MODIFIED_MTIME_OFFSET, mtime + MODIFIED_MTIME_OFFSET))
+        changed_bytes += path.stat().st_size
+    return count, changed_bytes
@@ -0,0 +1,283 @@
+"""
+تصفح محتويات النسخ الاحتياطية
+مسؤولية واحدة: فهرسة أسماء الأعضاء من الدليل المركزي مباشرة وبناء مستويات المجلدات عند الطلب ومعاينة الأعضاء دون استخراج
+"""
+import os
+import struct
+import zipfile
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.repository_cache import LRUCache
+from utils.config import MANIFEST_FILENAME
+
+# حد ذاكرة فهارس الأرشيفات المفتوحة - فهرس أرشيف بنصف مليون عضو يكلف نحو 130 ميجابايت
+CATALOG_CACHE_BYTES = 192 * 1024 * 1024
+# أقصى ما يُفك ضغطه من العضو للمعاينة، وحد ذاكرة المعاينات
+PREVIEW_MAX_BYTES = 64 * 1024
+PREVIEW_CACHE_BYTES = 16 * 1024 * 1024
+
+# سجل الدليل المركزي (structCentralDir في zipfile)
+_CENTRAL_RECORD = struct.Struct("<4s4B4HL2L5H2L")
+# أطوال الاسم والحقل الإضافي والتعليق في الإزاحة 28 من السجل
+_NAME_LENGTHS = struct.Struct("<3H")
+_CENTRAL_SIGNATURE = b"PK\x01\x02"
+_ZIP64_EXTRA_ID = 0x0001
+_ZIP64_MARKER = 0xFFFFFFFF
+_UTF8_FLAG = 0x800
+# لا يظهر في UTF-8 فهو حد أعلى لكل الأسماء التي تبدأ ببادئة
+_PREFIX_END = b"\xff"
+_MANIFEST_NAME = MANIFEST_FILENAME.encode()
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """عنصر في مستوى مجلد داخل الأرشيف - Value Object"""
+    name: str
+    path: str                            # المسار داخل الأرشيف دون '/' في النهاية
+    is_dir: bool
+    size: int = 0
+    modified: Optional[datetime] = None
+
+
+@dataclass(frozen=True)
+class MemberPreview:
+    """بداية محتوى عضو بعد فك ضغطها - Value Object"""
+    path: str
+    data: bytes
+    size: int                            # الحجم الكامل للعضو
+
+    @property
+    def truncated(self) -> bool:
+        return len(self.data) < self.size
+
+    @property
+    def text(self) -> Optional[str]:
+        """المحتوى نصاً، أو None إذا بدا ملفاً ثنائياً"""
+        if b"\x00" in self.data:
+            return None
+        return self.data.decode('utf-8', errors='replace')
+
+
+class _CatalogZipFile(zipfile.ZipFile):
+    """ZipFile لا يحلل الدليل المركزي عند الفتح - الأعضاء تُفتح بـ ZipInfo من الفهرس"""
+
+    def _RealGetContents(self):
+        pass
+
+
+class ArchiveCatalog:
+    """فهرس أرشيف واحد للتصفح
+
+    الدليل المركزي يُقرأ بقراءة واحدة ولا يُحلل منه عند الفتح إلا الأسماء، فتُرتب مرة واحدة
+    ويُحسب كل مستوى مجلد عند طلبه بالبحث الثنائي والقفز فوق كل مجلد فرعي دون المرور بأعضائه.
+    السجل الكامل للعضو (الحجم والتاريخ وموضع البيانات) يُحلل عند الحاجة إليه فقط.
+    أرشيفات الحرز تكتب الأسماء بـ UTF-8، والأسماء غير الصالحة تُعرض بـ surrogateescape.
+    """
+
+    def __init__(self, path: Path, central_directory: bytes, names: List[bytes], offsets: List[int],
+                 concat: int = 0, cache_key: Tuple[str, int, float] = None):
+        self.path = path
+        self.concat = concat
+        self.cache_key = cache_key or (str(path), 0, 0.0)
+        self._directory = central_directory
+        # الأسماء مرتبة، والإزاحات بترتيب الدليل؛ جدول الاسم ← الإزاحة يُبنى عند أول طلب لعضو
+        self._names = sorted(names)
+        self._unsorted = (names, offsets)
+        self._offsets: Optional[Dict[bytes, int]] = None
+
+        manifest_at = bisect_left(self._names, _MANIFEST_NAME)
+        if manifest_at < len(self._names) and self._names[manifest_at] == _MANIFEST_NAME:
+            del self._names[manifest_at]
+
+    @classmethod
+    def read(cls, path: Path, cache_key: Tuple[str, int, float] = None) -> "ArchiveCatalog":
+        """قراءة الدليل المركزي للأرشيف - zipfile.BadZipFile إذا كان تالفاً"""
+        with open(path, 'rb') as f:
+            end_record = zipfile._EndRecData(f)
+            if end_record is None:
+                raise zipfile.BadZipFile(f"ليس أرشيف ZIP: {path}")
+            directory_size = end_record[zipfile._ECD_SIZE]
+            # بيانات قبل بداية الأرشيف (أرشيف ملحق بملف آخر) تزيح كل المواضع
+            concat = end_record[zipfile._ECD_LOCATION] - directory_size - end_record[zipfile._ECD_OFFSET]
+            if end_record[zipfile._ECD_SIGNATURE] == zipfile.stringEndArchive64:
+                concat -= zipfile.sizeEndCentDir64 + zipfile.sizeEndCentDir64Locator
+            f.seek(end_record[zipfile._ECD_OFFSET] + concat)
+            directory = f.read(directory_size)
+
+        names: List[bytes] = []
+        offsets: List[int] = []
+        add_name, add_offset = names.append, offsets.append
+        lengths = _NAME_LENGTHS.unpack_from
+        position, end = 0, len(directory)
+        try:
+            while position < end:
+                name_length, extra_length, comment_length = lengths(directory, position + 28)
+                name_start = position + 46
+                add_name(directory[name_start:name_start + name_length])
+                add_offset(position)
+                position = name_start + name_length + extra_length + comment_length
+        except struct.error as e:
+            raise zipfile.BadZipFile(f"دليل مركزي ناقص: {path}") from e
+        if offsets and directory[offsets[-1]:offsets[-1] + 4] != _CENTRAL_SIGNATURE:
+            raise zipfile.BadZipFile(f"دليل مركزي تالف: {path}")
+
+        return cls(path, directory, names, offsets, concat, cache_key)
+
+    @property
+    def member_count(self) -> int:
+        return len(self._names)
+
+    @property
+    def memory_cost(self) -> int:
+        """تقدير ذاكرة الفهرس لحدود LRUCache"""
+        return len(self._directory) * 3
+
+    def list_dir(self, path: str = "") -> List[ArchiveEntry]:
+        """عناصر مستوى مجلد واحد - المجلدات أولاً ثم الملفات، كل منها مرتب بالاسم"""
+        prefix = _encode(path) + b"/" if path else b""
+        names = self._names
+        index = bisect_left(names, prefix)
+        end = bisect_left(names, prefix + _PREFIX_END, index)
+        folders: List[ArchiveEntry] = []
+        files: List[ArchiveEntry] = []
+
+        while index < end:
+            name = names[index]
+            if name == prefix:
+                # مدخل صريح للمجلد نفسه
+                index += 1
+                continue
+            slash = name.find(b"/", len(prefix))
+            if slash == -1:
+                files.append(self._file_entry(name))
+                index += 1
+                continue
+            # مجلد فرعي: عنصر واحد ثم القفز فوق جميع أعضائه
+            child = name[:slash]
+            folders.append(ArchiveEntry(_decode(child[len(prefix):]), _decode(child), True))
+            index = bisect_left(names, child + b"/" + _PREFIX_END, index, end)
+        return folders + files
+
+    def files_under(self, paths: Iterable[str]) -> List[str]:
+        """الملفات المحددة مع جميع الملفات داخل المجلدات المحددة، دون تكرار"""
+        selected: Dict[bytes, None] = {}
+        offsets = self._member_offsets()
+        for path in paths:
+            raw = _encode(path.strip("/"))
+            if raw in offsets:
+                selected[raw] = None
+                continue
+            prefix = raw + b"/" if raw else b""
+            start = bisect_left(self._names, prefix)
+            end = bisect_left(self._names, prefix + _PREFIX_END, start)
+            selected.update(dict.fromkeys(name for name in self._names[start:end] if not name.endswith(b"/")))
+        return [_decode(name) for name in selected]
+
+    def zipinfo(self, path: str) -> zipfile.ZipInfo:
+        """ZipInfo العضو من سجله في الدليل المركزي - KeyError إذا لم يوجد"""
+        raw = _encode(path)
+        position = self._member_offsets()[raw]
+        record = _CENTRAL_RECORD.unpack_from(self._directory, position)
+        (_, create_version, create_system, extract_version, reserved, flag_bits, compress_type,
+         dos_time, dos_date, crc, compress_size, file_size, name_length, extra_length,
+         comment_length, _, internal_attr, external_attr, header_offset) = record
+
+        filename = raw.decode('utf-8' if flag_bits & _UTF8_FLAG else 'cp437')
+        zinfo = zipfile.ZipInfo(filename, _dos_date_time(dos_date, dos_time))
+        extra_start = position + 46 + name_length
+        zinfo.extra = self._directory[extra_start:extra_start + extra_length]
+        zinfo.create_version, zinfo.create_system = create_version, create_system
+        zinfo.extract_version, zinfo.reserved = extract_version, reserved
+        zinfo.flag_bits, zinfo.compress_type, zinfo.CRC = flag_bits, compress_type, crc
+        zinfo.internal_attr, zinfo.external_attr = internal_attr, external_attr
+        zinfo.file_size, zinfo.compress_size, header_offset = _apply_zip64(
+            zinfo.extra, file_size, compress_size, header_offset)
+        zinfo.header_offset = header_offset + self.concat
+        return zinfo
+
+    def open_zipfile(self) -> zipfile.ZipFile:
+        """ZipFile للقراءة بـ zipinfo دون تحليل الدليل المركزي مرة أخرى"""
+        return _CatalogZipFile(self.path, 'r')
+
+    def read_preview(self, path: str, limit: int = PREVIEW_MAX_BYTES) -> MemberPreview:
+        """بداية محتوى العضو - يُفك ضغط أول limit بايت فقط، والنتيجة تُحفظ في ذاكرة LRU"""
+        key = (self.cache_key, path, limit)
+        preview = _preview_cache.get(key)
+        if preview is not None:
+            return preview
+
+        zinfo = self.zipinfo(path)
+        with self.open_zipfile() as zipf, zipf.open(zinfo) as member:
+            data = member.read(limit)
+        preview = MemberPreview(path, data, zinfo.file_size)
+        _preview_cache.put(key, preview, len(data) + len(path))
+        return preview
+
+    def _member_offsets(self) -> Dict[bytes, int]:
+        if self._offsets is None:
+            self._offsets = dict(zip(*self._unsorted))
+        return self._offsets
+
+    def _file_entry(self, name: bytes) -> ArchiveEntry:
+        position = self._member_offsets()[name]
+        record = _CENTRAL_RECORD.unpack_from(self._directory, position)
+        dos_time, dos_date, file_size, name_length = record[7], record[8], record[11], record[12]
+        if file_size == _ZIP64_MARKER:
+            extra_start = position + 46 + name_length
+            file_size = _apply_zip64(self._directory[extra_start:extra_start + record[13]],
+                                     file_size, record[10], record[18])[0]
+        try:
+            modified = datetime(*_dos_date_time(dos_date, dos_time))
+        except ValueError:
+            modified = None
+        return ArchiveEntry(_decode(name.rsplit(b"/", 1)[-1]), _decode(name), False, file_size, modified)
+
+
+def _encode(path: str) -> bytes:
+    return path.encode('utf-8', 'surrogateescape')
+
+
+def _decode(name: bytes) -> str:
+    return name.decode('utf-8', 'surrogateescape')
+
+
+def _dos_date_time(dos_date: int, dos_time: int) -> Tuple[int, int, int, int, int, int]:
+    return ((dos_date >> 9) + 1980, (dos_date >> 5) & 0xF, dos_date & 0x1F,
+            dos_time >> 11, (dos_time >> 5) & 0x3F, (dos_time & 0x1F) * 2)
+
+
+def _apply_zip64(extra: bytes, file_size: int, compress_size: int, header_offset: int) -> Tuple[int, int, int]:
+    """القيم الحقيقية من حقل Zip64 الإضافي للحقول التي تحمل العلامة 0xFFFFFFFF"""
+    values = [file_size, compress_size, header_offset]
+    position = 0
+    while position + 4 <= len(extra):
+        field_id, length = struct.unpack_from("<HH", extra, position)
+        if field_id == _ZIP64_EXTRA_ID:
+            data_position = position + 4
+            for index, value in enumerate(values):
+                if value == _ZIP64_MARKER:
+                    values[index] = struct.unpack_from("<Q", extra, data_position)[0]
+                    data_position += 8
+            break
+        position += 4 + length
+    return values[0], values[1], values[2]
+
+
+# فهارس الأرشيفات المفتوحة ومعايناتها مشتركة في العملية - مفتاحها (المسار، الحجم، الوقت) فتتجدد بتغير الأرشيف
+_catalog_cache = LRUCache(CATALOG_CACHE_BYTES)
+_preview_cache = LRUCache(PREVIEW_CACHE_BYTES)
+
+
+def open_catalog(archive_path: Path) -> ArchiveCatalog:
+    """فهرس الأرشيف من الذاكرة أو من الدليل المركزي - OSError أو zipfile.BadZipFile عند الفشل"""
+    stat = os.stat(archive_path)
+    key = (str(archive_path), stat.st_size, stat.st_mtime)
+    catalog = _catalog_cache.get(key)
+    if catalog is None:
+        catalog = ArchiveCatalog.read(Path(archive_path), key)
+        _catalog_cache.put(key, catalog, catalog.memory_cost)
+    return catalog
@@ -0,0 +1,123 @@
+"""
+أدوات منخفضة المستوى لأرشيفات ZIP
+مسؤولية واحدة: نقل البيانات المضغوطة بين الأرشيفات دون فك الضغط أو إعادة الضغط
+
+تعتمد على بنية zipfile الداخلية (fp و start_dir) لأن المكتبة لا توفر واجهة عامة
+لكتابة بيانات مضغوطة مسبقاً.
+"""
+import copy
+import struct
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+# حجم القطعة عند نسخ البيانات المضغوطة
+RAW_COPY_CHUNK_SIZE = 1024 * 1024
+
+# بت وجود واصف البيانات بعد العضو (الأحجام معروفة مسبقاً عند النسخ الخام)
+_DATA_DESCRIPTOR_FLAG = 0x08
+
+# معرف حقل Zip64 الإضافي
+_ZIP64_EXTRA_ID = 1
+
+
+def _seek_to_member_data(source_fp: BinaryIO, info: zipfile.ZipInfo) -> None:
+    """تجاوز الترويسة المحلية للعضو والوصول إلى بياناته المضغوطة"""
+    source_fp.seek(info.header_offset)
+    header = source_fp.read(zipfile.sizeFileHeader)
+    if len(header) != zipfile.sizeFileHeader:
+        raise zipfile.BadZipFile(f"ترويسة ناقصة للعضو: {info.filename}")
+
+    fields = struct.unpack(zipfile.structFileHeader, header)
+    if fields[zipfile._FH_SIGNATURE] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"توقيع ترويسة غير صحيح للعضو: {info.filename}")
+
+    source_fp.seek(fields[zipfile._FH_FILENAME_LENGTH] + fields[zipfile._FH_EXTRA_FIELD_LENGTH], 1)
+
+
+def copy_member_raw(source: zipfile.ZipFile, info: zipfile.ZipInfo, destination: zipfile.ZipFile) -> zipfile.ZipInfo:
+    """نسخ عضو من أرشيف إلى آخر بصيغته المضغوطة كما هي"""
+    if destination.mode not in ('w', 'x', 'a'):
+        raise ValueError("يجب فتح الأرشيف الهدف للكتابة")
+    if info.filename in destination.NameToInfo:
+        raise ValueError(f"العضو موجود مسبقاً في الأرشيف الهدف: {info.filename}")
+
+    new_info = copy.copy(info)
+    new_info.flag_bits &= ~_DATA_DESCRIPTOR_FLAG
+    new_info.extra = zipfile._strip_extra(info.extra, (_ZIP64_EXTRA_ID,))
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+
+    with source._lock, destination._lock:
+        _seek_to_member_data(source.fp, info)
+        _write_local_header(destination, new_info, zip64)
+
+        remaining = info.compress_size
+        while remaining > 0:
+            chunk = source.fp.read(min(RAW_COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"بيانات ناقصة للعضو: {info.filename}")
+            destination.fp.write(chunk)
+            remaining -= len(chunk)
+
+        _register_member(destination, new_info)
+
+    return new_info
+
+
+@contextmanager
+def append_in_place(archive_path: Path) -> Iterator[zipfile.ZipFile]:
+    """فتح أرشيف لإضافة أعضاء في آخره دون نسخه - الفشل يعيد دليله المركزي الأصلي ويقتطع المضاف
+
+    الإضافة تكتب فوق الدليل المركزي، فيُحفظ ما بعد بداية الدليل قبل أي كتابة.
+    """
+    destination = zipfile.ZipFile(archive_path, 'a')
+    original_end = destination.start_dir
+    try:
+        destination.fp.seek(original_end)
+        tail = destination.fp.read()
+    except BaseException:
+        destination.close()
+        raise
+
+    try:
+        yield destination
+    except BaseException:
+        with destination._lock:
+            destination.fp.seek(original_end)
+            destination.fp.write(tail)
+            destination.fp.truncate()
+            destination._didModify = False
+        destination.close()
+        raise
+    destination.close()
+
+
+def write_member_raw(destination: zipfile.ZipFile, info: zipfile.ZipInfo, data: bytes) -> zipfile.ZipInfo:
+    """كتابة عضو ببيانات مضغوطة مسبقاً - يجب أن تحمل info قيم CRC والأحجام ونوع الضغط"""
+    if destination.mode not in ('w', 'x', 'a'):
+        raise ValueError("يجب فتح الأرشيف الهدف للكتابة")
+    if info.filename in destination.NameToInfo:
+        raise ValueError(f"العضو موجود مسبقاً في الأرشيف الهدف: {info.filename}")
+
+    zip64 = info.file_size > zipfile.ZIP64_LIMIT or info.compress_size > zipfile.ZIP64_LIMIT
+    with destination._lock:
+        _write_local_header(destination, info, zip64)
+        destination.fp.write(data)
+        _register_member(destination, info)
+
+    return info
+
+
+def _write_local_header(destination: zipfile.ZipFile, info: zipfile.ZipInfo, zip64: bool) -> None:
+    destination.fp.seek(destination.start_dir)
+    info.header_offset = destination.start_dir
+    destination.fp.write(info.FileHeader(zip64))
+
+
+def _register_member(destination: zipfile.ZipFile, info: zipfile.ZipInfo) -> None:
+    """إضافة العضو المكتوب إلى الفهرس المركزي الذي يُكتب عند إغلاق الأرشيف"""
+    destination.start_dir = destination.fp.tell()
+    destination.filelist.append(info)
+    destination.NameToInfo[info.filename] = info
+    destination._didModify = True
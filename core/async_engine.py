@@ -0,0 +1,642 @@
+"""
+محرك النسخ غير المتزامن
+مسؤولية واحدة: تشغيل مراحل النسخ (الفحص، المقارنة، الضغط، الكتابة) ومراحل الاسترداد (القراءة وفك الضغط، الكتابة) بالتوازي عبر طوابير asyncio محدودة
+"""
+import asyncio
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from core.archive_utils import write_member_raw
+from core.backup_manager import BackupOrchestrator
+from core.exceptions import BackupInterruptedError
+from core.file_scanner import FileScanner
+from core.resource_governor import ResourceGovernor
+from core.retry_queue import FileRetryQueue, describe_error
+from core.run_metrics import MetricsRecorder
+from core.strategies import DEFAULT_CODEC, STREAM_CHUNK_SIZE, IncrementalBackupStrategy, SmartRestoreStrategy
+from core.tracing import trace_span
+from utils.config import HOME_DIR, MANIFEST_FILENAME
+
+# الملفات الأكبر من هذا الحد تُضغط بالتدفق في خيط الكتابة بدل نقلها كاملة إلى عملية أخرى
+INLINE_COMPRESSION_MAX_SIZE = 8 * 1024 * 1024
+# أقصى حجم وعدد لدفعة الملفات الصغيرة المرسلة إلى عملية ضغط واحدة
+BATCH_MAX_BYTES = 4 * 1024 * 1024
+BATCH_MAX_FILES = 64
+# عدد المسارات في كل دفعة من مرحلة الفحص
+SCAN_BATCH_SIZE = 256
+# سعة الطوابير بين المراحل - تحد الذاكرة التي تشغلها البيانات المضغوطة المنتظرة للكتابة
+STAGE_QUEUE_SIZE = 8
+
+# علامة انتهاء المرحلة السابقة
+_DONE = None
+# فترة فحص طلب الإيقاف أثناء انتظار مكان في طابور ممتلئ
+_PUT_POLL_SECONDS = 0.1
+# أقدم تاريخ يقبله تنسيق ZIP
+_ZIP_MIN_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+class CompressedMember(NamedTuple):
+    """ملف مضغوط في عملية منفصلة وجاهز للكتابة الخام في الأرشيف"""
+    mtime: float
+    mode: int
+    size: int
+    crc: int
+    compress_type: int
+    data: bytes
+
+
+def compress_batch(paths: List[str], level: int) -> List[Tuple[str, Optional[CompressedMember], Optional[OSError]]]:
+    """ضغط دفعة ملفات صغيرة في عملية منفصلة - خطأ ملف واحد يُرجع معه ولا يُفشل الدفعة"""
+    results = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as source:
+                stat_result = os.fstat(source.fileno())
+                data = source.read()
+        except OSError as e:
+            results.append((path, None, e))
+            continue
+
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+        compressed = compressor.compress(data) + compressor.flush()
+        # البيانات غير القابلة للضغط تُخزن كما هي فيصبح استردادها أسرع
+        if len(compressed) < len(data):
+            payload, compress_type = compressed, zipfile.ZIP_DEFLATED
+        else:
+            payload, compress_type = data, zipfile.ZIP_STORED
+
+        results.append((path, CompressedMember(
+            stat_result.st_mtime, stat_result.st_mode, len(data),
+            zlib.crc32(data), compress_type, payload
+        ), None))
+    return results
+
+
+def create_compression_executor(workers: int) -> Executor:
+    """مجمع عمليات للضغط، أو خيوط إذا تعذر إنشاء العمليات أو لم يكن هناك إلا عامل واحد"""
+    if workers <= 1:
+        # عملية واحدة لا تضيف توازياً وتكلف نقل البيانات بين العمليات
+        return create_thread_compression_executor(workers)
+    try:
+        # forkserver يتجنب نسخ خيوط Qt والأقفال المحجوزة إلى العمليات الفرعية
+        start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None
+        return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+    except (ImportError, NotImplementedError, OSError, ValueError):
+        return create_thread_compression_executor(workers)
+
+
+def create_thread_compression_executor(workers: int) -> Executor:
+    """خيوط للضغط - أبطأ من العمليات مع الملفات الصغيرة لكن zlib يحرر قفل المفسر أثناء الضغط"""
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='alhirz-compress')
+
+
+async def run_stages(*coroutines) -> None:
+    """تشغيل المراحل معاً - فشل أي مرحلة يلغي البقية ويُرفع خطؤه"""
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in tasks:
+            if task in done and task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def put_from_thread(loop, queue: asyncio.Queue, item, stopped: threading.Event) -> float:
+    """وضع عنصر في طابور الحلقة من خيط آخر مع الانتظار عند امتلائه - يرجع زمن الانتظار"""
+    started = time.perf_counter()
+    future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+    with trace_span("queue_wait"):
+        while True:
+            try:
+                future.result(_PUT_POLL_SECONDS)
+                return time.perf_counter() - started
+            except concurrent.futures.TimeoutError:
+                if stopped.is_set():
+                    future.cancel()
+                    raise BackupInterruptedError()
+
+
+class PipelinedBackupStrategy(IncrementalBackupStrategy):
+    """استراتيجية نسخ تراكمي بمراحل متوازية - تنتج أرشيفاً بنفس صيغة IncrementalBackupStrategy
+
+    الفحص يعمل في خيط وينتج المسارات أولاً بأول، ومقارنة التواريخ في خيط آخر، والملفات
+    الصغيرة تُضغط على دفعات في مجمع عمليات ثم تُكتب خاماً، والكبيرة تُضغط بالتدفق في خيط
+    الكتابة. الطوابير المحدودة بين المراحل توقف المرحلة السريعة عند امتلاء ما بعدها.
+    """
+
+    def __init__(self,
+                 old_manifest: Dict[str, Any],
+                 governor: ResourceGovernor = None,
+                 file_scanner: FileScanner = None,
+                 compression_workers: int = None,
+                 compression_level: int = zlib.Z_DEFAULT_COMPRESSION,
+                 metrics: MetricsRecorder = None):
+        super().__init__(old_manifest, governor, metrics, compression_level=compression_level)
+        self.file_scanner = file_scanner or FileScanner()
+        self.compression_workers = compression_workers or os.cpu_count() or 1
+        self.scanned_count = 0
+
+    async def run(self,
+                  folders: List[Path],
+                  exclusions: List[str],
+                  destination: Path,
+                  progress_callback: Callable[[int, str], None],
+                  is_running_check: Callable[[], bool]) -> Dict[str, str]:
+        """فحص المجلدات وكتابة الأرشيف وإرجاع الملفات التي تعذر نسخها مع أسبابها"""
+        loop = asyncio.get_running_loop()
+        self._destination = destination
+        self._progress_callback = progress_callback
+        self._is_running_check = is_running_check
+        self._stopped = threading.Event()
+        self._manifest: Dict[str, Any] = {}
+        self._stat_failures: Dict[str, str] = {}
+        self._retry_queue = FileRetryQueue()
+        self._zipf: Optional[zipfile.ZipFile] = None
+        self._found_count = 0
+        self._written_count = 0
+        self._last_progress = 10
+
+        paths_queue = asyncio.Queue(STAGE_QUEUE_SIZE)
+        compress_queue = asyncio.Queue(STAGE_QUEUE_SIZE)
+        write_queue = asyncio.Queue(STAGE_QUEUE_SIZE)
+        # خيط للفحص وآخر للمقارنة وثالث للكتابة
+        io_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix='alhirz-io')
+        self._compression_executors = [create_compression_executor(self.compression_workers)]
+
+        try:
+            await run_stages(
+                self._scan_stage(loop, io_executor, folders, exclusions, paths_queue),
+                self._filter_stage(loop, io_executor, paths_queue, compress_queue, write_queue),
+                *[self._compress_stage(loop, compress_queue, write_queue)
+                  for _ in range(self.compression_workers)],
+                self._write_stage(loop, io_executor, write_queue, self.compression_workers + 1)
+            )
+            return await loop.run_in_executor(io_executor, self._finish)
+        finally:
+            self._stopped.set()
+            io_executor.shutdown(wait=True)
+            # دفعات الضغط الجارية لا تُنتظر عند الإلغاء؛ نتائجها لم تعد مطلوبة
+            for executor in self._compression_executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+            if self._zipf is not None:
+                try:
+                    self._zipf.close()
+                except OSError:
+                    pass
+
+    def _check(self) -> bool:
+        """فحص الاستمرار - يتوقف أيضاً إذا فشلت مرحلة أخرى"""
+        return not self._stopped.is_set() and self._is_running_check()
+
+    # --- المراحل ---
+
+    async def _scan_stage(self, loop, executor, folders, exclusions, paths_queue) -> None:
+        await loop.run_in_executor(executor, self._scan_folders, loop, folders, exclusions, paths_queue)
+        await paths_queue.put(_DONE)
+
+    async def _filter_stage(self, loop, executor, paths_queue, compress_queue, write_queue) -> None:
+        batch: List[Path] = []
+        batch_bytes = 0
+
+        while True:
+            paths = await paths_queue.get()
+            if paths is _DONE:
+                break
+
+            for file, relative_path_str, mtime, size in await loop.run_in_executor(executor, self._stat_files, paths):
+                self._manifest[relative_path_str] = mtime
+                self.sizes[relative_path_str] = size
+                if not self.needs_backup(relative_path_str, mtime):
+                    continue
+
+                self._found_count += 1
+                self.metrics.add(files_changed=1)
+                if size > INLINE_COMPRESSION_MAX_SIZE:
+                    await write_queue.put(('stream', file))
+                    continue
+
+                batch.append(file)
+                batch_bytes += size
+                if len(batch) >= BATCH_MAX_FILES or batch_bytes >= BATCH_MAX_BYTES:
+                    await compress_queue.put(batch)
+                    batch, batch_bytes = [], 0
+
+        if batch:
+            await compress_queue.put(batch)
+        for _ in range(self.compression_workers):
+            await compress_queue.put(_DONE)
+        await write_queue.put(_DONE)
+
+    async def _compress_stage(self, loop, compress_queue, write_queue) -> None:
+        while True:
+            batch = await compress_queue.get()
+            if batch is _DONE:
+                break
+            if self._stopped.is_set():
+                raise BackupInterruptedError()
+
+            paths = [str(file) for file in batch]
+            executor = self._compression_executors[-1]
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(executor, compress_batch, paths, self.compression_level)
+            except BrokenProcessPool:
+                # تعذر تشغيل العمليات الفرعية (مثلاً وحدة رئيسية لا يمكن استيرادها) فيكمل الضغط في خيوط
+                if self._compression_executors[-1] is executor:
+                    self._compression_executors.append(
+                        create_thread_compression_executor(self.compression_workers))
+                results = await loop.run_in_executor(
+                    self._compression_executors[-1], compress_batch, paths, self.compression_level)
+            self.metrics.add_time("compress", time.perf_counter() - started)
+            await write_queue.put(('compressed', results))
+
+        await write_queue.put(_DONE)
+
+    async def _write_stage(self, loop, executor, write_queue, producers: int) -> None:
+        while producers:
+            item = await write_queue.get()
+            if item is _DONE:
+                producers -= 1
+                continue
+            await loop.run_in_executor(executor, self._write_item, *item)
+
+    # --- العمل الفعلي داخل الخيوط ---
+
+    def _scan_folders(self, loop, folders, exclusions, paths_queue) -> None:
+        started = time.perf_counter()
+        # زمن انتظار الطابور الممتلئ لا يُحسب من زمن الفحص
+        waited = 0.0
+        batch = []
+        for file in self.file_scanner.iter_files(folders, exclusions):
+            batch.append(file)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                waited += self._put_threadsafe(loop, paths_queue, batch)
+                batch = []
+        if batch:
+            waited += self._put_threadsafe(loop, paths_queue, batch)
+        self.metrics.add_time("scan", time.perf_counter() - started - waited)
+
+    def _put_threadsafe(self, loop, queue: asyncio.Queue, item) -> float:
+        """وضع عنصر في طابور الحلقة من خيط آخر مع الانتظار عند امتلائه - يرجع زمن الانتظار"""
+        if not self._check():
+            raise BackupInterruptedError()
+        return put_from_thread(loop, queue, item, self._stopped)
+
+    def _stat_files(self, files: List[Path]) -> List[Tuple[Path, str, float, int]]:
+        """قراءة تاريخ وحجم كل ملف - الملف المحذوف بعد الفحص يُتجاهل"""
+        stats = []
+        with self.metrics.phase("filter"), trace_span("stat_batch", {'files': len(files)}):
+            for file in files:
+                relative_path_str = self._relative_key(file)
+                try:
+                    stat_result = file.stat()
+                except FileNotFoundError:
+                    continue
+                except OSError as e:
+                    self._stat_failures[relative_path_str] = describe_error(e)
+                    continue
+                stats.append((file, relative_path_str, stat_result.st_mtime, stat_result.st_size))
+        self.scanned_count += len(files)
+        self.metrics.add(files_seen=len(files))
+        return stats
+
+    def _write_item(self, kind: str, payload) -> None:
+        if not self._check():
+            raise BackupInterruptedError()
+        zipf = self._open_archive()
+
+        if kind == 'stream':
+            self._report_progress(payload)
+            # الملفات الكبيرة تُضغط بالتدفق داخل خيط الكتابة
+            with self.metrics.phase("compress"):
+                self._write_isolated(zipf, payload)
+            return
+
+        with self.metrics.phase("write"), trace_span("write_batch", {'files': len(payload)}):
+            for path, member, error in payload:
+                file = Path(path)
+                self._report_progress(file)
+                if error is not None:
+                    self._defer(file, error)
+                    continue
+                self.governor.throttle_read(member.size, self._check)
+                write_member_raw(zipf, self._member_info(file, member), member.data)
+                self.governor.throttle_write(member.size, self._check)
+                self.metrics.add(bytes_read=member.size, bytes_compressed=len(member.data))
+
+    def _write_isolated(self, zipf: zipfile.ZipFile, file: Path) -> None:
+        try:
+            self._write_member(zipf, file, self._check)
+        except Exception as e:
+            self._defer(file, e)
+
+    def _defer(self, file: Path, error: Exception) -> None:
+        if not self._retry_queue.isolates(error):
+            raise error
+        self._retry_queue.handle_failure(self._relative_key(file), file, error)
+
+    def _open_archive(self) -> zipfile.ZipFile:
+        """الأرشيف لا يُنشأ إلا عند وصول أول ملف معدل"""
+        if self._zipf is None:
+            self._zipf = zipfile.ZipFile(self._destination, 'w', zipfile.ZIP_DEFLATED)
+        return self._zipf
+
+    def _member_info(self, file: Path, member: CompressedMember) -> zipfile.ZipInfo:
+        """ترويسة العضو بنفس ما يضعه ZipInfo.from_file"""
+        date_time = max(time.localtime(member.mtime)[:6], _ZIP_MIN_DATE_TIME)
+        zinfo = zipfile.ZipInfo(self._relative_key(file), date_time)
+        zinfo.external_attr = (member.mode & 0xFFFF) << 16
+        zinfo.compress_type = member.compress_type
+        zinfo.file_size = member.size
+        zinfo.compress_size = len(member.data)
+        zinfo.CRC = member.crc
+        return zinfo
+
+    def _report_progress(self, file: Path) -> None:
+        """نسبة التقدم لا تتراجع رغم أن عدد الملفات المعدلة يزداد أثناء الفحص"""
+        self._written_count += 1
+        progress = 10 + int((self._written_count / max(self._found_count, self._written_count)) * 85)
+        self._last_progress = max(self._last_progress, min(progress, 95))
+        self._progress_callback(self._last_progress, f"يتم ضغط: {file.name[:30]}...{self.governor.describe()}")
+
+    def _finish(self) -> Dict[str, str]:
+        """إعادة محاولة الملفات المؤجلة ثم كتابة السجل وإغلاق الأرشيف"""
+        if self._zipf is not None and self._retry_queue:
+            with self.metrics.phase("compress"), trace_span("retry_drain", {'pending': len(self._retry_queue)}):
+                self._retry_queue.drain(
+                    lambda file: self._write_member(self._zipf, file, self._check),
+                    self._check,
+                    lambda key, attempt: self._progress_callback(
+                        96, f"إعادة محاولة ({attempt}): {Path(key).name[:30]}...")
+                )
+
+        failures = {**self._stat_failures, **self._retry_queue.failures}
+        self._finish_manifest(self._manifest, failures)
+
+        if self._zipf is None:
+            self._progress_callback(100, "لا توجد ملفات جديدة أو معدّلة لنسخها.")
+            if self.old_manifest.keys() != self._manifest.keys():
+                self._create_manifest_only_backup(self._destination, self._manifest)
+            return failures
+
+        self._progress_callback(98, "جارٍ كتابة سجل النسخة...")
+        with self.metrics.phase("manifest"), trace_span("manifest_write", {'entries': len(self._manifest)}):
+            self._zipf.writestr(MANIFEST_FILENAME, self._serialize_manifest(self._manifest))
+        with self.metrics.phase("finalize"), trace_span("zip_finalize"):
+            self._zipf.close()
+        self._zipf = None
+
+        self._progress_callback(100, "اكتمل الضغط.")
+        return failures
+
+
+class PipelinedRestoreStrategy(SmartRestoreStrategy):
+    """استراتيجية استرداد بمرحلتين متوازيتين - تنتج نفس ملفات SmartRestoreStrategy
+
+    خيط يقرأ الأعضاء من الأرشيف ويفك ضغطها على أجزاء، وخيط آخر يكتب الأجزاء إلى ملف
+    مؤقت لكل عضو وينقله إلى مكانه عند اكتماله، فيتداخل فك ضغط العضو التالي مع كتابة
+    الحالي. الطابور المحدود بينهما يحد البيانات المفكوكة المنتظرة في الذاكرة.
+    """
+
+    def _restore_members(self,
+                         zipf: zipfile.ZipFile,
+                         all_files_info: List[zipfile.ZipInfo],
+                         progress_callback: Callable[[int, str], None],
+                         is_running_check: Callable[[], bool],
+                         overwrite: bool) -> str:
+        return asyncio.run(self.run(zipf, all_files_info, progress_callback, is_running_check, overwrite))
+
+    async def run(self,
+                  zipf: zipfile.ZipFile,
+                  all_files_info: List[zipfile.ZipInfo],
+                  progress_callback: Callable[[int, str], None],
+                  is_running_check: Callable[[], bool],
+                  overwrite: bool) -> str:
+        """استخراج الأعضاء وإرجاع ملخص الاسترداد"""
+        loop = asyncio.get_running_loop()
+        self._zipf = zipf
+        self._progress_callback = progress_callback
+        self._is_running_check = is_running_check
+        self._stopped = threading.Event()
+        self._retry_queue = FileRetryQueue(isolated_errors=self.ISOLATED_ERRORS)
+        self._total_files = len(all_files_info)
+        self._processed_count = 0
+        self._skipped_count = 0
+        # العضو الجاري كتابته (اسم الملف المؤقت، الملف المفتوح)، والأعضاء التي فشلت كتابتها فتُهمل بقية أجزائها
+        self._partial: Optional[Tuple[str, Any]] = None
+        self._write_failed = set()
+
+        chunks_queue = asyncio.Queue(STAGE_QUEUE_SIZE)
+        # خيط للقراءة وفك الضغط وآخر للكتابة
+        io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='alhirz-restore')
+        try:
+            await run_stages(
+                self._read_stage(loop, io_executor, all_files_info, overwrite, chunks_queue),
+                self._write_stage(loop, io_executor, chunks_queue)
+            )
+            return await loop.run_in_executor(io_executor, self._finish)
+        finally:
+            self._stopped.set()
+            io_executor.shutdown(wait=True)
+            self._abandon_partial()
+
+    def _check(self) -> bool:
+        """فحص الاستمرار - يتوقف أيضاً إذا فشلت المرحلة الأخرى"""
+        return not self._stopped.is_set() and self._is_running_check()
+
+    # --- المراحل ---
+
+    async def _read_stage(self, loop, executor, all_files_info, overwrite, chunks_queue) -> None:
+        await loop.run_in_executor(executor, self._read_members, loop, all_files_info, overwrite, chunks_queue)
+        await chunks_queue.put(_DONE)
+
+    async def _write_stage(self, loop, executor, chunks_queue) -> None:
+        while True:
+            item = await chunks_queue.get()
+            if item is _DONE:
+                break
+            await loop.run_in_executor(executor, self._write_item, *item)
+
+    # --- العمل الفعلي داخل الخيوط ---
+
+    def _read_members(self, loop, all_files_info, overwrite, chunks_queue) -> None:
+        """فك ضغط الأعضاء بالترتيب وإرسالها أجزاءً - خطأ القراءة المعزول يصل خيط الكتابة كعنصر"""
+        def put(*item) -> None:
+            if not self._check():
+                raise BackupInterruptedError()
+            put_from_thread(loop, chunks_queue, item, self._stopped)
+
+        for member in all_files_info:
+            target_path = HOME_DIR / Path(member.filename)
+            if not overwrite and target_path.exists():
+                put('skip', member, target_path, None)
+                continue
+            if member.is_dir():
+                put('dir', member, target_path, None)
+                continue
+
+            try:
+                with self._zipf.open(member) as source:
+                    while True:
+                        chunk = source.read(STREAM_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        self.governor.throttle_read(len(chunk), self._check)
+                        self.governor.throttle_cpu(self._check)
+                        put('chunk', member, target_path, chunk)
+            except Exception as e:
+                if not self._retry_queue.isolates(e):
+                    raise
+                put('failed', member, target_path, e)
+                continue
+            put('end', member, target_path, None)
+
+    def _write_item(self, kind: str, member: zipfile.ZipInfo, target_path: Path, payload) -> None:
+        if not self._check():
+            raise BackupInterruptedError()
+        if kind == 'skip':
+            self._skipped_count += 1
+            self._report_progress(target_path)
+            return
+        if member.filename in self._write_failed:
+            return
+
+        try:
+            if kind == 'failed':
+                raise payload
+            if kind == 'dir':
+                target_path.mkdir(parents=True, exist_ok=True)
+            elif kind == 'chunk':
+                self._partial_file(member, target_path).write(payload)
+                self.governor.throttle_write(len(payload), self._check)
+                return
+            else:
+                # العضو الفارغ لا أجزاء له فيُفتح ملفه المؤقت عند نهايته
+                self._partial_file(member, target_path).close()
+                partial_name = self._partial[0]
+                self._partial = None
+                try:
+                    self._publish_partial(member, partial_name, target_path)
+                finally:
+                    if os.path.exists(partial_name):
+                        os.unlink(partial_name)
+        except Exception as e:
+            self._abandon_partial()
+            if not self._retry_queue.isolates(e):
+                raise
+            self._write_failed.add(member.filename)
+            self._retry_queue.handle_failure(member.filename, (member, target_path), e)
+        self._report_progress(target_path)
+
+    def _partial_file(self, member: zipfile.ZipInfo, target_path: Path):
+        if self._partial is None:
+            self._partial = self._open_partial(member, target_path)
+        return self._partial[1]
+
+    def _abandon_partial(self) -> None:
+        """حذف الملف المؤقت للعضو الجاري عند فشله أو عند الإلغاء"""
+        if self._partial is None:
+            return
+        partial_name, destination = self._partial
+        self._partial = None
+        destination.close()
+        if os.path.exists(partial_name):
+            os.unlink(partial_name)
+
+    def _report_progress(self, target_path: Path) -> None:
+        self._processed_count += 1
+        progress = self._processed_count * 100 // max(self._total_files, 1)
+        self._progress_callback(progress, f"معالجة: {target_path.name[:40]}...{self.governor.describe()}")
+
+    def _finish(self) -> str:
+        """إعادة محاولة الأعضاء المؤجلة تسلسلياً بعد انتهاء المرحلتين"""
+        self._retry_queue.drain(
+            lambda member_and_target: self._extract_member(self._zipf, *member_and_target, self._check),
+            self._check,
+            lambda key, attempt: self._progress_callback(
+                100, f"إعادة محاولة ({attempt}): {Path(key).name[:40]}...")
+        )
+        return self._summary(self._total_files, self._skipped_count, self._retry_queue.failures)
+
+
+class AsyncBackupOrchestrator(BackupOrchestrator):
+    """منسق بمحرك النسخ المتوازي - يطابق IBackupOrchestrator فيستخدمه عمال Qt وسطر الأوامر والخدمة
+
+    الواجهات المتزامنة تشغل حلقة أحداث خاصة بالعملية، ومن يعمل داخل حلقة قائمة
+    يستخدم create_incremental_backup_async و restore_from_backup_async. الاسترداد
+    يمر بمرحلتي PipelinedRestoreStrategy.
+    """
+
+    engine_name = "pipelined"
+
+    def __init__(self, *args, compression_workers: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.compression_workers = compression_workers
+
+    def _write_backup(self,
+                      folders: List[Path],
+                      exclusions: List[str],
+                      old_manifest: Dict[str, Any],
+                      destination: Path,
+                      progress_callback: Callable[[int, str], None],
+                      is_running_check: Callable[[], bool],
+                      metrics: MetricsRecorder) -> Dict[str, str]:
+        if self._runs_sequentially():
+            metrics.metrics.engine = BackupOrchestrator.engine_name
+            return super()._write_backup(folders, exclusions, old_manifest, destination,
+                                         progress_callback, is_running_check, metrics)
+
+        progress_callback(5, "جارٍ حصر الملفات الجديدة والمعدلة...")
+        level = zlib.Z_DEFAULT_COMPRESSION if self.compression_level is None else self.compression_level
+        strategy = PipelinedBackupStrategy(old_manifest, self.governor, self._scanner_for(folders),
+                                           self.compression_workers, level, metrics=metrics)
+        failed_files = asyncio.run(strategy.run(folders, exclusions, destination,
+                                                progress_callback, is_running_check))
+        self.logger.info(f"تم العثور على {strategy.scanned_count} ملف للمعالجة")
+        return failed_files
+
+    def _runs_sequentially(self) -> bool:
+        # حصة المعالج لا تُطبق على العمليات الفرعية، فالنسخ المحدود يبقى تسلسلياً،
+        # ومراحل الضغط المتوازية لا تنتج إلا deflate فتُكتب الخوارزميات الأخرى تسلسلياً
+        return self.governor.limits.is_limited or self.codec != DEFAULT_CODEC
+
+    def busy_workers(self) -> int:
+        if self._runs_sequentially():
+            return super().busy_workers()
+        # عمليات الضغط وخيط الكتابة
+        return (self.compression_workers or os.cpu_count() or 1) + 1
+
+    def _restore_strategy(self) -> SmartRestoreStrategy:
+        return PipelinedRestoreStrategy(self.governor)
+
+    async def create_incremental_backup_async(self,
+                                              folders: List[Path],
+                                              backup_filepath: Path,
+                                              exclusions: List[str],
+                                              progress_callback: Callable[[int, str], None],
+                                              is_running_check: Callable[[], bool]) -> Dict[str, str]:
+        """النسخ من داخل حلقة أحداث قائمة دون حجبها"""
+        return await asyncio.to_thread(self.create_incremental_backup, folders, backup_filepath,
+                                       exclusions, progress_callback, is_running_check)
+
+    async def restore_from_backup_async(self,
+                                        backup_path: Path,
+                                        progress_callback: Callable[[int, str], None],
+                                        is_running_check: Callable[[], bool],
+                                        members: Optional[List[str]] = None,
+                                        overwrite: bool = False) -> str:
+        """الاسترداد من داخل حلقة أحداث قائمة دون حجبها"""
+        return await asyncio.to_thread(self.restore_from_backup, backup_path,
+                                       progress_callback, is_running_check, members, overwrite)
@@ -0,0 +1,294 @@
+"""
+النسخ الاحتياطي التلقائي في الخلفية
+مسؤولية واحدة: تشغيل النسخ التراكمي دورياً حسب الإعدادات دون واجهة رسومية وبأولوية منخفضة
+"""
+import ctypes
+import json
+import os
+import platform
+import threading
+import time
+from pathlib import Path
+from typing import List, Tuple, Optional
+
+from core.async_engine import AsyncBackupOrchestrator
+from core.backup_manager import BackupOrchestrator
+from core.backup_profiles import BackupProfile, BackupProfileStore, create_profile_orchestrator
+from core.logging_system import ILogger, LoggerFactory
+from core.resource_governor import create_settings_governor
+from core.retention import RetentionPolicy
+from core.run_metrics import create_metrics_store
+from core.tracing import create_trace_recorder
+from core.profiling import create_run_profiler
+from utils.config import (APP_DIR, HOME_DIR, DEFAULT_FOLDERS, DEFAULT_EXCLUSIONS,
+                          SETTINGS_FILENAME, AUTO_BACKUP_STATE_FILENAME)
+from utils.config_manager import ConfigurationManager
+from utils.settings_store import SettingsStore
+
+# أرقام استدعاء ioprio_set حسب المعمارية
+_IOPRIO_SET_SYSCALLS = {'x86_64': 251, 'i386': 289, 'i686': 289, 'aarch64': 30, 'arm64': 30}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+
+_NICE_INCREMENT = 10
+_SECONDS_PER_HOUR = 3600
+
+
+def lower_process_priority(logger: ILogger = None) -> None:
+    """خفض أولوية المعالج والقرص للعملية الحالية - الفشل لا يوقف النسخ"""
+    logger = logger or LoggerFactory.create_default_logger()
+
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(_NICE_INCREMENT)
+        except OSError as e:
+            logger.warning(f"تعذر خفض أولوية المعالج: {e}")
+
+    syscall_number = _IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if platform.system() != 'Linux' or syscall_number is None:
+        return
+
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        ioprio = _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT
+        if libc.syscall(syscall_number, _IOPRIO_WHO_PROCESS, 0, ioprio) != 0:
+            logger.warning(f"تعذر خفض أولوية القرص: {os.strerror(ctypes.get_errno())}")
+    except (OSError, AttributeError) as e:
+        logger.warning(f"تعذر خفض أولوية القرص: {e}")
+
+
+class SystemLoadMonitor:
+    """مراقب حمل النظام - يعتبر النظام مشغولاً إذا تجاوز متوسط الحمل نسبة من عدد المعالجات"""
+
+    def __init__(self, max_load_per_cpu: float = 0.8):
+        self.max_load_per_cpu = max_load_per_cpu
+        self.cpu_count = os.cpu_count() or 1
+
+    def current_load(self) -> Optional[float]:
+        """متوسط حمل النظام خلال الدقيقة الأخيرة - None إذا تعذرت قراءته"""
+        if not hasattr(os, 'getloadavg'):
+            return None
+        try:
+            return os.getloadavg()[0]
+        except OSError:
+            return None
+
+    def is_overloaded(self, baseline: Optional[float] = None, own_workers: int = 0) -> bool:
+        """فحص حمل النظام خلال الدقيقة الأخيرة دون حمل النسخ الجاري نفسه
+
+        baseline هو الحمل قبل بدء النسخ: الزيادة فوقه تُنسب إلى النسخ حتى own_workers مهمة،
+        فلا يوقف النسخ نفسه بعمليات ضغطه، وما زاد عن ذلك حمل من برامج أخرى.
+        """
+        load = self.current_load()
+        if load is None:
+            return False
+        if baseline is not None:
+            load = max(min(load, baseline), load - own_workers)
+        return load / self.cpu_count > self.max_load_per_cpu
+
+
+def load_backup_selection() -> Tuple[List[Path], List[str]]:
+    """قراءة المجلدات المحددة والاستثناءات المحفوظة من إعدادات الواجهة"""
+    settings = SettingsStore.for_path(APP_DIR / SETTINGS_FILENAME).read()
+
+    if 'folders' in settings:
+        folders = [Path(entry['path']) for entry in settings['folders'] if entry.get('enabled')]
+    else:
+        folders = [HOME_DIR / name for name in DEFAULT_FOLDERS]
+
+    exclusions = settings.get('exclusions', DEFAULT_EXCLUSIONS.copy())
+    return [folder for folder in folders if folder.is_dir()], exclusions
+
+
+class AutoBackupDaemon:
+    """خدمة النسخ التلقائي - تنفذ نسخة كل auto_backup_interval_hours وتعوض النسخ الفائتة بعد الاستئناف
+
+    ملفات التعريف ذات auto_backup_interval_hours تعمل بجدولها الخاص على مستودعاتها،
+    و auto_backup_enabled يبقى مفتاح التشغيل العام لها جميعاً.
+    """
+
+    def __init__(self,
+                 orchestrator: BackupOrchestrator = None,
+                 config_manager: ConfigurationManager = None,
+                 profile_store: BackupProfileStore = None,
+                 load_monitor: SystemLoadMonitor = None,
+                 logger: ILogger = None,
+                 state_path: Path = None,
+                 poll_interval: float = 60.0,
+                 load_check_interval: float = 5.0):
+        self.logger = logger or LoggerFactory.create_default_logger()
+        self.config_manager = config_manager or ConfigurationManager(logger=self.logger)
+        self.orchestrator = orchestrator or AsyncBackupOrchestrator(
+            logger=self.logger,
+            governor=create_settings_governor(self.config_manager),
+            metrics_store=create_metrics_store(self.config_manager),
+            trace_recorder=create_trace_recorder(self.config_manager),
+            profiler=create_run_profiler(self.config_manager)
+        )
+        self.profile_store = profile_store or BackupProfileStore()
+        self.load_monitor = load_monitor or SystemLoadMonitor()
+        self.state_path = state_path or (APP_DIR / AUTO_BACKUP_STATE_FILENAME)
+        self.poll_interval = poll_interval
+        self.load_check_interval = load_check_interval
+        self._stop_event = threading.Event()
+        # حمل النظام قبل النسخة الجارية وعدد مهامها، ليُستثنى حملها من فحص الإيقاف المؤقت
+        self._load_baseline: Optional[float] = None
+        self._own_workers = 0
+
+    def run_forever(self) -> None:
+        """حلقة الخدمة - تعتمد على ساعة النظام حتى تُكتشف الفترات الفائتة أثناء السبات"""
+        self.logger.info("بدء خدمة النسخ التلقائي")
+
+        while not self._stop_event.is_set():
+            settings = self._reload_settings()
+            wait_seconds = self.poll_interval
+            ran = False
+
+            if settings.auto_backup_enabled:
+                for profile, interval_hours in self._scheduled_runs(settings):
+                    due_at = self.next_run_time(interval_hours, profile.name if profile else None)
+                    if time.time() >= due_at:
+                        if profile is None:
+                            self.run_once()
+                        else:
+                            self.run_profile(profile)
+                        ran = True
+                        break
+                    wait_seconds = min(wait_seconds, due_at - time.time())
+
+            if not ran:
+                self._stop_event.wait(max(wait_seconds, 0))
+
+        self.logger.info("توقفت خدمة النسخ التلقائي")
+
+    def stop(self) -> None:
+        """طلب إيقاف الخدمة وإلغاء النسخة الجارية"""
+        self._stop_event.set()
+
+    def next_run_time(self, interval_hours: int, profile_name: Optional[str] = None) -> float:
+        """موعد النسخة التالية (لملف التعريف إن حُدد) - النسخ الفائتة تُدمج في نسخة واحدة فورية"""
+        state = self._load_state()
+        if profile_name is not None:
+            state = state.get('profiles', {}).get(profile_name, {})
+        last_run = state.get('last_run')
+        if last_run is None:
+            return 0.0
+        return last_run + interval_hours * _SECONDS_PER_HOUR
+
+    def run_once(self) -> Optional[Path]:
+        """تنفيذ نسخة تراكمية واحدة للمجلدات المحددة في الواجهة ثم تطبيق سياسة الاحتفاظ"""
+        settings = self._reload_settings()
+        folders, exclusions = load_backup_selection()
+        policy = RetentionPolicy(keep_last=settings.backup_retention, keep_daily=settings.keep_daily,
+                                 keep_weekly=settings.keep_weekly, keep_monthly=settings.keep_monthly)
+        return self._run_backup(self.orchestrator, folders, exclusions, policy)
+
+    def run_profile(self, profile: BackupProfile) -> Optional[Path]:
+        """تنفيذ نسخة تراكمية لملف تعريف على مستودعه ثم تطبيق سياسة احتفاظه"""
+        folders = [folder for folder in profile.folder_paths if folder.is_dir()]
+        return self._run_backup(create_profile_orchestrator(profile, self.orchestrator),
+                                folders, profile.exclusions, profile.retention_policy, profile.name)
+
+    def _scheduled_runs(self, settings) -> List[Tuple[Optional[BackupProfile], int]]:
+        """النسخ الدورية: مجلدات الواجهة (None) ثم ملفات التعريف التي لها فترة"""
+        runs: List[Tuple[Optional[BackupProfile], int]] = [(None, settings.auto_backup_interval_hours)]
+        runs += [(profile, profile.auto_backup_interval_hours)
+                 for profile in self.profile_store.list_profiles()
+                 if profile.auto_backup_interval_hours > 0]
+        return runs
+
+    def _run_backup(self,
+                    orchestrator: BackupOrchestrator,
+                    folders: List[Path],
+                    exclusions: List[str],
+                    policy: RetentionPolicy,
+                    profile_name: Optional[str] = None) -> Optional[Path]:
+        started_at = time.time()
+
+        if not folders:
+            self.logger.warning(f"لا توجد مجلدات محددة للنسخ التلقائي{self._label(profile_name)}")
+            self._record_run(profile_name, {'last_run': started_at, 'last_result': 'no_folders'})
+            return None
+
+        repository = orchestrator.repository
+        backup_filepath = repository.new_backup_path()
+        result = 'failed'
+        self._load_baseline = self.load_monitor.current_load()
+        self._own_workers = orchestrator.busy_workers()
+
+        try:
+            failed_files = orchestrator.create_incremental_backup(
+                folders, backup_filepath, exclusions,
+                self._on_progress, self._should_continue
+            ) or {}
+            if self._stop_event.is_set():
+                result = 'cancelled'
+                return None
+
+            result = 'created' if backup_filepath.exists() else 'unchanged'
+            if failed_files:
+                result += '_with_failures'
+            report = orchestrator.apply_retention_policy(policy)
+            self.logger.info(f"اكتمل النسخ التلقائي{self._label(profile_name)}. {report.summary()}")
+            return backup_filepath if backup_filepath.exists() else None
+
+        except Exception as e:
+            self.logger.error(f"فشل النسخ التلقائي{self._label(profile_name)}: {e}")
+            return None
+        finally:
+            # النسخة الملغاة بسبب الإيقاف تُعاد في التشغيل القادم
+            if result != 'cancelled':
+                self._record_run(profile_name, {'last_run': started_at, 'last_result': result})
+
+    @staticmethod
+    def _label(profile_name: Optional[str]) -> str:
+        return f" ({profile_name})" if profile_name else ""
+
+    def _should_continue(self) -> bool:
+        """فحص الاستمرار - يتوقف مؤقتاً طالما النظام تحت حمل مرتفع"""
+        paused = False
+        while not self._stop_event.is_set() and self.load_monitor.is_overloaded(self._load_baseline,
+                                                                                 self._own_workers):
+            if not paused:
+                self.logger.info("إيقاف مؤقت للنسخ التلقائي بسبب ارتفاع حمل النظام")
+                paused = True
+            self._stop_event.wait(self.load_check_interval)
+
+        if paused and not self._stop_event.is_set():
+            self.logger.info("استئناف النسخ التلقائي")
+        return not self._stop_event.is_set()
+
+    def _on_progress(self, progress: int, status: str) -> None:
+        self.logger.debug(f"[{progress}%] {status}")
+
+    def _reload_settings(self):
+        """الإعدادات الحالية - تعديلات الواجهة على الملف تُكتشف بتاريخ تعديله دون إعادة تشغيل الخدمة"""
+        return self.config_manager.load_settings()
+
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _record_run(self, profile_name: Optional[str], run: dict) -> None:
+        """حفظ نتيجة تشغيل - حالة كل ملف تعريف منفصلة تحت 'profiles'"""
+        state = self._load_state()
+        if profile_name is None:
+            state.update(run)
+        else:
+            state.setdefault('profiles', {})[profile_name] = run
+        self._save_state(state)
+
+    def _save_state(self, state: dict) -> None:
+        """حفظ حالة آخر تشغيل بكتابة ذرية"""
+        temp_path = self.state_path.with_name(self.state_path.name + '.tmp')
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            self.logger.error(f"فشل في حفظ حالة النسخ التلقائي: {e}")
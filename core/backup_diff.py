@@ -0,0 +1,196 @@
+"""
+مقارنة نسختين احتياطيتين
+مسؤولية واحدة: استخراج الملفات المضافة والمحذوفة والمعدلة بين سجلي نسختين بدمج مرتب دون قراءة بيانات الأرشيف
+"""
+import itertools
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from core.backup_repository import BackupRepository
+from core.exceptions import BackupInterruptedError, CorruptedBackupError
+from utils.config import MANIFEST_SIZES_KEY
+
+CHANGE_ADDED = "added"
+CHANGE_REMOVED = "removed"
+CHANGE_MODIFIED = "modified"
+
+# عدد التغييرات المحفوظة في التقرير للعرض - المجاميع تشمل جميع التغييرات دائماً
+DIFF_MAX_ENTRIES = 10_000
+
+# اسم المجموعة للملفات الموجودة مباشرة في المجلد الرئيسي
+HOME_FOLDER = "~"
+
+
+@dataclass(frozen=True)
+class DiffEntry:
+    """تغيير ملف واحد بين النسختين - Value Object"""
+    path: str
+    change: str
+    old_size: Optional[int] = None
+    new_size: Optional[int] = None
+
+    @property
+    def folder(self) -> str:
+        """المجلد الأعلى للملف نسبة إلى المجلد الرئيسي"""
+        head, separator, _ = self.path.partition("/")
+        return head if separator else HOME_FOLDER
+
+    @property
+    def size_delta(self) -> Optional[int]:
+        """فرق الحجم بالبايت - None إذا لم يكن الحجم محفوظاً في السجل (نسخ أقدم من حفظ الأحجام)"""
+        if self.change == CHANGE_ADDED:
+            return self.new_size
+        if self.change == CHANGE_REMOVED:
+            return None if self.old_size is None else -self.old_size
+        if self.old_size is None or self.new_size is None:
+            return None
+        return self.new_size - self.old_size
+
+
+@dataclass
+class DiffTotals:
+    """مجاميع التغييرات في مجلد واحد أو في النسخة كلها"""
+    added: int = 0
+    removed: int = 0
+    modified: int = 0
+    bytes_delta: int = 0
+    unknown_sizes: int = 0
+
+    @property
+    def changed(self) -> int:
+        return self.added + self.removed + self.modified
+
+    def add(self, entry: DiffEntry) -> None:
+        if entry.change == CHANGE_ADDED:
+            self.added += 1
+        elif entry.change == CHANGE_REMOVED:
+            self.removed += 1
+        else:
+            self.modified += 1
+        delta = entry.size_delta
+        if delta is None:
+            self.unknown_sizes += 1
+        else:
+            self.bytes_delta += delta
+
+
+@dataclass
+class BackupDiffReport:
+    """نتيجة مقارنة نسختين"""
+    old_backup: Path
+    new_backup: Path
+    total: DiffTotals = field(default_factory=DiffTotals)
+    folders: Dict[str, DiffTotals] = field(default_factory=dict)
+    entries: List[DiffEntry] = field(default_factory=list)
+    omitted_entries: int = 0
+
+    def add(self, entry: DiffEntry, max_entries: int) -> None:
+        self.total.add(entry)
+        self.folders.setdefault(entry.folder, DiffTotals()).add(entry)
+        if len(self.entries) < max_entries:
+            self.entries.append(entry)
+        else:
+            self.omitted_entries += 1
+
+    def summary(self) -> str:
+        """ملخص نصي للمقارنة"""
+        if self.total.changed == 0:
+            return "لا توجد فروق بين النسختين."
+        lines = [f"+{self.total.added} مضاف، -{self.total.removed} محذوف، ~{self.total.modified} معدل "
+                 f"({format_size_delta(self.total.bytes_delta)})"]
+        if self.total.unknown_sizes:
+            lines.append(f"{self.total.unknown_sizes} تغييراً بلا حجم محفوظ (نسخ أقدم من حفظ الأحجام).")
+        return "\n".join(lines)
+
+
+def format_size_delta(delta: int) -> str:
+    """فرق حجم مقروء مع إشارته"""
+    sign = "-" if delta < 0 else "+"
+    size = abs(delta)
+    if size < 1024:
+        return f"{sign}{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{sign}{size:.1f} {unit}"
+
+
+def _file_paths(manifest: Dict[str, Any]) -> Iterator[str]:
+    """مسارات الملفات في السجل بترتيبها - المفاتيح الخاصة ('_sizes' وغيرها) قيمها ليست تواريخ
+
+    السجلات تُكتب مرتبة المفاتيح (sort_keys) ويحفظ json.load ترتيبها، فتُمرر المفاتيح كما هي
+    دون نسخها في قائمة. السجلات الأقدم غير المرتبة وحدها تُنسخ وتُرتب.
+    """
+    keys = iter(manifest)
+    ordered = all(previous < current for previous, current in zip(manifest, itertools.islice(keys, 1, None)))
+    paths = manifest if ordered else sorted(manifest)
+    return (path for path in paths if isinstance(manifest[path], (int, float)))
+
+
+def iter_manifest_diff(old_manifest: Dict[str, Any],
+                       new_manifest: Dict[str, Any],
+                       is_running_check: Callable[[], bool] = None) -> Iterator[DiffEntry]:
+    """التغييرات بين سجلين بترتيب المسار - دمج مرتب بمؤشرين على مفاتيح السجلين
+
+    السجلان نفساهما محملان كاملين (json داخل الأرشيف ويبقيان في ذاكرة المستودع المؤقتة)، فالذاكرة
+    بحجم السجلين؛ الدمج لا يضيف إليها شيئاً يزيد بعدد الملفات أو التغييرات.
+    """
+    old_paths = _file_paths(old_manifest)
+    new_paths = _file_paths(new_manifest)
+    old_sizes = old_manifest.get(MANIFEST_SIZES_KEY) or {}
+    new_sizes = new_manifest.get(MANIFEST_SIZES_KEY) or {}
+    old_path = next(old_paths, None)
+    new_path = next(new_paths, None)
+    steps = 0
+
+    while old_path is not None or new_path is not None:
+        if is_running_check is not None and steps % 10_000 == 0 and not is_running_check():
+            raise BackupInterruptedError()
+        steps += 1
+
+        if new_path is None or (old_path is not None and old_path < new_path):
+            yield DiffEntry(old_path, CHANGE_REMOVED, old_size=old_sizes.get(old_path))
+            old_path = next(old_paths, None)
+        elif old_path is None or new_path < old_path:
+            yield DiffEntry(new_path, CHANGE_ADDED, new_size=new_sizes.get(new_path))
+            new_path = next(new_paths, None)
+        else:
+            old_size, new_size = old_sizes.get(old_path), new_sizes.get(new_path)
+            if old_manifest[old_path] != new_manifest[new_path] or (
+                    old_size is not None and new_size is not None and old_size != new_size):
+                yield DiffEntry(new_path, CHANGE_MODIFIED, old_size, new_size)
+            old_path = next(old_paths, None)
+            new_path = next(new_paths, None)
+
+
+class BackupDiffer:
+    """مقارنة نسخ مستودع واحد من سجلاتها فقط - السجلات تأتي من ذاكرة المستودع المؤقتة"""
+
+    def __init__(self, repository: BackupRepository = None):
+        self.repository = repository or BackupRepository()
+
+    def iter_changes(self,
+                     old_backup: Path,
+                     new_backup: Path,
+                     is_running_check: Callable[[], bool] = None) -> Iterator[DiffEntry]:
+        """التغييرات من old_backup إلى new_backup واحداً تلو الآخر"""
+        return iter_manifest_diff(self._manifest(old_backup), self._manifest(new_backup), is_running_check)
+
+    def diff(self,
+             old_backup: Path,
+             new_backup: Path,
+             max_entries: int = DIFF_MAX_ENTRIES,
+             is_running_check: Callable[[], bool] = None) -> BackupDiffReport:
+        """تقرير المقارنة: مجاميع كل مجلد أعلى وأول max_entries تغييراً"""
+        report = BackupDiffReport(old_backup, new_backup)
+        for entry in self.iter_changes(old_backup, new_backup, is_running_check):
+            report.add(entry, max_entries)
+        return report
+
+    def _manifest(self, backup_path: Path) -> Dict[str, Any]:
+        """سجل النسخة - كل نسخة صالحة لها سجل، فالسجل الفارغ يعني تعذر قراءتها"""
+        manifest = self.repository.get_backup_manifest(backup_path)
+        if not manifest:
+            raise CorruptedBackupError(str(backup_path))
+        return manifest
@@ -1,11 +1,21 @@
 
 from pathlib import Path
-from typing import List, Callable
+from typing import Any, Dict, List, Callable, Mapping, Optional
 
 from interfaces.backup_interfaces import IBackupOrchestrator
 from core.file_scanner import FileScanner
 from core.backup_repository import BackupRepository
-from core.strategies import IncrementalBackupStrategy, SmartRestoreStrategy
+from core.dry_run import DryRunner, DryRunReport
+from core.retention import RetentionPolicy, RetentionReport
+from core.scan_cache import IndexedFileScanner, IndexingFileScanner, take_scan_for_backup
+from core.search_index import SearchIndex, SearchResult
+from core.repository_lock import partial_path_for, publish_archive
+from core.resource_governor import ResourceGovernor
+from core.run_metrics import MetricsRecorder, MetricsStore, BackupRunMetrics
+from core.tracing import TraceRecorder, trace_span
+from core.profiling import RunProfiler
+from core.exceptions import BackupInterruptedError
+from core.strategies import DEFAULT_CODEC, IncrementalBackupStrategy, SmartRestoreStrategy
 from core.logging_system import ILogger, LoggerFactory
 from core.error_handler import ErrorHandler, ErrorHandlerFactory
 
@@ -13,55 +23,101 @@ from core.error_handler import ErrorHandler, ErrorHandlerFactory
 class BackupOrchestrator(IBackupOrchestrator):
     """منسق العمليات - مسؤولية واحدة: تنسيق تدفق عمليات النسخ والاسترداد"""
     
+    engine_name = "sequential"
+    
     def __init__(self, 
                  file_scanner: FileScanner = None,
                  repository: BackupRepository = None,
                  logger: ILogger = None,
-                 error_handler: ErrorHandler = None):
+                 error_handler: ErrorHandler = None,
+                 search_index: SearchIndex = None,
+                 governor: ResourceGovernor = None,
+                 metrics_store: MetricsStore = None,
+                 trace_recorder: TraceRecorder = None,
+                 profiler: RunProfiler = None,
+                 codec: str = DEFAULT_CODEC,
+                 compression_level: Optional[int] = None):
         self.file_scanner = file_scanner or FileScanner()
         self.repository = repository or BackupRepository()
         self.logger = logger or LoggerFactory.create_default_logger()
         self.error_handler = error_handler or ErrorHandlerFactory.create_default_handler()
+        self.search_index = search_index or SearchIndex(self.repository, logger=self.logger)
+        self.governor = governor or ResourceGovernor()
+        self.metrics_store = metrics_store or MetricsStore()
+        self.last_run_metrics: Optional[BackupRunMetrics] = None
+        self.trace_recorder = trace_recorder or TraceRecorder(logger=self.logger)
+        self.profiler = profiler or RunProfiler()
+        self.codec = codec
+        self.compression_level = compression_level
     
     def create_incremental_backup(self, 
                                  folders: List[Path], 
                                  backup_filepath: Path, 
                                  exclusions: List[str],
                                  progress_callback: Callable[[int, str], None],
-                                 is_running_check: Callable[[], bool]) -> None:
-        """تنسيق عملية النسخ التراكمي مع معالجة الأخطاء والسجلات"""
+                                 is_running_check: Callable[[], bool]) -> Dict[str, str]:
+        """تنسيق عملية النسخ التراكمي مع معالجة الأخطاء والسجلات
         
+        يُرجع الملفات التي تعذر نسخها مع أسبابها؛ أخطاء الملفات المفردة تعالجها
+        الاستراتيجية ملفاً ملفاً، فلا تُعاد العملية كاملة من بدايتها.
+        """
+        with self.profiler.profile("backup"), \
+                self.trace_recorder.session("backup", {'backup_path': str(backup_filepath), 'engine': self.engine_name}):
+            return self._create_incremental_backup(folders, backup_filepath, exclusions,
+                                                   progress_callback, is_running_check)
+    
+    def _create_incremental_backup(self, 
+                                   folders: List[Path], 
+                                   backup_filepath: Path, 
+                                   exclusions: List[str],
+                                   progress_callback: Callable[[int, str], None],
+                                   is_running_check: Callable[[], bool]) -> Dict[str, str]:
         self.logger.info("بدء عملية النسخ الاحتياطي التراكمي", {
             'folders_count': len(folders),
             'backup_path': str(backup_filepath),
             'exclusions_count': len(exclusions)
         })
         
+        # تُكتب النسخة باسم مؤقت ولا تظهر في القائمة إلا بعد اكتمالها
+        partial_filepath = partial_path_for(backup_filepath)
+        failed_files: Dict[str, str] = {}
+        metrics = MetricsRecorder(backup_filepath, self.engine_name)
+        status = "failed"
+        
         try:
-            progress_callback(0, "جارٍ البحث عن النسخة السابقة...")
-            old_manifest = self.repository.get_latest_backup_manifest()
-            
-            progress_callback(5, "جارٍ حصر الملفات الجديدة والمعدلة...")
-            all_files = self.file_scanner.scan_files(folders, exclusions)
+            with self.repository.lock.writer():
+                progress_callback(0, "جارٍ البحث عن النسخة السابقة...")
+                with metrics.phase("manifest"), trace_span("manifest_read"):
+                    old_manifest = self.repository.get_latest_backup_manifest()
+                
+                failed_files = self._write_backup(
+                    folders, exclusions, old_manifest, partial_filepath,
+                    progress_callback, is_running_check, metrics
+                ) or {}
+                
+                with metrics.phase("finalize"), trace_span("publish_archive"):
+                    if partial_filepath.exists():
+                        publish_archive(partial_filepath, backup_filepath)
+                    self.repository.invalidate_cache()
             
-            self.logger.info(f"تم العثور على {len(all_files)} ملف للمعالجة")
+            with metrics.phase("finalize"), trace_span("search_index_update"):
+                self.sync_search_index()
+            status = "created" if backup_filepath.exists() else "unchanged"
             
-            # إنشاء استراتيجية النسخ التراكمي
-            backup_strategy = IncrementalBackupStrategy(old_manifest)
-            
-            # تنفيذ النسخ مع معالجة الأخطاء
-            safe_backup = self.error_handler.create_safe_operation(
-                backup_strategy.create_backup,
-                "إنشاء النسخة الاحتياطية"
-            )
-            
-            safe_backup(all_files, backup_filepath, progress_callback, is_running_check)
+            if failed_files:
+                self.logger.warning(f"تعذر نسخ {len(failed_files)} ملف", {
+                    'backup_path': str(backup_filepath),
+                    'failed_files': failed_files
+                })
             
             self.logger.info("اكتملت عملية النسخ الاحتياطي بنجاح", {
                 'backup_path': str(backup_filepath)
             })
+            return failed_files
             
         except Exception as e:
+            if isinstance(e, BackupInterruptedError):
+                status = "cancelled"
             context = {
                 'folders': [str(f) for f in folders],
                 'backup_filepath': str(backup_filepath),
@@ -71,27 +127,115 @@ class BackupOrchestrator(IBackupOrchestrator):
             if not self.error_handler.handle_exception(e, context, "النسخ الاحتياطي التراكمي"):
                 self.logger.critical("فشل في النسخ الاحتياطي ولم يتم الاسترداد")
                 raise
+            return failed_files
+        finally:
+            if partial_filepath.exists():
+                partial_filepath.unlink()
+            metrics.add(files_failed=len(failed_files))
+            self._save_run_metrics(metrics.finish(status, backup_filepath))
+    
+    def _save_run_metrics(self, metrics: BackupRunMetrics) -> None:
+        """حفظ مقاييس التشغيل - فشل الحفظ لا يفشل النسخ"""
+        self.last_run_metrics = metrics
+        try:
+            self.metrics_store.append(metrics)
+        except Exception as e:
+            self.logger.warning(f"فشل في حفظ مقاييس التشغيل: {e}")
+    
+    def _write_backup(self,
+                      folders: List[Path],
+                      exclusions: List[str],
+                      old_manifest: Dict[str, Any],
+                      destination: Path,
+                      progress_callback: Callable[[int, str], None],
+                      is_running_check: Callable[[], bool],
+                      metrics: MetricsRecorder) -> Dict[str, str]:
+        """فحص المجلدات ثم كتابة الأرشيف - نقطة التوسعة لمحركات النسخ الأخرى"""
+        progress_callback(5, "جارٍ حصر الملفات الجديدة والمعدلة...")
+        with metrics.phase("scan"):
+            all_files = self._scanner_for(folders).scan_files(folders, exclusions)
+        metrics.add(files_seen=len(all_files))
+        
+        self.logger.info(f"تم العثور على {len(all_files)} ملف للمعالجة")
+        
+        # إنشاء استراتيجية النسخ التراكمي
+        backup_strategy = IncrementalBackupStrategy(old_manifest, self.governor, metrics,
+                                                    self.codec, self.compression_level)
+        
+        return backup_strategy.create_backup(
+            all_files, destination, progress_callback, is_running_check
+        )
+    
+    def busy_workers(self) -> int:
+        """عدد المهام التي يشغلها النسخ في المعالج معاً - يطرحها مراقب الحمل من حمل النظام"""
+        return 1
+    
+    def _scanner_for(self, folders: List[Path]) -> FileScanner:
+        """فحص المعاينة التي سبقت النسخ مباشرة لنفس المجلدات يغني عن المرور على القرص مرة أخرى
+
+        وإلا يفحص النسخ القرص ويحفظ فحصه الكامل، فتجد صفحة الاستثناءات فحصاً دون معاينة.
+        """
+        index = take_scan_for_backup(self.repository.backup_dir, folders)
+        if index is None:
+            return IndexingFileScanner(self.file_scanner, self.repository.backup_dir)
+        self.logger.info(f"استخدام فحص المعاينة السابق قبل {index.age_seconds:.0f} ثانية")
+        return IndexedFileScanner(index)
+    
+    def preview_backup(self,
+                       folders: List[Path],
+                       exclusions: List[str],
+                       update_callback: Callable[[DryRunReport], None],
+                       is_running_check: Callable[[], bool]) -> DryRunReport:
+        """معاينة النسخة التالية دون كتابة شيء - تُبث النتائج أثناء الفحص"""
+        self.logger.info("بدء معاينة النسخة التالية", {
+            'folders_count': len(folders),
+            'exclusions_count': len(exclusions)
+        })
+        runner = DryRunner(self.repository, self.file_scanner, self.metrics_store)
+        report = runner.run(folders, exclusions, update_callback, is_running_check)
+        self.logger.info("اكتملت معاينة النسخة التالية", {
+            'files_to_backup': report.files_to_backup,
+            'bytes_to_backup': report.bytes_to_backup
+        })
+        return report
+    
+    def sync_search_index(self) -> None:
+        """مزامنة فهرس البحث بعد كل كتابة أو حذف على المستودع - فشل الفهرسة لا يفشل العملية"""
+        try:
+            self.search_index.sync()
+        except Exception as e:
+            self.logger.warning(f"فشل في تحديث فهرس البحث: {e}")
+    
+    def apply_retention_policy(self, policy: RetentionPolicy) -> RetentionReport:
+        """تطبيق سياسة الاحتفاظ على المستودع ثم إزالة النسخ المحذوفة من فهرس البحث"""
+        report = self.repository.apply_retention_policy(policy)
+        self.sync_search_index()
+        return report
+    
+    def _restore_strategy(self) -> SmartRestoreStrategy:
+        """استراتيجية الاسترداد - نقطة التوسعة لمحركات الاسترداد الأخرى"""
+        return SmartRestoreStrategy(self.governor)
     
     def restore_from_backup(self, 
                            backup_path: Path,
                            progress_callback: Callable[[int, str], None],
-                           is_running_check: Callable[[], bool]) -> str:
+                           is_running_check: Callable[[], bool],
+                           members: Optional[List[str]] = None,
+                           overwrite: bool = False) -> str:
         """تنسيق عملية الاسترداد مع معالجة الأخطاء والسجلات"""
         
         self.logger.info("بدء عملية الاسترداد", {
-            'backup_path': str(backup_path)
+            'backup_path': str(backup_path),
+            'selected_members': len(members) if members is not None else 'all'
         })
         
         try:
-            restore_strategy = SmartRestoreStrategy()
-            
-            # تنفيذ الاسترداد مع معالجة الأخطاء
-            safe_restore = self.error_handler.create_safe_operation(
-                restore_strategy.restore_backup,
-                "استرداد النسخة الاحتياطية"
-            )
+            restore_strategy = self._restore_strategy()
             
-            result = safe_restore(backup_path, progress_callback, is_running_check)
+            # قفل قراءة مشترك: لا يحجب القرّاء الآخرين لكنه يمنع حذف النسخة أثناء قراءتها
+            with self.profiler.profile("restore"), self.repository.lock.shared():
+                result = restore_strategy.restore_backup(backup_path, progress_callback, is_running_check,
+                                                         members, overwrite)
             
             self.logger.info("اكتملت عملية الاسترداد بنجاح", {
                 'backup_path': str(backup_path)
@@ -119,19 +263,16 @@ class BackupManager(BackupOrchestrator):
     def get_backups_list(self) -> List[Path]:
         return self.repository.get_backups_list()
     
-    def get_latest_backup_manifest(self) -> dict:
+    def get_latest_backup_manifest(self) -> Mapping[str, Any]:
         return self.repository.get_latest_backup_manifest()
     
     def delete_backups(self, backup_paths: List[Path]) -> int:
-        deleted_count = 0
-        for path in backup_paths:
-            try:
-                if path and path.exists():
-                    path.unlink()
-                    deleted_count += 1
-            except OSError:
-                pass
+        deleted_count = self.repository.delete_backups(backup_paths)
+        self.sync_search_index()
         return deleted_count
     
     def apply_backup_rotation(self, retention_count: int) -> int:
-        return self.repository.apply_backup_rotation(retention_count)
+        return self.apply_retention_policy(RetentionPolicy(keep_last=retention_count)).deleted_count
+    
+    def search_backups(self, query: str, limit: int = 200) -> List[SearchResult]:
+        return self.search_index.search(query, limit)
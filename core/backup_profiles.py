@@ -0,0 +1,160 @@
+"""
+ملفات تعريف النسخ المسماة
+مسؤولية واحدة: حفظ مجموعات نسخ مستقلة لكل منها مجلداتها واستثناءاتها وضغطها واحتفاظها ووجهتها
+"""
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.backup_manager import BackupOrchestrator
+from core.backup_repository import BackupRepository
+from core.exceptions import ConfigurationException, ValidationException
+from core.retention import RetentionPolicy
+from core.strategies import ARCHIVE_CODECS, DEFAULT_CODEC
+from utils.config import (APP_DIR, BACKUP_DIR, BACKUP_PROFILES_FILENAME, DEFAULT_BACKUP_RETENTION,
+                          DEFAULT_EXCLUSIONS, PROFILE_BACKUPS_SUBDIR)
+from utils.settings_store import SettingsStore
+
+
+@dataclass
+class BackupProfile:
+    """ملف تعريف نسخ - Value Object يُحفظ في backup_profiles.json تحت اسمه
+
+    لكل ملف تعريف مجلد وجهة خاص به، فسلسلة نسخه وسجل آخر نسخة فيها (وكل ذاكرة
+    مؤقتة مفتاحها مجلد المستودع) لا تتأثر بتشغيل ملف تعريف آخر أو بالنسخ من الواجهة.
+    """
+    name: str
+    folders: List[str] = field(default_factory=list)
+    exclusions: List[str] = field(default_factory=lambda: DEFAULT_EXCLUSIONS.copy())
+    destination: str = ""                      # فارغ: profile_backups/<الاسم> داخل مجلد التطبيق
+    codec: str = DEFAULT_CODEC                 # deflate أو stored أو bzip2 أو lzma
+    compression_level: Optional[int] = None    # None: المستوى الافتراضي للخوارزمية
+    keep_last: int = DEFAULT_BACKUP_RETENTION
+    keep_daily: int = 0
+    keep_weekly: int = 0
+    keep_monthly: int = 0
+    auto_backup_interval_hours: int = 0        # صفر: لا يعمل إلا عند الطلب
+
+    @property
+    def backup_dir(self) -> Path:
+        """مجلد مستودع ملف التعريف"""
+        if self.destination:
+            return Path(self.destination).expanduser()
+        return APP_DIR / PROFILE_BACKUPS_SUBDIR / self.name
+
+    @property
+    def folder_paths(self) -> List[Path]:
+        return [Path(folder).expanduser() for folder in self.folders]
+
+    @property
+    def retention_policy(self) -> RetentionPolicy:
+        return RetentionPolicy(keep_last=self.keep_last, keep_daily=self.keep_daily,
+                               keep_weekly=self.keep_weekly, keep_monthly=self.keep_monthly)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        del data['name']
+        return data
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict[str, Any]) -> "BackupProfile":
+        """بناء ملف التعريف من المحفوظ - المفاتيح غير المعروفة (من إصدار أحدث) تُتجاهل"""
+        known = {f.name for f in fields(cls)} - {'name'}
+        return cls(name=name, **{key: value for key, value in data.items() if key in known})
+
+
+class BackupProfileStore:
+    """مخزن ملفات التعريف - مستند JSON مفاتيحه أسماء الملفات، مشترك في العملية عبر SettingsStore"""
+
+    def __init__(self, path: Path = None):
+        self.store = SettingsStore.for_path(path or (APP_DIR / BACKUP_PROFILES_FILENAME))
+
+    def list_profiles(self) -> List[BackupProfile]:
+        """جميع ملفات التعريف مرتبة بالاسم - المدخل التالف يُتجاهل"""
+        profiles = []
+        for name, data in sorted(self.store.read().items()):
+            try:
+                profiles.append(BackupProfile.from_dict(name, data))
+            except (TypeError, AttributeError):
+                continue
+        return profiles
+
+    def get(self, name: str) -> Optional[BackupProfile]:
+        data = self.store.get(name)
+        if not isinstance(data, dict):
+            return None
+        try:
+            return BackupProfile.from_dict(name, data)
+        except TypeError:
+            return None
+
+    def require(self, name: str) -> BackupProfile:
+        """ملف التعريف بالاسم أو ConfigurationException إذا لم يوجد"""
+        profile = self.get(name)
+        if profile is None:
+            raise ConfigurationException(f"ملف التعريف غير موجود: {name}", config_key=name)
+        return profile
+
+    def save(self, profile: BackupProfile) -> None:
+        """إضافة ملف تعريف أو استبداله بعد التحقق منه"""
+        self.validate(profile)
+        self.store.update({profile.name: profile.to_dict()})
+
+    def delete(self, name: str) -> bool:
+        """حذف ملف التعريف - نسخه الموجودة في وجهته تبقى كما هي"""
+        data = self.store.read()
+        if name not in data:
+            return False
+        del data[name]
+        self.store.replace(data)
+        return True
+
+    def validate(self, profile: BackupProfile) -> None:
+        """رفع ValidationException عند أول حقل غير صالح"""
+        if not profile.name or not all(ch.isalnum() or ch in "-_" for ch in profile.name):
+            raise ValidationException(f"اسم ملف التعريف غير صالح: {profile.name!r}", field_name='name')
+        if not profile.folders:
+            raise ValidationException("لم تُحدد مجلدات لملف التعريف", field_name='folders')
+        if profile.codec not in ARCHIVE_CODECS:
+            raise ValidationException(f"خوارزمية ضغط غير مدعومة: {profile.codec}", field_name='codec')
+
+        level = profile.compression_level
+        lowest_level = 1 if profile.codec == "bzip2" else 0
+        if level is not None and not (isinstance(level, int) and lowest_level <= level <= 9):
+            raise ValidationException(f"مستوى ضغط غير صالح: {level}", field_name='compression_level')
+        if not (isinstance(profile.keep_last, int) and 1 <= profile.keep_last <= 100):
+            raise ValidationException(f"عدد النسخ المحتفظ بها غير صالح: {profile.keep_last}",
+                                      field_name='keep_last')
+        for field_name in ('keep_daily', 'keep_weekly', 'keep_monthly'):
+            value = getattr(profile, field_name)
+            if not (isinstance(value, int) and value >= 0):
+                raise ValidationException(f"قيمة غير صالحة: {field_name}={value}", field_name=field_name)
+        interval = profile.auto_backup_interval_hours
+        if not (isinstance(interval, int) and 0 <= interval <= 168):
+            raise ValidationException(f"فترة النسخ التلقائي غير صالحة: {interval}",
+                                      field_name='auto_backup_interval_hours')
+
+        # مستودعان مشتركان يعنيان سلسلة سجلات واحدة، فيفسد كل منهما كشف التغيير للآخر
+        backup_dir = profile.backup_dir.resolve()
+        if backup_dir == BACKUP_DIR.resolve():
+            raise ValidationException("وجهة ملف التعريف هي مجلد النسخ الافتراضي", field_name='destination')
+        for other in self.list_profiles():
+            if other.name != profile.name and other.backup_dir.resolve() == backup_dir:
+                raise ValidationException(f"الوجهة مستخدمة في ملف التعريف: {other.name}",
+                                          field_name='destination')
+
+
+def create_profile_orchestrator(profile: BackupProfile, template: BackupOrchestrator) -> BackupOrchestrator:
+    """منسق من نوع template على مستودع ملف التعريف وبضغطه، يشارك template حدود الموارد والمقاييس والتتبع والقياس"""
+    return type(template)(
+        file_scanner=template.file_scanner,
+        repository=BackupRepository(profile.backup_dir),
+        logger=template.logger,
+        error_handler=template.error_handler,
+        governor=template.governor,
+        metrics_store=template.metrics_store,
+        trace_recorder=template.trace_recorder,
+        profiler=template.profiler,
+        codec=profile.codec,
+        compression_level=profile.compression_level
+    )
@@ -1,64 +1,123 @@
-import os
 import json
 import zipfile
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Mapping, TYPE_CHECKING
 
 from interfaces.backup_interfaces import IBackupRepository
-from utils.config import BACKUP_DIR, MANIFEST_FILENAME
+from core.repository_cache import ArchiveInfo, RepositoryCache, freeze_manifest, get_repository_cache
+from core.repository_lock import RepositoryLock, get_repository_lock, partial_path_for
+from utils.config import BACKUP_DIR, BACKUP_NAME_PREFIX, MANIFEST_FILENAME
+
+if TYPE_CHECKING:
+    from core.retention import RetentionPolicy, RetentionReport
 
 
 class BackupRepository(IBackupRepository):
     """مسؤولية واحدة: إدارة الوصول لبيانات النسخ الاحتياطية"""
-    
+
+    def __init__(self, 
+                 backup_dir: Path = None, 
+                 cache: RepositoryCache = None,
+                 lock: RepositoryLock = None):
+        self.backup_dir = backup_dir or BACKUP_DIR
+        self.cache = cache or get_repository_cache(self.backup_dir)
+        self.lock = lock or get_repository_lock(self.backup_dir)
+
     def get_backups_list(self) -> List[Path]:
         """الحصول على قائمة النسخ الاحتياطية مرتبة من الأحدث للأقدم"""
-        if not BACKUP_DIR.exists():
-            return []
-        
-        return sorted(
-            [f for f in BACKUP_DIR.glob('*.zip') if f.is_file()],
-            key=os.path.getmtime,
-            reverse=True
-        )
-    
-    def get_latest_backup_manifest(self) -> Dict[str, Any]:
-        """الحصول على سجل آخر نسخة احتياطية"""
-        backups = self.get_backups_list()
+        return [info.path for info in self.cache.list_archives()]
+
+    def get_backups_info(self) -> List[ArchiveInfo]:
+        """الحصول على بيانات النسخ (المسار، الحجم، الوقت) مرتبة من الأحدث للأقدم"""
+        return self.cache.list_archives()
+
+    def get_backup_info(self, backup_path: Path) -> Optional[ArchiveInfo]:
+        """الحصول على بيانات نسخة محددة دون استدعاء stat"""
+        return self.cache.get_info(backup_path)
+
+    def get_member_count(self, backup_path: Path) -> Optional[int]:
+        """عدد الملفات في نسخة - يُقرأ من الفهرس المركزي مرة واحدة لكل نسخة"""
+        info = self.cache.get_info(backup_path)
+        if info is None:
+            return None
+        return self.cache.get_member_count(info, self._count_members)
+
+    def get_latest_backup_manifest(self) -> Mapping[str, Any]:
+        """الحصول على سجل آخر نسخة احتياطية - للقراءة فقط لأنه مشترك في الذاكرة المؤقتة"""
+        backups = self.cache.list_archives()
         if not backups:
             return {}
-        
-        latest_backup = backups[0]
-        return self._read_manifest_from_backup(latest_backup)
-    
-    def delete_backups(self, backup_paths: List[Path]) -> None:
-        """حذف نسخ احتياطية محددة"""
-        for path in backup_paths:
-            try:
-                if path.exists():
-                    path.unlink()
-            except OSError:
-                pass
-    
+
+        return self.cache.get_manifest(backups[0], self._read_manifest_from_backup)
+
+    def new_backup_path(self) -> Path:
+        """مسار نسخة جديدة باسم زمني لا يتعارض مع نسخة موجودة أو قيد الكتابة"""
+        timestamp = datetime.now().strftime('%Y-%m-%d_%H%M%S')
+        candidate = self.backup_dir / f"{BACKUP_NAME_PREFIX}{timestamp}.zip"
+        suffix = 2
+        while candidate.exists() or partial_path_for(candidate).exists():
+            candidate = self.backup_dir / f"{BACKUP_NAME_PREFIX}{timestamp}_{suffix}.zip"
+            suffix += 1
+        return candidate
+
+    def get_backup_manifest(self, backup_path: Path) -> Mapping[str, Any]:
+        """الحصول على سجل نسخة محددة - للقراءة فقط لأنه مشترك في الذاكرة المؤقتة"""
+        info = self.cache.get_info(backup_path)
+        if info is None:
+            return {}
+
+        return self.cache.get_manifest(info, self._read_manifest_from_backup)
+
+    def delete_backups(self, backup_paths: List[Path]) -> int:
+        """حذف نسخ احتياطية محددة وإرجاع عدد المحذوفة - ينتظر انتهاء القرّاء والكاتب"""
+        deleted_count = 0
+        with self.lock.exclusive():
+            for path in backup_paths:
+                try:
+                    if path and path.exists():
+                        path.unlink()
+                        deleted_count += 1
+                except OSError:
+                    pass
+
+        self.cache.invalidate()
+        return deleted_count
+
     def apply_backup_rotation(self, retention_count: int) -> int:
         """تطبيق سياسة الاحتفاظ بالنسخ وحذف الأقدم"""
-        backups = self.get_backups_list()
-        
-        if len(backups) <= retention_count:
-            return 0
-        
-        to_delete = backups[retention_count:]
-        self.delete_backups(to_delete)
-        return len(to_delete)
-    
-    def _read_manifest_from_backup(self, backup_path: Path) -> Dict[str, Any]:
-        """قراءة سجل النسخة من ملف النسخة الاحتياطية"""
+        from core.retention import RetentionPolicy
+
+        return self.apply_retention_policy(RetentionPolicy(keep_last=retention_count)).deleted_count
+
+    def apply_retention_policy(self, policy: "RetentionPolicy") -> "RetentionReport":
+        """تطبيق سياسة الاحتفاظ (الجد-الأب-الابن) مع دمج الملفات المطلوبة قبل الحذف"""
+        from core.retention import RetentionEngine
+
+        return RetentionEngine(self).apply(policy)
+
+    def invalidate_cache(self) -> None:
+        """إبطال الذاكرة المؤقتة بعد كتابة نسخة جديدة"""
+        self.cache.invalidate()
+
+    @staticmethod
+    def _count_members(backup_path: Path) -> Optional[int]:
+        """عدد أعضاء الأرشيف دون السجل والمجلدات - None إذا تعذرت قراءته"""
+        try:
+            with zipfile.ZipFile(backup_path, 'r') as zipf:
+                return sum(1 for name in zipf.NameToInfo
+                           if name != MANIFEST_FILENAME and not name.endswith('/'))
+        except (OSError, zipfile.BadZipFile):
+            return None
+
+    def _read_manifest_from_backup(self, backup_path: Path) -> Tuple[Mapping[str, Any], int]:
+        """قراءة سجل النسخة من ملف النسخة الاحتياطية مع حجمه بعد التحليل في الذاكرة"""
         try:
             with zipfile.ZipFile(backup_path, 'r') as zipf:
-                if MANIFEST_FILENAME in zipf.namelist():
+                if MANIFEST_FILENAME in zipf.NameToInfo:
                     with zipf.open(MANIFEST_FILENAME) as manifest_file:
-                        return json.load(manifest_file)
+                        return freeze_manifest(json.load(manifest_file))
         except Exception:
             pass
-        
-        return {}
\ No newline at end of file
+
+        return {}, 0
@@ -0,0 +1,332 @@
+"""
+فاحص سلامة النسخ الاحتياطية
+مسؤولية واحدة: التحقق من CRC لجميع أعضاء الأرشيفات دون استخراجها
+"""
+import json
+import lzma
+import math
+import multiprocessing
+import os
+import random
+import time
+import zipfile
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+
+from core.backup_repository import BackupRepository
+from core.exceptions import BackupInterruptedError, CorruptedBackupError
+from core.logging_system import ILogger, LoggerFactory
+from utils.config import APP_DIR, VERIFY_CACHE_FILENAME
+
+# حجم القطعة عند القراءة التدفقية للأعضاء
+VERIFY_CHUNK_SIZE = 1024 * 1024
+
+# أخطاء تعني أن بيانات الأرشيف نفسها تالفة: بنية ZIP أو CRC (BadZipFile) أو فك الضغط أو بيانات مبتورة
+CORRUPTION_ERRORS = (zipfile.BadZipFile, zlib.error, lzma.LZMAError, EOFError)
+
+
+def _is_corruption(error: Exception, info: Optional[zipfile.ZipInfo]) -> bool:
+    """فك ضغط bzip2 يرفع OSError بلا رقم خطأ عند تلف البيانات، بخلاف أخطاء نظام الملفات"""
+    if isinstance(error, CORRUPTION_ERRORS):
+        return True
+    return (isinstance(error, OSError) and error.errno is None
+            and info is not None and info.compress_type == zipfile.ZIP_BZIP2)
+
+
+def verify_archive(archive_path: str) -> Dict[str, Any]:
+    """قراءة جميع أعضاء الأرشيف تدفقياً للتحقق من CRC - تعمل داخل عملية منفصلة
+
+    التلف وحده يُرجع كنتيجة فاشلة؛ الأخطاء الأخرى (مثل حذف الأرشيف أثناء فحصه) تُرفع كما هي.
+    """
+    members_checked = 0
+    bytes_checked = 0
+    current_member = None
+    current_info = None
+
+    try:
+        with zipfile.ZipFile(archive_path, 'r') as zipf:
+            for info in zipf.infolist():
+                if info.is_dir():
+                    continue
+
+                current_member = info.filename
+                current_info = info
+                # ZipExtFile يتحقق من CRC تلقائياً عند الوصول لنهاية العضو
+                with zipf.open(info, 'r') as member_file:
+                    while True:
+                        chunk = member_file.read(VERIFY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        bytes_checked += len(chunk)
+
+                members_checked += 1
+    except Exception as e:
+        if not _is_corruption(e, current_info):
+            raise
+        return {
+            'ok': False,
+            'members_checked': members_checked,
+            'bytes_checked': bytes_checked,
+            'bad_member': current_member,
+            'error': str(e)
+        }
+
+    return {
+        'ok': True,
+        'members_checked': members_checked,
+        'bytes_checked': bytes_checked,
+        'bad_member': None,
+        'error': None
+    }
+
+
+def create_verify_executor(workers: int) -> ProcessPoolExecutor:
+    """مجمع عمليات الفحص - الفحص يبدأ من خيط عامل Qt، و fork لعملية متعددة الخيوط ينسخ أقفالها المحجوزة"""
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+
+
+@dataclass
+class ArchiveVerification:
+    """نتيجة فحص أرشيف واحد - Value Object"""
+    name: str
+    size: int
+    mtime: float
+    ok: bool
+    members_checked: int = 0
+    bytes_checked: int = 0
+    bad_member: Optional[str] = None
+    error: Optional[str] = None
+    checked_at: float = 0.0
+
+    def matches(self, size: int, mtime: float) -> bool:
+        """فحص ما إذا كانت النتيجة ما زالت صالحة للأرشيف الحالي"""
+        return self.size == size and self.mtime == mtime
+
+
+@dataclass
+class VerificationReport:
+    """تقرير عملية الفحص الكاملة"""
+    checked: List[ArchiveVerification] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    corrupted: List[Path] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)   # نسخ تعذر فحصها لسبب غير التلف
+
+    def summary(self) -> str:
+        """ملخص نصي للتقرير"""
+        lines = [
+            "اكتمل فحص سلامة النسخ!",
+            "",
+            f"✓ تم فحص {len(self.checked)} نسخة.",
+            f"↷ تم تخطي {len(self.skipped)} نسخة لم تتغير منذ آخر فحص.",
+        ]
+        if self.corrupted:
+            lines.append(f"⚠ عُثر على {len(self.corrupted)} نسخة تالفة:")
+            lines.extend(f"  - {path.name}" for path in self.corrupted)
+        if self.failed:
+            lines.append(f"✗ تعذر فحص {len(self.failed)} نسخة:")
+            lines.extend(f"  - {name}: {error}" for name, error in self.failed.items())
+        return "\n".join(lines)
+
+
+class BackupVerifier:
+    """فاحص النسخ - مسؤولية واحدة: فحص الأرشيفات بالتوازي مع تخزين النتائج مؤقتاً"""
+
+    def __init__(self,
+                 repository: BackupRepository = None,
+                 cache_path: Path = None,
+                 logger: ILogger = None,
+                 max_workers: int = None):
+        self.repository = repository or BackupRepository()
+        self.cache_path = cache_path or (APP_DIR / VERIFY_CACHE_FILENAME)
+        self.logger = logger or LoggerFactory.create_default_logger()
+        self.max_workers = max_workers
+        self._cache: Optional[Dict[str, ArchiveVerification]] = None
+        self._cache_mtime: Optional[int] = None
+
+    def verify_backup(self, backup_path: Path) -> ArchiveVerification:
+        """فحص نسخة واحدة ورفع CorruptedBackupError إذا كانت تالفة"""
+        with self.repository.lock.shared():
+            stat = backup_path.stat()
+            result = self._build_result(backup_path, stat.st_size, stat.st_mtime,
+                                        verify_archive(str(backup_path)))
+        self._store_results([result])
+
+        if not result.ok:
+            raise CorruptedBackupError(str(backup_path))
+        return result
+
+    def verify_all(self,
+                   sample_percent: float = 100.0,
+                   force: bool = False,
+                   progress_callback: Callable[[int, str], None] = None,
+                   is_running_check: Callable[[], bool] = None) -> VerificationReport:
+        """فحص جميع النسخ بالتوازي - أرشيف واحد لكل عامل
+
+        الأرشيفات غير المتغيرة (الحجم ووقت التعديل) تُتخطى، إلا في وضع
+        العينة حيث تُختار نسبة عشوائية من جميع الأرشيفات لكشف التلف الصامت.
+        """
+        # قفل قراءة مشترك يمنع حذف الأرشيفات أثناء فحصها
+        with self.repository.lock.shared():
+            return self._verify_all(sample_percent, force,
+                                    progress_callback or (lambda p, s: None),
+                                    is_running_check or (lambda: True))
+
+    def _verify_all(self,
+                    sample_percent: float,
+                    force: bool,
+                    progress_callback: Callable[[int, str], None],
+                    is_running_check: Callable[[], bool]) -> VerificationReport:
+        """تنفيذ الفحص أثناء حمل قفل القراءة"""
+        report = VerificationReport()
+        cache = self._load_cache()
+
+        progress_callback(0, "جارٍ حصر النسخ الاحتياطية...")
+        archives = {info.path: (info.size, info.mtime)
+                    for info in self.repository.get_backups_info()}
+
+        to_check = self._select_archives(archives, cache, sample_percent, force)
+        for backup_path in archives:
+            if backup_path not in to_check:
+                report.skipped.append(backup_path.name)
+                cached = cache.get(backup_path.name)
+                if cached is not None and not cached.ok:
+                    report.corrupted.append(backup_path)
+
+        if not to_check:
+            progress_callback(100, "لا توجد نسخ تحتاج إلى فحص.")
+            return report
+
+        total = len(to_check)
+        workers = min(self.max_workers or os.cpu_count() or 1, total)
+        self.logger.info("بدء فحص سلامة النسخ", {
+            'archives_count': total,
+            'workers': workers,
+            'sample_percent': sample_percent
+        })
+
+        executor = create_verify_executor(workers)
+        try:
+            futures = {executor.submit(verify_archive, str(path)): path for path in to_check}
+            for i, future in enumerate(as_completed(futures)):
+                if not is_running_check():
+                    raise BackupInterruptedError()
+
+                backup_path = futures[future]
+                size, mtime = archives[backup_path]
+                try:
+                    self._record_result(report, backup_path,
+                                        self._build_result(backup_path, size, mtime, future.result()))
+                except OSError as e:
+                    report.failed[backup_path.name] = str(e)
+                    self.logger.warning(f"تعذر فحص النسخة {backup_path.name}: {e}")
+
+                progress = (i + 1) * 100 // total
+                progress_callback(progress, f"تم فحص: {backup_path.name[:40]}")
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._store_results(report.checked)
+
+        return report
+
+    def _record_result(self, report: VerificationReport, backup_path: Path,
+                       result: ArchiveVerification) -> None:
+        """إضافة نتيجة أرشيف إلى التقرير وتسجيل تلفه"""
+        report.checked.append(result)
+        if not result.ok:
+            report.corrupted.append(backup_path)
+            error = CorruptedBackupError(str(backup_path))
+            self.logger.error(error.message, {
+                'bad_member': result.bad_member,
+                'error': result.error
+            })
+
+    def get_corrupted_backups(self) -> List[Path]:
+        """النسخ التي وُجدت تالفة في آخر فحص ولم تتغير بعده"""
+        corrupted = []
+        cache = self._load_cache()
+
+        for info in self.repository.get_backups_info():
+            cached = cache.get(info.name)
+            if cached is not None and not cached.ok and cached.matches(info.size, info.mtime):
+                corrupted.append(info.path)
+
+        return corrupted
+
+    def _select_archives(self,
+                         archives: Dict[Path, tuple],
+                         cache: Dict[str, ArchiveVerification],
+                         sample_percent: float,
+                         force: bool) -> List[Path]:
+        """اختيار الأرشيفات المطلوب فحصها في هذه الدورة"""
+        if force:
+            return list(archives)
+
+        stale = [path for path, (size, mtime) in archives.items()
+                 if path.name not in cache or not cache[path.name].matches(size, mtime)]
+
+        if sample_percent >= 100:
+            return stale
+
+        sample_size = math.ceil(len(archives) * max(sample_percent, 0) / 100)
+        sample = random.sample(list(archives), min(sample_size, len(archives)))
+        return list(dict.fromkeys(stale + sample))
+
+    def _build_result(self, backup_path: Path, size: int, mtime: float,
+                      raw: Dict[str, Any]) -> ArchiveVerification:
+        """تحويل نتيجة العامل إلى كائن نتيجة"""
+        return ArchiveVerification(
+            name=backup_path.name,
+            size=size,
+            mtime=mtime,
+            checked_at=time.time(),
+            **raw
+        )
+
+    def _load_cache(self) -> Dict[str, ArchiveVerification]:
+        """تحميل نتائج الفحص السابقة"""
+        try:
+            cache_mtime = self.cache_path.stat().st_mtime_ns
+        except OSError:
+            cache_mtime = None
+
+        # إعادة التحميل إذا كتب فاحص آخر نتائج جديدة
+        if self._cache is not None and cache_mtime == self._cache_mtime:
+            return self._cache
+
+        self._cache = {}
+        self._cache_mtime = cache_mtime
+        try:
+            if cache_mtime is not None:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                for name, entry in data.items():
+                    self._cache[name] = ArchiveVerification(**entry)
+        except Exception as e:
+            self.logger.warning(f"فشل في قراءة ذاكرة الفحص المؤقتة: {e}")
+            self._cache = {}
+
+        return self._cache
+
+    def _store_results(self, results: List[ArchiveVerification]) -> None:
+        """حفظ نتائج الفحص مع حذف الأرشيفات التي لم تعد موجودة"""
+        cache = self._load_cache()
+        for result in results:
+            cache[result.name] = result
+
+        existing = {path.name for path in self.repository.get_backups_list()}
+        for name in list(cache):
+            if name not in existing:
+                del cache[name]
+
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({name: asdict(entry) for name, entry in cache.items()},
+                          f, indent=2, ensure_ascii=False)
+            self._cache_mtime = self.cache_path.stat().st_mtime_ns
+        except Exception as e:
+            self.logger.warning(f"فشل في حفظ ذاكرة الفحص المؤقتة: {e}")
@@ -0,0 +1,45 @@
+"""
+رمز الإلغاء والإيقاف المؤقت
+مسؤولية واحدة: إبلاغ العمليات الطويلة بطلبات الإلغاء والإيقاف المؤقت بين أجزاء الملف الواحد
+"""
+import threading
+
+
+class CancellationToken:
+    """رمز إلغاء وإيقاف مؤقت - يُمرر مباشرة كـ is_running_check
+
+    الاستدعاء يحجب طالما العملية متوقفة مؤقتاً، فتبقى الملفات المفتوحة
+    وموضع القراءة كما هي ويستأنف العمل من منتصف الملف.
+    """
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._resumed = threading.Event()
+        self._resumed.set()
+
+    def __call__(self) -> bool:
+        """انتظار الاستئناف إن كانت العملية متوقفة ثم إرجاع True إذا لم تُلغَ"""
+        self._resumed.wait()
+        return not self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """إلغاء العملية - يوقظ العملية المتوقفة مؤقتاً حتى تخرج فوراً"""
+        self._cancelled.set()
+        self._resumed.set()
+
+    def pause(self) -> None:
+        """إيقاف مؤقت عند نقطة الفحص التالية"""
+        if not self._cancelled.is_set():
+            self._resumed.clear()
+
+    def resume(self) -> None:
+        """استئناف العملية المتوقفة"""
+        self._resumed.set()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def is_paused(self) -> bool:
+        return not self._resumed.is_set()
@@ -0,0 +1,163 @@
+"""
+معاينة النسخة التالية
+مسؤولية واحدة: فحص المجلدات ومقارنتها بسجل آخر نسخة دون كتابة شيء، وبث ما سيُنسخ أولاً بأول
+"""
+import heapq
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from core.backup_repository import BackupRepository
+from core.file_scanner import ExclusionMatcher, FileScanner
+from core.run_metrics import MetricsStore
+from core.scan_cache import ScanIndex, store_scan_index
+from core.strategies import IncrementalBackupStrategy
+
+# عدد أكبر الملفات الجديدة أو المعدلة المعروضة
+DRY_RUN_LARGEST_FILES = 20
+# أقل فاصل بين تحديثين متتاليين للمعاينة الجارية
+DRY_RUN_UPDATE_INTERVAL = 0.2
+# عدد التشغيلات الناجحة الأخيرة التي تُحسب منها نسبة الضغط المتوقعة
+COMPRESSION_RATIO_RUNS = 10
+
+
+@dataclass(frozen=True)
+class DryRunFile:
+    """ملف سيدخل النسخة التالية - Value Object"""
+    path: str
+    size: int
+    is_new: bool
+
+
+@dataclass
+class DryRunReport:
+    """ما ستحتويه النسخة التالية - يُبث منه نسخ متتالية أثناء الفحص ثم النسخة النهائية"""
+    files_scanned: int = 0
+    files_excluded: int = 0
+    bytes_excluded: int = 0
+    new_files: int = 0
+    new_bytes: int = 0
+    changed_files: int = 0
+    changed_bytes: int = 0
+    largest: List[DryRunFile] = field(default_factory=list)
+    # حجم المضغوط إلى الأصل في التشغيلات الأخيرة - 1 إذا لم توجد تشغيلات سابقة
+    compression_ratio: float = 1.0
+    elapsed_seconds: float = 0.0
+    completed: bool = False
+
+    @property
+    def files_to_backup(self) -> int:
+        return self.new_files + self.changed_files
+
+    @property
+    def bytes_to_backup(self) -> int:
+        return self.new_bytes + self.changed_bytes
+
+    @property
+    def estimated_archive_bytes(self) -> int:
+        """حجم الأرشيف المتوقع - تقدير من نسبة الضغط السابقة، ولا يشمل السجل"""
+        return int(self.bytes_to_backup * self.compression_ratio)
+
+    def summary(self) -> str:
+        """ملخص نصي للمعاينة"""
+        mb = 1024 * 1024
+        state = "" if self.completed else " (جارٍ الفحص)"
+        if self.completed and self.files_to_backup == 0:
+            return f"لا توجد ملفات جديدة أو معدّلة - فُحص {self.files_scanned} ملف."
+        return (f"{self.files_to_backup} ملف للنسخ{state}: {self.new_files} جديد و{self.changed_files} معدل "
+                f"({self.bytes_to_backup / mb:.2f} ميجابايت، الأرشيف المتوقع "
+                f"{self.estimated_archive_bytes / mb:.2f} ميجابايت)\n"
+                f"فُحص {self.files_scanned} ملف واستُبعد {self.files_excluded} "
+                f"({self.bytes_excluded / mb:.2f} ميجابايت).")
+
+
+def estimate_compression_ratio(metrics_store: MetricsStore, runs: int = COMPRESSION_RATIO_RUNS) -> float:
+    """نسبة الضغط الإجمالية لآخر التشغيلات الناجحة التي نسخت بيانات"""
+    bytes_read = bytes_compressed = 0
+    for run in metrics_store.read_recent(limit=runs):
+        if run.get('status') == 'created' and run.get('bytes_read'):
+            bytes_read += run['bytes_read']
+            bytes_compressed += run.get('bytes_compressed', 0)
+    return bytes_compressed / bytes_read if bytes_read and bytes_compressed else 1.0
+
+
+class DryRunner:
+    """معاينة النسخة التالية لمستودع - نفس الفحص ونفس مرشح التغيير الذي يستخدمه النسخ
+
+    الفحص الكامل يُحفظ في ذاكرة الفحص فيستخدمه النسخ إذا بدأ بعده مباشرة.
+    """
+
+    def __init__(self,
+                 repository: BackupRepository = None,
+                 file_scanner: FileScanner = None,
+                 metrics_store: MetricsStore = None,
+                 largest_count: int = DRY_RUN_LARGEST_FILES,
+                 update_interval: float = DRY_RUN_UPDATE_INTERVAL):
+        self.repository = repository or BackupRepository()
+        self.file_scanner = file_scanner or FileScanner()
+        self.metrics_store = metrics_store or MetricsStore()
+        self.largest_count = largest_count
+        self.update_interval = update_interval
+
+    def run(self,
+            folders: List[Path],
+            exclusions: List[str],
+            update_callback: Callable[[DryRunReport], None] = None,
+            is_running_check: Callable[[], bool] = None) -> DryRunReport:
+        """فحص المجلدات وإرجاع التقرير النهائي - update_callback يستقبل نسخة مستقلة من التقرير الجاري"""
+        started = time.perf_counter()
+        old_manifest: Dict[str, Any] = self.repository.get_latest_backup_manifest()
+        change_filter = IncrementalBackupStrategy(old_manifest)
+        matcher = ExclusionMatcher(exclusions)
+        index = ScanIndex(folders)
+        report = DryRunReport(compression_ratio=estimate_compression_ratio(self.metrics_store))
+        # أصغر العناصر أولاً فيُستبدل الأصغر عند وصول ملف أكبر
+        largest: List[Tuple[int, str, bool]] = []
+        last_update = started
+
+        for directory in self.file_scanner.walk(folders, is_running_check):
+            index.add(directory)
+            directory_excluded = matcher.is_directory_excluded(directory.path)
+            for name, size, mtime in zip(directory.names, directory.sizes, directory.mtimes):
+                if directory_excluded or matcher.matches(name):
+                    report.files_excluded += 1
+                    report.bytes_excluded += size
+                    continue
+
+                report.files_scanned += 1
+                relative_path = directory.relative_path(name)
+                if not change_filter.needs_backup(relative_path, mtime):
+                    continue
+                is_new = relative_path not in old_manifest
+                if is_new:
+                    report.new_files += 1
+                    report.new_bytes += size
+                else:
+                    report.changed_files += 1
+                    report.changed_bytes += size
+                if len(largest) < self.largest_count:
+                    heapq.heappush(largest, (size, relative_path, is_new))
+                elif size > largest[0][0]:
+                    heapq.heapreplace(largest, (size, relative_path, is_new))
+
+            now = time.perf_counter()
+            if update_callback is not None and now - last_update >= self.update_interval:
+                last_update = now
+                update_callback(self._snapshot(report, largest, now - started))
+
+        store_scan_index(self.repository.backup_dir, index)
+        report.completed = True
+        report = self._snapshot(report, largest, time.perf_counter() - started)
+        if update_callback is not None:
+            update_callback(report)
+        return report
+
+    @staticmethod
+    def _snapshot(report: DryRunReport, largest: List[Tuple[int, str, bool]], elapsed: float) -> DryRunReport:
+        """نسخة من التقرير يمكن إرسالها إلى خيط آخر بينما يستمر الفحص"""
+        return replace(
+            report,
+            largest=[DryRunFile(path, size, is_new) for size, path, is_new in sorted(largest, reverse=True)],
+            elapsed_seconds=round(elapsed, 3)
+        )
@@ -5,7 +5,6 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, Callable, List
 from pathlib import Path
-import time
 
 from core.exceptions import (
     AlHirzException, ErrorSeverity, ErrorCategory,
@@ -29,37 +28,6 @@ class IRecoveryStrategy(ABC):
         pass
 
 
-class RetryRecoveryStrategy(IRecoveryStrategy):
-    """استراتيجية إعادة المحاولة"""
-    
-    def __init__(self, max_retries: int = 3, delay_seconds: float = 1.0):
-        self.max_retries = max_retries
-        self.delay_seconds = delay_seconds
-    
-    def can_recover(self, exception: AlHirzException) -> bool:
-        """فحص إمكانية إعادة المحاولة"""
-        # يمكن إعادة المحاولة للأخطاء القابلة للاسترداد وليست حرجة
-        return (exception.recoverable and 
-                exception.severity != ErrorSeverity.CRITICAL and
-                exception.category in [ErrorCategory.FILE_SYSTEM, ErrorCategory.NETWORK])
-    
-    def recover(self, exception: AlHirzException, context: Dict[str, Any]) -> bool:
-        """محاولة الاسترداد بإعادة المحاولة"""
-        operation = context.get('operation')
-        if not operation or not callable(operation):
-            return False
-        
-        for attempt in range(self.max_retries):
-            try:
-                time.sleep(self.delay_seconds * (attempt + 1))  # تأخير متزايد
-                operation()
-                return True
-            except Exception:
-                continue
-        
-        return False
-
-
 class FallbackRecoveryStrategy(IRecoveryStrategy):
     """استراتيجية البديل"""
     
@@ -92,7 +60,6 @@ class ErrorHandler:
     
     def _setup_default_strategies(self) -> None:
         """إعداد استراتيجيات الاسترداد الافتراضية"""
-        self.recovery_strategies.append(RetryRecoveryStrategy())
         self.recovery_strategies.append(FallbackRecoveryStrategy())
     
     def add_recovery_strategy(self, strategy: IRecoveryStrategy) -> None:
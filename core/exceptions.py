@@ -177,6 +177,19 @@ class BackupInterruptedError(BackupException):
         )
 
 
+class RepositoryLockedError(BackupException):
+    """مستودع النسخ مقفل من عملية أخرى"""
+    
+    def __init__(self, backup_path: str, timeout: float):
+        super().__init__(
+            message=f"مستودع النسخ مشغول بعملية أخرى ولم يتحرر خلال {timeout:g} ثانية: {backup_path}",
+            backup_path=backup_path,
+            severity=ErrorSeverity.MEDIUM,
+            recoverable=True
+        )
+        self.context['timeout'] = timeout
+
+
 class RestoreConflictError(RestoreException):
     """تعارض في عملية الاسترداد"""
     
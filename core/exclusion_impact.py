@@ -0,0 +1,191 @@
+"""
+أثر قواعد الاستبعاد
+مسؤولية واحدة: حساب ما يستبعده كل نمط من آخر فحص محفوظ، واقتراح المجلدات الكبيرة القابلة لإعادة الإنشاء
+"""
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from core.file_scanner import ExclusionMatcher
+from core.scan_cache import ScanIndex
+
+# أسماء مجلدات يعيد إنشاءها مدير حزم أو أداة بناء، فلا حاجة لنسخها
+REGENERABLE_DIRECTORY_NAMES = {
+    "node_modules": "حزم npm",
+    "bower_components": "حزم bower",
+    ".venv": "بيئة بايثون",
+    "venv": "بيئة بايثون",
+    "site-packages": "حزم بايثون",
+    "__pycache__": "ملفات بايثون المترجمة",
+    ".tox": "بيئات tox",
+    ".mypy_cache": "ذاكرة مؤقتة",
+    ".pytest_cache": "ذاكرة مؤقتة",
+    ".cache": "ذاكرة مؤقتة",
+    "Cache": "ذاكرة مؤقتة",
+    "cache": "ذاكرة مؤقتة",
+    ".gradle": "ذاكرة Gradle",
+    ".m2": "مستودع Maven",
+    ".npm": "ذاكرة npm",
+    ".yarn": "ذاكرة Yarn",
+    ".cargo": "ذاكرة Cargo",
+    ".next": "مخرجات البناء",
+    "build": "مخرجات البناء",
+    "dist": "مخرجات البناء",
+    "target": "مخرجات البناء",
+}
+# ملفات تعلن أن المجلد الذي يحتويها قابل لإعادة الإنشاء
+REGENERABLE_DIRECTORY_MARKERS = {
+    "pyvenv.cfg": "بيئة بايثون",
+    "CACHEDIR.TAG": "ذاكرة مؤقتة",
+}
+# أقل حجم لمجلد يُقترح استبعاده
+SUGGESTION_MIN_BYTES = 10 * 1024 * 1024
+SUGGESTION_LIMIT = 10
+
+
+@dataclass(frozen=True)
+class PatternImpact:
+    """ما يستبعده نمط واحد لو كان وحده - الملف الذي يطابق نمطين يُحسب في كليهما"""
+    pattern: str
+    files: int
+    bytes: int
+
+
+@dataclass(frozen=True)
+class DirectorySuggestion:
+    """مجلد كبير غير مستبعد يمكن إعادة إنشائه - pattern هو اسمه كنمط استبعاد"""
+    path: str
+    pattern: str
+    reason: str
+    files: int
+    bytes: int
+
+
+@dataclass
+class ExclusionImpactReport:
+    """أثر قواعد الاستبعاد على آخر فحص محفوظ"""
+    scanned_at: float
+    total_files: int
+    total_bytes: int
+    excluded_files: int = 0
+    excluded_bytes: int = 0
+    patterns: List[PatternImpact] = field(default_factory=list)
+    suggestions: List[DirectorySuggestion] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """ملخص نصي للأثر"""
+        mb = 1024 * 1024
+        return (f"القواعد تستبعد {self.excluded_files} من {self.total_files} ملف "
+                f"({self.excluded_bytes / mb:.1f} من {self.total_bytes / mb:.1f} ميجابايت).")
+
+
+class ExclusionImpactAnalyzer:
+    """تحليل أثر الاستبعاد على فحص واحد - نتيجة كل نمط تُحفظ، فتعديل نمط لا يعيد حساب البقية
+
+    أعداد أسماء الملفات تُجمع مرة واحدة، فيُطابق النمط مع كل اسم مختلف مرة واحدة
+    بدل كل ملف، ولا يُمر على ملفات المجلدات إلا في المجلدات التي يستبعدها النمط.
+    """
+
+    def __init__(self, index: ScanIndex):
+        self.index = index
+        self._name_totals: Optional[Dict[str, Tuple[int, int]]] = None
+        self._impacts: Dict[Tuple[str, ...], Tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def analyze(self, exclusions: List[str], suggestion_limit: int = SUGGESTION_LIMIT) -> ExclusionImpactReport:
+        """أثر كل نمط وأثرها مجتمعة ومقترحات الاستبعاد"""
+        with self._lock:
+            report = ExclusionImpactReport(self.index.scanned_at, self.index.file_count, self.index.total_bytes)
+            for pattern in exclusions:
+                files, size = self._impact((pattern,))
+                report.patterns.append(PatternImpact(pattern, files, size))
+            report.excluded_files, report.excluded_bytes = self._impact(tuple(exclusions))
+            report.suggestions = self._suggestions(exclusions, suggestion_limit)
+            return report
+
+    def _impact(self, patterns: Tuple[str, ...]) -> Tuple[int, int]:
+        cached = self._impacts.get(patterns)
+        if cached is not None:
+            return cached
+
+        name_totals = self._names()
+        matcher = ExclusionMatcher(list(patterns))
+        matched_names: Set[str] = {name for name in name_totals if matcher.matches(name)}
+        files = sum(name_totals[name][0] for name in matched_names)
+        size = sum(name_totals[name][1] for name in matched_names)
+
+        # ملفات المجلدات المستبعدة التي لم تُحسب باسمها
+        for directory in self.index.directories:
+            if not matcher.is_directory_excluded(directory.path):
+                continue
+            for name, file_size in zip(directory.names, directory.sizes):
+                if name not in matched_names:
+                    files += 1
+                    size += file_size
+
+        self._impacts[patterns] = (files, size)
+        return files, size
+
+    def _names(self) -> Dict[str, Tuple[int, int]]:
+        """عدد الملفات ومجموع أحجامها لكل اسم ملف في الفحص"""
+        if self._name_totals is None:
+            totals: Dict[str, List[int]] = {}
+            for directory in self.index.directories:
+                for name, size in zip(directory.names, directory.sizes):
+                    entry = totals.get(name)
+                    if entry is None:
+                        totals[name] = [1, size]
+                    else:
+                        entry[0] += 1
+                        entry[1] += size
+            self._name_totals = {name: (entry[0], entry[1]) for name, entry in totals.items()}
+        return self._name_totals
+
+    def _suggestions(self, exclusions: List[str], limit: int) -> List[DirectorySuggestion]:
+        """أكبر المجلدات القابلة لإعادة الإنشاء التي لا يستبعدها أي نمط حالياً
+
+        الحجم هو مجموع ملفات المجلد وما تحته في المجلدات غير المستبعدة؛ الملفات التي
+        تستبعدها الأنماط باسمها داخله تبقى محسوبة فيه.
+        """
+        matcher = ExclusionMatcher(exclusions)
+        candidates: Dict[str, str] = {}
+        for directory in self.index.directories:
+            if not directory.path or matcher.is_directory_excluded(directory.path):
+                continue
+            name = os.path.basename(directory.path)
+            reason = REGENERABLE_DIRECTORY_NAMES.get(name)
+            if reason is None:
+                reason = next((REGENERABLE_DIRECTORY_MARKERS[marker] for marker in directory.names
+                               if marker in REGENERABLE_DIRECTORY_MARKERS), None)
+            if reason is not None:
+                candidates[directory.path] = reason
+        if not candidates:
+            return []
+
+        totals: Dict[str, List[int]] = {path: [0, 0] for path in candidates}
+        for directory in self.index.directories:
+            if not directory.names or matcher.is_directory_excluded(directory.path):
+                continue
+            size = sum(directory.sizes)
+            path = directory.path
+            while path:
+                entry = totals.get(path)
+                if entry is not None:
+                    entry[0] += len(directory)
+                    entry[1] += size
+                path = path.rpartition(os.sep)[0]
+
+        chosen: List[DirectorySuggestion] = []
+        for path, (files, size) in sorted(totals.items(), key=lambda item: -item[1][1]):
+            if size < SUGGESTION_MIN_BYTES or len(chosen) >= limit:
+                break
+            # مجلد داخل مجلد مقترح (أو العكس) لا يُقترح مرتين
+            if any(_is_nested(path, suggestion.path) for suggestion in chosen):
+                continue
+            chosen.append(DirectorySuggestion(path, os.path.basename(path), candidates[path], files, size))
+        return chosen
+
+
+def _is_nested(path: str, other: str) -> bool:
+    return path.startswith(other + os.sep) or other.startswith(path + os.sep)
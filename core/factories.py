@@ -1,11 +1,18 @@
 from enum import Enum
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple, TYPE_CHECKING
 
 from interfaces.backup_interfaces import IBackupStrategy, IRestoreStrategy, IBackupOrchestrator
-from core.strategies import IncrementalBackupStrategy, SmartRestoreStrategy
+from core.strategies import DEFAULT_CODEC, IncrementalBackupStrategy, SmartRestoreStrategy
 from core.backup_manager import BackupOrchestrator
-from core.workers import BackupWorker, RestoreWorker
+from core.async_engine import AsyncBackupOrchestrator
+from core.job_scheduler import BackupJob, JobScheduler
+from core.profiling import RunProfiler
+
+if TYPE_CHECKING:
+    from core.backup_profiles import BackupProfile
+    # عمال Qt تُستورد عند الحاجة فقط حتى يبقى المركز قابلاً للاستخدام دون PyQt5
+    from ui.workers import BackupWorker, DryRunWorker, RestoreWorker, VerifyWorker
 
 
 class BackupType(Enum):
@@ -59,8 +66,10 @@ class WorkerFactory:
     def create_backup_worker(folders_to_backup: List[Path], 
                            backup_filepath: Path, 
                            exclusions: List[str],
-                           orchestrator: IBackupOrchestrator = None) -> BackupWorker:
+                           orchestrator: IBackupOrchestrator = None,
+                           profiler: RunProfiler = None) -> "BackupWorker":
         """إنشاء عامل النسخ الاحتياطي"""
+        from ui.workers import BackupWorker
         
         if orchestrator is None:
             orchestrator = BackupOrchestrator()
@@ -69,20 +78,46 @@ class WorkerFactory:
             folders_to_backup=folders_to_backup,
             backup_filepath=backup_filepath,
             exclusions=exclusions,
-            orchestrator=orchestrator
+            orchestrator=orchestrator,
+            profiler=profiler
+        )
+    
+    @staticmethod
+    def create_dry_run_worker(folders_to_backup: List[Path],
+                              exclusions: List[str],
+                              orchestrator: IBackupOrchestrator = None,
+                              profiler: RunProfiler = None) -> "DryRunWorker":
+        """إنشاء عامل معاينة النسخ"""
+        from ui.workers import DryRunWorker
+        
+        if orchestrator is None:
+            orchestrator = BackupOrchestrator()
+        
+        return DryRunWorker(
+            folders_to_backup=folders_to_backup,
+            exclusions=exclusions,
+            orchestrator=orchestrator,
+            profiler=profiler
         )
     
     @staticmethod
     def create_restore_worker(backup_to_restore: Path,
-                            orchestrator: IBackupOrchestrator = None) -> RestoreWorker:
-        """إنشاء عامل الاسترداد"""
+                            orchestrator: IBackupOrchestrator = None,
+                            profiler: RunProfiler = None,
+                            members: Optional[List[str]] = None,
+                            overwrite: bool = False) -> "RestoreWorker":
+        """إنشاء عامل الاسترداد - members لاسترداد ملفات ومجلدات محددة فقط"""
+        from ui.workers import RestoreWorker
         
         if orchestrator is None:
             orchestrator = BackupOrchestrator()
         
         return RestoreWorker(
             backup_to_restore=backup_to_restore,
-            orchestrator=orchestrator
+            orchestrator=orchestrator,
+            profiler=profiler,
+            members=members,
+            overwrite=overwrite
         )
 
 
@@ -97,6 +132,14 @@ class ServiceContainer:
         """إعداد الخدمات الافتراضية"""
         from core.file_scanner import FileScanner
         from core.backup_repository import BackupRepository
+        from core.backup_verifier import BackupVerifier
+        from core.search_index import SearchIndex
+        from core.resource_governor import create_settings_governor
+        from core.run_metrics import create_metrics_store
+        from core.tracing import create_trace_recorder
+        from core.profiling import create_run_profiler
+        from core.backup_profiles import BackupProfileStore
+        from utils.config_manager import ConfigurationManager
         from core.logging_system import LoggerFactory
         from core.error_handler import ErrorHandlerFactory
         
@@ -106,13 +149,36 @@ class ServiceContainer:
         
         self.register('logger', logger)
         self.register('error_handler', error_handler)
+        self.register('config_manager', ConfigurationManager(logger=logger))
+        self.register('resource_governor', create_settings_governor(self.get('config_manager')))
+        self.register('metrics_store', create_metrics_store(self.get('config_manager')))
+        self.register('trace_recorder', create_trace_recorder(self.get('config_manager')))
+        self.register('run_profiler', create_run_profiler(self.get('config_manager')))
+        self.register('profile_store', BackupProfileStore())
         self.register('file_scanner', FileScanner())
         self.register('backup_repository', BackupRepository())
-        self.register('backup_orchestrator', BackupOrchestrator(
+        self.register('search_index', SearchIndex(
+            repository=self.get('backup_repository'),
+            logger=self.get('logger')
+        ))
+        self.register('backup_verifier', BackupVerifier(
+            repository=self.get('backup_repository'),
+            logger=self.get('logger')
+        ))
+        self.register('backup_orchestrator', AsyncBackupOrchestrator(
             file_scanner=self.get('file_scanner'),
             repository=self.get('backup_repository'),
             logger=self.get('logger'),
-            error_handler=self.get('error_handler')
+            error_handler=self.get('error_handler'),
+            search_index=self.get('search_index'),
+            governor=self.get('resource_governor'),
+            metrics_store=self.get('metrics_store'),
+            trace_recorder=self.get('trace_recorder'),
+            profiler=self.get('run_profiler')
+        ))
+        self.register('job_scheduler', JobScheduler(
+            job_runner=self.run_backup_job,
+            logger=self.get('logger')
         ))
     
     def register(self, name: str, service: Any) -> None:
@@ -127,14 +193,119 @@ class ServiceContainer:
     
     def create_backup_worker(self, folders_to_backup: List[Path], 
                            backup_filepath: Path, 
-                           exclusions: List[str]) -> BackupWorker:
+                           exclusions: List[str]) -> "BackupWorker":
         """إنشاء عامل النسخ باستخدام الاعتماديات المحقونة"""
         orchestrator = self.get('backup_orchestrator')
         return WorkerFactory.create_backup_worker(
-            folders_to_backup, backup_filepath, exclusions, orchestrator
+            folders_to_backup, backup_filepath, exclusions, orchestrator,
+            self.get('run_profiler')
         )
     
-    def create_restore_worker(self, backup_to_restore: Path) -> RestoreWorker:
+    def create_dry_run_worker(self, folders_to_backup: List[Path], exclusions: List[str]) -> "DryRunWorker":
+        """إنشاء عامل المعاينة بنفس منسق النسخ حتى يجد النسخ فحصها في ذاكرة مستودعه"""
+        orchestrator = self.get('backup_orchestrator')
+        return WorkerFactory.create_dry_run_worker(folders_to_backup, exclusions, orchestrator,
+                                                   self.get('run_profiler'))
+    
+    def create_restore_worker(self,
+                              backup_to_restore: Path,
+                              members: Optional[List[str]] = None,
+                              overwrite: bool = False) -> "RestoreWorker":
         """إنشاء عامل الاسترداد باستخدام الاعتماديات المحقونة"""
         orchestrator = self.get('backup_orchestrator')
-        return WorkerFactory.create_restore_worker(backup_to_restore, orchestrator)
\ No newline at end of file
+        return WorkerFactory.create_restore_worker(backup_to_restore, orchestrator,
+                                                   self.get('run_profiler'), members, overwrite)
+    
+    def create_verify_worker(self, sample_percent: float = 100.0) -> "VerifyWorker":
+        """إنشاء عامل فحص السلامة باستخدام الاعتماديات المحقونة"""
+        from ui.workers import VerifyWorker
+        
+        return VerifyWorker(
+            verifier=self.get('backup_verifier'),
+            sample_percent=sample_percent,
+            logger=self.get('logger'),
+            error_handler=self.get('error_handler'),
+            profiler=self.get('run_profiler')
+        )
+    
+    def create_backup_job(self,
+                          folders_to_backup: List[Path],
+                          exclusions: List[str],
+                          name: str,
+                          priority: int = 0) -> Tuple[BackupJob, "BackupWorker"]:
+        """مهمة مجدولة ينفذها عامل نسخ على المستودع الرئيسي - تُربط إشارات العامل قبل جدولتها
+
+        المجدول يقرر متى تبدأ المهمة حسب أولويتها وانشغال أجهزتها، ثم يشغل العامل في خيط المهمة.
+        """
+        repository = self.get('backup_repository')
+        worker = self.create_backup_worker(folders_to_backup, repository.new_backup_path(), exclusions)
+        job = BackupJob(
+            name=name,
+            folders=list(folders_to_backup),
+            destination=repository.backup_dir,
+            exclusions=list(exclusions),
+            priority=priority,
+            runner=worker.run_job,
+            cancel_callback=worker.stop
+        )
+        return job, worker
+    
+    def submit_backup_job(self, job: BackupJob) -> BackupJob:
+        """جدولة مهمة نسخ لتعمل بالتوازي مع مهام الأجهزة الأخرى"""
+        return self.get('job_scheduler').submit(job)
+    
+    def submit_profile_backup(self, 
+                              profile: "BackupProfile",
+                              progress_callback: Callable[[int, str], None] = None,
+                              completion_callback: Callable[[BackupJob], None] = None) -> BackupJob:
+        """جدولة نسخة لملف تعريف على مستودعه الخاص ثم تطبيق سياسة احتفاظه"""
+        job = self.create_profile_job(profile)
+        job.progress_callback = progress_callback
+        job.completion_callback = completion_callback
+        return self.submit_backup_job(job)
+    
+    @staticmethod
+    def create_profile_job(profile: "BackupProfile") -> BackupJob:
+        """مهمة نسخ ملف تعريف غير مجدولة بعد - ينفذها منفذ المجدول الافتراضي run_backup_job"""
+        return BackupJob(
+            name=profile.name,
+            folders=[folder for folder in profile.folder_paths if folder.is_dir()],
+            destination=profile.backup_dir,
+            exclusions=list(profile.exclusions),
+            codec=profile.codec,
+            compression_level=profile.compression_level,
+            retention=profile.retention_policy
+        )
+    
+    def run_backup_job(self, job: BackupJob) -> Optional[str]:
+        """تنفيذ مهمة نسخ على مستودع وجهتها وإرجاع مسار النسخة الناتجة (None إذا لم تتغير الملفات)"""
+        from core.backup_repository import BackupRepository
+        
+        repository = BackupRepository(job.destination)
+        default_compression = job.codec == DEFAULT_CODEC and job.compression_level is None
+        if repository.backup_dir == self.get('backup_repository').backup_dir and default_compression:
+            repository = self.get('backup_repository')
+            orchestrator = self.get('backup_orchestrator')
+        else:
+            orchestrator = AsyncBackupOrchestrator(
+                file_scanner=self.get('file_scanner'),
+                repository=repository,
+                logger=self.get('logger'),
+                error_handler=self.get('error_handler'),
+                governor=self.get('resource_governor'),
+                metrics_store=self.get('metrics_store'),
+                trace_recorder=self.get('trace_recorder'),
+                profiler=self.get('run_profiler'),
+                codec=job.codec,
+                compression_level=job.compression_level
+            )
+        
+        backup_filepath = repository.new_backup_path()
+        orchestrator.create_incremental_backup(
+            job.folders, backup_filepath, job.exclusions,
+            job.report_progress, job.is_running
+        )
+        if job.retention is not None and job.is_running():
+            report = orchestrator.apply_retention_policy(job.retention)
+            self.get('logger').info(f"{job.name}: {report.summary()}")
+        return str(backup_filepath) if backup_filepath.exists() else None
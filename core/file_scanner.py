@@ -1,31 +1,133 @@
 import fnmatch
+import os
+import re
+from array import array
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, Iterator, List
 
+from core.exceptions import BackupInterruptedError
+from core.tracing import trace_span
 from interfaces.backup_interfaces import IFileScanner
 from utils.config import HOME_DIR
 
+# عدد العناصر بين كل فحصين للإلغاء داخل المجلد الواحد الكبير
+WALK_CHECK_INTERVAL = 1000
+
+
+class ExclusionMatcher:
+    """مطابقة قواعد الاستبعاد بتعبير منتظم واحد - نفس نتيجة FileScanner.is_excluded
+
+    حالة كل مجلد تُحسب مرة واحدة، فلا يُطابق إلا اسم الملف لكل ملف.
+    """
+
+    def __init__(self, exclusions: List[str]):
+        patterns = [fnmatch.translate(os.path.normcase(pattern)) for pattern in exclusions]
+        self._regex = re.compile("|".join(f"(?:{pattern})" for pattern in patterns)) if patterns else None
+        self._directories: Dict[str, bool] = {'': False}
+
+    def matches(self, name: str) -> bool:
+        """تطابق جزء واحد من المسار (اسم مجلد أو ملف) مع أي قاعدة"""
+        return self._regex is not None and self._regex.match(os.path.normcase(name)) is not None
+
+    def is_directory_excluded(self, relative_dir: str) -> bool:
+        """المجلد مستبعد إذا طابق اسمه أو اسم أي مجلد أعلى منه قاعدة ما"""
+        excluded = self._directories.get(relative_dir)
+        if excluded is None:
+            parent, _, name = relative_dir.rpartition(os.sep)
+            excluded = self.is_directory_excluded(parent) or self.matches(name)
+            self._directories[relative_dir] = excluded
+        return excluded
+
+
+class ScannedDirectory:
+    """ملفات مجلد واحد كما وُجدت في الفحص - المسار نسبة إلى المجلد الرئيسي ('' للمجلد الرئيسي نفسه)"""
+    __slots__ = ('path', 'names', 'sizes', 'mtimes')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.names: List[str] = []
+        self.sizes = array('q')
+        self.mtimes = array('d')
+
+    def relative_path(self, name: str) -> str:
+        return os.path.join(self.path, name) if self.path else name
+
+    def __len__(self) -> int:
+        return len(self.names)
+
 
 class FileScanner(IFileScanner):
     """مسؤولية واحدة: فحص وتصفية الملفات حسب قواعد الاستبعاد"""
     
     def scan_files(self, paths: List[Path], exclusions: List[str]) -> List[Path]:
         """فحص المسارات وإرجاع قائمة الملفات المفلترة"""
-        files = []
-        
+        return list(self.iter_files(paths, exclusions))
+    
+    def iter_files(self, paths: List[Path], exclusions: List[str]) -> Iterator[Path]:
+        """فحص المسارات وإنتاج الملفات المفلترة أولاً بأول حتى تبدأ المراحل التالية قبل انتهاء الفحص"""
         for folder_path in paths:
             if not folder_path.is_dir():
                 continue
-                
-            for file in folder_path.rglob('*'):
-                if not file.is_file():
-                    continue
-                    
-                if not self.is_excluded(file, exclusions):
-                    files.append(file)
-        
-        return files
+            
+            # مقطع لكل مجلد جذر يكشف المجلدات البطيئة مثل أقراص الشبكة
+            with trace_span("scan_root", {'folder': str(folder_path)}):
+                for file in folder_path.rglob('*'):
+                    if not file.is_file():
+                        continue
+                        
+                    if not self.is_excluded(file, exclusions):
+                        yield file
     
+    def walk(self, paths: List[Path], is_running_check: Callable[[], bool] = None) -> Iterator[ScannedDirectory]:
+        """كل ملفات المسارات قبل تطبيق الاستبعاد مجمعة بالمجلد مع أحجامها وتواريخها
+
+        نفس ملفات iter_files: المجلدات الرمزية لا يُدخل إليها والملفات الرمزية تُتبع، وما
+        خارج المجلد الرئيسي يُتجاهل لأنه مستبعد دائماً. الإلغاء يُفحص بين كل مجلد وآخر.
+        """
+        for folder_path in paths:
+            if not folder_path.is_dir():
+                continue
+            try:
+                relative_root = str(folder_path.relative_to(HOME_DIR))
+            except ValueError:
+                continue
+
+            with trace_span("scan_root", {'folder': str(folder_path)}):
+                pending = [(str(folder_path), '' if relative_root == '.' else relative_root)]
+                while pending:
+                    directory_path, relative_dir = pending.pop()
+                    if is_running_check is not None and not is_running_check():
+                        raise BackupInterruptedError()
+                    directory = self._scan_directory(directory_path, relative_dir, pending, is_running_check)
+                    if directory is not None:
+                        yield directory
+
+    @staticmethod
+    def _scan_directory(directory_path: str,
+                        relative_dir: str,
+                        pending: list,
+                        is_running_check: Callable[[], bool] = None) -> "ScannedDirectory":
+        directory = ScannedDirectory(relative_dir)
+        try:
+            with os.scandir(directory_path) as entries:
+                for count, entry in enumerate(entries, 1):
+                    if is_running_check is not None and count % WALK_CHECK_INTERVAL == 0 and not is_running_check():
+                        raise BackupInterruptedError()
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append((entry.path, os.path.join(relative_dir, entry.name)))
+                        elif entry.is_file():
+                            stat_result = entry.stat()
+                            directory.names.append(entry.name)
+                            directory.sizes.append(stat_result.st_size)
+                            directory.mtimes.append(stat_result.st_mtime)
+                    except OSError:
+                        # الملف الذي حُذف أو تعذرت قراءة بياناته أثناء الفحص لا يدخل القائمة
+                        continue
+        except OSError:
+            return None
+        return directory
+
     def is_excluded(self, file_path: Path, exclusions: List[str]) -> bool:
         """فحص ما إذا كان الملف مستبعداً حسب قواعد الاستبعاد"""
         try:
@@ -0,0 +1,236 @@
+"""
+مجدول مهام النسخ الاحتياطي
+مسؤولية واحدة: تشغيل عدة مهام نسخ بالتوازي مع أولويات وحدود تزامن لكل جهاز تخزين
+"""
+import itertools
+import os
+import threading
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import List, Dict, Set, Callable, Optional
+
+from core.logging_system import ILogger, LoggerFactory
+from core.retention import RetentionPolicy
+from core.strategies import DEFAULT_CODEC
+
+
+class JobState(Enum):
+    """حالات مهمة النسخ"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass
+class BackupJob:
+    """مهمة نسخ واحدة مع تقدمها وإلغائها المستقلين"""
+    name: str
+    folders: List[Path]
+    destination: Path
+    exclusions: List[str] = field(default_factory=list)
+    priority: int = 0
+    codec: str = DEFAULT_CODEC
+    compression_level: Optional[int] = None
+    retention: Optional[RetentionPolicy] = None   # تُطبق على الوجهة بعد النسخ
+    progress_callback: Optional[Callable[[int, str], None]] = None
+    completion_callback: Optional[Callable[["BackupJob"], None]] = None
+    # منفذ خاص بالمهمة (مثل عامل الواجهة) بدل منفذ المجدول، ويُستدعى cancel_callback عند إلغائها
+    runner: Optional[Callable[["BackupJob"], Optional[str]]] = None
+    cancel_callback: Optional[Callable[[], None]] = None
+
+    job_id: int = 0
+    state: JobState = JobState.PENDING
+    progress: int = 0
+    status: str = ""
+    result: Optional[str] = None
+    error: Optional[Exception] = None
+    _cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    _done_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def cancel(self) -> None:
+        """طلب إلغاء المهمة"""
+        self._cancel_event.set()
+        if self.cancel_callback:
+            self.cancel_callback()
+
+    def is_running(self) -> bool:
+        """فحص استمرار المهمة - يُمرر كـ is_running_check للمنسق"""
+        return not self._cancel_event.is_set()
+
+    def report_progress(self, progress: int, status: str) -> None:
+        """تحديث تقدم المهمة وإبلاغ المستمع إن وجد"""
+        self.progress = progress
+        self.status = status
+        if self.progress_callback:
+            self.progress_callback(progress, status)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """انتظار انتهاء المهمة"""
+        return self._done_event.wait(timeout)
+
+    @property
+    def is_finished(self) -> bool:
+        return self._done_event.is_set()
+
+
+def device_of(path: Path) -> int:
+    """معرف جهاز التخزين لمسار (أو لأقرب مجلد أب موجود)"""
+    current = Path(os.path.abspath(path))
+    while True:
+        try:
+            return os.stat(current).st_dev
+        except OSError:
+            if current.parent == current:
+                return -1
+            current = current.parent
+
+
+class JobScheduler:
+    """مجدول المهام - طابور أولويات مع تسلسل المهام التي تشترك في جهاز تخزين
+
+    المهام التي تقرأ أو تكتب على نفس القرص تعمل واحدة تلو الأخرى، والمهام
+    على أقراص مختلفة تعمل بالتوازي.
+    """
+
+    def __init__(self,
+                 job_runner: Callable[[BackupJob], Optional[str]],
+                 max_parallel_jobs: int = 4,
+                 logger: ILogger = None):
+        self.job_runner = job_runner
+        self.max_parallel_jobs = max_parallel_jobs
+        self.logger = logger or LoggerFactory.create_default_logger()
+        self._pending: List[BackupJob] = []
+        self._running: Dict[int, Set[int]] = {}
+        self._jobs: Dict[int, BackupJob] = {}
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._shutdown = False
+
+    def submit(self, job: BackupJob) -> BackupJob:
+        """إضافة مهمة إلى الطابور"""
+        with self._condition:
+            if self._shutdown:
+                raise RuntimeError("المجدول متوقف ولا يقبل مهام جديدة")
+
+            job.job_id = next(self._ids)
+            job.state = JobState.PENDING
+            self._jobs[job.job_id] = job
+            self._pending.append(job)
+            self.logger.info(f"تمت جدولة المهمة: {job.name}", {
+                'job_id': job.job_id,
+                'priority': job.priority
+            })
+            self._dispatch()
+
+        return job
+
+    def cancel(self, job_id: int) -> bool:
+        """إلغاء مهمة منتظرة أو جارية"""
+        cancelled_pending = False
+        with self._condition:
+            job = self._jobs.get(job_id)
+            if job is None or job.is_finished:
+                return False
+
+            if job in self._pending:
+                self._pending.remove(job)
+                self._finish(job, JobState.CANCELLED)
+                cancelled_pending = True
+
+        # خارج القفل لأن إلغاء العامل أو إشعار الانتهاء قد يستدعي المجدول من جديد
+        job.cancel()
+        if cancelled_pending:
+            self._notify(job)
+        return True
+
+    def get_jobs(self) -> List[BackupJob]:
+        """جميع المهام المعروفة للمجدول"""
+        with self._condition:
+            return list(self._jobs.values())
+
+    def wait_all(self, timeout: Optional[float] = None) -> bool:
+        """انتظار انتهاء جميع المهام المنتظرة والجارية"""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._running, timeout)
+
+    def shutdown(self, cancel_pending: bool = True, wait: bool = True, cancel_running: bool = False) -> None:
+        """إيقاف المجدول مع إلغاء المهام المنتظرة والجارية اختيارياً"""
+        with self._condition:
+            self._shutdown = True
+            cancelled = list(self._pending) if cancel_pending else []
+            for job in cancelled:
+                self._finish(job, JobState.CANCELLED)
+            if cancel_pending:
+                self._pending.clear()
+            running = [self._jobs[job_id] for job_id in self._running] if cancel_running else []
+
+        for job in cancelled + running:
+            job.cancel()
+        for job in cancelled:
+            self._notify(job)
+        if wait:
+            self.wait_all()
+
+    def _dispatch(self) -> None:
+        """تشغيل أعلى المهام أولوية التي أجهزتها غير مشغولة - يُستدعى مع حمل القفل"""
+        busy_devices = set().union(*self._running.values()) if self._running else set()
+
+        for job in sorted(self._pending, key=lambda j: (-j.priority, j.job_id)):
+            if len(self._running) >= self.max_parallel_jobs:
+                break
+
+            devices = self._devices_for(job)
+            if devices & busy_devices:
+                continue
+
+            self._pending.remove(job)
+            self._running[job.job_id] = devices
+            busy_devices |= devices
+            job.state = JobState.RUNNING
+
+            thread = threading.Thread(target=self._run_job, args=(job,),
+                                      name=f"backup-job-{job.job_id}", daemon=True)
+            thread.start()
+
+    def _run_job(self, job: BackupJob) -> None:
+        """تنفيذ المهمة في خيطها الخاص"""
+        self.logger.info(f"بدء المهمة: {job.name}", {'job_id': job.job_id})
+        state = JobState.COMPLETED
+
+        try:
+            job.result = (job.runner or self.job_runner)(job)
+            if not job.is_running():
+                state = JobState.CANCELLED
+        except Exception as e:
+            job.error = e
+            state = JobState.CANCELLED if not job.is_running() else JobState.FAILED
+            self.logger.error(f"فشلت المهمة {job.name}: {e}", {'job_id': job.job_id})
+
+        with self._condition:
+            self._running.pop(job.job_id, None)
+            self._finish(job, state)
+            if not self._shutdown:
+                self._dispatch()
+        self._notify(job)
+
+    def _finish(self, job: BackupJob, state: JobState) -> None:
+        """تسجيل انتهاء المهمة وإيقاظ المنتظرين - يُستدعى مع حمل القفل"""
+        job.state = state
+        job._done_event.set()
+        self._condition.notify_all()
+
+    def _notify(self, job: BackupJob) -> None:
+        """إبلاغ مستمع الانتهاء - دون حمل القفل حتى يستطيع جدولة مهمة جديدة أو الاستعلام عن المهام"""
+        if job.completion_callback:
+            try:
+                job.completion_callback(job)
+            except Exception as e:
+                self.logger.error(f"خطأ في callback انتهاء المهمة: {e}")
+
+    def _devices_for(self, job: BackupJob) -> Set[int]:
+        """أجهزة التخزين التي تقرأ منها المهمة أو تكتب عليها"""
+        return {device_of(path) for path in [*job.folders, job.destination]}
@@ -2,14 +2,20 @@
 نظام السجلات المتقدم للحِرز
 مسؤولية واحدة: إدارة وتسجيل الأحداث والأخطاء
 """
+import atexit
 import os
 import json
+import queue
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from core.tracing import active_tracer
 from utils.config import APP_DIR
 
 
@@ -56,6 +62,15 @@ class ILogger(ABC):
         pass
 
 
+_LEVEL_VALUES = {
+    LogLevel.DEBUG: 0,
+    LogLevel.INFO: 1,
+    LogLevel.WARNING: 2,
+    LogLevel.ERROR: 3,
+    LogLevel.CRITICAL: 4
+}
+
+
 class LogEntry:
     """كائن يمثل إدخال سجل واحد"""
     
@@ -85,76 +100,156 @@ class LogEntry:
         return f"[{timestamp_str}] {self.level.value}: {self.message}{context_str}"
 
 
-class FileLogger(ILogger):
-    """مسجل الملفات - مسؤولية واحدة: كتابة السجلات في ملف"""
-    
-    def __init__(self, 
-                 log_file_path: Path = None, 
-                 min_level: LogLevel = LogLevel.INFO,
-                 max_file_size_mb: int = 10,
-                 max_files: int = 5):
-        self.log_file_path = log_file_path or (APP_DIR / "logs" / "alhirz.log")
-        self.min_level = min_level
+class LogFileWriter:
+    """كاتب ملف السجل - خيط خلفي واحد لكل ملف يكتب الإدخالات على دفعات عبر مقبض مفتوح
+
+    المسجلون يضعون الإدخالات في طابور دون انتظار، والخيط يفرغ المخزن دورياً وفوراً
+    عند الأخطاء، ويدور الملف حسب الحجم المكتوب دون فحص الملف بعد كل رسالة. المخزن
+    يُفرغ عند خروج البرنامج حتى بعد استثناء غير معالج.
+    """
+    
+    # أقصى مدة تبقى فيها الإدخالات في المخزن قبل إفراغه إلى القرص
+    FLUSH_INTERVAL_SECONDS = 0.5
+    # أقصى عدد إدخالات يُكتب في دفعة واحدة
+    MAX_BATCH_SIZE = 1000
+    # أقصى مدة لانتظار إفراغ الطابور عند الإغلاق
+    CLOSE_TIMEOUT_SECONDS = 2.0
+    
+    _writers: Dict[Path, "LogFileWriter"] = {}
+    _writers_lock = threading.Lock()
+    
+    def __init__(self, log_file_path: Path, max_file_size_mb: int = 10, max_files: int = 5):
+        self.log_file_path = log_file_path
         self.max_file_size_mb = max_file_size_mb
         self.max_files = max_files
-        
-        # إنشاء مجلد السجلات إذا لم يكن موجوداً
-        self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    def log(self, level: LogLevel, message: str, context: Optional[Dict[str, Any]] = None) -> None:
-        """تسجيل رسالة في الملف"""
-        if self._should_log(level):
-            entry = LogEntry(level, message, context)
-            self._write_to_file(entry)
-            self._rotate_logs_if_needed()
-    
-    def debug(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
-        self.log(LogLevel.DEBUG, message, context)
-    
-    def info(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
-        self.log(LogLevel.INFO, message, context)
-    
-    def warning(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
-        self.log(LogLevel.WARNING, message, context)
-    
-    def error(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
-        self.log(LogLevel.ERROR, message, context)
+        self._start_lock = threading.Lock()
+        self._reset()
+        atexit.register(self.close)
+    
+    @classmethod
+    def for_path(cls, log_file_path: Path, max_file_size_mb: int = 10, max_files: int = 5) -> "LogFileWriter":
+        """الكاتب المشترك لملف السجل - كاتب واحد لكل ملف حتى لا يتعارض التدوير"""
+        key = Path(log_file_path).absolute()
+        with cls._writers_lock:
+            writer = cls._writers.get(key)
+            if writer is None:
+                writer = cls._writers[key] = cls(key, max_file_size_mb, max_files)
+            return writer
+    
+    def write(self, entry: LogEntry) -> None:
+        """وضع الإدخال في الطابور دون انتظار الكتابة"""
+        if self._thread is None:
+            self._start()
+        self._queue.put(entry)
+    
+    def flush(self, timeout: float = CLOSE_TIMEOUT_SECONDS) -> bool:
+        """انتظار كتابة كل ما في الطابور إلى القرص"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self) -> None:
+        """إفراغ الطابور وإيقاف الخيط وإغلاق الملف"""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        thread.join(self.CLOSE_TIMEOUT_SECONDS)
+    
+    def _reset(self) -> None:
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._thread: Optional[threading.Thread] = None
+        self._file = None
+        self._file_size = 0
+    
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="alhirz-log-writer", daemon=True)
+                self._thread.start()
+    
+    def _run(self) -> None:
+        """حلقة الكتابة - تنتظر الإدخال التالي، أو موعد الإفراغ إذا كان في المخزن ما لم يُفرغ"""
+        dirty_since = None
+        while True:
+            timeout = None
+            if dirty_since is not None:
+                timeout = max(dirty_since + self.FLUSH_INTERVAL_SECONDS - time.monotonic(), 0)
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_file()
+                dirty_since = None
+                continue
+            
+            batch = [item]
+            while len(batch) < self.MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            urgent = False
+            waiters = []
+            stop = False
+            for item in batch:
+                if item is _STOP:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    self._write_entry(item)
+                    urgent = urgent or item.level in (LogLevel.ERROR, LogLevel.CRITICAL)
+            
+            if urgent or waiters or stop or (
+                    dirty_since is not None and
+                    time.monotonic() - dirty_since >= self.FLUSH_INTERVAL_SECONDS):
+                self._flush_file()
+                dirty_since = None
+            elif dirty_since is None:
+                dirty_since = time.monotonic()
+            
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                self._close_file()
+                return
     
-    def critical(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
-        self.log(LogLevel.CRITICAL, message, context)
+    def _write_entry(self, entry: LogEntry) -> None:
+        """كتابة الإدخال في الملف - فشل الكتابة لا يجب أن يتسبب في خطأ آخر"""
+        try:
+            if self._file is None:
+                self._open_file()
+            data = (entry.to_string() + '\n').encode('utf-8')
+            self._file.write(data)
+            self._file_size += len(data)
+            if self._file_size > self.max_file_size_mb * 1024 * 1024:
+                self._close_file()
+                self._rotate_logs()
+        except Exception:
+            pass
     
-    def _should_log(self, level: LogLevel) -> bool:
-        """فحص ما إذا كان يجب تسجيل هذا المستوى"""
-        level_values = {
-            LogLevel.DEBUG: 0,
-            LogLevel.INFO: 1,
-            LogLevel.WARNING: 2,
-            LogLevel.ERROR: 3,
-            LogLevel.CRITICAL: 4
-        }
-        return level_values[level] >= level_values[self.min_level]
+    def _open_file(self) -> None:
+        self.log_file_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.log_file_path, 'ab')
+        self._file_size = self._file.tell()
     
-    def _write_to_file(self, entry: LogEntry) -> None:
-        """كتابة الإدخال في الملف"""
+    def _flush_file(self) -> None:
         try:
-            with open(self.log_file_path, 'a', encoding='utf-8') as f:
-                f.write(entry.to_string() + '\n')
+            if self._file is not None:
+                self._file.flush()
         except Exception:
-            # في حالة فشل الكتابة، لا نريد أن نتسبب في خطأ آخر
             pass
     
-    def _rotate_logs_if_needed(self) -> None:
-        """تدوير السجلات إذا تجاوز الحجم المحدد"""
+    def _close_file(self) -> None:
         try:
-            if not self.log_file_path.exists():
-                return
-            
-            file_size_mb = self.log_file_path.stat().st_size / (1024 * 1024)
-            
-            if file_size_mb > self.max_file_size_mb:
-                self._rotate_logs()
+            if self._file is not None:
+                self._file.close()
         except Exception:
             pass
+        self._file = None
     
     def _rotate_logs(self) -> None:
         """تدوير ملفات السجلات"""
@@ -177,6 +272,91 @@ class FileLogger(ILogger):
                 self.log_file_path.rename(rotated_file)
         except Exception:
             pass
+    
+    @classmethod
+    def flush_all(cls) -> None:
+        """إفراغ جميع ملفات السجلات - يُستدعى قبل إنهاء البرنامج بسبب خطأ"""
+        with cls._writers_lock:
+            writers = list(cls._writers.values())
+        for writer in writers:
+            writer.flush()
+    
+    @classmethod
+    def _reset_after_fork(cls) -> None:
+        """العملية الفرعية ترث الكتاب دون خيوطهم فتبدأ بطوابير جديدة"""
+        for writer in cls._writers.values():
+            writer._start_lock = threading.Lock()
+            writer._reset()
+
+
+# علامة إيقاف خيط الكتابة
+_STOP = object()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=LogFileWriter._reset_after_fork)
+
+
+def _install_crash_flush() -> None:
+    """إفراغ السجلات قبل معالج الاستثناءات غير الملتقطة
+
+    PyQt5 ينهي البرنامج بـ abort بعد استدعاء sys.excepthook فلا تعمل دوال atexit.
+    """
+    previous_hook = sys.excepthook
+    
+    def excepthook(*args):
+        LogFileWriter.flush_all()
+        previous_hook(*args)
+    
+    sys.excepthook = excepthook
+
+
+_install_crash_flush()
+
+
+class FileLogger(ILogger):
+    """مسجل الملفات - مسؤولية واحدة: تصفية الإدخالات حسب المستوى وتمريرها إلى كاتب الملف"""
+    
+    def __init__(self, 
+                 log_file_path: Path = None, 
+                 min_level: LogLevel = LogLevel.INFO,
+                 max_file_size_mb: int = 10,
+                 max_files: int = 5):
+        self.log_file_path = log_file_path or (APP_DIR / "logs" / "alhirz.log")
+        self.min_level = min_level
+        self.max_file_size_mb = max_file_size_mb
+        self.max_files = max_files
+        self.writer = LogFileWriter.for_path(self.log_file_path, max_file_size_mb, max_files)
+    
+    def log(self, level: LogLevel, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        """تسجيل رسالة في الملف دون انتظار الكتابة - وحدثاً لحظياً في التتبع النشط بأي مستوى"""
+        tracer = active_tracer()
+        if tracer is not None:
+            tracer.instant(message, {'level': level.value, **(context or {})})
+        if self._should_log(level):
+            self.writer.write(LogEntry(level, message, context))
+    
+    def debug(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        self.log(LogLevel.DEBUG, message, context)
+    
+    def info(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        self.log(LogLevel.INFO, message, context)
+    
+    def warning(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        self.log(LogLevel.WARNING, message, context)
+    
+    def error(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        self.log(LogLevel.ERROR, message, context)
+    
+    def critical(self, message: str, context: Optional[Dict[str, Any]] = None) -> None:
+        self.log(LogLevel.CRITICAL, message, context)
+    
+    def flush(self) -> None:
+        """انتظار كتابة الإدخالات المعلقة"""
+        self.writer.flush()
+    
+    def _should_log(self, level: LogLevel) -> bool:
+        """فحص ما إذا كان يجب تسجيل هذا المستوى"""
+        return _LEVEL_VALUES[level] >= _LEVEL_VALUES[self.min_level]
 
 
 class ConsoleLogger(ILogger):
@@ -208,14 +388,7 @@ class ConsoleLogger(ILogger):
     
     def _should_log(self, level: LogLevel) -> bool:
         """فحص ما إذا كان يجب تسجيل هذا المستوى"""
-        level_values = {
-            LogLevel.DEBUG: 0,
-            LogLevel.INFO: 1,
-            LogLevel.WARNING: 2,
-            LogLevel.ERROR: 3,
-            LogLevel.CRITICAL: 4
-        }
-        return level_values[level] >= level_values[self.min_level]
+        return _LEVEL_VALUES[level] >= _LEVEL_VALUES[self.min_level]
 
 
 class CompositeLogger(ILogger):
@@ -260,38 +433,44 @@ class CompositeLogger(ILogger):
 
 
 class LoggerFactory:
-    """Factory لإنشاء المسجلات - Factory Pattern"""
-    
-    @staticmethod
-    def create_default_logger() -> ILogger:
-        """إنشاء المسجل الافتراضي للنظام - يسجل الأخطاء فقط"""
-        file_logger = FileLogger(min_level=LogLevel.ERROR)
-        console_logger = ConsoleLogger(min_level=LogLevel.ERROR)
-        
-        composite_logger = CompositeLogger()
-        composite_logger.add_logger(file_logger)
-        composite_logger.add_logger(console_logger)
-        
-        return composite_logger
-    
-    @staticmethod
-    def create_debug_logger() -> ILogger:
-        """إنشاء مسجل للتشخيص"""
-        file_logger = FileLogger(min_level=LogLevel.DEBUG)
-        console_logger = ConsoleLogger(min_level=LogLevel.DEBUG)
-        
-        composite_logger = CompositeLogger()
-        composite_logger.add_logger(file_logger)
-        composite_logger.add_logger(console_logger)
-        
-        return composite_logger
-    
-    @staticmethod
-    def create_file_only_logger() -> ILogger:
-        """إنشاء مسجل للملفات فقط"""
-        return FileLogger(min_level=LogLevel.INFO)
-    
-    @staticmethod
-    def create_console_only_logger() -> ILogger:
-        """إنشاء مسجل لوحدة التحكم فقط"""
-        return ConsoleLogger(min_level=LogLevel.INFO)
\ No newline at end of file
+    """Factory لإنشاء المسجلات - Factory Pattern
+    
+    كل نوع يُنشأ مرة واحدة ويُشارك بين جميع المكونات.
+    """
+    
+    _instances: Dict[str, ILogger] = {}
+    _lock = threading.Lock()
+    
+    @classmethod
+    def _shared(cls, name: str, create) -> ILogger:
+        with cls._lock:
+            logger = cls._instances.get(name)
+            if logger is None:
+                logger = cls._instances[name] = create()
+            return logger
+    
+    @classmethod
+    def create_default_logger(cls) -> ILogger:
+        """المسجل الافتراضي للنظام - يسجل الأخطاء فقط"""
+        return cls._shared('default', lambda: CompositeLogger([
+            FileLogger(min_level=LogLevel.ERROR),
+            ConsoleLogger(min_level=LogLevel.ERROR)
+        ]))
+    
+    @classmethod
+    def create_debug_logger(cls) -> ILogger:
+        """مسجل التشخيص"""
+        return cls._shared('debug', lambda: CompositeLogger([
+            FileLogger(min_level=LogLevel.DEBUG),
+            ConsoleLogger(min_level=LogLevel.DEBUG)
+        ]))
+    
+    @classmethod
+    def create_file_only_logger(cls) -> ILogger:
+        """مسجل الملفات فقط"""
+        return cls._shared('file_only', lambda: FileLogger(min_level=LogLevel.INFO))
+    
+    @classmethod
+    def create_console_only_logger(cls) -> ILogger:
+        """مسجل وحدة التحكم فقط"""
+        return cls._shared('console_only', lambda: ConsoleLogger(min_level=LogLevel.INFO))
@@ -0,0 +1,267 @@
+"""
+عمليات النسخ والاسترداد والفحص دون أي اعتماد على Qt
+مسؤولية واحدة: تنفيذ العملية وإرجاع رسالة النتيجة - تستخدمها الواجهة وسطر الأوامر والخدمة
+"""
+from pathlib import Path
+from typing import List, Callable, Optional
+
+from interfaces.backup_interfaces import IBackupOrchestrator
+from core.backup_manager import BackupOrchestrator
+from core.backup_verifier import BackupVerifier
+from core.cancellation import CancellationToken
+from core.dry_run import DryRunReport
+from core.logging_system import ILogger, LoggerFactory
+from core.error_handler import ErrorHandler, ErrorHandlerFactory
+from core.exceptions import BackupInterruptedError
+from core.retry_queue import format_failures
+
+ProgressCallback = Callable[[int, str], None]
+
+
+class BaseOperation:
+    """عملية أساسية موحدة - Template Method Pattern مع دعم السجلات ومعالجة الأخطاء"""
+
+    def __init__(self,
+                 orchestrator: IBackupOrchestrator = None,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None):
+        self.orchestrator = orchestrator or BackupOrchestrator()
+        self.logger = logger or LoggerFactory.create_default_logger()
+        self.error_handler = error_handler or ErrorHandlerFactory.create_default_handler()
+        self.cancellation_token = CancellationToken()
+        self.operation_name = self.__class__.__name__
+        self._progress_callback: Optional[ProgressCallback] = None
+
+    def run(self, progress_callback: ProgressCallback = None) -> str:
+        """Template Method - تدفق العمل الموحد وإرجاع رسالة النتيجة"""
+        self._progress_callback = progress_callback
+        self.logger.info(f"بدء تشغيل {self.operation_name}")
+
+        try:
+            self.prepare()
+            result = self.execute_operation()
+
+            if not self.is_running:
+                raise BackupInterruptedError("تم إلغاء العملية من قبل المستخدم")
+
+            self.logger.info(f"اكتمل تشغيل {self.operation_name} بنجاح")
+            return result
+
+        except BackupInterruptedError as e:
+            self.logger.warning(f"تم إلغاء {self.operation_name}: {e.message}")
+            return self.handle_cancellation()
+        except Exception as e:
+            self.logger.error(f"خطأ في {self.operation_name}: {str(e)}")
+
+            # أخطاء الملفات المفردة تُعاد محاولتها داخل العملية، فما يصل هنا لا يُعاد تنفيذه
+            self.error_handler.handle_exception(e, self.get_error_context(), self.operation_name)
+            return self.handle_error(e)
+
+    def prepare(self) -> None:
+        """التحضير للعملية - يمكن إعادة تعريفها في الفئات المشتقة"""
+        pass
+
+    def execute_operation(self) -> str:
+        """تنفيذ العملية الأساسية - يجب إعادة تعريفها في الفئات المشتقة"""
+        raise NotImplementedError("يجب تنفيذ execute_operation في الفئة المشتقة")
+
+    def handle_cancellation(self) -> str:
+        """معالجة إلغاء العملية وإرجاع رسالة الإلغاء"""
+        raise NotImplementedError("يجب تنفيذ handle_cancellation في الفئة المشتقة")
+
+    def handle_error(self, error: Exception) -> str:
+        """معالجة الأخطاء وإرجاع رسالة الخطأ"""
+        raise NotImplementedError("يجب تنفيذ handle_error في الفئة المشتقة")
+
+    def progress_callback(self, progress: int, message: str) -> None:
+        """callback للتقدم"""
+        if self._progress_callback:
+            self._progress_callback(progress, message)
+
+    @property
+    def is_running(self) -> bool:
+        return not self.cancellation_token.is_cancelled
+
+    @property
+    def is_paused(self) -> bool:
+        return self.cancellation_token.is_paused
+
+    def stop(self) -> None:
+        """إيقاف العملية"""
+        self.cancellation_token.cancel()
+        self.logger.info(f"تم طلب إيقاف {self.operation_name}")
+
+    def pause(self) -> None:
+        """إيقاف العملية مؤقتاً مع الاحتفاظ بموضعها داخل الملف الحالي"""
+        self.cancellation_token.pause()
+        self.logger.info(f"تم إيقاف {self.operation_name} مؤقتاً")
+
+    def resume(self) -> None:
+        """استئناف العملية من حيث توقفت"""
+        self.cancellation_token.resume()
+        self.logger.info(f"تم استئناف {self.operation_name}")
+
+    def get_error_context(self) -> dict:
+        """الحصول على سياق الخطأ للمعالجة"""
+        return {
+            'operation_type': self.__class__.__name__,
+            'operation_name': self.operation_name,
+            'is_running': self.is_running
+        }
+
+
+class BackupOperation(BaseOperation):
+    """عملية النسخ الاحتياطي"""
+
+    def __init__(self,
+                 folders_to_backup: List[Path],
+                 backup_filepath: Path,
+                 exclusions: List[str],
+                 orchestrator: IBackupOrchestrator = None,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None):
+        super().__init__(orchestrator, logger, error_handler)
+        self.folders_to_backup = folders_to_backup
+        self.backup_filepath = backup_filepath
+        self.exclusions = exclusions
+        self.operation_name = "النسخ الاحتياطي"
+
+    def execute_operation(self) -> str:
+        """تنفيذ عملية النسخ"""
+        failed_files = self.orchestrator.create_incremental_backup(
+            self.folders_to_backup,
+            self.backup_filepath,
+            self.exclusions,
+            self.progress_callback,
+            self.cancellation_token
+        )
+        failures_report = format_failures(failed_files or {}, "تعذر نسخ")
+
+        # التحقق من وجود الملف وحساب الحجم
+        if not self.backup_filepath.exists():
+            return f"اكتمل النسخ بنجاح!\nلم يتم العثور على ملفات جديدة لنسخها.{failures_report}"
+
+        final_size_mb = self.backup_filepath.stat().st_size / (1024 * 1024)
+        return (f"اكتمل النسخ بنجاح!\nالمسار: {self.backup_filepath}\n"
+                f"الحجم: {final_size_mb:.2f} ميجابايت{failures_report}")
+
+    def handle_cancellation(self) -> str:
+        """معالجة إلغاء النسخ"""
+        if self.backup_filepath.exists():
+            self.backup_filepath.unlink()
+        return "تم إلغاء عملية النسخ الاحتياطي."
+
+    def handle_error(self, error: Exception) -> str:
+        """معالجة أخطاء النسخ"""
+        if self.backup_filepath.exists():
+            self.backup_filepath.unlink()
+        return f"حدث خطأ فادح أثناء النسخ:\n{error}"
+
+
+class DryRunOperation(BaseOperation):
+    """عملية معاينة النسخة التالية - لا تكتب شيئاً، فالإلغاء لا يحتاج تنظيفاً"""
+
+    def __init__(self,
+                 folders_to_backup: List[Path],
+                 exclusions: List[str],
+                 orchestrator: IBackupOrchestrator = None,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None,
+                 report_callback: Callable[[DryRunReport], None] = None):
+        super().__init__(orchestrator, logger, error_handler)
+        self.folders_to_backup = folders_to_backup
+        self.exclusions = exclusions
+        self.report_callback = report_callback
+        self.operation_name = "معاينة النسخ"
+
+    def execute_operation(self) -> str:
+        """تنفيذ المعاينة"""
+        self.progress_callback(0, "جارٍ فحص المجلدات ومقارنتها بآخر نسخة...")
+        report = self.orchestrator.preview_backup(
+            self.folders_to_backup,
+            self.exclusions,
+            self._on_report,
+            self.cancellation_token
+        )
+        self.progress_callback(100, "اكتملت المعاينة.")
+        return f"اكتملت المعاينة.\n{report.summary()}"
+
+    def _on_report(self, report: DryRunReport) -> None:
+        if self.report_callback:
+            self.report_callback(report)
+        if not report.completed:
+            self.progress_callback(0, f"{report.files_to_backup} ملف للنسخ من {report.files_scanned} ملف فُحص...")
+
+    def handle_cancellation(self) -> str:
+        """معالجة إلغاء المعاينة"""
+        return "تم إلغاء المعاينة."
+
+    def handle_error(self, error: Exception) -> str:
+        """معالجة أخطاء المعاينة"""
+        return f"حدث خطأ أثناء المعاينة:\n{error}"
+
+
+class RestoreOperation(BaseOperation):
+    """عملية الاسترداد"""
+
+    def __init__(self,
+                 backup_to_restore: Path,
+                 orchestrator: IBackupOrchestrator = None,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None,
+                 members: Optional[List[str]] = None,
+                 overwrite: bool = False):
+        super().__init__(orchestrator, logger, error_handler)
+        self.backup_to_restore = backup_to_restore
+        self.members = members
+        self.overwrite = overwrite
+        self.operation_name = "الاسترداد"
+
+    def execute_operation(self) -> str:
+        """تنفيذ عملية الاسترداد"""
+        return self.orchestrator.restore_from_backup(
+            self.backup_to_restore,
+            self.progress_callback,
+            self.cancellation_token,
+            self.members,
+            self.overwrite
+        )
+
+    def handle_cancellation(self) -> str:
+        """معالجة إلغاء الاسترداد"""
+        return "تم إلغاء عملية الاسترداد."
+
+    def handle_error(self, error: Exception) -> str:
+        """معالجة أخطاء الاسترداد"""
+        return f"حدث خطأ فادح أثناء الاسترداد:\n{error}"
+
+
+class VerifyOperation(BaseOperation):
+    """عملية فحص السلامة"""
+
+    def __init__(self,
+                 verifier: BackupVerifier,
+                 sample_percent: float = 100.0,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None):
+        super().__init__(None, logger, error_handler)
+        self.verifier = verifier
+        self.sample_percent = sample_percent
+        self.operation_name = "فحص السلامة"
+
+    def execute_operation(self) -> str:
+        """تنفيذ فحص السلامة"""
+        report = self.verifier.verify_all(
+            sample_percent=self.sample_percent,
+            progress_callback=self.progress_callback,
+            is_running_check=self.cancellation_token
+        )
+        return report.summary()
+
+    def handle_cancellation(self) -> str:
+        """معالجة إلغاء الفحص"""
+        return "تم إلغاء عملية الفحص."
+
+    def handle_error(self, error: Exception) -> str:
+        """معالجة أخطاء الفحص"""
+        return f"حدث خطأ أثناء فحص النسخ:\n{error}"
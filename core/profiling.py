@@ -0,0 +1,298 @@
+"""
+قياس الأداء عند الطلب
+مسؤولية واحدة: تشغيل عملية تحت cProfile و tracemalloc أو أخذ عينات دورية من مكدسات الخيوط، وحفظ التقارير في مجلد profiles
+"""
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.config import (APP_DIR, PROFILES_SUBDIR, PROFILE_OFF, PROFILE_SAMPLING, PROFILE_FULL,
+                          PROFILING_MODES)
+
+# متغير بيئة يحدد وضع القياس ويتقدم على الإعدادات
+PROFILE_ENV = "ALHIRZ_PROFILE"
+
+# عدد جلسات القياس المحتفظ بتقاريرها
+PROFILE_RETENTION = 10
+# الفاصل بين عينات المكدسات - 100 عينة في الثانية تكلفتها أقل من 1% في الغالب
+SAMPLING_INTERVAL_SECONDS = 0.01
+# عدد الإطارات المحفوظة لكل تخصيص ذاكرة في tracemalloc
+TRACEMALLOC_FRAMES = 10
+# عدد السطور في تقارير أكثر الدوال كلفة وأكثر مواقع التخصيص
+TOP_FUNCTIONS = 40
+TOP_ALLOCATIONS = 30
+# منذ 3.12 يعتمد cProfile على sys.monitoring فيقيس مقياس واحد كل الخيوط ولا يقبل مقياساً ثانياً
+PER_THREAD_PROFILERS = sys.version_info < (3, 12)
+
+
+def _clear_profile_all_threads() -> None:
+    """إزالة دالة القياس من كل الخيوط الحية - threading.setprofile_all_threads، وقبل 3.12 بنفس واجهة C"""
+    if hasattr(threading, 'setprofile_all_threads'):
+        threading.setprofile_all_threads(None)
+        return
+
+    import ctypes
+    api = ctypes.pythonapi
+    api.PyInterpreterState_Get.restype = ctypes.c_void_p
+    api.PyInterpreterState_ThreadHead.argtypes = [ctypes.c_void_p]
+    api.PyInterpreterState_ThreadHead.restype = ctypes.c_void_p
+    api.PyThreadState_Next.argtypes = [ctypes.c_void_p]
+    api.PyThreadState_Next.restype = ctypes.c_void_p
+    api._PyEval_SetProfile.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p]
+    api._PyEval_SetProfile.restype = ctypes.c_int
+
+    # الاستدعاءات تتم مع حمل قفل المفسر فلا تتغير قائمة الخيوط أثناء المرور عليها
+    thread_state = api.PyInterpreterState_ThreadHead(api.PyInterpreterState_Get())
+    while thread_state:
+        api._PyEval_SetProfile(thread_state, None, None)
+        thread_state = api.PyThreadState_Next(thread_state)
+
+
+def _slug(name: str) -> str:
+    """اسم صالح لملف من اسم الجلسة"""
+    return "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name) or "run"
+
+
+class FullProfile:
+    """قياس كامل - cProfile لكل خيط يبدأ أثناء الجلسة إضافة إلى الخيط المستدعي، و tracemalloc للذاكرة
+
+    الكلفة عالية (تبطئ النسخ عدة مرات) فيناسب إعادة إنتاج مشكلة لا الاستخدام اليومي.
+    عمليات الضغط الفرعية لا تُقاس، ويظهر زمن انتظار نتائجها في خيط الحلقة.
+    """
+
+    def __init__(self):
+        self._profilers: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._owns_tracemalloc = False
+
+    def start(self) -> None:
+        self._owns_tracemalloc = not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        if PER_THREAD_PROFILERS:
+            threading.setprofile(self._profile_new_thread)
+        self._main_profiler = self._add_profiler()
+
+    def stop(self, base_path: Path) -> List[Path]:
+        threading.setprofile(None)
+        self._main_profiler.disable()
+        if PER_THREAD_PROFILERS:
+            # disable يوقف خيط المستدعي فقط، والخيوط التي بدأت أثناء الجلسة وما زالت تعمل (كاتب
+            # السجل ومؤقتات الإعدادات وخيوط المنفذين) تبقى تقيس أثناء قراءة نتائجها حتى تُزال دالتها
+            _clear_profile_all_threads()
+
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        current, peak = tracemalloc.get_traced_memory() if snapshot is not None else (0, 0)
+        if self._owns_tracemalloc:
+            tracemalloc.stop()
+
+        with self._lock:
+            profilers = list(self._profilers)
+        stats = pstats.Stats(profilers[0])
+        for profiler in profilers[1:]:
+            stats.add(profiler)
+
+        prof_path = base_path.with_suffix('.prof')
+        stats.dump_stats(str(prof_path))
+        paths = [prof_path, self._write_stats_report(stats, base_path.with_name(base_path.name + '_functions.txt'))]
+        if snapshot is not None:
+            paths.append(self._write_allocations_report(
+                snapshot, current, peak, base_path.with_name(base_path.name + '_allocations.txt')))
+        return paths
+
+    def _add_profiler(self) -> cProfile.Profile:
+        profiler = cProfile.Profile()
+        with self._lock:
+            self._profilers.append(profiler)
+        profiler.enable()
+        return profiler
+
+    def _profile_new_thread(self, frame, event, arg) -> None:
+        """يُستدعى مرة في بداية كل خيط جديد فيستبدل نفسه بمقياس cProfile خاص بالخيط"""
+        sys.setprofile(None)
+        self._add_profiler()
+
+    @staticmethod
+    def _write_stats_report(stats: pstats.Stats, path: Path) -> Path:
+        stream = io.StringIO()
+        stats.stream = stream
+        stream.write("=== حسب الزمن التراكمي ===\n")
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(TOP_FUNCTIONS)
+        stream.write("\n=== حسب الزمن الذاتي ===\n")
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(TOP_FUNCTIONS)
+        path.write_text(stream.getvalue(), encoding='utf-8')
+        return path
+
+    @staticmethod
+    def _write_allocations_report(snapshot: tracemalloc.Snapshot, current: int, peak: int, path: Path) -> Path:
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        lines = [f"الذاكرة المتتبعة عند الانتهاء: {current / 1024:.1f} KiB",
+                 f"الذروة أثناء الجلسة: {peak / 1024:.1f} KiB",
+                 "", "=== أكثر مواقع التخصيص الباقية ==="]
+        for index, stat in enumerate(snapshot.statistics('lineno')[:TOP_ALLOCATIONS], 1):
+            frame = stat.traceback[0]
+            lines.append(f"{index:2d}. {frame.filename}:{frame.lineno}  "
+                         f"{stat.size / 1024:.1f} KiB في {stat.count} كتلة")
+        lines += ["", "=== حسب الملف ==="]
+        for stat in snapshot.statistics('filename')[:TOP_ALLOCATIONS]:
+            lines.append(f"{stat.traceback[0].filename}  {stat.size / 1024:.1f} KiB")
+        path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        return path
+
+
+class SamplingProfile:
+    """قياس بالعينات - خيط يقرأ مكدسات جميع الخيوط كل SAMPLING_INTERVAL_SECONDS دون تتبع كل استدعاء
+
+    الناتج بصيغة المكدسات المطوية (folded) التي يقرأها speedscope و flamegraph.pl،
+    مع تقرير بأكثر الدوال ظهوراً في العينات.
+    """
+
+    def __init__(self, interval: float = SAMPLING_INTERVAL_SECONDS):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name='alhirz-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self, base_path: Path) -> List[Path]:
+        self._stop_event.set()
+        self._thread.join()
+
+        folded_path = base_path.with_name(base_path.name + '_samples.folded')
+        with open(folded_path, 'w', encoding='utf-8') as f:
+            for stack, count in self._stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+        return [folded_path, self._write_top_report(base_path.with_name(base_path.name + '_samples.txt'))]
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self._stacks[self._stack(names.get(thread_id, str(thread_id)), frame)] += 1
+            self.samples += 1
+
+    @staticmethod
+    def _stack(thread_name: str, frame) -> Tuple[str, ...]:
+        """المكدس من الجذر إلى الإطار الحالي مسبوقاً باسم الخيط"""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+            frame = frame.f_back
+        stack.append(thread_name)
+        return tuple(reversed(stack))
+
+    def _write_top_report(self, path: Path) -> Path:
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self._stacks.items():
+            self_counts[stack[-1]] += count
+            for function in set(stack[1:]):
+                total_counts[function] += count
+
+        lines = [f"عدد العينات: {self.samples} كل {self.interval * 1000:.0f} ms", "",
+                 "=== أكثر الدوال ظهوراً في قمة المكدس (الزمن الذاتي) ==="]
+        lines += [f"{count:8d}  {function}" for function, count in self_counts.most_common(TOP_FUNCTIONS)]
+        lines += ["", "=== أكثر الدوال ظهوراً في المكدس (الزمن الشامل) ==="]
+        lines += [f"{count:8d}  {function}" for function, count in total_counts.most_common(TOP_FUNCTIONS)]
+        path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+        return path
+
+
+# جلسة القياس النشطة - جلسة واحدة في العملية، والاستدعاءات المتداخلة تعمل داخلها
+_active_session = None
+_session_lock = threading.Lock()
+
+
+def env_profiling_mode() -> Optional[str]:
+    """وضع القياس من متغير البيئة - None إذا لم يُحدد أو كان غير صالح"""
+    value = os.environ.get(PROFILE_ENV, "").strip().lower()
+    return value if value in PROFILING_MODES else None
+
+
+class RunProfiler:
+    """مشغّل جلسات القياس - يقرأ الوضع عند بدء كل عملية حتى تنعكس تغييرات الإعدادات دون إعادة تشغيل"""
+
+    def __init__(self,
+                 mode_source: Callable[[], str] = None,
+                 profiles_dir: Path = None,
+                 retention: int = PROFILE_RETENTION):
+        self.mode_source = mode_source or (lambda: env_profiling_mode() or PROFILE_OFF)
+        self.profiles_dir = profiles_dir or (APP_DIR / PROFILES_SUBDIR)
+        self.retention = retention
+        self.last_profile_paths: List[Path] = []
+
+    @contextmanager
+    def profile(self, name: str) -> Iterator[Optional[str]]:
+        """قياس الكتلة حسب الوضع المحدد - يُرجع الوضع المستخدم أو None إذا لم تُقس"""
+        global _active_session
+
+        mode = self.mode_source()
+        session_class = {PROFILE_FULL: FullProfile, PROFILE_SAMPLING: SamplingProfile}.get(mode)
+        with _session_lock:
+            if session_class is None or _active_session is not None:
+                session = None
+            else:
+                session = _active_session = session_class()
+        if session is None:
+            yield None
+            return
+
+        base_path = self.profiles_dir / f"profile_{datetime.now().strftime('%Y-%m-%d_%H%M%S_%f')}_{_slug(name)}"
+        session.start()
+        try:
+            yield mode
+        finally:
+            try:
+                self.profiles_dir.mkdir(parents=True, exist_ok=True)
+                self.last_profile_paths = session.stop(base_path)
+            finally:
+                with _session_lock:
+                    _active_session = None
+            self._prune()
+
+    def _prune(self) -> None:
+        """حذف تقارير أقدم الجلسات الزائدة عن حد الاحتفاظ"""
+        if self.retention <= 0:
+            return
+        sessions: Dict[str, List[Path]] = {}
+        for path in self.profiles_dir.glob('profile_*'):
+            # profile_<التاريخ>_<الوقت>_<الميكروثانية>_...
+            sessions.setdefault("_".join(path.name.split("_")[:4]), []).append(path)
+        for key in sorted(sessions)[:-self.retention]:
+            for path in sessions[key]:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+
+def create_run_profiler(config_manager=None, mode: Optional[str] = None) -> RunProfiler:
+    """مشغّل القياس حسب الإعدادات - mode الصريح (سطر الأوامر) ثم متغير البيئة ثم profiling_mode"""
+    from utils.config_manager import ConfigurationManager
+
+    config_manager = config_manager or ConfigurationManager()
+
+    def mode_source() -> str:
+        return mode or env_profiling_mode() or config_manager.get_setting('profiling_mode', PROFILE_OFF)
+
+    return RunProfiler(mode_source)
@@ -0,0 +1,230 @@
+"""
+ذاكرة مؤقتة لمستودع النسخ الاحتياطية
+مسؤولية واحدة: تخزين قوائم الأرشيفات وسجلاتها مؤقتاً لتجنب إعادة قراءتها من القرص
+"""
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Callable, Tuple, Hashable, Mapping
+
+# الحد الافتراضي لذاكرة السجلات المحللة
+DEFAULT_MANIFEST_CACHE_BYTES = 64 * 1024 * 1024
+
+# مدة عدم الثقة بوقت تعديل المجلد (لأنظمة الملفات ذات الدقة المنخفضة)
+DIRECTORY_MTIME_GRACE_SECONDS = 2.0
+
+
+def freeze_manifest(manifest: Dict[str, Any]) -> Tuple[Mapping[str, Any], int]:
+    """تحويل سجل محلل إلى عرض للقراءة فقط مع حجمه الفعلي في الذاكرة
+
+    السجل المخزن مشترك بين جميع المستدعين، فلا يُسلَّم قاموساً قابلاً للتعديل. الحجم يُجمع
+    بـ sys.getsizeof للقاموس ومفاتيحه وقيمه، وهو أضعاف حجم JSON في الأرشيف.
+    """
+    return _freeze(manifest)
+
+
+def _freeze(value: Any) -> Tuple[Any, int]:
+    if isinstance(value, dict):
+        cost = sys.getsizeof(value)
+        for key, item in value.items():
+            frozen, item_cost = _freeze(item)
+            if frozen is not item:
+                value[key] = frozen
+            cost += sys.getsizeof(key) + item_cost
+        return MappingProxyType(value), cost
+    if isinstance(value, list):
+        items = [_freeze(item) for item in value]
+        frozen = tuple(item for item, _ in items)
+        return frozen, sys.getsizeof(frozen) + sum(cost for _, cost in items)
+    return value, sys.getsizeof(value)
+
+
+@dataclass(frozen=True)
+class ArchiveInfo:
+    """بيانات أرشيف واحد كما قُرئت من المجلد - Value Object"""
+    path: Path
+    size: int
+    mtime: float
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def cache_key(self) -> Tuple[str, int, float]:
+        """مفتاح يتغير بتغير محتوى الأرشيف"""
+        return (str(self.path), self.size, self.mtime)
+
+
+class LRUCache:
+    """ذاكرة LRU محدودة بمجموع تكلفة العناصر بدلاً من عددها"""
+
+    def __init__(self, max_cost: int):
+        self.max_cost = max_cost
+        self.current_cost = 0
+        self._items: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """الحصول على عنصر وتحديث ترتيب استخدامه"""
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, cost: int) -> None:
+        """إضافة عنصر وطرد الأقدم استخداماً عند تجاوز الحد"""
+        if cost > self.max_cost:
+            return
+
+        with self._lock:
+            if key in self._items:
+                self.current_cost -= self._items.pop(key)[1]
+
+            self._items[key] = (value, cost)
+            self.current_cost += cost
+
+            while self.current_cost > self.max_cost and self._items:
+                _, (_, evicted_cost) = self._items.popitem(last=False)
+                self.current_cost -= evicted_cost
+
+    def discard_if(self, predicate: Callable[[Hashable], bool]) -> None:
+        """حذف العناصر التي يحققها الشرط"""
+        with self._lock:
+            for key in [k for k in self._items if predicate(k)]:
+                self.current_cost -= self._items.pop(key)[1]
+
+    def clear(self) -> None:
+        """مسح جميع العناصر"""
+        with self._lock:
+            self._items.clear()
+            self.current_cost = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class RepositoryCache:
+    """ذاكرة المستودع - قائمة مفتاحها وقت تعديل المجلد وسجلات مفتاحها (المسار، الحجم، الوقت)"""
+
+    def __init__(self, backup_dir: Path, max_manifest_bytes: int = DEFAULT_MANIFEST_CACHE_BYTES):
+        self.backup_dir = backup_dir
+        self.manifests = LRUCache(max_manifest_bytes)
+        self._member_counts: Dict[Tuple[str, int, float], int] = {}
+        self._listing: Optional[List[ArchiveInfo]] = None
+        self._index: Dict[Path, ArchiveInfo] = {}
+        self._dir_mtime_ns: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def list_archives(self) -> List[ArchiveInfo]:
+        """قائمة الأرشيفات مرتبة من الأحدث للأقدم - فحص واحد للمجلد عند تغيره فقط"""
+        try:
+            dir_mtime_ns = os.stat(self.backup_dir).st_mtime_ns
+        except OSError:
+            self.invalidate()
+            return []
+
+        with self._lock:
+            if self._listing is not None and dir_mtime_ns == self._dir_mtime_ns:
+                return list(self._listing)
+
+            listing = self._scan_directory()
+            self._listing = listing
+            self._index = {info.path: info for info in listing}
+
+            # وقت تعديل حديث جداً قد لا يلتقط تغييرات تالية في نفس اللحظة
+            if time.time() - dir_mtime_ns / 1e9 > DIRECTORY_MTIME_GRACE_SECONDS:
+                self._dir_mtime_ns = dir_mtime_ns
+            else:
+                self._dir_mtime_ns = None
+
+        self._drop_stale_manifests()
+        return list(listing)
+
+    def get_info(self, archive_path: Path) -> Optional[ArchiveInfo]:
+        """بيانات أرشيف محدد من آخر قائمة"""
+        self.list_archives()
+        with self._lock:
+            return self._index.get(archive_path)
+
+    def get_manifest(self,
+                     info: ArchiveInfo,
+                     loader: Callable[[Path], Tuple[Mapping[str, Any], int]]) -> Mapping[str, Any]:
+        """سجل الأرشيف من الذاكرة أو بتحميله - المحمّل يعيد (السجل للقراءة فقط، تكلفته بالبايت)"""
+        manifest = self.manifests.get(info.cache_key)
+        if manifest is not None:
+            return manifest
+
+        manifest, cost = loader(info.path)
+        # لا نخزن فشل القراءة حتى لا يبقى أرشيف قيد الكتابة بلا سجل
+        if manifest:
+            self.manifests.put(info.cache_key, manifest, cost)
+        return manifest
+
+    def get_member_count(self,
+                         info: ArchiveInfo,
+                         loader: Callable[[Path], Optional[int]]) -> Optional[int]:
+        """عدد ملفات الأرشيف من الذاكرة أو بتحميله - رقم صغير يبقى ما بقي الأرشيف دون تعديل"""
+        with self._lock:
+            count = self._member_counts.get(info.cache_key)
+        if count is not None:
+            return count
+
+        count = loader(info.path)
+        if count is not None:
+            with self._lock:
+                self._member_counts[info.cache_key] = count
+        return count
+
+    def invalidate(self) -> None:
+        """إبطال القائمة المخزنة لإجبار إعادة فحص المجلد"""
+        with self._lock:
+            self._listing = None
+            self._index = {}
+            self._dir_mtime_ns = None
+
+    def _scan_directory(self) -> List[ArchiveInfo]:
+        """فحص المجلد مرة واحدة وجمع بيانات الأرشيفات"""
+        archives = []
+        with os.scandir(self.backup_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.zip'):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                archives.append(ArchiveInfo(Path(entry.path), stat.st_size, stat.st_mtime))
+
+        archives.sort(key=lambda info: info.mtime, reverse=True)
+        return archives
+
+    def _drop_stale_manifests(self) -> None:
+        """حذف سجلات الأرشيفات المحذوفة أو المعدلة وأعداد ملفاتها"""
+        with self._lock:
+            current_keys = {info.cache_key for info in self._listing or []}
+            for key in [key for key in self._member_counts if key not in current_keys]:
+                del self._member_counts[key]
+        self.manifests.discard_if(lambda key: key not in current_keys)
+
+
+_caches: Dict[Path, RepositoryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_repository_cache(backup_dir: Path) -> RepositoryCache:
+    """ذاكرة مشتركة لكل مجلد نسخ حتى تتشاركها جميع نسخ المستودع في العملية"""
+    key = Path(os.path.abspath(backup_dir))
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = RepositoryCache(key)
+        return _caches[key]
@@ -0,0 +1,162 @@
+"""
+أقفال مستودع النسخ الاحتياطية
+مسؤولية واحدة: منع تعارض الكتّاب والقرّاء على نفس المستودع بين الخيوط والعمليات
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows - الأقفال غير متاحة وتصبح العمليات بلا قفل
+    fcntl = None
+
+from core.exceptions import RepositoryLockedError
+from utils.config import BACKUP_NAME_PREFIX
+
+# قفل الوصول: مشترك للقرّاء وحصري للحذف والدمج
+ACCESS_LOCK_FILENAME = ".alhirz.lock"
+# قفل الكتابة: كاتب واحد فقط للمستودع في أي لحظة
+WRITER_LOCK_FILENAME = ".alhirz-writer.lock"
+# لاحقة الأرشيفات قيد الكتابة - لا تظهر في قائمة النسخ
+PARTIAL_SUFFIX = ".partial"
+
+_POLL_INTERVAL_SECONDS = 0.1
+
+
+def partial_path_for(archive_path: Path) -> Path:
+    """المسار المؤقت الذي يُكتب فيه الأرشيف قبل إعادة تسميته"""
+    return archive_path.with_name(archive_path.name + PARTIAL_SUFFIX)
+
+
+def is_stale_partial_name(name: str) -> bool:
+    """هل الاسم لأرشيف نسخة قيد الكتابة كما يسميه partial_path_for"""
+    return name.startswith(BACKUP_NAME_PREFIX) and name.endswith(".zip" + PARTIAL_SUFFIX)
+
+
+def publish_archive(partial_path: Path, archive_path: Path) -> None:
+    """نقل الأرشيف المكتمل إلى اسمه النهائي بعملية ذرية بعد حفظه على القرص"""
+    with open(partial_path, 'rb') as f:
+        os.fsync(f.fileno())
+
+    os.replace(partial_path, archive_path)
+
+    # حفظ إدخال المجلد حتى لا تضيع إعادة التسمية عند انقطاع الطاقة
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(archive_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+class RepositoryLock:
+    """أقفال fcntl للمستودع - القرّاء لا يحجبون بعضهم والكتّاب حصريون
+
+    كل اكتساب يفتح واصف ملف خاصاً به حتى تعمل الأقفال بين خيوط نفس
+    العملية، مع دعم التداخل داخل الخيط الواحد.
+    """
+
+    SHARED = 1
+    WRITER = 2
+    EXCLUSIVE = 3
+
+    def __init__(self, backup_dir: Path, timeout: float = 10.0):
+        self.backup_dir = backup_dir
+        self.timeout = timeout
+        self._held = threading.local()
+
+    @contextmanager
+    def shared(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """قفل القراءة (الاسترداد، الفحص): يمنع الحذف فقط"""
+        with self._acquire(self.SHARED, timeout):
+            yield
+
+    @contextmanager
+    def writer(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """قفل كتابة أرشيف جديد: كاتب واحد، ولا يحجب القرّاء"""
+        with self._acquire(self.WRITER, timeout) as acquired:
+            if acquired:
+                self._remove_stale_partials()
+            yield
+
+    @contextmanager
+    def exclusive(self, timeout: Optional[float] = None) -> Iterator[None]:
+        """قفل حصري (الحذف، الدمج): ينتظر انتهاء الكاتب وجميع القرّاء"""
+        with self._acquire(self.EXCLUSIVE, timeout):
+            yield
+
+    @contextmanager
+    def _acquire(self, level: int, timeout: Optional[float]) -> Iterator[bool]:
+        """اكتساب مستوى القفل مع دعم التداخل داخل نفس الخيط - يعيد True إذا اكتُسب فعلاً
+
+        الخيط الذي يحمل قفل الكتابة يرقّيه إلى حصري بقفل الوصول وحده، لأن flock على واصف
+        جديد لملف الكتابة ينتظر القفل الذي يحمله الخيط نفسه حتى انتهاء المهلة.
+        """
+        held_level = getattr(self._held, 'level', 0)
+        if fcntl is None or held_level >= level or (held_level == self.WRITER and level == self.SHARED):
+            yield False
+            return
+        if held_level == self.SHARED:
+            raise RuntimeError("لا يمكن ترقية قفل القراءة إلى قفل كتابة داخل نفس الخيط")
+
+        timeout = self.timeout if timeout is None else timeout
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        handles = []
+        try:
+            if level in (self.WRITER, self.EXCLUSIVE) and held_level != self.WRITER:
+                handles.append(self._lock_file(WRITER_LOCK_FILENAME, fcntl.LOCK_EX, timeout))
+            if level in (self.SHARED, self.EXCLUSIVE):
+                mode = fcntl.LOCK_SH if level == self.SHARED else fcntl.LOCK_EX
+                handles.append(self._lock_file(ACCESS_LOCK_FILENAME, mode, timeout))
+
+            self._held.level = level
+            yield True
+        finally:
+            self._held.level = held_level
+            for fd in reversed(handles):
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+    def _lock_file(self, filename: str, mode: int, timeout: float) -> int:
+        """فتح ملف القفل وانتظار القفل حتى المهلة المحددة"""
+        fd = os.open(self.backup_dir / filename, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(fd, mode | fcntl.LOCK_NB)
+                return fd
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    raise RepositoryLockedError(str(self.backup_dir), timeout)
+                time.sleep(_POLL_INTERVAL_SECONDS)
+
+    def _remove_stale_partials(self) -> None:
+        """حذف الأرشيفات الناقصة المتبقية من عمليات توقفت - لا كاتب آخر أثناء قفل الكتابة
+
+        لا يُحذف إلا ما يطابق اسم أرشيف نسخة قيد الكتابة (نسخة_*.zip.partial)، فملفات
+        المستخدم الأخرى في المجلد لا تُمس.
+        """
+        try:
+            for entry in os.scandir(self.backup_dir):
+                if is_stale_partial_name(entry.name) and entry.is_file():
+                    os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+_locks: Dict[Path, RepositoryLock] = {}
+_locks_lock = threading.Lock()
+
+
+def get_repository_lock(backup_dir: Path) -> RepositoryLock:
+    """قفل مشترك لكل مجلد نسخ حتى يعمل التداخل عبر جميع نسخ المستودع في العملية"""
+    key = Path(os.path.abspath(backup_dir))
+    with _locks_lock:
+        if key not in _locks:
+            _locks[key] = RepositoryLock(key)
+        return _locks[key]
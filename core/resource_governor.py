@@ -0,0 +1,197 @@
+"""
+منظم الموارد للنسخ في الخلفية
+مسؤولية واحدة: تحديد سرعة القراءة والكتابة وحصة المعالج حتى لا يثقل النسخ على الجهاز
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from core.exceptions import BackupInterruptedError
+
+_BYTES_PER_MB = 1024 * 1024
+# أقصى مدة نوم متصلة - تبقي زمن الاستجابة للإلغاء والإيقاف المؤقت قصيراً
+_MAX_SLEEP_SLICE_SECONDS = 0.1
+# نافذة قياس استهلاك المعالج
+_CPU_WINDOW_SECONDS = 1.0
+# أقل فترة بين قراءتين للحدود من مصدرها
+_LIMITS_REFRESH_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """حدود الموارد - صفر يعني بلا حد - Value Object"""
+    read_mb_per_sec: int = 0
+    write_mb_per_sec: int = 0
+    cpu_percent: int = 100
+
+    @property
+    def is_limited(self) -> bool:
+        return bool(self.read_mb_per_sec or self.write_mb_per_sec or self.cpu_percent < 100)
+
+    def describe(self) -> str:
+        """وصف مختصر للحدود المفعلة يُعرض مع رسائل التقدم"""
+        parts = []
+        if self.read_mb_per_sec:
+            parts.append(f"قراءة ≤ {self.read_mb_per_sec} MB/s")
+        if self.write_mb_per_sec:
+            parts.append(f"كتابة ≤ {self.write_mb_per_sec} MB/s")
+        if self.cpu_percent < 100:
+            parts.append(f"معالج ≤ {self.cpu_percent}%")
+        return "، ".join(parts)
+
+
+class TokenBucket:
+    """دلو الرموز - يسمح بدفعة قصيرة ثم يحافظ على المعدل المحدد"""
+
+    def __init__(self, rate_bytes_per_sec: float = 0):
+        self._lock = threading.Lock()
+        self._tokens = 0.0
+        self._updated_at = time.monotonic()
+        self.set_rate(rate_bytes_per_sec)
+
+    def set_rate(self, rate_bytes_per_sec: float) -> None:
+        """تغيير المعدل أثناء العمل - صفر يلغي الحد"""
+        with self._lock:
+            self._rate = max(rate_bytes_per_sec, 0)
+            # سعة الدلو ثانية واحدة من المعدل
+            self._capacity = self._rate
+            self._tokens = min(self._tokens, self._capacity)
+
+    def consume(self, amount: int, is_running_check: Callable[[], bool]) -> None:
+        """سحب رموز بقدر البايتات والانتظار حتى يعود الرصيد موجباً"""
+        with self._lock:
+            if self._rate <= 0:
+                return
+            self._refill()
+            self._tokens -= amount
+
+        while True:
+            with self._lock:
+                if self._rate <= 0:
+                    return
+                self._refill()
+                deficit = -self._tokens
+                rate = self._rate
+            if deficit <= 0:
+                return
+
+            time.sleep(min(deficit / rate, _MAX_SLEEP_SLICE_SECONDS))
+            if not is_running_check():
+                raise BackupInterruptedError()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+
+class ResourceGovernor:
+    """منظم الموارد - تشترك فيه محركات النسخ والاسترداد وتُعدل حدوده أثناء العمل
+
+    يمكن ربطه بمصدر للحدود (مثل ملف الإعدادات) يُعاد قراءته كل ثانية على
+    الأكثر، فتنعكس التعديلات من الواجهة أو سطر الأوامر على العمليات الجارية.
+    """
+
+    def __init__(self,
+                 limits: ResourceLimits = None,
+                 limits_source: Optional[Callable[[], ResourceLimits]] = None):
+        self._read_bucket = TokenBucket()
+        self._write_bucket = TokenBucket()
+        self._cpu_state = threading.local()
+        self._limits_source = limits_source
+        self._refreshed_at = 0.0
+        self._limits = ResourceLimits()
+        self.set_limits(limits or (limits_source() if limits_source else ResourceLimits()))
+
+    @property
+    def limits(self) -> ResourceLimits:
+        self._refresh_limits()
+        return self._limits
+
+    def set_limits(self, limits: ResourceLimits) -> None:
+        """تطبيق حدود جديدة فوراً على جميع العمليات الجارية"""
+        self._limits = limits
+        self._read_bucket.set_rate(limits.read_mb_per_sec * _BYTES_PER_MB)
+        self._write_bucket.set_rate(limits.write_mb_per_sec * _BYTES_PER_MB)
+
+    def throttle_read(self, amount: int, is_running_check: Callable[[], bool]) -> None:
+        """احتساب بايتات مقروءة والانتظار إذا تجاوزت الحد"""
+        self._refresh_limits()
+        self._read_bucket.consume(amount, is_running_check)
+
+    def throttle_write(self, amount: int, is_running_check: Callable[[], bool]) -> None:
+        """احتساب بايتات مكتوبة والانتظار إذا تجاوزت الحد"""
+        self._refresh_limits()
+        self._write_bucket.consume(amount, is_running_check)
+
+    def throttle_cpu(self, is_running_check: Callable[[], bool]) -> None:
+        """الانتظار حتى لا يتجاوز زمن المعالج للخيط الحالي الحصة المحددة من الزمن الفعلي"""
+        budget = self._limits.cpu_percent / 100
+        state = self._cpu_state
+        now_wall, now_cpu = time.monotonic(), time.thread_time()
+
+        if budget >= 1 or not hasattr(state, 'wall_start'):
+            state.wall_start, state.cpu_start = now_wall, now_cpu
+            return
+
+        # النافذة تُحاسب قبل بدء نافذة جديدة، حتى لا يفلت جزء طويل تجاوز مدتها من الحصة
+        overshoot = (now_cpu - state.cpu_start) / max(budget, 0.01) - (now_wall - state.wall_start)
+        while overshoot > 0:
+            pause = min(overshoot, _MAX_SLEEP_SLICE_SECONDS)
+            time.sleep(pause)
+            overshoot -= pause
+            if not is_running_check():
+                raise BackupInterruptedError()
+
+        if time.monotonic() - state.wall_start > _CPU_WINDOW_SECONDS:
+            state.wall_start, state.cpu_start = time.monotonic(), time.thread_time()
+
+    def describe(self) -> str:
+        """وصف الحدود الحالية لقناة التقدم - فارغ إذا لم تكن هناك حدود"""
+        limits = self.limits
+        return f" [{limits.describe()}]" if limits.is_limited else ""
+
+    @staticmethod
+    def drop_page_cache(fd: int) -> None:
+        """إخبار النظام بأن الملف المقروء لن يُحتاج قريباً حتى لا يزاحم ذاكرة التطبيقات"""
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass
+
+    def _refresh_limits(self) -> None:
+        """إعادة قراءة الحدود من مصدرها بحد أقصى مرة في الثانية"""
+        if self._limits_source is None:
+            return
+        now = time.monotonic()
+        if now - self._refreshed_at < _LIMITS_REFRESH_SECONDS:
+            return
+        self._refreshed_at = now
+        try:
+            limits = self._limits_source()
+        except Exception:
+            return
+        if limits != self._limits:
+            self.set_limits(limits)
+
+
+def load_limits_from_settings(config_manager) -> ResourceLimits:
+    """قراءة حدود الموارد من إعدادات التطبيق (app_settings.json)"""
+    settings = config_manager.load_settings()
+    return ResourceLimits(
+        read_mb_per_sec=settings.io_read_limit_mb,
+        write_mb_per_sec=settings.io_write_limit_mb,
+        cpu_percent=settings.cpu_limit_percent
+    )
+
+
+def create_settings_governor(config_manager=None) -> ResourceGovernor:
+    """منظم موارد يتابع تعديلات الحدود في ملف الإعدادات"""
+    from utils.config_manager import ConfigurationManager
+
+    config_manager = config_manager or ConfigurationManager()
+    # الإعدادات تُقرأ من الذاكرة، وتعديلات الملف من عملية أخرى يكتشفها مخزن الإعدادات
+    return ResourceGovernor(limits_source=lambda: load_limits_from_settings(config_manager))
@@ -0,0 +1,210 @@
+"""
+محرك سياسة الاحتفاظ بالنسخ
+مسؤولية واحدة: اختيار النسخ المحتفظ بها (الجد-الأب-الابن) وحذف الباقي دون فقدان ملفات ما زالت مطلوبة
+"""
+import os
+import zipfile
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional, Set, Callable, Tuple
+
+from core.archive_utils import append_in_place, copy_member_raw
+from core.backup_repository import BackupRepository
+from core.logging_system import ILogger, LoggerFactory
+from core.repository_cache import ArchiveInfo
+from utils.config import DEFAULT_BACKUP_RETENTION, MANIFEST_FILENAME
+
+
+@dataclass
+class RetentionPolicy:
+    """سياسة الاحتفاظ - Value Object"""
+    keep_last: int = DEFAULT_BACKUP_RETENTION
+    keep_daily: int = 0
+    keep_weekly: int = 0
+    keep_monthly: int = 0
+
+
+@dataclass
+class RetentionReport:
+    """تقرير تطبيق سياسة الاحتفاظ"""
+    kept: List[Path] = field(default_factory=list)
+    deleted: List[Path] = field(default_factory=list)
+    consolidated: Dict[str, int] = field(default_factory=dict)
+    # نسخ تعذرت قراءة محتوياتها فبقيت ولم تُحذف
+    unreadable: List[Path] = field(default_factory=list)
+    bytes_reclaimed: int = 0
+
+    @property
+    def deleted_count(self) -> int:
+        return len(self.deleted)
+
+    def summary(self) -> str:
+        """ملخص نصي للتقرير"""
+        reclaimed_mb = self.bytes_reclaimed / (1024 * 1024)
+        lines = [f"تم حذف {self.deleted_count} من النسخ القديمة وتحرير {reclaimed_mb:.2f} ميجابايت."]
+        carried = sum(self.consolidated.values())
+        if carried:
+            lines.append(f"تم نقل {carried} ملفاً ما زال مطلوباً إلى {len(self.consolidated)} نسخة أحدث.")
+        if self.unreadable:
+            names = "، ".join(path.name for path in self.unreadable)
+            lines.append(f"تعذرت قراءة محتويات {len(self.unreadable)} نسخة فلم تُحذف: {names}")
+        return "\n".join(lines)
+
+
+class RetentionEngine:
+    """محرك الاحتفاظ - يدمج الأعضاء المطلوبة في النسخة المحتفظ بها التالية قبل الحذف"""
+
+    def __init__(self, repository: BackupRepository = None, logger: ILogger = None):
+        self.repository = repository or BackupRepository()
+        self.logger = logger or LoggerFactory.create_default_logger()
+
+    def select_archives_to_keep(self, archives: List[ArchiveInfo], policy: RetentionPolicy) -> Set[Path]:
+        """اختيار النسخ المحتفظ بها حسب قواعد الجد-الأب-الابن (القائمة من الأحدث للأقدم)"""
+        keep = set()
+        if not archives:
+            return keep
+
+        # أحدث نسخة تبقى دائماً لأنها تحمل السجل الحالي
+        keep.add(archives[0].path)
+        keep.update(info.path for info in archives[:max(policy.keep_last, 0)])
+
+        rules: List[Tuple[int, Callable[[datetime], tuple]]] = [
+            (policy.keep_daily, lambda d: (d.year, d.month, d.day)),
+            (policy.keep_weekly, lambda d: tuple(d.isocalendar())[:2]),
+            (policy.keep_monthly, lambda d: (d.year, d.month)),
+        ]
+
+        for count, bucket_of in rules:
+            seen_buckets = set()
+            for info in archives:
+                if len(seen_buckets) >= count:
+                    break
+                bucket = bucket_of(datetime.fromtimestamp(info.mtime))
+                if bucket not in seen_buckets:
+                    seen_buckets.add(bucket)
+                    keep.add(info.path)
+
+        return keep
+
+    def apply(self, policy: RetentionPolicy) -> RetentionReport:
+        """تطبيق السياسة: دمج الأعضاء المطلوبة ثم حذف النسخ غير المحتفظ بها - تحت قفل حصري"""
+        with self.repository.lock.exclusive():
+            return self._apply(policy)
+
+    def _apply(self, policy: RetentionPolicy) -> RetentionReport:
+        """تطبيق السياسة أثناء حمل القفل الحصري"""
+        report = RetentionReport()
+        archives = self.repository.get_backups_info()
+        keep = self.select_archives_to_keep(archives, policy)
+
+        # النسخة التي تعذرت قراءتها لا يُعرف ما تحمله من ملفات مطلوبة، فتبقى ولا تستقبل ملفات منقولة
+        members: Dict[Path, Set[str]] = {}
+        for info in archives:
+            names = self._member_names(info.path)
+            if names is None:
+                keep.add(info.path)
+                report.unreadable.append(info.path)
+            else:
+                members[info.path] = names
+
+        report.kept = [info.path for info in archives if info.path in keep]
+        to_delete = [info for info in archives if info.path not in keep]
+        if not to_delete:
+            return report
+
+        carries = self._plan_carries(archives, keep, members)
+        growth = 0
+        for target, carried in carries.items():
+            growth += self._consolidate(target, carried)
+            report.consolidated[target.name] = len(carried)
+
+        report.deleted = [info.path for info in to_delete]
+        deleted_count = self.repository.delete_backups(report.deleted)
+        if deleted_count != len(report.deleted):
+            self.logger.warning("تعذر حذف بعض النسخ القديمة", {
+                'expected': len(report.deleted),
+                'deleted': deleted_count
+            })
+
+        report.bytes_reclaimed = sum(info.size for info in to_delete) - growth
+        self.logger.info("تم تطبيق سياسة الاحتفاظ", {
+            'deleted': deleted_count,
+            'consolidated_members': sum(report.consolidated.values()),
+            'unreadable': len(report.unreadable),
+            'bytes_reclaimed': report.bytes_reclaimed
+        })
+        return report
+
+    def _plan_carries(self,
+                      archives: List[ArchiveInfo],
+                      keep: Set[Path],
+                      members: Dict[Path, Set[str]]) -> Dict[Path, List[Tuple[Path, str]]]:
+        """تحديد ما تحتاجه كل نسخة محتفظ بها من ملفات في نسخ ستُحذف والنسخة التي ستستقبل كل ملف
+
+        ملف في سجل نسخة محتفظ بها موجود في أحدث نسخة تحمله منها أو مما قبلها؛ إذا كانت تلك
+        النسخة ستُحذف يُنقل الملف إلى أقرب نسخة مقروءة محتفظ بها بعدها.
+        """
+        next_kept: Dict[Path, Optional[Path]] = {}
+        latest_kept = None
+        for info in archives:
+            if info.path in keep and info.path in members:
+                latest_kept = info.path
+            next_kept[info.path] = latest_kept
+
+        planned: Dict[Path, Dict[str, Path]] = {}
+        for index, kept in enumerate(archives):
+            if kept.path not in keep:
+                continue
+            # مدخلات الملفات قيمها تواريخ تعديل؛ المفاتيح الأخرى (_sizes وغيرها) قيمها قواميس
+            pending = {name for name, value in self.repository.get_backup_manifest(kept.path).items()
+                       if isinstance(value, (int, float))}
+            for info in archives[index:]:
+                if not pending:
+                    break
+                found = pending & members.get(info.path, set())
+                if not found:
+                    continue
+                pending -= found
+                target = next_kept[info.path]
+                if info.path not in keep and target is not None:
+                    carried = planned.setdefault(target, {})
+                    for name in found:
+                        carried.setdefault(name, info.path)
+
+        return {target: [(source, name) for name, source in sorted(carried.items())]
+                for target, carried in planned.items()}
+
+    def _member_names(self, archive_path: Path) -> Optional[Set[str]]:
+        """أسماء أعضاء الأرشيف من الدليل المركزي فقط - None إذا تعذرت قراءته"""
+        try:
+            with zipfile.ZipFile(archive_path, 'r') as zipf:
+                return {name for name in zipf.namelist() if name != MANIFEST_FILENAME}
+        except (OSError, zipfile.BadZipFile) as e:
+            self.logger.warning(f"تعذر قراءة محتويات النسخة {archive_path.name}: {e}")
+            return None
+
+    def _consolidate(self, target: Path, members: List[Tuple[Path, str]]) -> int:
+        """إضافة الأعضاء المنقولة إلى آخر النسخة الهدف بنسخ خام وإرجاع الزيادة في حجمها
+
+        أعضاء الهدف لا تُعاد كتابتها، والمنقولة تُنسخ ببياناتها المضغوطة دون فك أو إعادة ضغط.
+        """
+        original_stat = target.stat()
+
+        by_source: Dict[Path, List[str]] = {}
+        for source_path, name in members:
+            by_source.setdefault(source_path, []).append(name)
+
+        try:
+            with append_in_place(target) as destination:
+                for source_path, names in by_source.items():
+                    with zipfile.ZipFile(source_path, 'r') as source:
+                        for name in names:
+                            if name not in destination.NameToInfo:
+                                copy_member_raw(source, source.getinfo(name), destination)
+        finally:
+            # الحفاظ على وقت التعديل لأن ترتيب النسخ يعتمد عليه
+            os.utime(target, ns=(original_stat.st_atime_ns, original_stat.st_mtime_ns))
+            self.repository.invalidate_cache()
+
+        return target.stat().st_size - original_stat.st_size
@@ -0,0 +1,128 @@
+"""
+طابور إعادة المحاولة على مستوى الملف
+مسؤولية واحدة: عزل أخطاء الملفات المفردة وإعادة محاولة المؤقتة منها في نهاية العملية
+"""
+import errno
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from core.exceptions import BackupInterruptedError
+
+# أخطاء يُتوقع زوالها: ملف مقفل أو مشغول أو قرص شبكي لم يستجب
+_TRANSIENT_ERRNOS = {
+    errno.EAGAIN, errno.EBUSY, errno.EINTR, errno.ETIMEDOUT, errno.ETXTBSY,
+    errno.EDEADLK, errno.ENOLCK, errno.ESTALE, errno.EIO
+}
+# أخطاء المشاركة في ويندوز (ملف مفتوح من برنامج آخر)
+_TRANSIENT_WINERRORS = {32, 33}
+# أخطاء الوجهة التي ستتكرر مع كل ملف فتوقف العملية كلها
+_FATAL_ERRNOS = {errno.ENOSPC, errno.EDQUOT, errno.EROFS}
+# أقصى مدة نوم متصلة أثناء انتظار موعد المحاولة التالية
+_MAX_SLEEP_SLICE_SECONDS = 0.1
+# أقصى عدد من الملفات الفاشلة يُعرض في رسالة النتيجة
+_REPORT_PREVIEW_COUNT = 5
+
+
+def is_transient_error(error: Exception) -> bool:
+    """هل الخطأ مؤقت ويستحق إعادة المحاولة لاحقاً"""
+    if not isinstance(error, OSError) or isinstance(error, (FileNotFoundError, IsADirectoryError)):
+        return False
+    return (error.errno in _TRANSIENT_ERRNOS or
+            getattr(error, 'winerror', None) in _TRANSIENT_WINERRORS)
+
+
+def is_fatal_error(error: Exception) -> bool:
+    """هل الخطأ يخص الوجهة ولا فائدة من متابعة بقية الملفات بعده"""
+    return isinstance(error, OSError) and error.errno in _FATAL_ERRNOS
+
+
+def describe_error(error: Exception) -> str:
+    """وصف مختصر للخطأ يُحفظ في السجل والتقرير"""
+    if isinstance(error, OSError) and error.strerror:
+        return error.strerror
+    return str(error) or error.__class__.__name__
+
+
+def format_failures(failures: Dict[str, str], title: str) -> str:
+    """سطور تقرير الملفات التي تعذرت معالجتها - فارغ إذا لم يفشل شيء"""
+    if not failures:
+        return ""
+    lines = [f"\n\n⚠ {title}: {len(failures)} ملفاً."]
+    for path, reason in list(failures.items())[:_REPORT_PREVIEW_COUNT]:
+        lines.append(f"  • {path} ({reason})")
+    if len(failures) > _REPORT_PREVIEW_COUNT:
+        lines.append(f"  … و{len(failures) - _REPORT_PREVIEW_COUNT} ملفاً آخر (التفاصيل في السجل).")
+    return "\n".join(lines)
+
+
+@dataclass(order=True)
+class _PendingItem:
+    due_at: float
+    sequence: int
+    key: str = field(compare=False)
+    item: Any = field(compare=False)
+    attempts: int = field(compare=False, default=1)
+
+
+class FileRetryQueue:
+    """طابور الملفات المؤجلة - يعالج الملف التالي المستحق بينما تنتظر الملفات الأخرى مهلتها
+
+    الملف الذي يفشل بخطأ مؤقت يُؤجل بمهلة متزايدة أسياً حتى max_attempts محاولة،
+    والفشل الدائم أو استنفاد المحاولات يُسجل في failures دون إيقاف العملية.
+    """
+
+    def __init__(self,
+                 max_attempts: int = 4,
+                 base_delay: float = 0.5,
+                 max_delay: float = 8.0,
+                 isolated_errors: Tuple[Type[Exception], ...] = (OSError,)):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.isolated_errors = isolated_errors
+        self.failures: Dict[str, str] = {}
+        self._pending: List[_PendingItem] = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def isolates(self, error: Exception) -> bool:
+        """هل يقتصر أثر الخطأ على ملفه فتتابع العملية بقية الملفات"""
+        return isinstance(error, self.isolated_errors) and not is_fatal_error(error)
+
+    def handle_failure(self, key: str, item: Any, error: Exception, attempts: int = 1) -> None:
+        """تأجيل الملف إذا كان الخطأ مؤقتاً، وإلا تسجيله فشلاً دائماً"""
+        if is_transient_error(error) and attempts < self.max_attempts:
+            delay = min(self.base_delay * (2 ** (attempts - 1)), self.max_delay)
+            heapq.heappush(self._pending, _PendingItem(
+                time.monotonic() + delay, next(self._sequence), key, item, attempts))
+        else:
+            self.failures[key] = describe_error(error)
+
+    def drain(self,
+              process: Callable[[Any], None],
+              is_running_check: Callable[[], bool],
+              on_retry: Optional[Callable[[str, int], None]] = None) -> None:
+        """إعادة محاولة الملفات المؤجلة حسب مواعيدها حتى تنجح أو تستنفد محاولاتها"""
+        while self._pending:
+            pending = self._pending[0]
+            while time.monotonic() < pending.due_at:
+                if not is_running_check():
+                    raise BackupInterruptedError()
+                time.sleep(max(min(pending.due_at - time.monotonic(), _MAX_SLEEP_SLICE_SECONDS), 0))
+            if not is_running_check():
+                raise BackupInterruptedError()
+
+            heapq.heappop(self._pending)
+            if on_retry:
+                on_retry(pending.key, pending.attempts + 1)
+            try:
+                process(pending.item)
+            except Exception as e:
+                if not self.isolates(e):
+                    raise
+                self.handle_failure(pending.key, pending.item, e, pending.attempts + 1)
@@ -0,0 +1,222 @@
+"""
+مقاييس تشغيل النسخ
+مسؤولية واحدة: قياس زمن كل مرحلة وأحجام البيانات لكل تشغيل وحفظها للمراقبة
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from utils.config import APP_DIR, METRICS_FILENAME
+
+# متغير بيئة يحدد ملف Prometheus النصي ويتقدم على الإعدادات
+METRICS_TEXTFILE_ENV = "ALHIRZ_METRICS_TEXTFILE"
+# حالات التشغيل الناجح
+SUCCESS_STATUSES = ("created", "unchanged")
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """أقصى ذاكرة مقيمة للعملية وعملياتها الفرعية المنتهية - None إذا لم يتوفر القياس"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss بالكيلوبايت في لينكس وبالبايت في macOS
+    scale = 1 if os.uname().sysname == 'Darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * scale
+
+
+@dataclass
+class BackupRunMetrics:
+    """مقاييس تشغيل نسخ واحد - Value Object يُحفظ سطراً في ملف JSON lines
+
+    أزمنة المراحل هي زمن انشغالها؛ في المحرك المتوازي تتداخل المراحل فقد يتجاوز
+    مجموعها duration_seconds.
+    """
+    started_at: float
+    backup_path: str
+    engine: str
+    status: str = "running"
+    duration_seconds: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    files_seen: int = 0
+    files_changed: int = 0
+    files_skipped: int = 0
+    files_failed: int = 0
+    bytes_read: int = 0
+    bytes_compressed: int = 0
+    bytes_written: int = 0
+    peak_rss_bytes: Optional[int] = None
+
+    @property
+    def compression_ratio(self) -> float:
+        """حجم البيانات المضغوطة إلى حجمها الأصلي - أقل من 1 يعني توفيراً"""
+        return self.bytes_compressed / self.bytes_read if self.bytes_read else 1.0
+
+    @property
+    def succeeded(self) -> bool:
+        return self.status in SUCCESS_STATUSES
+
+    @property
+    def throughput_bytes_per_second(self) -> float:
+        return self.bytes_read / self.duration_seconds if self.duration_seconds else 0.0
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data['compression_ratio'] = round(self.compression_ratio, 4)
+        data['throughput_bytes_per_second'] = round(self.throughput_bytes_per_second, 1)
+        return data
+
+
+class MetricsRecorder:
+    """مسجل مقاييس التشغيل الجاري - آمن للاستخدام من خيوط المراحل المتوازية"""
+
+    def __init__(self, backup_path: Path = None, engine: str = ""):
+        self.metrics = BackupRunMetrics(started_at=time.time(), backup_path=str(backup_path or ""), engine=engine)
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """قياس زمن مرحلة - التكرار يُجمع"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.metrics.phases[name] = self.metrics.phases.get(name, 0.0) + seconds
+
+    def add(self, **counters: int) -> None:
+        """زيادة العدادات (bytes_read، files_changed، ...)"""
+        with self._lock:
+            for name, value in counters.items():
+                setattr(self.metrics, name, getattr(self.metrics, name) + value)
+
+    def finish(self, status: str, archive_path: Optional[Path] = None) -> BackupRunMetrics:
+        """إنهاء القياس وإرجاع المقاييس النهائية"""
+        metrics = self.metrics
+        metrics.status = status
+        metrics.duration_seconds = round(time.perf_counter() - self._started, 4)
+        metrics.phases = {name: round(seconds, 4) for name, seconds in metrics.phases.items()}
+        metrics.files_skipped = max(metrics.files_seen - metrics.files_changed, 0)
+        if archive_path is not None and archive_path.exists():
+            metrics.bytes_written = archive_path.stat().st_size
+        metrics.peak_rss_bytes = peak_rss_bytes()
+        return metrics
+
+
+class MetricsStore:
+    """مخزن المقاييس - سطر JSON لكل تشغيل، وملف Prometheus نصي اختياري لـ node-exporter"""
+
+    def __init__(self, path: Path = None, textfile_path: Optional[Path] = None):
+        self.path = path or (APP_DIR / METRICS_FILENAME)
+        self.textfile_path = textfile_path
+
+    def append(self, metrics: BackupRunMetrics) -> None:
+        """حفظ مقاييس التشغيل وتحديث ملف Prometheus"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(metrics.to_dict(), ensure_ascii=False) + '\n')
+
+        if self.textfile_path:
+            self._write_textfile(metrics, self._last_success_timestamp(metrics))
+
+    def read_recent(self, limit: int = 20) -> List[dict]:
+        """آخر التشغيلات المحفوظة من الأحدث إلى الأقدم"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()[-limit:]
+        except OSError:
+            return []
+
+        runs = []
+        for line in reversed(lines):
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue
+        return runs
+
+    def _last_success_timestamp(self, metrics: BackupRunMetrics) -> Optional[float]:
+        """موعد آخر تشغيل ناجح - التشغيل الفاشل لا يمحو آخر نجاح سابق"""
+        if metrics.succeeded:
+            return metrics.started_at
+        for run in self.read_recent(limit=1000):
+            if run.get('status') in SUCCESS_STATUSES:
+                return run.get('started_at')
+        return None
+
+    def _write_textfile(self, metrics: BackupRunMetrics, last_success: Optional[float]) -> None:
+        """كتابة ذرية حتى لا يقرأ node-exporter ملفاً نصف مكتوب"""
+        lines = [
+            "# HELP alhirz_backup_last_run_timestamp_seconds Start time of the last backup run.",
+            "# TYPE alhirz_backup_last_run_timestamp_seconds gauge",
+            f"alhirz_backup_last_run_timestamp_seconds {metrics.started_at:.0f}",
+            "# HELP alhirz_backup_last_success Whether the last backup run completed.",
+            "# TYPE alhirz_backup_last_success gauge",
+            f"alhirz_backup_last_success {int(metrics.succeeded)}",
+            "# HELP alhirz_backup_last_duration_seconds Wall-clock duration of the last backup run.",
+            "# TYPE alhirz_backup_last_duration_seconds gauge",
+            f"alhirz_backup_last_duration_seconds {metrics.duration_seconds}",
+            "# HELP alhirz_backup_last_phase_seconds Busy time per phase of the last backup run.",
+            "# TYPE alhirz_backup_last_phase_seconds gauge",
+        ]
+        lines += [f'alhirz_backup_last_phase_seconds{{phase="{name}"}} {seconds}'
+                  for name, seconds in metrics.phases.items()]
+        lines += [
+            "# HELP alhirz_backup_last_files Files handled by the last backup run.",
+            "# TYPE alhirz_backup_last_files gauge",
+            f'alhirz_backup_last_files{{state="seen"}} {metrics.files_seen}',
+            f'alhirz_backup_last_files{{state="changed"}} {metrics.files_changed}',
+            f'alhirz_backup_last_files{{state="skipped"}} {metrics.files_skipped}',
+            f'alhirz_backup_last_files{{state="failed"}} {metrics.files_failed}',
+            "# HELP alhirz_backup_last_bytes Bytes handled by the last backup run.",
+            "# TYPE alhirz_backup_last_bytes gauge",
+            f'alhirz_backup_last_bytes{{kind="read"}} {metrics.bytes_read}',
+            f'alhirz_backup_last_bytes{{kind="written"}} {metrics.bytes_written}',
+            "# HELP alhirz_backup_last_throughput_bytes_per_second Source bytes read per second.",
+            "# TYPE alhirz_backup_last_throughput_bytes_per_second gauge",
+            f"alhirz_backup_last_throughput_bytes_per_second {metrics.throughput_bytes_per_second:.1f}",
+            "# HELP alhirz_backup_last_compression_ratio Compressed size over source size.",
+            "# TYPE alhirz_backup_last_compression_ratio gauge",
+            f"alhirz_backup_last_compression_ratio {metrics.compression_ratio:.4f}",
+        ]
+        if last_success is not None:
+            lines += [
+                "# HELP alhirz_backup_last_success_timestamp_seconds Start time of the last successful backup run.",
+                "# TYPE alhirz_backup_last_success_timestamp_seconds gauge",
+                f"alhirz_backup_last_success_timestamp_seconds {last_success:.0f}",
+            ]
+        if metrics.peak_rss_bytes is not None:
+            lines += [
+                "# HELP alhirz_backup_last_peak_rss_bytes Peak resident memory during the last backup run.",
+                "# TYPE alhirz_backup_last_peak_rss_bytes gauge",
+                f"alhirz_backup_last_peak_rss_bytes {metrics.peak_rss_bytes}",
+            ]
+
+        textfile_path = Path(self.textfile_path)
+        temp_path = textfile_path.with_name(textfile_path.name + '.tmp')
+        textfile_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(temp_path, textfile_path)
+
+
+def create_metrics_store(config_manager=None) -> MetricsStore:
+    """مخزن المقاييس حسب الإعدادات - متغير البيئة يتقدم على metrics_textfile_path"""
+    textfile_path = os.environ.get(METRICS_TEXTFILE_ENV)
+    if textfile_path is None:
+        from utils.config_manager import ConfigurationManager
+
+        config_manager = config_manager or ConfigurationManager()
+        textfile_path = config_manager.get_setting('metrics_textfile_path', '')
+    return MetricsStore(textfile_path=Path(textfile_path).expanduser() if textfile_path else None)
@@ -0,0 +1,120 @@
+"""
+ذاكرة نتائج الفحص
+مسؤولية واحدة: الاحتفاظ بآخر فحص كامل لمجلدات كل مستودع لتستخدمه المعاينة والنسخ التالي دون إعادة المرور على القرص
+"""
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.file_scanner import ExclusionMatcher, FileScanner, ScannedDirectory
+from utils.config import HOME_DIR
+
+# أقصى عمر لفحص يستخدمه النسخ بدل فحص جديد - الملفات التي تُنشأ بعده تنتظر النسخة التالية
+SCAN_REUSE_MAX_AGE_SECONDS = 120.0
+
+
+class ScanIndex:
+    """فحص كامل لمجموعة مجلدات قبل تطبيق الاستبعاد - تُطبق عليه أي قواعد لاحقاً في الذاكرة"""
+
+    def __init__(self, folders: List[Path]):
+        self.folders = folder_key(folders)
+        self.scanned_at = time.time()
+        self.directories: List[ScannedDirectory] = []
+        self.file_count = 0
+        self.total_bytes = 0
+        # النسخ يستخدم الفحص مرة واحدة فقط
+        self.used_by_backup = False
+
+    def add(self, directory: ScannedDirectory) -> None:
+        self.directories.append(directory)
+        self.file_count += len(directory)
+        self.total_bytes += sum(directory.sizes)
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.scanned_at
+
+    def iter_files(self, exclusions: List[str]) -> Iterator[Tuple[str, int, float]]:
+        """الملفات غير المستبعدة (المسار النسبي، الحجم، تاريخ التعديل)"""
+        matcher = ExclusionMatcher(exclusions)
+        for directory in self.directories:
+            yield from _included_files(directory, matcher)
+
+
+def _included_files(directory: ScannedDirectory, matcher: ExclusionMatcher) -> Iterator[Tuple[str, int, float]]:
+    if matcher.is_directory_excluded(directory.path):
+        return
+    for name, size, mtime in zip(directory.names, directory.sizes, directory.mtimes):
+        if not matcher.matches(name):
+            yield directory.relative_path(name), size, mtime
+
+
+class IndexedFileScanner(FileScanner):
+    """ماسح يُرجع ملفات فحص محفوظ - تواريخ الملفات وأحجامها تُقرأ من جديد عند نسخها"""
+
+    def __init__(self, index: ScanIndex):
+        self.index = index
+
+    def iter_files(self, paths: List[Path], exclusions: List[str]) -> Iterator[Path]:
+        for relative_path, _, _ in self.index.iter_files(exclusions):
+            yield HOME_DIR / relative_path
+
+
+class IndexingFileScanner(FileScanner):
+    """ماسح النسخ - يمر على القرص مرة واحدة ويحفظ الفحص الكامل قبل الاستبعاد لتحليل الاستثناءات"""
+
+    def __init__(self, scanner: FileScanner, backup_dir: Path):
+        self.scanner = scanner
+        self.backup_dir = backup_dir
+
+    def iter_files(self, paths: List[Path], exclusions: List[str]) -> Iterator[Path]:
+        index = ScanIndex(paths)
+        # النسخ الحالي استخدم هذا الفحص فلا يعيد النسخ التالي استخدامه
+        index.used_by_backup = True
+        matcher = ExclusionMatcher(exclusions)
+        for directory in self.scanner.walk(paths):
+            index.add(directory)
+            for relative_path, _, _ in _included_files(directory, matcher):
+                yield HOME_DIR / relative_path
+        # الفحص الناقص لا يُحفظ حتى لا تظهر صفحة الاستثناءات أرقاماً ناقصة
+        store_scan_index(self.backup_dir, index)
+
+
+def folder_key(folders: List[Path]) -> Tuple[str, ...]:
+    """مفتاح مجموعة المجلدات - الترتيب لا يغير نتيجة الفحص"""
+    return tuple(sorted(os.path.abspath(folder) for folder in folders))
+
+
+_scans: Dict[Path, ScanIndex] = {}
+_scans_lock = threading.Lock()
+
+
+def _repository_key(backup_dir: Path) -> Path:
+    return Path(os.path.abspath(backup_dir))
+
+
+def store_scan_index(backup_dir: Path, index: ScanIndex) -> None:
+    """حفظ آخر فحص كامل لمستودع - يحل محل الفحص السابق"""
+    with _scans_lock:
+        _scans[_repository_key(backup_dir)] = index
+
+
+def get_scan_index(backup_dir: Path) -> Optional[ScanIndex]:
+    """آخر فحص كامل لمستودع مهما كان عمره - للتقديرات التي لا تحتاج حالة القرص الآن"""
+    with _scans_lock:
+        return _scans.get(_repository_key(backup_dir))
+
+
+def take_scan_for_backup(backup_dir: Path,
+                         folders: List[Path],
+                         max_age: float = SCAN_REUSE_MAX_AGE_SECONDS) -> Optional[ScanIndex]:
+    """فحص حديث لنفس المجلدات لم يستخدمه نسخ بعد، أو None فيفحص النسخ القرص بنفسه"""
+    with _scans_lock:
+        index = _scans.get(_repository_key(backup_dir))
+        if (index is None or index.used_by_backup or index.folders != folder_key(folders)
+                or index.age_seconds > max_age):
+            return None
+        index.used_by_backup = True
+        return index
@@ -0,0 +1,170 @@
+"""
+فهرس البحث في محتويات النسخ الاحتياطية
+مسؤولية واحدة: فهرسة مسارات الملفات داخل جميع الأرشيفات والبحث فيها بسرعة
+"""
+import sqlite3
+import threading
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Tuple, Optional
+
+from core.backup_repository import BackupRepository
+from core.logging_system import ILogger, LoggerFactory
+from utils.config import APP_DIR, MANIFEST_FILENAME, SEARCH_INDEX_FILENAME
+
+# أقل طول لاستعلام يستفيد من فهرس الثلاثيات - الأقصر منه يحتاج مسح الجدول كاملاً فلا يُبحث به
+MIN_QUERY_LENGTH = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archives (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    directory TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archives_directory ON archives(directory);
+CREATE TABLE IF NOT EXISTS members (
+    id INTEGER PRIMARY KEY,
+    archive_id INTEGER NOT NULL REFERENCES archives(id),
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS members_archive ON members(archive_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS members_fts USING fts5(
+    path, content='members', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS members_after_insert AFTER INSERT ON members BEGIN
+    INSERT INTO members_fts(rowid, path) VALUES (new.id, new.path);
+END;
+CREATE TRIGGER IF NOT EXISTS members_after_delete AFTER DELETE ON members BEGIN
+    INSERT INTO members_fts(members_fts, rowid, path) VALUES ('delete', old.id, old.path);
+END;
+"""
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """نتيجة بحث واحدة - Value Object"""
+    member_path: str
+    size: int
+    backup_path: Path
+    backup_mtime: float
+
+
+class SearchIndex:
+    """فهرس البحث - SQLite FTS5 بمقسم الثلاثيات مع تحديث تراكمي حسب قائمة المستودع"""
+
+    def __init__(self,
+                 repository: BackupRepository = None,
+                 db_path: Path = None,
+                 logger: ILogger = None):
+        self.repository = repository or BackupRepository()
+        self.db_path = db_path or (APP_DIR / SEARCH_INDEX_FILENAME)
+        self.logger = logger or LoggerFactory.create_default_logger()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def sync(self) -> Tuple[int, int]:
+        """مزامنة الفهرس مع قائمة النسخ: فهرسة الجديد والمعدل وحذف المحذوف"""
+        archives = {str(info.path): info for info in self.repository.get_backups_info()}
+        directory = str(self.repository.cache.backup_dir)
+        added = removed = 0
+
+        with self._lock:
+            connection = self._connect()
+            indexed = {
+                path: (size, mtime)
+                for path, size, mtime in connection.execute(
+                    "SELECT path, size, mtime FROM archives WHERE directory = ?", (directory,))
+            }
+
+            for path, (size, mtime) in indexed.items():
+                info = archives.get(path)
+                if info is None or (info.size, info.mtime) != (size, mtime):
+                    self._remove_archive(connection, path)
+                    removed += 1
+
+            for path, info in archives.items():
+                if indexed.get(path) != (info.size, info.mtime):
+                    if self._add_archive(connection, info.path, info.size, info.mtime):
+                        added += 1
+
+        if added or removed:
+            self.logger.info("تم تحديث فهرس البحث", {'added': added, 'removed': removed})
+        return added, removed
+
+    def search(self, query: str, limit: int = 200) -> List[SearchResult]:
+        """البحث عن الملفات التي يحتوي مسارها على النص المطلوب - الأحدث أولاً
+
+        لا يزامن الفهرس: المزامنة بعد كل كتابة أو حذف على المستودع وعند تحميل قائمة النسخ.
+        الاستعلام الأقصر من MIN_QUERY_LENGTH لا يعيد نتائج لأنه لا يكوّن ثلاثية في الفهرس.
+        """
+        query = query.strip()
+        if len(query) < MIN_QUERY_LENGTH:
+            return []
+
+        sql = """
+            SELECT m.path, m.size, a.path, a.mtime
+            FROM members_fts
+            JOIN members m ON m.id = members_fts.rowid
+            JOIN archives a ON a.id = m.archive_id
+            WHERE members_fts MATCH ?
+            ORDER BY members_fts.rowid DESC
+            LIMIT ?
+        """
+        params = ('"' + query.replace('"', '""') + '"', limit)
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+
+        return [SearchResult(member_path, size, Path(backup_path), mtime)
+                for member_path, size, backup_path, mtime in rows]
+
+    def close(self) -> None:
+        """إغلاق الاتصال بقاعدة البيانات"""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        """فتح الاتصال عند أول استخدام وإنشاء الجداول"""
+        if self._connection is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def _add_archive(self, connection: sqlite3.Connection, archive_path: Path, size: int, mtime: float) -> bool:
+        """فهرسة أعضاء أرشيف واحد من الدليل المركزي فقط"""
+        try:
+            with zipfile.ZipFile(archive_path, 'r') as zipf:
+                members = [(info.filename, info.file_size) for info in zipf.infolist()
+                           if not info.is_dir() and info.filename != MANIFEST_FILENAME]
+        except (OSError, zipfile.BadZipFile) as e:
+            self.logger.warning(f"تعذر فهرسة النسخة {archive_path.name}: {e}")
+            return False
+
+        with connection:
+            cursor = connection.execute(
+                "INSERT INTO archives(path, directory, size, mtime) VALUES (?, ?, ?, ?)",
+                (str(archive_path), str(archive_path.parent), size, mtime))
+            archive_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO members(archive_id, path, size) VALUES (?, ?, ?)",
+                ((archive_id, name, file_size) for name, file_size in members))
+        return True
+
+    def _remove_archive(self, connection: sqlite3.Connection, archive_path: str) -> None:
+        """حذف أرشيف وأعضائه من الفهرس"""
+        with connection:
+            row = connection.execute("SELECT id FROM archives WHERE path = ?", (archive_path,)).fetchone()
+            if row is None:
+                return
+            connection.execute("DELETE FROM members WHERE archive_id = ?", (row[0],))
+            connection.execute("DELETE FROM archives WHERE id = ?", (row[0],))
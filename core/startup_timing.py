@@ -0,0 +1,63 @@
+"""
+قياس زمن بدء التشغيل
+مسؤولية واحدة: تسجيل مراحل الإقلاع بأزمنتها وإبلاغ المستمعين بها
+"""
+import os
+import sys
+import time
+from typing import List, Tuple, Callable, Optional
+
+from core.logging_system import ILogger, LoggerFactory
+
+# تفعيل طباعة مراحل الإقلاع على stderr
+STARTUP_TIMING_ENV = "ALHIRZ_STARTUP_TIMING"
+
+StartupListener = Callable[[str, float], None]
+
+
+class StartupTimer:
+    """مؤقت الإقلاع - يسجل الزمن المنقضي بالميلي ثانية منذ بدء القياس لكل مرحلة"""
+
+    def __init__(self):
+        self._started_at = time.perf_counter()
+        self._marks: List[Tuple[str, float]] = []
+        self._listeners: List[StartupListener] = []
+        self._finished = False
+
+        if os.environ.get(STARTUP_TIMING_ENV):
+            self.add_listener(lambda stage, elapsed_ms: sys.stderr.write(
+                f"[startup] {stage}: {elapsed_ms:.1f} ms\n"))
+
+    def start(self) -> None:
+        """إعادة ضبط نقطة البداية - تُستدعى أول ما تبدأ نقطة الدخول"""
+        self._started_at = time.perf_counter()
+        self._marks.clear()
+        self._finished = False
+
+    def mark(self, stage: str) -> float:
+        """تسجيل انتهاء مرحلة وإرجاع الزمن المنقضي"""
+        elapsed_ms = (time.perf_counter() - self._started_at) * 1000
+        self._marks.append((stage, elapsed_ms))
+        for listener in self._listeners:
+            listener(stage, elapsed_ms)
+        return elapsed_ms
+
+    def finish(self, stage: str = "ready", logger: Optional[ILogger] = None) -> None:
+        """تسجيل المرحلة الأخيرة وكتابة ملخص الإقلاع في السجل مرة واحدة"""
+        if self._finished:
+            return
+        self._finished = True
+        self.mark(stage)
+        (logger or LoggerFactory.create_default_logger()).info(
+            "زمن بدء التشغيل", {name: round(elapsed, 1) for name, elapsed in self._marks})
+
+    def add_listener(self, listener: StartupListener) -> None:
+        """إضافة مستمع يُستدعى عند كل مرحلة - نقطة ربط لأدوات القياس"""
+        self._listeners.append(listener)
+
+    @property
+    def marks(self) -> List[Tuple[str, float]]:
+        return list(self._marks)
+
+
+startup_timer = StartupTimer()
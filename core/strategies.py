@@ -1,122 +1,380 @@
 import json
+import os
+import stat
+import tempfile
 import zipfile
+import zlib
 from pathlib import Path
-from typing import List, Callable, Dict, Any
+from typing import List, Callable, Dict, Any, Optional
 
 from interfaces.backup_interfaces import IBackupStrategy, IRestoreStrategy
-from utils.config import HOME_DIR, MANIFEST_FILENAME
+from core.archive_browser import open_catalog
+from core.exceptions import CorruptedBackupError, BackupInterruptedError
+from core.resource_governor import ResourceGovernor
+from core.retry_queue import FileRetryQueue, describe_error, format_failures
+from core.run_metrics import MetricsRecorder
+from core.tracing import LARGE_FILE_TRACE_MIN_SIZE, NULL_SPAN, trace_span
+from utils.config import HOME_DIR, MANIFEST_FILENAME, MANIFEST_SIZES_KEY
+
+# حجم الجزء المقروء في كل خطوة - يحدد أقصى زمن للاستجابة للإلغاء والإيقاف المؤقت
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# صلاحية الملف المسترد إذا لم يحمل العضو صلاحيته - كما ينشئه open حسب umask العملية
+_PROCESS_UMASK = os.umask(0)
+os.umask(_PROCESS_UMASK)
+DEFAULT_FILE_MODE = 0o666 & ~_PROCESS_UMASK
+
+# خوارزميات الضغط المتاحة لأعضاء الأرشيف - جميعها يقرؤها zipfile عند الاسترداد
+ARCHIVE_CODECS = {
+    "deflate": zipfile.ZIP_DEFLATED,
+    "stored": zipfile.ZIP_STORED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+DEFAULT_CODEC = "deflate"
+
+
+def copy_stream(source, 
+                destination, 
+                is_running_check: Callable[[], bool],
+                governor: ResourceGovernor = None) -> None:
+    """نسخ البيانات على أجزاء مع فحص الإلغاء والإيقاف المؤقت وحدود الموارد بين كل جزء
+
+    حد الكتابة يُحتسب بحجم البيانات قبل الضغط، وهو أكبر من المكتوب فعلاً في النسخ.
+    """
+    while True:
+        if not is_running_check():
+            raise BackupInterruptedError()
+        chunk = source.read(STREAM_CHUNK_SIZE)
+        if not chunk:
+            break
+        if governor:
+            governor.throttle_read(len(chunk), is_running_check)
+        destination.write(chunk)
+        if governor:
+            governor.throttle_write(len(chunk), is_running_check)
+            governor.throttle_cpu(is_running_check)
 
 
 class IncrementalBackupStrategy(IBackupStrategy):
     """استراتيجية النسخ التراكمي - مسؤولية واحدة: إنشاء نسخ تراكمية"""
     
-    def __init__(self, old_manifest: Dict[str, Any]):
+    def __init__(self, 
+                 old_manifest: Dict[str, Any], 
+                 governor: ResourceGovernor = None,
+                 metrics: MetricsRecorder = None,
+                 codec: str = DEFAULT_CODEC,
+                 compression_level: Optional[int] = None):
         self.old_manifest = old_manifest
+        # أحجام الملفات التي دخلت السجل الجديد، تُحفظ فيه تحت MANIFEST_SIZES_KEY
+        self.sizes: Dict[str, int] = {}
+        self.governor = governor or ResourceGovernor()
+        self.metrics = metrics or MetricsRecorder()
+        self.compress_type = ARCHIVE_CODECS[codec]
+        # None يعني المستوى الافتراضي للخوارزمية
+        self.compression_level = compression_level
     
     def create_backup(self, 
                      files: List[Path], 
                      destination: Path, 
                      progress_callback: Callable[[int, str], None],
-                     is_running_check: Callable[[], bool]) -> None:
-        """إنشاء نسخة احتياطية تراكمية"""
+                     is_running_check: Callable[[], bool]) -> Dict[str, str]:
+        """إنشاء نسخة احتياطية تراكمية وإرجاع الملفات التي تعذر نسخها مع أسبابها
+        
+        فشل ملف واحد لا يوقف النسخ: الأخطاء المؤقتة (ملف مقفل أو مشغول) تُعاد
+        محاولتها في النهاية بمهلة متزايدة، والدائمة تُسجل في '_failed_files' بالسجل.
+        """
+        retry_queue = FileRetryQueue()
         
         # تحديد الملفات التي تحتاج نسخ
-        files_to_backup = self._filter_files_for_backup(files)
-        new_manifest = self._create_manifest(files)
+        with self.metrics.phase("filter"):
+            new_manifest = self._create_manifest(files, retry_queue)
+            files_to_backup = self._filter_files_for_backup(files, new_manifest)
         
         total_files = len(files_to_backup)
+        self.metrics.add(files_changed=total_files)
         
         if total_files == 0:
             progress_callback(100, "لا توجد ملفات جديدة أو معدّلة لنسخها.")
+            self._finish_manifest(new_manifest, retry_queue.failures)
             # إنشاء ملف بسجل محدث إذا كان هناك تغيير في السجل
             if self.old_manifest.keys() != new_manifest.keys():
                 self._create_manifest_only_backup(destination, new_manifest)
-            return
+            return retry_queue.failures
         
         # إنشاء النسخة الاحتياطية
-        with zipfile.ZipFile(destination, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        zipf = zipfile.ZipFile(destination, 'w', self.compress_type, compresslevel=self.compression_level)
+        try:
+            self._compress_files(zipf, files_to_backup, retry_queue, progress_callback, is_running_check)
+            
+            self._finish_manifest(new_manifest, retry_queue.failures)
+            progress_callback(98, "جارٍ كتابة سجل النسخة...")
+            with self.metrics.phase("manifest"), trace_span("manifest_write", {'entries': len(new_manifest)}):
+                zipf.writestr(MANIFEST_FILENAME, self._serialize_manifest(new_manifest))
+        finally:
+            with self.metrics.phase("finalize"), trace_span("zip_finalize"):
+                zipf.close()
+        
+        progress_callback(100, "اكتمل الضغط.")
+        return retry_queue.failures
+    
+    def _compress_files(self,
+                        zipf: zipfile.ZipFile,
+                        files_to_backup: List[Path],
+                        retry_queue: FileRetryQueue,
+                        progress_callback: Callable[[int, str], None],
+                        is_running_check: Callable[[], bool]) -> None:
+        """ضغط الملفات المعدلة مع عزل أخطاء كل ملف ثم إعادة محاولة المؤجل منها"""
+        total_files = len(files_to_backup)
+        with self.metrics.phase("compress"):
             for i, file in enumerate(files_to_backup):
                 if not is_running_check():
-                    raise InterruptedError("تم إلغاء العملية.")
+                    raise BackupInterruptedError()
                 
                 progress = 10 + int((i / total_files) * 85)
-                progress_callback(progress, f"يتم ضغط: {file.name[:30]}...")
+                progress_callback(progress, f"يتم ضغط: {file.name[:30]}...{self.governor.describe()}")
                 
-                zipf.write(file, file.relative_to(HOME_DIR))
+                try:
+                    self._write_member(zipf, file, is_running_check)
+                except Exception as e:
+                    if not retry_queue.isolates(e):
+                        raise
+                    retry_queue.handle_failure(self._relative_key(file), file, e)
             
-            progress_callback(98, "جارٍ كتابة سجل النسخة...")
-            zipf.writestr(MANIFEST_FILENAME, json.dumps(new_manifest, indent=2))
+            if retry_queue:
+                with trace_span("retry_drain", {'pending': len(retry_queue)}):
+                    retry_queue.drain(
+                        lambda file: self._write_member(zipf, file, is_running_check),
+                        is_running_check,
+                        lambda key, attempt: progress_callback(
+                            96, f"إعادة محاولة ({attempt}): {Path(key).name[:30]}...")
+                    )
+    
+    def _write_member(self, 
+                      zipf: zipfile.ZipFile, 
+                      file: Path, 
+                      is_running_check: Callable[[], bool]) -> None:
+        """ضغط ملف واحد على أجزاء حتى يمكن إلغاؤه أو إيقافه مؤقتاً في منتصفه"""
+        zinfo = zipfile.ZipInfo.from_file(file, file.relative_to(HOME_DIR))
+        zinfo.compress_type = self.compress_type
+        # ZipInfo.from_file لا يحمل مستوى الضغط و zipf.open يقرؤه من العضو
+        zinfo._compresslevel = self.compression_level
         
-        progress_callback(100, "اكتمل الضغط.")
+        span = (trace_span("large_file", {'path': zinfo.filename, 'size': zinfo.file_size})
+                if zinfo.file_size >= LARGE_FILE_TRACE_MIN_SIZE else NULL_SPAN)
+        with span, open(file, 'rb') as source:
+            try:
+                with zipf.open(zinfo, 'w') as destination:
+                    copy_stream(source, destination, is_running_check, self.governor)
+            except Exception:
+                self._discard_member(zipf, zinfo)
+                raise
+            self.governor.drop_page_cache(source.fileno())
+        self.metrics.add(bytes_read=zinfo.file_size, bytes_compressed=zinfo.compress_size)
+    
+    @staticmethod
+    def _discard_member(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo) -> None:
+        """حذف عضو مبتور من آخر الأرشيف - إغلاق العضو بعد الخطأ يضيفه إلى الفهرس المركزي"""
+        if zipf.filelist and zipf.filelist[-1] is zinfo:
+            zipf.filelist.pop()
+            zipf.NameToInfo.pop(zinfo.filename, None)
+        zipf.fp.seek(zinfo.header_offset)
+        zipf.fp.truncate()
+        zipf.start_dir = zinfo.header_offset
+    
+    def _finish_manifest(self, manifest: Dict[str, Any], failures: Dict[str, str]) -> None:
+        """إضافة الأحجام إلى السجل ثم إعادة الملفات التي تعذر نسخها إلى حالتها السابقة"""
+        manifest[MANIFEST_SIZES_KEY] = self.sizes
+        self._apply_failures(manifest, failures)
     
-    def _filter_files_for_backup(self, files: List[Path]) -> List[Path]:
+    def _apply_failures(self, manifest: Dict[str, Any], failures: Dict[str, str]) -> None:
+        """الملف الذي تعذر نسخه يبقى بتاريخه السابق (أو يُحذف إن كان جديداً) ليُعاد في النسخة التالية"""
+        if not failures:
+            return
+        sizes = manifest.get(MANIFEST_SIZES_KEY, {})
+        old_sizes = self.old_manifest.get(MANIFEST_SIZES_KEY, {})
+        for relative_path_str in failures:
+            if relative_path_str in self.old_manifest:
+                manifest[relative_path_str] = self.old_manifest[relative_path_str]
+            else:
+                manifest.pop(relative_path_str, None)
+            if relative_path_str in old_sizes:
+                sizes[relative_path_str] = old_sizes[relative_path_str]
+            else:
+                sizes.pop(relative_path_str, None)
+        manifest['_failed_files'] = dict(failures)
+    
+    @staticmethod
+    def _serialize_manifest(manifest: Dict[str, Any]) -> str:
+        """السجل مرتباً بالمسار - فتُقارن سجلات النسخ بدمج خطي دون إعادة ترتيب"""
+        return json.dumps(manifest, indent=2, sort_keys=True)
+    
+    @staticmethod
+    def _relative_key(file: Path) -> str:
+        return str(file.relative_to(HOME_DIR))
+    
+    def _filter_files_for_backup(self, files: List[Path], new_manifest: Dict[str, Any]) -> List[Path]:
         """تصفية الملفات التي تحتاج نسخ احتياطي"""
         files_to_backup = []
         
         for file in files:
-            relative_path_str = str(file.relative_to(HOME_DIR))
-            current_mtime = file.stat().st_mtime
-            
-            # فحص إذا كان الملف جديد أو معدل
-            is_newly_included = (relative_path_str not in self.old_manifest and 
-                               relative_path_str in self.old_manifest.get('_excluded_files', []))
-            
-            if (relative_path_str not in self.old_manifest or 
-                current_mtime > self.old_manifest.get(relative_path_str, 0) or 
-                is_newly_included):
+            relative_path_str = self._relative_key(file)
+            if relative_path_str not in new_manifest:
+                continue
+            if self.needs_backup(relative_path_str, new_manifest[relative_path_str]):
                 files_to_backup.append(file)
         
         return files_to_backup
     
-    def _create_manifest(self, files: List[Path]) -> Dict[str, Any]:
-        """إنشاء سجل النسخة الجديد"""
+    def needs_backup(self, relative_path_str: str, current_mtime: float) -> bool:
+        """فحص إذا كان الملف جديد أو معدل منذ النسخة السابقة"""
+        is_newly_included = (relative_path_str not in self.old_manifest and 
+                           relative_path_str in self.old_manifest.get('_excluded_files', []))
+        
+        return (relative_path_str not in self.old_manifest or 
+                current_mtime > self.old_manifest.get(relative_path_str, 0) or 
+                is_newly_included)
+    
+    def _create_manifest(self, files: List[Path], retry_queue: FileRetryQueue) -> Dict[str, Any]:
+        """إنشاء سجل النسخة الجديد - الملف المحذوف بعد الفحص يُتجاهل"""
         manifest = {}
         
         for file in files:
-            relative_path_str = str(file.relative_to(HOME_DIR))
-            current_mtime = file.stat().st_mtime
-            manifest[relative_path_str] = current_mtime
+            relative_path_str = self._relative_key(file)
+            try:
+                stat_result = file.stat()
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                retry_queue.failures[relative_path_str] = describe_error(e)
+                continue
+            manifest[relative_path_str] = stat_result.st_mtime
+            self.sizes[relative_path_str] = stat_result.st_size
         
         return manifest
     
     def _create_manifest_only_backup(self, destination: Path, manifest: Dict[str, Any]) -> None:
         """إنشاء نسخة تحتوي على السجل فقط"""
-        with zipfile.ZipFile(destination, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.writestr(MANIFEST_FILENAME, json.dumps(manifest, indent=2))
+        with trace_span("manifest_write", {'entries': len(manifest)}), \
+                zipfile.ZipFile(destination, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            zipf.writestr(MANIFEST_FILENAME, self._serialize_manifest(manifest))
 
 
 class SmartRestoreStrategy(IRestoreStrategy):
     """استراتيجية الاسترداد الذكي - مسؤولية واحدة: استرداد الملفات بذكاء"""
     
+    # العضو التالف أو الوجهة المقفلة تُفشل ملفها فقط
+    ISOLATED_ERRORS = (OSError, zipfile.BadZipFile, zlib.error)
+    
+    def __init__(self, governor: ResourceGovernor = None):
+        self.governor = governor or ResourceGovernor()
+    
     def restore_backup(self, 
                       source: Path, 
                       progress_callback: Callable[[int, str], None],
-                      is_running_check: Callable[[], bool]) -> str:
-        """استرداد النسخة الاحتياطية بذكاء (تخطي الموجود)"""
-        
-        with zipfile.ZipFile(source, 'r') as zipf:
-            all_files_info = [info for info in zipf.infolist() 
-                            if info.filename != MANIFEST_FILENAME]
-            total_files = len(all_files_info)
-            restored_count = 0
-            skipped_count = 0
+                      is_running_check: Callable[[], bool],
+                      members: Optional[List[str]] = None,
+                      overwrite: bool = False) -> str:
+        """استرداد النسخة الاحتياطية بذكاء (تخطي الموجود) - أو الملفات والمجلدات المحددة في members فقط"""
+        
+        try:
+            if members is None:
+                with zipfile.ZipFile(source, 'r') as zipf:
+                    all_files_info = [info for info in zipf.infolist() 
+                                    if info.filename != MANIFEST_FILENAME]
+                    return self._restore_members(zipf, all_files_info, progress_callback,
+                                                 is_running_check, overwrite)
             
-            for i, member in enumerate(all_files_info):
-                if not is_running_check():
-                    raise InterruptedError("تم إلغاء العملية.")
-                
-                target_path = HOME_DIR / Path(member.filename)
-                progress = (i + 1) * 100 // total_files
-                progress_callback(progress, f"معالجة: {target_path.name[:40]}...")
-                
-                if target_path.exists():
-                    skipped_count += 1
-                    continue
-                
-                target_path.parent.mkdir(parents=True, exist_ok=True)
-                zipf.extract(member, HOME_DIR)
-                restored_count += 1
+            # الاسترداد الجزئي لا يحلل الدليل المركزي كاملاً؛ فهرس المتصفح يحدد الأعضاء المطلوبة فقط
+            catalog = open_catalog(source)
+            with catalog.open_zipfile() as zipf:
+                selected_info = [catalog.zipinfo(path) for path in catalog.files_under(members)]
+                return self._restore_members(zipf, selected_info, progress_callback,
+                                             is_running_check, overwrite)
+        except zipfile.BadZipFile as e:
+            raise CorruptedBackupError(str(source)) from e
+    
+    def _restore_members(self, 
+                        zipf: zipfile.ZipFile,
+                        all_files_info: List[zipfile.ZipInfo],
+                        progress_callback: Callable[[int, str], None],
+                        is_running_check: Callable[[], bool],
+                        overwrite: bool) -> str:
+        """استخراج أعضاء الأرشيف غير الموجودة في الوجهة - أو جميعها فوق الموجود مع overwrite"""
+        total_files = len(all_files_info)
+        skipped_count = 0
+        retry_queue = FileRetryQueue(isolated_errors=self.ISOLATED_ERRORS)
         
+        def extract(member_and_target) -> None:
+            self._extract_member(zipf, *member_and_target, is_running_check)
+        
+        for i, member in enumerate(all_files_info):
+            if not is_running_check():
+                raise BackupInterruptedError()
+            
+            target_path = HOME_DIR / Path(member.filename)
+            progress = (i + 1) * 100 // total_files
+            progress_callback(progress, f"معالجة: {target_path.name[:40]}...{self.governor.describe()}")
+            
+            if not overwrite and target_path.exists():
+                skipped_count += 1
+                continue
+            
+            try:
+                extract((member, target_path))
+            except Exception as e:
+                if not retry_queue.isolates(e):
+                    raise
+                retry_queue.handle_failure(member.filename, (member, target_path), e)
+        
+        retry_queue.drain(
+            extract, is_running_check,
+            lambda key, attempt: progress_callback(
+                100, f"إعادة محاولة ({attempt}): {Path(key).name[:40]}...")
+        )
+        return self._summary(total_files, skipped_count, retry_queue.failures)
+    
+    @staticmethod
+    def _summary(total_files: int, skipped_count: int, failures: Dict[str, str]) -> str:
+        restored_count = total_files - skipped_count - len(failures)
         return (f"اكتمل الاسترداد الذكي بنجاح!\n\n"
                 f"✓ تم استرداد {restored_count} ملفاً جديداً.\n"
-                f"↷ تم تخطي {skipped_count} ملفاً لوجودها مسبقاً.")
\ No newline at end of file
+                f"↷ تم تخطي {skipped_count} ملفاً لوجودها مسبقاً."
+                f"{format_failures(failures, 'تعذر استرداد')}")
+    
+    def _extract_member(self, 
+                        zipf: zipfile.ZipFile, 
+                        member: zipfile.ZipInfo, 
+                        target_path: Path,
+                        is_running_check: Callable[[], bool]) -> None:
+        """استخراج عضو على أجزاء إلى ملف مؤقت ثم نقله، حتى لا يبقى ملف ناقص عند الإلغاء"""
+        if member.is_dir():
+            target_path.mkdir(parents=True, exist_ok=True)
+            return
+        
+        partial_name, destination = self._open_partial(member, target_path)
+        try:
+            with destination, zipf.open(member) as source:
+                copy_stream(source, destination, is_running_check, self.governor)
+            self._publish_partial(member, partial_name, target_path)
+        finally:
+            if os.path.exists(partial_name):
+                os.unlink(partial_name)
+    
+    @staticmethod
+    def _open_partial(member: zipfile.ZipInfo, target_path: Path):
+        """ملف مؤقت باسم فريد في مجلد الوجهة لا يمكن أن يطابق ملفاً للمستخدم - يُرجع (اسمه، الملف المفتوح)"""
+        home = os.path.abspath(HOME_DIR)
+        if os.path.commonpath([home, os.path.abspath(target_path)]) != home:
+            raise CorruptedBackupError(str(member.filename))
+        
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, partial_name = tempfile.mkstemp(dir=target_path.parent, prefix='.alhirz-')
+        return partial_name, os.fdopen(descriptor, 'wb')
+    
+    @staticmethod
+    def _publish_partial(member: zipfile.ZipInfo, partial_name: str, target_path: Path) -> None:
+        """نقل الملف المؤقت المكتمل إلى مكانه بصلاحية العضو"""
+        # mkstemp ينشئ الملف بصلاحية 0600 و os.replace يحتفظ بها
+        os.chmod(partial_name, stat.S_IMODE(member.external_attr >> 16) or DEFAULT_FILE_MODE)
+        os.replace(partial_name, target_path)
@@ -0,0 +1,244 @@
+"""
+تتبع زمني بالمقاطع (Spans)
+مسؤولية واحدة: تسجيل مقاطع زمنية لمراحل التشغيل وحفظها بصيغة Chrome trace-event لفتحها في Perfetto
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from utils.config import APP_DIR, TRACES_SUBDIR
+
+# متغير بيئة يفعّل التتبع ويتقدم على الإعدادات ("1" للتفعيل و"0" للتعطيل)
+TRACE_ENV = "ALHIRZ_TRACE"
+# عدد ملفات التتبع المحتفظ بها
+TRACE_RETENTION = 20
+# الملفات الأكبر من هذا الحد تحصل على مقطع خاص بها
+LARGE_FILE_TRACE_MIN_SIZE = 8 * 1024 * 1024
+# حد أعلى لعدد الأحداث حتى لا يستهلك تتبع طويل الذاكرة
+MAX_TRACE_EVENTS = 500_000
+
+
+class _NullSpan:
+    """مقطع لا يفعل شيئاً - يُرجع عند تعطيل التتبع فلا يكلف إلا استدعاء دالة"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """مقطع زمني واحد يُسجل عند الخروج منه حدثاً كاملاً (ph=X)"""
+    __slots__ = ('_tracer', '_name', '_context', '_started')
+
+    def __init__(self, tracer: "Tracer", name: str, context: Optional[Dict[str, Any]]):
+        self._tracer = tracer
+        self._name = name
+        self._context = context
+
+    def __enter__(self):
+        self._started = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        args = dict(self._context) if self._context else {}
+        if exc_type is not None:
+            args['error'] = exc_type.__name__
+        self._tracer._add_complete(self._name, self._started, time.perf_counter_ns(), args)
+        return False
+
+
+class Tracer:
+    """مجمّع أحداث التتبع لتشغيل واحد - آمن للاستخدام من عدة خيوط"""
+
+    def __init__(self, process_name: str = "alhirz"):
+        self.process_name = process_name
+        self.dropped_events = 0
+        self._origin = time.perf_counter_ns()
+        self._pid = os.getpid()
+        self._events: List[Dict[str, Any]] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, context: Optional[Dict[str, Any]] = None) -> _Span:
+        """مقطع زمني - context بنفس صيغة سياق ILogger ويظهر في args"""
+        return _Span(self, name, context)
+
+    def instant(self, name: str, context: Optional[Dict[str, Any]] = None, category: str = "log") -> None:
+        """حدث لحظي (ph=i) مثل رسالة سجل أثناء التشغيل"""
+        self._add({
+            'name': name, 'cat': category, 'ph': 'i', 's': 't',
+            'ts': self._micros(time.perf_counter_ns()),
+            'args': dict(context) if context else {}
+        })
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """الأحداث بصيغة JSON Object Format التي يقرأها Perfetto و chrome://tracing"""
+        with self._lock:
+            events = list(self._events)
+            thread_names = dict(self._thread_names)
+
+        metadata = [{'name': 'process_name', 'ph': 'M', 'pid': self._pid, 'tid': 0,
+                     'args': {'name': self.process_name}}]
+        metadata += [{'name': 'thread_name', 'ph': 'M', 'pid': self._pid, 'tid': tid, 'args': {'name': name}}
+                     for tid, name in thread_names.items()]
+        return {
+            'traceEvents': metadata + events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'dropped_events': self.dropped_events}
+        }
+
+    def save(self, path: Path) -> None:
+        """كتابة ذرية لملف التتبع"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False, default=str)
+        os.replace(temp_path, path)
+
+    def _add_complete(self, name: str, started: int, finished: int, args: Dict[str, Any]) -> None:
+        self._add({
+            'name': name, 'cat': 'backup', 'ph': 'X',
+            'ts': self._micros(started), 'dur': (finished - started) / 1000,
+            'args': args
+        })
+
+    def _add(self, event: Dict[str, Any]) -> None:
+        thread = threading.current_thread()
+        tid = threading.get_native_id()
+        event['pid'] = self._pid
+        event['tid'] = tid
+        with self._lock:
+            if len(self._events) >= MAX_TRACE_EVENTS:
+                self.dropped_events += 1
+                return
+            self._events.append(event)
+            if tid not in self._thread_names:
+                self._thread_names[tid] = thread.name
+
+    def _micros(self, perf_ns: int) -> float:
+        return (perf_ns - self._origin) / 1000
+
+
+# المتتبع النشط في العملية - None عند تعطيل التتبع
+_active_tracer: Optional[Tracer] = None
+_session_users = 0
+_session_lock = threading.Lock()
+
+
+def active_tracer() -> Optional[Tracer]:
+    return _active_tracer
+
+
+def trace_span(name: str, context: Optional[Dict[str, Any]] = None):
+    """مقطع في المتتبع النشط، أو مقطع فارغ إذا لم يكن هناك تتبع"""
+    tracer = _active_tracer
+    if tracer is None:
+        return NULL_SPAN
+    return tracer.span(name, context)
+
+
+def env_tracing_enabled() -> Optional[bool]:
+    """قيمة متغير البيئة - None إذا لم يُحدد"""
+    value = os.environ.get(TRACE_ENV)
+    if value is None or value == "":
+        return None
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+class TraceRecorder:
+    """مشغّل جلسات التتبع - يقرر التفعيل عند بدء كل تشغيل ويحفظ النتيجة في مجلد traces
+
+    العمليات المتزامنة (مهام عدة وجهات) تشترك في متتبع واحد، ويُحفظ الملف عند انتهاء آخرها.
+    """
+
+    def __init__(self,
+                 enabled_source: Callable[[], bool] = None,
+                 traces_dir: Path = None,
+                 retention: int = TRACE_RETENTION,
+                 logger=None):
+        self.enabled_source = enabled_source or (lambda: bool(env_tracing_enabled()))
+        self.traces_dir = traces_dir or (APP_DIR / TRACES_SUBDIR)
+        self.retention = retention
+        # يُنشأ عند الحاجة لأن نظام السجلات يستورد هذه الوحدة
+        self.logger = logger
+        self.last_trace_path: Optional[Path] = None
+
+    @contextmanager
+    def session(self, name: str, context: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Tracer]]:
+        """تفعيل التتبع طوال الكتلة إذا كان مفعلاً في الإعدادات - الكتلة كلها مقطع باسم name"""
+        if not self.enabled_source():
+            yield None
+            return
+
+        global _active_tracer, _session_users
+        with _session_lock:
+            if _active_tracer is None:
+                _active_tracer = Tracer()
+            tracer = _active_tracer
+            _session_users += 1
+
+        try:
+            with tracer.span(name, context):
+                yield tracer
+        finally:
+            with _session_lock:
+                _session_users -= 1
+                finished = _session_users == 0
+                if finished:
+                    _active_tracer = None
+            if finished:
+                self._save(tracer, name)
+
+    def _save(self, tracer: Tracer, name: str) -> None:
+        """حفظ ملف التتبع - فشل الحفظ لا يفشل العملية التي انتهت ولا يخفي خطأها"""
+        try:
+            self._write(tracer, name)
+        except Exception as e:
+            if self.logger is None:
+                from core.logging_system import LoggerFactory
+
+                self.logger = LoggerFactory.create_default_logger()
+            self.logger.warning(f"فشل في حفظ ملف التتبع: {e}")
+
+    def _write(self, tracer: Tracer, name: str) -> None:
+        path = self.traces_dir / f"trace_{datetime.now().strftime('%Y-%m-%d_%H%M%S_%f')}_{name}.json"
+        tracer.save(path)
+        self.last_trace_path = path
+        self._prune()
+
+    def _prune(self) -> None:
+        """حذف أقدم ملفات التتبع الزائدة عن حد الاحتفاظ"""
+        if self.retention <= 0:
+            return
+        traces = sorted(self.traces_dir.glob('trace_*.json'))
+        for old_trace in traces[:-self.retention]:
+            try:
+                old_trace.unlink()
+            except OSError:
+                pass
+
+
+def create_trace_recorder(config_manager=None) -> TraceRecorder:
+    """مشغّل جلسات التتبع حسب الإعدادات - متغير البيئة يتقدم على tracing_enabled"""
+    from utils.config_manager import ConfigurationManager
+
+    config_manager = config_manager or ConfigurationManager()
+
+    def enabled_source() -> bool:
+        from_env = env_tracing_enabled()
+        if from_env is not None:
+            return from_env
+        return bool(config_manager.get_setting('tracing_enabled', False))
+
+    return TraceRecorder(enabled_source)
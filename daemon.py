@@ -0,0 +1,48 @@
+"""
+نقطة دخول خدمة النسخ التلقائي - تعمل دون واجهة رسومية ودون PyQt5
+"""
+import argparse
+import signal
+import sys
+
+from core.auto_backup import AutoBackupDaemon, lower_process_priority
+from core.logging_system import LoggerFactory
+
+
+def main():
+    """تشغيل خدمة النسخ التلقائي حسب auto_backup_interval_hours"""
+    parser = argparse.ArgumentParser(description="خدمة النسخ الاحتياطي التلقائي للحِرز")
+    parser.add_argument('--once', action='store_true', help="تنفيذ نسخة واحدة فوراً ثم الخروج")
+    parser.add_argument('--backup-profile', metavar='NAME',
+                        help="مع --once: نسخ ملف التعريف المحدد بدل مجلدات الواجهة")
+    parser.add_argument('--max-load', type=float, default=0.8,
+                        help="أقصى متوسط حمل لكل معالج قبل الإيقاف المؤقت")
+    args = parser.parse_args()
+    if args.backup_profile and not args.once:
+        # الخدمة الدائمة تنسخ مجلدات الواجهة حسب الجدول، فلا تقبل ملف تعريف
+        parser.error("--backup-profile يتطلب --once")
+
+    logger = LoggerFactory.create_default_logger()
+    lower_process_priority(logger)
+
+    daemon = AutoBackupDaemon(logger=logger)
+    daemon.load_monitor.max_load_per_cpu = args.max_load
+
+    def handle_signal(signum, frame):
+        logger.info("تم استلام إشارة الإيقاف")
+        daemon.stop()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    if args.once and args.backup_profile:
+        daemon.run_profile(daemon.profile_store.require(args.backup_profile))
+    elif args.once:
+        daemon.run_once()
+    else:
+        daemon.run_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import List, Dict, Callable, Any
+from typing import List, Dict, Callable, Any, Optional, Mapping
 
 
 class IFileScanner(ABC):
@@ -25,8 +25,8 @@ class IBackupStrategy(ABC):
                      files: List[Path], 
                      destination: Path, 
                      progress_callback: Callable[[int, str], None],
-                     is_running_check: Callable[[], bool]) -> None:
-        """إنشاء نسخة احتياطية"""
+                     is_running_check: Callable[[], bool]) -> Dict[str, str]:
+        """إنشاء نسخة احتياطية وإرجاع الملفات التي تعذر نسخها مع أسبابها"""
         pass
 
 
@@ -37,8 +37,10 @@ class IRestoreStrategy(ABC):
     def restore_backup(self, 
                       source: Path, 
                       progress_callback: Callable[[int, str], None],
-                      is_running_check: Callable[[], bool]) -> str:
-        """استرداد نسخة احتياطية"""
+                      is_running_check: Callable[[], bool],
+                      members: Optional[List[str]] = None,
+                      overwrite: bool = False) -> str:
+        """استرداد نسخة احتياطية - أو الملفات والمجلدات المحددة في members فقط"""
         pass
 
 
@@ -51,13 +53,13 @@ class IBackupRepository(ABC):
         pass
     
     @abstractmethod
-    def get_latest_backup_manifest(self) -> Dict[str, Any]:
+    def get_latest_backup_manifest(self) -> Mapping[str, Any]:
         """الحصول على سجل آخر نسخة احتياطية"""
         pass
     
     @abstractmethod
-    def delete_backups(self, backup_paths: List[Path]) -> None:
-        """حذف نسخ احتياطية محددة"""
+    def delete_backups(self, backup_paths: List[Path]) -> int:
+        """حذف نسخ احتياطية محددة وإرجاع عدد المحذوفة"""
         pass
     
     @abstractmethod
@@ -75,14 +77,25 @@ class IBackupOrchestrator(ABC):
                                  backup_filepath: Path, 
                                  exclusions: List[str],
                                  progress_callback: Callable[[int, str], None],
-                                 is_running_check: Callable[[], bool]) -> None:
-        """تنسيق عملية النسخ التراكمي"""
+                                 is_running_check: Callable[[], bool]) -> Dict[str, str]:
+        """تنسيق عملية النسخ التراكمي وإرجاع الملفات التي تعذر نسخها"""
         pass
     
     @abstractmethod
     def restore_from_backup(self, 
                            backup_path: Path,
                            progress_callback: Callable[[int, str], None],
-                           is_running_check: Callable[[], bool]) -> str:
-        """تنسيق عملية الاسترداد"""
+                           is_running_check: Callable[[], bool],
+                           members: Optional[List[str]] = None,
+                           overwrite: bool = False) -> str:
+        """تنسيق عملية الاسترداد - members لاسترداد ملفات ومجلدات محددة، و overwrite لاستبدال الموجود"""
+        pass
+    
+    @abstractmethod
+    def preview_backup(self,
+                       folders: List[Path],
+                       exclusions: List[str],
+                       update_callback: Callable[[Any], None],
+                       is_running_check: Callable[[], bool]) -> Any:
+        """معاينة النسخة التالية دون كتابة شيء (DryRunReport) - update_callback يستقبل التقرير الجاري"""
         pass
\ No newline at end of file
@@ -5,7 +5,7 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict
 from pathlib import Path
 
 
@@ -32,6 +32,21 @@ class IMainView(ABC):
         """تفعيل/تعطيل عناصر التحكم"""
         pass
     
+    @abstractmethod
+    def get_resource_limits(self) -> Dict[str, int]:
+        """الحصول على حدود الموارد المحددة في الإعدادات"""
+        pass
+    
+    @abstractmethod
+    def get_profiling_mode(self) -> str:
+        """الحصول على وضع قياس الأداء المحدد في الإعدادات"""
+        pass
+    
+    @abstractmethod
+    def set_operation_paused(self, paused: bool, operation_type: str) -> None:
+        """عرض حالة الإيقاف المؤقت للعملية الجارية"""
+        pass
+    
     @abstractmethod
     def get_selected_folders(self) -> List[Path]:
         """الحصول على المجلدات المحددة"""
@@ -57,10 +72,45 @@ class IMainView(ABC):
         """الحصول على عدد النسخ المراد الاحتفاظ بها"""
         pass
     
+    @abstractmethod
+    def get_gfs_retention(self) -> Dict[str, int]:
+        """الحصول على عدد النسخ اليومية والأسبوعية والشهرية المراد الاحتفاظ بها"""
+        pass
+    
     @abstractmethod
     def refresh_backups_list(self) -> None:
         """تحديث قائمة النسخ الاحتياطية"""
         pass
+    
+    @abstractmethod
+    def show_search_results(self, results: list) -> None:
+        """عرض نتائج البحث في النسخ"""
+        pass
+    
+    @abstractmethod
+    def show_dry_run_report(self, report) -> None:
+        """عرض تقرير معاينة النسخة التالية (DryRunReport) الجاري أو النهائي"""
+        pass
+    
+    @abstractmethod
+    def update_job(self, job) -> None:
+        """عرض حالة مهمة نسخ مجدولة (BackupJob) وتقدمها في قائمة المهام"""
+        pass
+    
+    @abstractmethod
+    def get_selected_job_id(self) -> Optional[int]:
+        """الحصول على معرف المهمة المحددة في قائمة المهام"""
+        pass
+    
+    @abstractmethod
+    def get_selected_backup_profile(self) -> Optional[str]:
+        """الحصول على اسم ملف التعريف المحدد لنسخه"""
+        pass
+    
+    @abstractmethod
+    def set_backup_profiles(self, profile_names: List[str]) -> None:
+        """عرض أسماء ملفات التعريف المتاحة للنسخ"""
+        pass
 
 
 class IMainPresenter(ABC):
@@ -71,16 +121,51 @@ class IMainPresenter(ABC):
         """بدء عملية النسخ الاحتياطي"""
         pass
     
+    @abstractmethod
+    def start_dry_run(self) -> None:
+        """معاينة ما ستحتويه النسخة التالية دون كتابة شيء"""
+        pass
+    
     @abstractmethod
     def start_restore(self) -> None:
         """بدء عملية الاسترداد"""
         pass
     
+    @abstractmethod
+    def start_selective_restore(self, backup_path: Path, members: List[str], overwrite: bool = False) -> None:
+        """استرداد ملفات ومجلدات محددة من نسخة"""
+        pass
+    
     @abstractmethod
     def cancel_operation(self) -> None:
         """إلغاء العملية الجارية"""
         pass
     
+    @abstractmethod
+    def start_profile_backup(self) -> None:
+        """جدولة نسخة لملف التعريف المحدد بالتوازي مع بقية المهام"""
+        pass
+    
+    @abstractmethod
+    def cancel_selected_job(self) -> None:
+        """إلغاء مهمة النسخ المحددة في قائمة المهام"""
+        pass
+    
+    @abstractmethod
+    def toggle_pause(self, operation_type: str) -> None:
+        """إيقاف العملية الجارية مؤقتاً أو استئنافها"""
+        pass
+    
+    @abstractmethod
+    def update_retention_settings(self) -> None:
+        """حفظ قواعد الاحتفاظ لتطبقها الواجهة وخدمة النسخ التلقائي"""
+        pass
+    
+    @abstractmethod
+    def update_resource_limits(self) -> None:
+        """تطبيق حدود الموارد وحفظها"""
+        pass
+    
     @abstractmethod
     def delete_backups(self) -> None:
         """حذف النسخ المحددة"""
@@ -110,6 +195,16 @@ class IMainPresenter(ABC):
     def refresh_backups(self) -> None:
         """تحديث قائمة النسخ"""
         pass
+    
+    @abstractmethod
+    def verify_backups(self) -> None:
+        """فحص سلامة النسخ الاحتياطية"""
+        pass
+    
+    @abstractmethod
+    def search_backups(self, query: str) -> None:
+        """البحث عن ملف في النسخ الاحتياطية"""
+        pass
 
 
 class IBackupModel(ABC):
@@ -143,4 +238,29 @@ class IBackupModel(ABC):
     @abstractmethod
     def get_default_folders(self) -> List[Path]:
         """الحصول على المجلدات الافتراضية"""
-        pass
\ No newline at end of file
+        pass
+    
+    @abstractmethod
+    def get_corrupted_backups(self) -> List[Path]:
+        """الحصول على النسخ التي وُجدت تالفة"""
+        pass
+    
+    @abstractmethod
+    def get_backup_member_count(self, backup_path: Path) -> Optional[int]:
+        """الحصول على عدد الملفات في نسخة"""
+        pass
+    
+    @abstractmethod
+    def open_backup_catalog(self, backup_path: Path):
+        """فهرس محتويات نسخة للتصفح (ArchiveCatalog) أو None"""
+        pass
+    
+    @abstractmethod
+    def analyze_exclusions(self, exclusions: List[str]):
+        """أثر قواعد الاستبعاد من آخر فحص محفوظ (ExclusionImpactReport) أو None إذا لم يوجد فحص"""
+        pass
+    
+    @abstractmethod
+    def diff_backups(self, old_backup: Path, new_backup: Path):
+        """مقارنة نسختين من سجليهما (BackupDiffReport) أو None"""
+        pass
@@ -1,8 +1,11 @@
 import sys
 import os
+from core.startup_timing import startup_timer
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
+startup_timer.mark("qt_imported")
 from ui.main_window_new import AlHirzApp
+startup_timer.mark("modules_imported")
 
 # إعدادات Linux للعرض
 if sys.platform.startswith('linux'):
@@ -23,6 +26,7 @@ def main():
     app.setLayoutDirection(Qt.RightToLeft)
 
     window = AlHirzApp()
+    startup_timer.mark("window_created")
     window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+نموذج شجرة محتويات النسخة - Qt Model/View
+مسؤولية واحدة: عرض مستويات المجلدات داخل أرشيف من فهرسه، ولا يُبنى مستوى إلا عند فتح مجلده
+"""
+
+from typing import Any, List, Optional
+
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt
+
+from core.archive_browser import ArchiveCatalog, ArchiveEntry
+
+COLUMN_NAME = 0
+COLUMN_SIZE = 1
+COLUMN_MODIFIED = 2
+_HEADERS = ("الاسم", "الحجم", "تاريخ التعديل")
+
+
+class _Node:
+    """عقدة في الشجرة - children تبقى None حتى يُفتح المجلد"""
+    __slots__ = ('entry', 'parent', 'row', 'children')
+
+    def __init__(self, entry: Optional[ArchiveEntry], parent: Optional["_Node"], row: int):
+        self.entry = entry
+        self.parent = parent
+        self.row = row
+        self.children: Optional[List["_Node"]] = None
+
+
+def format_size(size: int) -> str:
+    """حجم مقروء للعرض"""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+class ArchiveTreeModel(QAbstractItemModel):
+    """نموذج الشجرة - كل مستوى يُطلب من ArchiveCatalog.list_dir عند fetchMore لمجلده"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.catalog: Optional[ArchiveCatalog] = None
+        self._root = _Node(None, None, 0)
+
+    # === واجهة QAbstractItemModel ===
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        children = self._node(parent).children or []
+        if not (0 <= row < len(children) and 0 <= column < len(_HEADERS)):
+            return QModelIndex()
+        return self.createIndex(row, column, children[row])
+
+    def parent(self, index: QModelIndex) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        parent_node = index.internalPointer().parent
+        if parent_node is None or parent_node is self._root:
+            return QModelIndex()
+        return self.createIndex(parent_node.row, 0, parent_node)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self._node(parent).children or [])
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return len(_HEADERS)
+
+    def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent)
+        if node is self._root:
+            return bool(node.children)
+        # المجلد يظهر قابلاً للفتح قبل بناء مستواه
+        return node.entry.is_dir and (node.children is None or bool(node.children))
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        node = self._node(parent)
+        return node is not self._root and node.entry.is_dir and node.children is None
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        node = self._node(parent)
+        if not self.canFetchMore(parent) or self.catalog is None:
+            return
+        entries = self.catalog.list_dir(node.entry.path)
+        node.children = []
+        if entries:
+            self.beginInsertRows(parent, 0, len(entries) - 1)
+            node.children = [_Node(entry, node, row) for row, entry in enumerate(entries)]
+            self.endInsertRows()
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        entry = index.internalPointer().entry
+
+        if role == Qt.DisplayRole:
+            if index.column() == COLUMN_NAME:
+                return f"📁 {entry.name}" if entry.is_dir else entry.name
+            if entry.is_dir:
+                return None
+            if index.column() == COLUMN_SIZE:
+                return format_size(entry.size)
+            if index.column() == COLUMN_MODIFIED and entry.modified is not None:
+                return entry.modified.strftime('%Y-%m-%d %H:%M')
+        elif role == Qt.UserRole:
+            return entry
+        elif role == Qt.ToolTipRole:
+            return entry.path
+        elif role == Qt.TextAlignmentRole and index.column() == COLUMN_SIZE:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(_HEADERS):
+            return _HEADERS[section]
+        return None
+
+    # === تحديث البيانات ===
+
+    def set_catalog(self, catalog: Optional[ArchiveCatalog]) -> None:
+        """عرض أرشيف جديد - يُبنى المستوى الأعلى فقط"""
+        self.beginResetModel()
+        self.catalog = catalog
+        self._root = _Node(None, None, 0)
+        if catalog is not None:
+            self._root.children = [_Node(entry, self._root, row)
+                                   for row, entry in enumerate(catalog.list_dir())]
+        self.endResetModel()
+
+    def entry(self, index: QModelIndex) -> Optional[ArchiveEntry]:
+        return index.internalPointer().entry if index.isValid() else None
+
+    def _node(self, index: QModelIndex) -> _Node:
+        return index.internalPointer() if index.isValid() else self._root
@@ -4,15 +4,23 @@
 مسؤولية واحدة: إدارة البيانات والحالة
 """
 
-import json
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 from interfaces.ui_interfaces import IBackupModel
 from utils.config import (APP_DIR, BACKUP_DIR, HOME_DIR, DEFAULT_FOLDERS,
                           SETTINGS_FILENAME, DEFAULT_EXCLUSIONS)
+from core.archive_browser import ArchiveCatalog, open_catalog
+from core.backup_diff import BackupDiffer, BackupDiffReport
+from core.exclusion_impact import ExclusionImpactAnalyzer, ExclusionImpactReport
 from core.backup_manager import BackupManager
+from core.repository_cache import ArchiveInfo
+from core.retention import RetentionPolicy, RetentionReport
+from core.scan_cache import get_scan_index
+from core.search_index import SearchResult
+from core.backup_verifier import BackupVerifier
 from core.logging_system import ILogger, LoggerFactory
+from utils.settings_store import SettingsStore
 
 
 class BackupModel(IBackupModel):
@@ -20,10 +28,14 @@ class BackupModel(IBackupModel):
     
     def __init__(self, 
                  backup_manager: BackupManager = None,
-                 logger: ILogger = None):
+                 verifier: BackupVerifier = None,
+                 logger: ILogger = None,
+                 settings_store: SettingsStore = None):
         self.backup_manager = backup_manager or BackupManager()
         self.logger = logger or LoggerFactory.create_default_logger()
-        self._exclusions_cache = None
+        self.verifier = verifier or BackupVerifier(self.backup_manager.repository, logger=self.logger)
+        self.settings_store = settings_store or SettingsStore.for_path(APP_DIR / SETTINGS_FILENAME)
+        self._impact_analyzer: Optional[ExclusionImpactAnalyzer] = None
         
         # التأكد من وجود المجلدات المطلوبة
         self._ensure_directories()
@@ -45,6 +57,59 @@ class BackupModel(IBackupModel):
             self.logger.error(f"فشل في الحصول على قائمة النسخ: {e}")
             return []
     
+    def get_backups_info(self) -> List[ArchiveInfo]:
+        """الحصول على بيانات النسخ (الحجم والتاريخ) دون قراءة القرص لكل نسخة"""
+        try:
+            return self.backup_manager.repository.get_backups_info()
+        except Exception as e:
+            self.logger.error(f"فشل في الحصول على بيانات النسخ: {e}")
+            return []
+    
+    def get_backup_member_count(self, backup_path: Path) -> Optional[int]:
+        """عدد الملفات في نسخة من ذاكرة المستودع - None إذا تعذرت قراءتها"""
+        try:
+            return self.backup_manager.repository.get_member_count(backup_path)
+        except Exception as e:
+            self.logger.error(f"فشل في قراءة عدد ملفات النسخة: {e}")
+            return None
+    
+    def open_backup_catalog(self, backup_path: Path) -> Optional[ArchiveCatalog]:
+        """فهرس محتويات نسخة للتصفح من دليلها المركزي - None إذا تعذرت قراءتها"""
+        try:
+            return open_catalog(backup_path)
+        except Exception as e:
+            self.logger.error(f"فشل في قراءة محتويات النسخة {backup_path.name}: {e}")
+            return None
+    
+    def analyze_exclusions(self, exclusions: List[str]) -> Optional[ExclusionImpactReport]:
+        """أثر قواعد الاستبعاد من آخر فحص للمستودع - المحلل يبقى ما بقي الفحص نفسه فتُحفظ نتائج الأنماط"""
+        index = get_scan_index(self.backup_manager.repository.backup_dir)
+        if index is None:
+            return None
+        try:
+            if self._impact_analyzer is None or self._impact_analyzer.index is not index:
+                self._impact_analyzer = ExclusionImpactAnalyzer(index)
+            return self._impact_analyzer.analyze(exclusions)
+        except Exception as e:
+            self.logger.error(f"فشل في تحليل أثر الاستثناءات: {e}")
+            return None
+    
+    def diff_backups(self, old_backup: Path, new_backup: Path) -> Optional[BackupDiffReport]:
+        """مقارنة نسختين من سجليهما دون قراءة بيانات الأرشيف - None إذا تعذرت المقارنة"""
+        try:
+            return BackupDiffer(self.backup_manager.repository).diff(old_backup, new_backup)
+        except Exception as e:
+            self.logger.error(f"فشل في مقارنة النسختين {old_backup.name} و{new_backup.name}: {e}")
+            return None
+    
+    def get_corrupted_backups(self) -> List[Path]:
+        """الحصول على النسخ التي وُجدت تالفة في آخر فحص"""
+        try:
+            return self.verifier.get_corrupted_backups()
+        except Exception as e:
+            self.logger.error(f"فشل في قراءة نتائج الفحص: {e}")
+            return []
+    
     def delete_backups(self, backup_paths: List[Path]) -> int:
         """حذف النسخ المحددة وإرجاع عدد المحذوفة"""
         try:
@@ -61,90 +126,75 @@ class BackupModel(IBackupModel):
             self.logger.error(f"فشل في تطبيق دوران النسخ: {e}")
             return 0
     
-    def get_settings(self) -> dict:
-        """الحصول على جميع الإعدادات"""
-        settings_path = APP_DIR / SETTINGS_FILENAME
-        
+    def apply_retention_policy(self, policy: RetentionPolicy) -> RetentionReport:
+        """تطبيق سياسة الاحتفاظ (الجد-الأب-الابن) وإرجاع التقرير"""
         try:
-            if settings_path.exists():
-                with open(settings_path, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-            else:
-                settings = {
-                    'exclusions': DEFAULT_EXCLUSIONS.copy(),
-                    'selected_folders': [],
-                    'ignore_hidden_files': True
-                }
-                self.save_settings(settings)
-            
-            return settings
-            
+            return self.backup_manager.apply_retention_policy(policy)
         except Exception as e:
-            self.logger.error(f"فشل في قراءة الإعدادات: {e}")
-            return {
-                'exclusions': DEFAULT_EXCLUSIONS.copy(),
-                'selected_folders': [],
-                'ignore_hidden_files': True
-            }
+            self.logger.error(f"فشل في تطبيق سياسة الاحتفاظ: {e}")
+            return RetentionReport()
     
-    def save_settings(self, settings: dict) -> None:
-        """حفظ جميع الإعدادات"""
-        settings_path = APP_DIR / SETTINGS_FILENAME
-        
+    def sync_search_index(self) -> None:
+        """مزامنة فهرس البحث مع المستودع - تلتقط النسخ التي كتبتها خدمة النسخ التلقائي أو الطرفية"""
+        self.backup_manager.sync_search_index()
+    
+    def search_backups(self, query: str) -> List[SearchResult]:
+        """البحث عن ملف في جميع النسخ الاحتياطية"""
         try:
-            with open(settings_path, 'w', encoding='utf-8') as f:
-                json.dump(settings, f, indent=2, ensure_ascii=False)
-            
-            # تحديث التخزين المؤقت
-            self._exclusions_cache = settings.get('exclusions', []).copy()
-            
+            return self.backup_manager.search_backups(query)
         except Exception as e:
-            self.logger.error(f"فشل في حفظ الإعدادات: {e}")
-            raise
+            self.logger.error(f"فشل في البحث في النسخ: {e}")
+            return []
+    
+    @staticmethod
+    def _default_settings() -> dict:
+        return {
+            'exclusions': DEFAULT_EXCLUSIONS.copy(),
+            'selected_folders': [],
+            'ignore_hidden_files': True
+        }
+    
+    def get_settings(self) -> dict:
+        """الحصول على جميع الإعدادات من الذاكرة - الملف يُقرأ مرة واحدة أو عند تعديله من الخارج"""
+        if not self.settings_store.exists:
+            self.settings_store.update(self._default_settings())
+        return self.settings_store.read()
+    
+    def save_settings(self, settings: dict) -> None:
+        """حفظ جميع الإعدادات - الكتابة إلى الملف مؤجلة وتُجمع مع التعديلات المتتالية"""
+        self.settings_store.replace(settings)
     
     def get_exclusions(self) -> List[str]:
         """الحصول على قائمة الاستثناءات"""
-        settings = self.get_settings()
-        return settings.get('exclusions', DEFAULT_EXCLUSIONS.copy())
+        return self.settings_store.get('exclusions', DEFAULT_EXCLUSIONS.copy())
     
     def save_exclusions(self, exclusions: List[str]) -> None:
         """حفظ قائمة الاستثناءات"""
-        settings = self.get_settings()
-        settings['exclusions'] = exclusions
-        self.save_settings(settings)
+        self.settings_store.update({'exclusions': exclusions})
     
     def get_selected_folders(self) -> List[str]:
         """الحصول على المجلدات المحددة"""
-        settings = self.get_settings()
-        return settings.get('selected_folders', [])
+        return self.settings_store.get('selected_folders', [])
     
     def save_selected_folders(self, folders: List[str]) -> None:
         """حفظ المجلدات المحددة"""
-        settings = self.get_settings()
-        settings['selected_folders'] = folders
-        self.save_settings(settings)
+        self.settings_store.update({'selected_folders': folders})
     
     def get_ignore_hidden_files(self) -> bool:
         """الحصول على إعداد تجاهل الملفات المخفية"""
-        settings = self.get_settings()
-        return settings.get('ignore_hidden_files', True)
+        return self.settings_store.get('ignore_hidden_files', True)
     
     def set_ignore_hidden_files(self, ignore: bool) -> None:
         """تعيين إعداد تجاهل الملفات المخفية"""
-        settings = self.get_settings()
-        settings['ignore_hidden_files'] = ignore
-        self.save_settings(settings)
+        self.settings_store.update({'ignore_hidden_files': ignore})
     
     def save_folder_settings(self, folders_settings: list) -> None:
         """حفظ إعدادات المجلدات"""
-        settings = self.get_settings()
-        settings['folders'] = folders_settings
-        self.save_settings(settings)
+        self.settings_store.update({'folders': folders_settings})
     
     def get_folder_settings(self) -> list:
         """الحصول على إعدادات المجلدات"""
-        settings = self.get_settings()
-        return settings.get('folders', [])
+        return self.settings_store.get('folders', [])
     
     def get_default_folders(self) -> List[Path]:
         """الحصول على المجلدات الافتراضية الموجودة"""
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+نموذج قائمة النسخ - Qt Model/View
+مسؤولية واحدة: عرض آلاف النسخ دون إنشاء عنصر لكل نسخة، مع جلب الصفوف على صفحات والترتيب والتصفية في الذاكرة
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Set
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+
+from core.repository_cache import ArchiveInfo
+
+# عدد الصفوف المضافة في كل جلب عند التمرير إلى آخر القائمة
+PAGE_SIZE = 200
+
+SORT_NEWEST = "newest"
+SORT_OLDEST = "oldest"
+SORT_LARGEST = "largest"
+SORT_NAME = "name"
+
+_SORT_KEYS: Dict[str, Callable[[ArchiveInfo], Any]] = {
+    SORT_NEWEST: lambda info: -info.mtime,
+    SORT_OLDEST: lambda info: info.mtime,
+    SORT_LARGEST: lambda info: -info.size,
+    SORT_NAME: lambda info: info.name,
+}
+
+_CORRUPTED_COLOR = QColor("#e74c3c")
+
+
+class BackupsListModel(QAbstractListModel):
+    """نموذج النسخ - القائمة الكاملة بيانات في الذاكرة، والعرض لا يطلب إلا الصفوف الظاهرة
+
+    الصفوف المرئية للعرض تُجلب على صفحات PAGE_SIZE عبر canFetchMore/fetchMore، وأعداد
+    الملفات تُطلب عبر request_member_counts لكل صفحة عند جلبها وتصل لاحقاً إلى set_member_counts.
+    """
+
+    def __init__(self,
+                 request_member_counts: Callable[[List[Path]], None] = None,
+                 parent=None):
+        super().__init__(parent)
+        self.request_member_counts = request_member_counts or (lambda paths: None)
+        self._archives: List[ArchiveInfo] = []
+        self._dates: Dict[Path, str] = {}
+        self._rows: List[ArchiveInfo] = []
+        self._row_of: Dict[Path, int] = {}
+        self._fetched = 0
+        self._corrupted: Set[Path] = set()
+        self._member_counts: Dict[Path, int] = {}
+        self._sort_key = SORT_NEWEST
+        self._filter_text = ""
+
+    # === واجهة QAbstractListModel ===
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetched < len(self._rows)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        self._fetch_until(self._fetched + PAGE_SIZE)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if not index.isValid() or index.row() >= self._fetched:
+            return None
+        info = self._rows[index.row()]
+
+        if role == Qt.DisplayRole:
+            return self._display_text(info)
+        if role == Qt.UserRole:
+            return info.path
+        if role == Qt.ToolTipRole:
+            return str(info.path)
+        if role == Qt.ForegroundRole and info.path in self._corrupted:
+            return _CORRUPTED_COLOR
+        return None
+
+    # === تحديث البيانات ===
+
+    def set_archives(self, archives: List[ArchiveInfo]) -> None:
+        """استبدال القائمة - أعداد الملفات المعروفة تبقى للنسخ التي لم تتغير"""
+        self._archives = list(archives)
+        self._dates = {info.path: datetime.fromtimestamp(info.mtime).strftime('%Y-%m-%d %H:%M')
+                       for info in self._archives}
+        current = set(self._dates)
+        self._corrupted &= current
+        self._member_counts = {path: count for path, count in self._member_counts.items() if path in current}
+        self._rebuild_rows()
+
+    def set_corrupted(self, backup_paths: Iterable[Path]) -> None:
+        """تمييز النسخ التي وُجدت تالفة في آخر فحص"""
+        corrupted = set(backup_paths)
+        changed = self._corrupted ^ corrupted
+        self._corrupted = corrupted
+        self._emit_rows_changed(changed)
+
+    def set_member_counts(self, counts: Dict[Path, int]) -> None:
+        """إضافة أعداد ملفات وصلت من خيط التحميل"""
+        self._member_counts.update(counts)
+        self._emit_rows_changed(counts)
+
+    def set_sort(self, sort_key: str) -> None:
+        """ترتيب القائمة (SORT_NEWEST، SORT_OLDEST، SORT_LARGEST، SORT_NAME)"""
+        if sort_key not in _SORT_KEYS or sort_key == self._sort_key:
+            return
+        self._sort_key = sort_key
+        self._rebuild_rows()
+
+    def set_filter_text(self, text: str) -> None:
+        """إظهار النسخ التي يحتوي اسمها أو تاريخها على النص فقط"""
+        text = text.strip().lower()
+        if text == self._filter_text:
+            return
+        self._filter_text = text
+        self._rebuild_rows()
+
+    # === استعلامات ===
+
+    @property
+    def total_count(self) -> int:
+        """عدد جميع النسخ قبل التصفية"""
+        return len(self._archives)
+
+    @property
+    def matching_count(self) -> int:
+        """عدد النسخ المطابقة للتصفية، المجلوبة وغير المجلوبة"""
+        return len(self._rows)
+
+    def index_of(self, backup_path: Path) -> QModelIndex:
+        """فهرس نسخة مع جلب الصفحات حتى صفها - فهرس غير صالح إذا كانت مخفية بالتصفية"""
+        row = self._row_of.get(backup_path)
+        if row is None:
+            return QModelIndex()
+        self._fetch_until(row + 1)
+        return self.index(row)
+
+    # === داخلي ===
+
+    def _rebuild_rows(self) -> None:
+        """إعادة الترتيب والتصفية في الذاكرة ثم عرض الصفحة الأولى - لا تُنشأ عناصر واجهة"""
+        self.beginResetModel()
+        rows = self._archives
+        if self._filter_text:
+            rows = [info for info in rows
+                    if self._filter_text in info.name.lower() or self._filter_text in self._dates[info.path]]
+        self._rows = sorted(rows, key=_SORT_KEYS[self._sort_key])
+        self._row_of = {info.path: row for row, info in enumerate(self._rows)}
+        self._fetched = 0
+        self.endResetModel()
+        self._fetch_until(PAGE_SIZE)
+
+    def _fetch_until(self, count: int) -> None:
+        """إضافة صفوف حتى يصبح عدد المجلوب count أو تنتهي القائمة"""
+        count = min(count, len(self._rows))
+        if count <= self._fetched:
+            return
+        first = self._fetched
+        self.beginInsertRows(QModelIndex(), first, count - 1)
+        self._fetched = count
+        self.endInsertRows()
+
+        missing = [info.path for info in self._rows[first:count] if info.path not in self._member_counts]
+        if missing:
+            self.request_member_counts(missing)
+
+    def _emit_rows_changed(self, backup_paths: Iterable[Path]) -> None:
+        rows = [self._row_of[path] for path in backup_paths
+                if path in self._row_of and self._row_of[path] < self._fetched]
+        if rows:
+            self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)))
+
+    def _display_text(self, info: ArchiveInfo) -> str:
+        text = f"{info.name}  ({self._dates[info.path]}) - {info.size / (1024 * 1024):.2f} MB"
+        count = self._member_counts.get(info.path)
+        if count is not None:
+            text += f" - {count} ملف"
+        if info.path in self._corrupted:
+            text = f"⚠ تالفة - {text}"
+        return text
@@ -4,10 +4,13 @@
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
-                             QListWidget, QProgressBar, QLabel, QFrame, QSpinBox,
-                             QAbstractItemView)
-from PyQt5.QtCore import Qt
-from utils.config import DEFAULT_BACKUP_RETENTION
+                             QListWidget, QListView, QProgressBar, QLabel, QFrame, QSpinBox,
+                             QAbstractItemView, QComboBox, QLineEdit, QTreeView, QPlainTextEdit,
+                             QSplitter, QCheckBox, QHeaderView)
+from PyQt5.QtCore import Qt, QTimer
+from ui.archive_tree_model import ArchiveTreeModel, COLUMN_NAME
+from ui.backups_list_model import BackupsListModel, SORT_NEWEST, SORT_OLDEST, SORT_LARGEST, SORT_NAME
+from utils.config import DEFAULT_BACKUP_RETENTION, PROFILE_OFF, PROFILE_SAMPLING, PROFILE_FULL
 
 
 class BackupPage(QWidget):
@@ -49,6 +52,25 @@ class BackupPage(QWidget):
         """)
         buttons_layout.addWidget(self.backup_btn)
         
+        self.dry_run_btn = QPushButton("معاينة ما سيُنسخ")
+        self.dry_run_btn.setStyleSheet("padding: 12px; border-radius: 6px; font-weight: bold; background-color: #16a085;")
+        buttons_layout.addWidget(self.dry_run_btn)
+        
+        self.pause_backup_btn = QPushButton("إيقاف مؤقت")
+        self.pause_backup_btn.setEnabled(False)
+        self.pause_backup_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #f39c12;
+                padding: 12px;
+                border-radius: 6px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #e67e22;
+            }
+        """)
+        buttons_layout.addWidget(self.pause_backup_btn)
+        
         self.cancel_backup_btn = QPushButton("إلغاء النسخ")
         self.cancel_backup_btn.setEnabled(False)
         self.cancel_backup_btn.setStyleSheet("""
@@ -86,6 +108,85 @@ class BackupPage(QWidget):
         progress_layout.addWidget(self.status_label)
         
         layout.addWidget(progress_frame)
+        
+        # مهام النسخ المجدولة - ملفات التعريف تعمل بالتوازي مع النسخ الرئيسي إذا كانت على أقراص أخرى
+        jobs_frame = QFrame()
+        jobs_frame.setFrameStyle(QFrame.Box)
+        jobs_frame.setStyleSheet("QFrame { border: 1px solid #4b749e; border-radius: 8px; padding: 15px; }")
+        jobs_layout = QVBoxLayout(jobs_frame)
+        
+        jobs_title = QLabel("مهام النسخ")
+        jobs_title.setStyleSheet("font-weight: bold; color: #2a82da; font-size: 12px;")
+        jobs_layout.addWidget(jobs_title)
+        
+        profile_layout = QHBoxLayout()
+        self.backup_profile_combo = QComboBox()
+        self.backup_profile_combo.setStyleSheet("""
+            QComboBox {
+                background-color: #3c3f41;
+                border: 1px solid #4b749e;
+                padding: 6px;
+                border-radius: 4px;
+                min-width: 200px;
+            }
+        """)
+        profile_layout.addWidget(self.backup_profile_combo)
+        
+        self.run_profile_btn = QPushButton("نسخ ملف التعريف")
+        self.run_profile_btn.setEnabled(False)
+        self.run_profile_btn.setStyleSheet("padding: 8px; border-radius: 6px; font-weight: bold; background-color: #2a82da;")
+        profile_layout.addWidget(self.run_profile_btn)
+        profile_layout.addStretch()
+        jobs_layout.addLayout(profile_layout)
+        
+        self.jobs_list = QListWidget()
+        self.jobs_list.setMaximumHeight(160)
+        self.jobs_list.setStyleSheet("""
+            QListWidget {
+                background-color: #2c2f31;
+                border: 1px solid #4b749e;
+                border-radius: 6px;
+                padding: 4px;
+                font-size: 10pt;
+            }
+        """)
+        jobs_layout.addWidget(self.jobs_list)
+        
+        self.cancel_job_btn = QPushButton("إلغاء المهمة المحددة")
+        self.cancel_job_btn.setStyleSheet("padding: 8px; border-radius: 6px; font-weight: bold; background-color: #e74c3c;")
+        jobs_layout.addWidget(self.cancel_job_btn)
+        
+        layout.addWidget(jobs_frame)
+        
+        # نتيجة المعاينة - تظهر عند أول تحديث وتتجدد أثناء الفحص
+        self.dry_run_frame = QFrame()
+        self.dry_run_frame.setFrameStyle(QFrame.Box)
+        self.dry_run_frame.setStyleSheet("QFrame { border: 1px solid #4b749e; border-radius: 8px; padding: 15px; }")
+        self.dry_run_frame.setVisible(False)
+        dry_run_layout = QVBoxLayout(self.dry_run_frame)
+        
+        dry_run_title = QLabel("معاينة النسخة التالية")
+        dry_run_title.setStyleSheet("font-weight: bold; color: #16a085; font-size: 12px;")
+        dry_run_layout.addWidget(dry_run_title)
+        
+        self.dry_run_summary_label = QLabel("")
+        self.dry_run_summary_label.setWordWrap(True)
+        dry_run_layout.addWidget(self.dry_run_summary_label)
+        
+        self.dry_run_largest_list = QListWidget()
+        self.dry_run_largest_list.setMaximumHeight(220)
+        self.dry_run_largest_list.setStyleSheet("""
+            QListWidget {
+                background-color: #2c2f31;
+                border: 1px solid #16a085;
+                border-radius: 6px;
+                padding: 4px;
+                font-size: 10pt;
+            }
+        """)
+        dry_run_layout.addWidget(self.dry_run_largest_list)
+        
+        layout.addWidget(self.dry_run_frame)
         layout.addStretch()
 
 
@@ -128,6 +229,21 @@ class RestorePage(QWidget):
         """)
         buttons_layout.addWidget(self.restore_btn)
         
+        self.pause_restore_btn = QPushButton("إيقاف مؤقت")
+        self.pause_restore_btn.setEnabled(False)
+        self.pause_restore_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #f39c12;
+                padding: 12px;
+                border-radius: 6px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #e67e22;
+            }
+        """)
+        buttons_layout.addWidget(self.pause_restore_btn)
+        
         self.cancel_restore_btn = QPushButton("إلغاء الاسترداد")
         self.cancel_restore_btn.setEnabled(False)
         self.cancel_restore_btn.setStyleSheet("""
@@ -430,7 +546,44 @@ class ExclusionsPage(QWidget):
         exclusions_layout.addWidget(scroll_area)
         
         layout.addWidget(exclusions_frame)
+        
+        # أثر الاستثناءات من آخر فحص محفوظ ومقترحات الاستبعاد
+        impact_frame = QFrame()
+        impact_frame.setFrameStyle(QFrame.Box)
+        impact_frame.setStyleSheet("QFrame { border: 1px solid #4b749e; border-radius: 8px; padding: 15px; }")
+        impact_layout = QVBoxLayout(impact_frame)
+        
+        impact_title = QLabel("أثر الاستثناءات")
+        impact_title.setStyleSheet("font-weight: bold; color: #e74c3c; font-size: 14px; margin-bottom: 10px;")
+        impact_layout.addWidget(impact_title)
+        
+        self.impact_summary_label = QLabel("")
+        self.impact_summary_label.setWordWrap(True)
+        self.impact_summary_label.setStyleSheet("color: #95a5a6;")
+        impact_layout.addWidget(self.impact_summary_label)
+        
+        self.suggestions_list = QListWidget()
+        self.suggestions_list.setMaximumHeight(160)
+        self.suggestions_list.setToolTip("انقر مرتين على مقترح لإضافته إلى الاستثناءات")
+        self.suggestions_list.setStyleSheet("""
+            QListWidget {
+                background-color: #2c2f31;
+                border: 1px solid #e74c3c;
+                border-radius: 6px;
+                padding: 4px;
+                font-size: 10pt;
+            }
+        """)
+        self.suggestions_list.itemDoubleClicked.connect(self.add_suggested_exclusion)
+        impact_layout.addWidget(self.suggestions_list)
+        
+        layout.addWidget(impact_frame)
         layout.addStretch()
+        
+        # تأخير حساب الأثر حتى تهدأ التعديلات المتتالية
+        self.impact_timer = QTimer(self)
+        self.impact_timer.setSingleShot(True)
+        self.impact_timer.setInterval(300)
     
     def add_exclusion_from_input(self):
         """إضافة استثناء من حقل الإدخال"""
@@ -464,6 +617,11 @@ class ExclusionsPage(QWidget):
         """)
         
         exclusion_layout.addWidget(exclusion_label)
+        
+        # عدد الملفات والحجم الذي يستبعده النمط - يُملأ من تحليل الأثر
+        impact_label = QLabel("")
+        impact_label.setStyleSheet("color: #95a5a6; font-size: 9pt;")
+        exclusion_layout.addWidget(impact_label)
         exclusion_layout.addStretch()
         
         # زر الحذف
@@ -487,6 +645,7 @@ class ExclusionsPage(QWidget):
         
         # حفظ البيانات
         exclusion_widget.exclusion_text = exclusion_text
+        exclusion_widget.impact_label = impact_label
         
         # إضافة إلى التخطيط
         self.exclusions_layout.insertWidget(self.exclusions_layout.count() - 1, exclusion_widget)
@@ -507,6 +666,13 @@ class ExclusionsPage(QWidget):
         if self.parent_window and hasattr(self.parent_window, 'model'):
             exclusions = [widget.exclusion_text for widget in self.exclusion_widgets]
             self.parent_window.model.save_exclusions(exclusions)
+        self.impact_timer.start()
+    
+    def add_suggested_exclusion(self, item):
+        """إضافة النمط المقترح إلى الاستثناءات"""
+        pattern = item.data(Qt.UserRole)
+        if pattern and self.add_exclusion_widget(pattern) is not None:
+            self.save_exclusions()
     
     def get_exclusions(self):
         """الحصول على قائمة الاستثناءات"""
@@ -551,32 +717,99 @@ class BackupsPage(QWidget):
         backups_label.setStyleSheet("font-weight: bold; color: #9b59b6; font-size: 14px; margin-bottom: 10px;")
         backups_layout.addWidget(backups_label)
         
-        self.backups_list = QListWidget()
+        # البحث عن ملف في جميع النسخ
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("ابحث عن ملف في جميع النسخ (مثال: report_final.docx)")
+        self.search_input.setStyleSheet("""
+            QLineEdit {
+                background-color: #3c3f41;
+                border: 2px solid #4b749e;
+                border-radius: 6px;
+                padding: 8px;
+                font-size: 11pt;
+                color: #d8d8d8;
+            }
+            QLineEdit:focus {
+                border: 2px solid #9b59b6;
+            }
+        """)
+        backups_layout.addWidget(self.search_input)
+        
+        # تأخير البحث حتى يتوقف المستخدم عن الكتابة
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(250)
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+        
+        self.search_results = QListWidget()
+        self.search_results.setVisible(False)
+        self.search_results.setMaximumHeight(200)
+        self.search_results.setStyleSheet("""
+            QListWidget {
+                background-color: #2c2f31;
+                border: 1px solid #9b59b6;
+                border-radius: 6px;
+                padding: 4px;
+                font-size: 10pt;
+            }
+        """)
+        backups_layout.addWidget(self.search_results)
+        
+        # تصفية النسخ وترتيبها - تعمل على النموذج في الذاكرة دون إعادة بناء القائمة
+        list_controls_layout = QHBoxLayout()
+        self.backups_filter_input = QLineEdit()
+        self.backups_filter_input.setPlaceholderText("تصفية النسخ بالاسم أو التاريخ (مثال: 2024-05)")
+        self.backups_filter_input.setClearButtonEnabled(True)
+        self.backups_sort_combo = QComboBox()
+        self.backups_sort_combo.addItem("الأحدث أولاً", SORT_NEWEST)
+        self.backups_sort_combo.addItem("الأقدم أولاً", SORT_OLDEST)
+        self.backups_sort_combo.addItem("الأكبر حجماً", SORT_LARGEST)
+        self.backups_sort_combo.addItem("حسب الاسم", SORT_NAME)
+        list_controls_layout.addWidget(self.backups_filter_input, 1)
+        list_controls_layout.addWidget(self.backups_sort_combo)
+        backups_layout.addLayout(list_controls_layout)
+        
+        self.backups_model = BackupsListModel(parent=self)
+        self.backups_list = QListView()
+        self.backups_list.setModel(self.backups_model)
         self.backups_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        # ارتفاع موحد للصفوف فلا يقيس العرض كل صف لحساب شريط التمرير
+        self.backups_list.setUniformItemSizes(True)
         self.backups_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 background-color: #3c3f41;
                 border: 1px solid #4b749e;
                 border-radius: 6px;
                 padding: 8px;
                 font-size: 11pt;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 10px;
                 border-bottom: 1px solid #555;
                 border-radius: 4px;
                 margin: 2px;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #9b59b6;
                 color: white;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #8e44ad;
             }
         """)
         backups_layout.addWidget(self.backups_list)
         
+        # حالة القائمة: التحميل أو عدم وجود نسخ أو عدد النسخ المطابقة
+        self.backups_status_label = QLabel("")
+        self.backups_status_label.setAlignment(Qt.AlignCenter)
+        self.backups_status_label.setStyleSheet("color: #95a5a6; font-style: italic;")
+        backups_layout.addWidget(self.backups_status_label)
+        
+        self.backups_filter_input.textChanged.connect(self.backups_model.set_filter_text)
+        self.backups_sort_combo.currentIndexChanged.connect(
+            lambda: self.backups_model.set_sort(self.backups_sort_combo.currentData())
+        )
+        
         # أزرار إدارة النسخ
         backup_management_layout = QHBoxLayout()
         
@@ -586,14 +819,186 @@ class BackupsPage(QWidget):
         self.refresh_btn = QPushButton("تحديث القائمة")
         self.refresh_btn.setStyleSheet("padding: 10px; font-weight: bold;")
         
+        self.verify_btn = QPushButton("فحص السلامة")
+        self.verify_btn.setStyleSheet("padding: 10px; font-weight: bold; background-color: #8e44ad;")
+        
+        self.browse_backup_btn = QPushButton("تصفح المحتويات")
+        self.browse_backup_btn.setStyleSheet("padding: 10px; font-weight: bold; background-color: #16a085;")
+        
+        self.compare_backups_btn = QPushButton("مقارنة نسختين")
+        self.compare_backups_btn.setStyleSheet("padding: 10px; font-weight: bold; background-color: #2980b9;")
+        
         backup_management_layout.addWidget(self.delete_backup_btn)
+        backup_management_layout.addWidget(self.verify_btn)
+        backup_management_layout.addWidget(self.browse_backup_btn)
+        backup_management_layout.addWidget(self.compare_backups_btn)
         backup_management_layout.addWidget(self.refresh_btn)
         backups_layout.addLayout(backup_management_layout)
         
+        # حالة فحص السلامة
+        self.verify_status_label = QLabel("")
+        self.verify_status_label.setAlignment(Qt.AlignCenter)
+        self.verify_status_label.setStyleSheet("color: #95a5a6; font-style: italic; margin-top: 5px;")
+        backups_layout.addWidget(self.verify_status_label)
+        
         layout.addWidget(backups_frame)
         layout.addStretch()
 
 
+class BrowserPage(QWidget):
+    """صفحة تصفح محتويات نسخة - شجرة تُبنى مستوياتها عند فتحها، ومعاينة، واسترداد المحدد فقط"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.archive_path = None
+        self.setup_ui()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(20)
+        
+        # عنوان الصفحة
+        title = QLabel("تصفح النسخة")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #16a085; margin-bottom: 15px;")
+        layout.addWidget(title)
+        
+        browser_frame = QFrame()
+        browser_frame.setFrameStyle(QFrame.Box)
+        browser_frame.setStyleSheet("QFrame { border: 1px solid #4b749e; border-radius: 8px; padding: 15px; }")
+        browser_layout = QVBoxLayout(browser_frame)
+        
+        self.archive_label = QLabel("اختر نسخة من صفحة النسخ المتاحة ثم اضغط تصفح المحتويات.")
+        self.archive_label.setStyleSheet("font-weight: bold; color: #16a085; font-size: 14px; margin-bottom: 10px;")
+        browser_layout.addWidget(self.archive_label)
+        
+        # الشجرة والمعاينة جنباً إلى جنب
+        splitter = QSplitter(Qt.Horizontal)
+        
+        self.tree_model = ArchiveTreeModel(self)
+        self.tree_view = QTreeView()
+        self.tree_view.setModel(self.tree_model)
+        self.tree_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.tree_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # ارتفاع موحد للصفوف فلا تقيس الشجرة كل صف في المجلدات الكبيرة
+        self.tree_view.setUniformRowHeights(True)
+        self.tree_view.header().setSectionResizeMode(COLUMN_NAME, QHeaderView.Stretch)
+        self.tree_view.header().setStretchLastSection(False)
+        self.tree_view.setStyleSheet("""
+            QTreeView {
+                background-color: #3c3f41;
+                border: 1px solid #4b749e;
+                border-radius: 6px;
+                padding: 8px;
+                font-size: 10pt;
+            }
+            QTreeView::item:selected {
+                background-color: #16a085;
+                color: white;
+            }
+        """)
+        splitter.addWidget(self.tree_view)
+        
+        self.preview_text = QPlainTextEdit()
+        self.preview_text.setReadOnly(True)
+        self.preview_text.setPlaceholderText("اختر ملفاً لمعاينة محتواه.")
+        self.preview_text.setStyleSheet("""
+            QPlainTextEdit {
+                background-color: #2c2f31;
+                border: 1px solid #4b749e;
+                border-radius: 6px;
+                padding: 8px;
+                font-family: monospace;
+                font-size: 10pt;
+            }
+        """)
+        splitter.addWidget(self.preview_text)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 2)
+        browser_layout.addWidget(splitter, 1)
+        
+        # حالة التحميل وعدد الملفات
+        self.browser_status_label = QLabel("")
+        self.browser_status_label.setAlignment(Qt.AlignCenter)
+        self.browser_status_label.setStyleSheet("color: #95a5a6; font-style: italic;")
+        browser_layout.addWidget(self.browser_status_label)
+        
+        # استرداد المحدد
+        restore_layout = QHBoxLayout()
+        self.overwrite_checkbox = QCheckBox("استبدال الملفات الموجودة بنسخها المحفوظة")
+        self.restore_selection_btn = QPushButton("استرداد المحدد")
+        self.restore_selection_btn.setStyleSheet("padding: 10px; font-weight: bold; background-color: #28a745;")
+        restore_layout.addWidget(self.overwrite_checkbox, 1)
+        restore_layout.addWidget(self.restore_selection_btn)
+        browser_layout.addLayout(restore_layout)
+        
+        layout.addWidget(browser_frame, 1)
+    
+    def get_selected_paths(self):
+        """مسارات العناصر المحددة داخل الأرشيف - المجلد المحدد يشمل كل ما بداخله"""
+        indexes = self.tree_view.selectionModel().selectedRows(COLUMN_NAME)
+        return [self.tree_model.entry(index).path for index in indexes]
+
+
+class CompareBackupsPage(QWidget):
+    """صفحة مقارنة نسختين - مجاميع كل مجلد أعلى وقائمة الملفات المتغيرة من السجلين"""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.setup_ui()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(20)
+        
+        # عنوان الصفحة
+        title = QLabel("مقارنة النسخ")
+        title.setStyleSheet("font-size: 18px; font-weight: bold; color: #2980b9; margin-bottom: 15px;")
+        layout.addWidget(title)
+        
+        compare_frame = QFrame()
+        compare_frame.setFrameStyle(QFrame.Box)
+        compare_frame.setStyleSheet("QFrame { border: 1px solid #4b749e; border-radius: 8px; padding: 15px; }")
+        compare_layout = QVBoxLayout(compare_frame)
+        
+        self.compare_label = QLabel("اختر نسختين من صفحة النسخ المتاحة ثم اضغط مقارنة نسختين.")
+        self.compare_label.setStyleSheet("font-weight: bold; color: #2980b9; font-size: 14px; margin-bottom: 10px;")
+        compare_layout.addWidget(self.compare_label)
+        
+        self.compare_summary_label = QLabel("")
+        self.compare_summary_label.setWordWrap(True)
+        compare_layout.addWidget(self.compare_summary_label)
+        
+        list_style = """
+            QListWidget {
+                background-color: #3c3f41;
+                border: 1px solid #4b749e;
+                border-radius: 6px;
+                padding: 8px;
+                font-size: 10pt;
+            }
+        """
+        
+        # مجاميع المجلدات والملفات المتغيرة جنباً إلى جنب
+        splitter = QSplitter(Qt.Horizontal)
+        
+        self.folders_diff_list = QListWidget()
+        self.folders_diff_list.setStyleSheet(list_style)
+        splitter.addWidget(self.folders_diff_list)
+        
+        self.changes_list = QListWidget()
+        # ارتفاع موحد للصفوف فلا تقيس القائمة آلاف التغييرات
+        self.changes_list.setUniformItemSizes(True)
+        self.changes_list.setStyleSheet(list_style)
+        splitter.addWidget(self.changes_list)
+        splitter.setStretchFactor(0, 2)
+        splitter.setStretchFactor(1, 3)
+        compare_layout.addWidget(splitter, 1)
+        
+        layout.addWidget(compare_frame, 1)
+
+
 class SettingsPage(QWidget):
     """صفحة الإعدادات"""
     
@@ -648,11 +1053,79 @@ class SettingsPage(QWidget):
     
         settings_layout.addLayout(retention_layout)
         
+        # سياسة الجد-الأب-الابن: نسخة واحدة لكل يوم/أسبوع/شهر
+        gfs_layout = QHBoxLayout()
+        gfs_layout.addWidget(QLabel("بالإضافة إلى آخر"))
+        self.daily_spinbox = self._create_gfs_spinbox()
+        gfs_layout.addWidget(self.daily_spinbox)
+        gfs_layout.addWidget(QLabel("يوم،"))
+        self.weekly_spinbox = self._create_gfs_spinbox()
+        gfs_layout.addWidget(self.weekly_spinbox)
+        gfs_layout.addWidget(QLabel("أسبوع،"))
+        self.monthly_spinbox = self._create_gfs_spinbox()
+        gfs_layout.addWidget(self.monthly_spinbox)
+        gfs_layout.addWidget(QLabel("شهر"))
+        gfs_layout.addStretch()
+        settings_layout.addLayout(gfs_layout)
+        
         # معلومات إضافية
-        info_label = QLabel("سيتم حذف النسخ الأقدم تلقائياً عند تجاوز العدد المحدد")
+        info_label = QLabel("سيتم حذف النسخ الأقدم تلقائياً عند تجاوز العدد المحدد، "
+                            "مع نقل الملفات التي ما زالت مطلوبة إلى نسخة أحدث")
         info_label.setStyleSheet("color: #95a5a6; font-style: italic; margin-top: 10px;")
         settings_layout.addWidget(info_label)
         
+        # حدود الموارد - تنطبق فوراً على العملية الجارية
+        limits_label = QLabel("حدود استهلاك الموارد أثناء النسخ")
+        limits_label.setStyleSheet("font-weight: bold; color: #f39c12; font-size: 14px; margin-top: 15px;")
+        settings_layout.addWidget(limits_label)
+        
+        limits_layout = QHBoxLayout()
+        limits_layout.addWidget(QLabel("القراءة"))
+        self.read_limit_spinbox = self._create_limit_spinbox(0, 10000, " MB/s")
+        limits_layout.addWidget(self.read_limit_spinbox)
+        limits_layout.addWidget(QLabel("الكتابة"))
+        self.write_limit_spinbox = self._create_limit_spinbox(0, 10000, " MB/s")
+        limits_layout.addWidget(self.write_limit_spinbox)
+        limits_layout.addWidget(QLabel("المعالج"))
+        self.cpu_limit_spinbox = self._create_limit_spinbox(5, 100, "%")
+        self.cpu_limit_spinbox.setValue(100)
+        limits_layout.addWidget(self.cpu_limit_spinbox)
+        limits_layout.addStretch()
+        settings_layout.addLayout(limits_layout)
+        
+        limits_info_label = QLabel("صفر يعني بلا حد. يمكن تعديل الحدود أثناء النسخ")
+        limits_info_label.setStyleSheet("color: #95a5a6; font-style: italic;")
+        settings_layout.addWidget(limits_info_label)
+        
+        # قياس الأداء - لالتقاط تقرير عند الإبلاغ عن بطء النسخ
+        profiling_label = QLabel("تشخيص الأداء")
+        profiling_label.setStyleSheet("font-weight: bold; color: #f39c12; font-size: 14px; margin-top: 15px;")
+        settings_layout.addWidget(profiling_label)
+        
+        profiling_layout = QHBoxLayout()
+        profiling_layout.addWidget(QLabel("قياس عمليات النسخ والاسترداد"))
+        self.profiling_combo = QComboBox()
+        self.profiling_combo.addItem("معطل", PROFILE_OFF)
+        self.profiling_combo.addItem("بالعينات (كلفة منخفضة)", PROFILE_SAMPLING)
+        self.profiling_combo.addItem("كامل (cProfile و tracemalloc)", PROFILE_FULL)
+        self.profiling_combo.setStyleSheet("""
+            QComboBox {
+                background-color: #3c3f41;
+                border: 1px solid #4b749e;
+                padding: 6px;
+                border-radius: 4px;
+                min-width: 200px;
+            }
+        """)
+        profiling_layout.addWidget(self.profiling_combo)
+        profiling_layout.addStretch()
+        settings_layout.addLayout(profiling_layout)
+        
+        profiling_info_label = QLabel("تُحفظ التقارير في مجلد profiles داخل مجلد البرنامج. "
+                                      "القياس الكامل يبطئ النسخ عدة مرات")
+        profiling_info_label.setStyleSheet("color: #95a5a6; font-style: italic;")
+        settings_layout.addWidget(profiling_info_label)
+        
         # خيار تجاهل الملفات المخفية
         from PyQt5.QtWidgets import QCheckBox
         hidden_files_layout = QHBoxLayout()
@@ -686,4 +1159,29 @@ class SettingsPage(QWidget):
         settings_layout.addLayout(hidden_files_layout)
         
         layout.addWidget(settings_frame)
-        layout.addStretch()
\ No newline at end of file
+        layout.addStretch()
+    
+    def _create_gfs_spinbox(self) -> QSpinBox:
+        """إنشاء حقل عدد لقواعد الاحتفاظ اليومية/الأسبوعية/الشهرية"""
+        spinbox = QSpinBox()
+        spinbox.setMinimum(0)
+        spinbox.setMaximum(120)
+        spinbox.setValue(0)
+        spinbox.setStyleSheet("""
+            QSpinBox {
+                background-color: #3c3f41;
+                border: 1px solid #4b749e;
+                padding: 6px;
+                border-radius: 4px;
+                font-weight: bold;
+                min-width: 60px;
+            }
+        """)
+        return spinbox
+    
+    def _create_limit_spinbox(self, minimum: int, maximum: int, suffix: str) -> QSpinBox:
+        """إنشاء حقل عدد لحدود الموارد"""
+        spinbox = self._create_gfs_spinbox()
+        spinbox.setRange(minimum, maximum)
+        spinbox.setSuffix(suffix)
+        return spinbox
@@ -41,6 +41,8 @@ class Sidebar(QWidget):
             ("folders", "إدارة المجلدات", "📁"),
             ("exclusions", "الاستثناءات", "🚫"),
             ("backups", "النسخ المتاحة", "💾"),
+            ("browser", "تصفح النسخة", "🗂️"),
+            ("compare", "مقارنة النسخ", "⚖️"),
             ("settings", "الإعدادات", "⚙️")
         ]
         
@@ -4,14 +4,18 @@
 مسؤولية واحدة: تنسيق التفاعل بين View و Model
 """
 
-from datetime import datetime
+from dataclasses import replace
 from pathlib import Path
 from typing import List, Optional
 
 from interfaces.ui_interfaces import IMainView, IMainPresenter, IBackupModel
 from core.factories import ServiceContainer
+from core.job_scheduler import BackupJob, JobState
 from core.logging_system import ILogger, LoggerFactory
-from utils.config import BACKUP_DIR
+from core.resource_governor import ResourceLimits
+from core.retention import RetentionPolicy
+from core.search_index import MIN_QUERY_LENGTH
+from ui.workers import BackupsDeleter, JobProgressRelay, RetentionApplier
 
 
 class MainPresenter(IMainPresenter):
@@ -27,6 +31,14 @@ class MainPresenter(IMainPresenter):
         self.service_container = service_container or ServiceContainer()
         self.logger = logger or LoggerFactory.create_default_logger()
         self.current_worker = None
+        # مهمة النسخ الرئيسي تعمل عبر المجدول مع مهام ملفات التعريف، وعاملها يبث تقدمها لصفحة النسخ
+        self.backup_job: Optional[BackupJob] = None
+        self.backup_job_worker = None
+        self.job_relay = JobProgressRelay()
+        self.job_relay.job_changed.connect(self.view.update_job)
+        self.job_relay.job_finished.connect(self._on_job_finished)
+        # الحذف وتطبيق الاحتفاظ ينتظران القفل الحصري، فيعملان في خيط حتى لا تتجمد الواجهة
+        self.maintenance_worker = None
     
     def start_backup(self) -> None:
         """بدء عملية النسخ الاحتياطي"""
@@ -43,27 +55,29 @@ class MainPresenter(IMainPresenter):
             
             # إعداد معاملات النسخ
             exclusions = self.view.get_exclusions()
-            timestamp = datetime.now().strftime('%Y-%m-%d_%H%M%S')
-            backup_filepath = BACKUP_DIR / f"نسخة_{timestamp}.zip"
             
             # تعطيل عناصر التحكم
             self.view.toggle_controls(False, 'backup')
             self.view.update_progress(0, "جارٍ التحضير...", 'backup')
             
-            # إنشاء وتشغيل العامل
-            self.current_worker = self.service_container.create_backup_worker(
-                selected_folders, backup_filepath, exclusions
+            # إنشاء المهمة وعاملها - النسخ الرئيسي يسبق مهام ملفات التعريف على نفس القرص
+            job, worker = self.service_container.create_backup_job(
+                selected_folders, exclusions, "النسخ الرئيسي", priority=1
             )
             
-            # ربط الإشارات
-            self.current_worker.progress_update.connect(
+            # ربط الإشارات قبل الجدولة لأن المهمة قد تبدأ فوراً
+            worker.progress_update.connect(
                 lambda p, s: self.view.update_progress(p, s, 'backup')
             )
-            self.current_worker.finished.connect(
+            worker.finished.connect(
                 lambda msg: self._on_backup_finished(msg)
             )
+            self.backup_job, self.backup_job_worker = self.job_relay.watch(job), worker
             
-            self.current_worker.start()
+            self.service_container.submit_backup_job(job)
+            self.view.update_job(job)
+            if job.state is JobState.PENDING:
+                self.view.update_progress(0, "في انتظار انتهاء مهمة أخرى على نفس القرص...", 'backup')
             self.logger.info("بدء عملية النسخ الاحتياطي")
             
         except Exception as e:
@@ -73,6 +87,106 @@ class MainPresenter(IMainPresenter):
                 f"حدث خطأ أثناء بدء النسخ الاحتياطي:\n{e}",
                 "error"
             )
+            self.backup_job = self.backup_job_worker = None
+            self.view.toggle_controls(True, 'backup')
+    
+    def start_profile_backup(self) -> None:
+        """جدولة نسخة لملف التعريف المحدد - تعمل بالتوازي مع النسخ الرئيسي إذا كانت وجهتها على قرص آخر"""
+        try:
+            profile_name = self.view.get_selected_backup_profile()
+            if not profile_name:
+                self.view.show_message(
+                    "لم يتم الاختيار",
+                    "الرجاء اختيار ملف تعريف.",
+                    "warning"
+                )
+                return
+            
+            profile = self.service_container.get('profile_store').require(profile_name)
+            job = self.job_relay.watch(self.service_container.create_profile_job(profile))
+            self.service_container.submit_backup_job(job)
+            self.view.update_job(job)
+            self.logger.info(f"تمت جدولة نسخ ملف التعريف: {profile_name}")
+            
+        except Exception as e:
+            self.logger.error(f"فشل في جدولة نسخ ملف التعريف: {e}")
+            self.view.show_message(
+                "خطأ في النسخ",
+                f"حدث خطأ أثناء جدولة نسخ ملف التعريف:\n{e}",
+                "error"
+            )
+    
+    def load_backup_profiles(self) -> None:
+        """عرض ملفات التعريف المحفوظة في قائمة مهام النسخ"""
+        try:
+            profiles = self.service_container.get('profile_store').list_profiles()
+            self.view.set_backup_profiles([profile.name for profile in profiles])
+        except Exception as e:
+            self.logger.error(f"فشل في تحميل ملفات التعريف: {e}")
+            self.view.set_backup_profiles([])
+    
+    def cancel_selected_job(self) -> None:
+        """إلغاء مهمة النسخ المحددة في قائمة المهام - منتظرة أو جارية"""
+        job_id = self.view.get_selected_job_id()
+        if job_id is not None and self.service_container.get('job_scheduler').cancel(job_id):
+            self.logger.info(f"تم طلب إلغاء المهمة {job_id}")
+    
+    def has_active_operations(self) -> bool:
+        """هل توجد عملية أو مهمة نسخ لم تنته بعد"""
+        if self.current_worker is not None and self.current_worker.isRunning():
+            return True
+        if self.maintenance_worker is not None and self.maintenance_worker.isRunning():
+            return True
+        return any(not job.is_finished for job in self.service_container.get('job_scheduler').get_jobs())
+    
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """إلغاء العمليات والمهام الجارية عند إغلاق البرنامج وانتظار توقفها حتى لا تبقى نسخ نصف مكتوبة"""
+        if self.current_worker is not None and self.current_worker.isRunning():
+            self.current_worker.stop()
+            self.current_worker.wait(int(timeout * 1000))
+        if self.maintenance_worker is not None:
+            self.maintenance_worker.wait(int(timeout * 1000))
+        scheduler = self.service_container.get('job_scheduler')
+        scheduler.shutdown(cancel_pending=True, wait=False, cancel_running=True)
+        scheduler.wait_all(timeout)
+    
+    def start_dry_run(self) -> None:
+        """معاينة النسخة التالية - يستخدم النسخ فحصها إذا بدأ بعدها مباشرة"""
+        try:
+            selected_folders = self.view.get_selected_folders()
+            if not selected_folders:
+                self.view.show_message(
+                    "لا توجد مجلدات", 
+                    "الرجاء اختيار مجلد واحد على الأقل.",
+                    "warning"
+                )
+                return
+            
+            # تعطيل عناصر التحكم - الإلغاء والإيقاف المؤقت بأزرار النسخ نفسها
+            self.view.toggle_controls(False, 'backup')
+            self.view.update_progress(0, "جارٍ التحضير للمعاينة...", 'backup')
+            
+            self.current_worker = self.service_container.create_dry_run_worker(
+                selected_folders, self.view.get_exclusions()
+            )
+            self.current_worker.progress_update.connect(
+                lambda p, s: self.view.update_progress(p, s, 'backup')
+            )
+            self.current_worker.report_update.connect(self.view.show_dry_run_report)
+            self.current_worker.finished.connect(
+                lambda msg: self._on_dry_run_finished(msg)
+            )
+            
+            self.current_worker.start()
+            self.logger.info("بدء معاينة النسخة التالية")
+            
+        except Exception as e:
+            self.logger.error(f"فشل في بدء المعاينة: {e}")
+            self.view.show_message(
+                "خطأ في المعاينة", 
+                f"حدث خطأ أثناء بدء المعاينة:\n{e}",
+                "error"
+            )
             self.view.toggle_controls(True, 'backup')
     
     def start_restore(self) -> None:
@@ -95,38 +209,127 @@ class MainPresenter(IMainPresenter):
             ):
                 return
             
-            # تعطيل عناصر التحكم
-            self.view.toggle_controls(False, 'restore')
+            self._launch_restore(selected_backup)
             
-            # إنشاء وتشغيل العامل
-            self.current_worker = self.service_container.create_restore_worker(selected_backup)
+        except Exception as e:
+            self._on_restore_start_failed(e)
+    
+    def start_selective_restore(self, backup_path: Path, members: List[str], overwrite: bool = False) -> None:
+        """استرداد ملفات ومجلدات محددة من متصفح النسخة"""
+        try:
+            if not members:
+                self.view.show_message(
+                    "لم يتم الاختيار",
+                    "الرجاء اختيار ملف أو مجلد من محتويات النسخة.",
+                    "warning"
+                )
+                return
             
-            # ربط الإشارات
-            self.current_worker.progress_update.connect(
-                lambda p, s: self.view.update_progress(p, s, 'restore')
-            )
-            self.current_worker.finished.connect(
-                lambda msg: self._on_restore_finished(msg)
-            )
+            note = ("سيتم استبدال الملفات الموجودة بنسخها المحفوظة." if overwrite
+                    else "لن يتم استبدال أي ملف موجود.")
+            if not self.view.show_confirmation(
+                "تأكيد الاسترداد",
+                f"استرداد {len(members)} من العناصر المحددة من {backup_path.name}؟ {note}"
+            ):
+                return
             
-            self.current_worker.start()
-            self.logger.info(f"بدء عملية الاسترداد من: {selected_backup}")
+            self._launch_restore(backup_path, members, overwrite)
             
         except Exception as e:
-            self.logger.error(f"فشل في بدء الاسترداد: {e}")
-            self.view.show_message(
-                "خطأ في الاسترداد", 
-                f"حدث خطأ أثناء بدء الاسترداد:\n{e}",
-                "error"
-            )
-            self.view.toggle_controls(True, 'restore')
+            self._on_restore_start_failed(e)
+    
+    def _launch_restore(self,
+                        backup_path: Path,
+                        members: Optional[List[str]] = None,
+                        overwrite: bool = False) -> None:
+        """تشغيل عامل الاسترداد وربط إشاراته"""
+        # تعطيل عناصر التحكم
+        self.view.toggle_controls(False, 'restore')
+        
+        # إنشاء وتشغيل العامل
+        self.current_worker = self.service_container.create_restore_worker(backup_path, members, overwrite)
+        
+        # ربط الإشارات
+        self.current_worker.progress_update.connect(
+            lambda p, s: self.view.update_progress(p, s, 'restore')
+        )
+        self.current_worker.finished.connect(
+            lambda msg: self._on_restore_finished(msg)
+        )
+        
+        self.current_worker.start()
+        self.logger.info(f"بدء عملية الاسترداد من: {backup_path}")
+    
+    def _on_restore_start_failed(self, error: Exception) -> None:
+        self.logger.error(f"فشل في بدء الاسترداد: {error}")
+        self.view.show_message(
+            "خطأ في الاسترداد", 
+            f"حدث خطأ أثناء بدء الاسترداد:\n{error}",
+            "error"
+        )
+        self.view.toggle_controls(True, 'restore')
     
     def cancel_operation(self) -> None:
-        """إلغاء العملية الجارية"""
-        if self.current_worker and self.current_worker.isRunning():
+        """إلغاء العملية الجارية - مهمة النسخ الرئيسي تُلغى عبر المجدول حتى لو لم تبدأ بعد"""
+        if self.backup_job is not None and not self.backup_job.is_finished:
+            self.service_container.get('job_scheduler').cancel(self.backup_job.job_id)
+            self.logger.info("تم طلب إلغاء النسخ الاحتياطي")
+        elif self.current_worker and self.current_worker.isRunning():
             self.current_worker.stop()
             self.logger.info("تم طلب إلغاء العملية")
     
+    def update_retention_settings(self) -> None:
+        """حفظ عدد النسخ المحتفظ بها وقواعد الجد-الأب-الابن - تقرؤها خدمة النسخ التلقائي أيضاً"""
+        config_manager = self.service_container.get('config_manager')
+        settings = replace(
+            config_manager.load_settings(),
+            backup_retention=self.view.get_retention_count(),
+            **self.view.get_gfs_retention()
+        )
+        if not config_manager.save_settings(settings):
+            self.logger.error("فشل في حفظ قواعد الاحتفاظ")
+    
+    def update_resource_limits(self) -> None:
+        """تطبيق حدود الموارد فوراً على العملية الجارية وحفظها لبقية العمليات"""
+        limits = self.view.get_resource_limits()
+        self.service_container.get('resource_governor').set_limits(ResourceLimits(
+            read_mb_per_sec=limits['read'],
+            write_mb_per_sec=limits['write'],
+            cpu_percent=limits['cpu']
+        ))
+        
+        config_manager = self.service_container.get('config_manager')
+        settings = replace(
+            config_manager.load_settings(),
+            io_read_limit_mb=limits['read'],
+            io_write_limit_mb=limits['write'],
+            cpu_limit_percent=limits['cpu']
+        )
+        if not config_manager.save_settings(settings):
+            self.logger.error("فشل في حفظ حدود الموارد")
+    
+    def update_profiling_mode(self) -> None:
+        """حفظ وضع قياس الأداء - يُطبق من العملية التالية"""
+        config_manager = self.service_container.get('config_manager')
+        if not config_manager.update_setting('profiling_mode', self.view.get_profiling_mode()):
+            self.logger.error("فشل في حفظ وضع قياس الأداء")
+    
+    def toggle_pause(self, operation_type: str) -> None:
+        """إيقاف العملية الجارية مؤقتاً أو استئنافها من نفس الموضع"""
+        if self.backup_job is not None and self.backup_job.state is JobState.RUNNING:
+            worker = self.backup_job_worker
+        elif self.current_worker and self.current_worker.isRunning():
+            worker = self.current_worker
+        else:
+            return
+        
+        if worker.is_paused:
+            worker.resume()
+            self.view.set_operation_paused(False, operation_type)
+        else:
+            worker.pause()
+            self.view.set_operation_paused(True, operation_type)
+    
     def delete_backups(self) -> None:
         """حذف النسخ المحددة"""
         try:
@@ -146,22 +349,12 @@ class MainPresenter(IMainPresenter):
             ):
                 return
             
-            deleted_count = self.model.delete_backups(selected_backups)
-            
-            if deleted_count > 0:
-                self.view.show_message(
-                    "اكتمل الحذف", 
-                    f"تم حذف {deleted_count} من النسخ بنجاح.",
-                    "info"
-                )
-                self.view.refresh_backups_list()
-                self.logger.info(f"تم حذف {deleted_count} نسخة احتياطية")
-            else:
-                self.view.show_message(
-                    "فشل الحذف", 
-                    "لم يتم حذف أي نسخة.",
-                    "warning"
-                )
+            self.view.toggle_controls(False, 'delete')
+            self.maintenance_worker = BackupsDeleter(self.model, selected_backups)
+            self.maintenance_worker.deletion_finished.connect(
+                lambda deleted_count: self._on_delete_finished(deleted_count)
+            )
+            self.maintenance_worker.start()
                 
         except Exception as e:
             self.logger.error(f"فشل في حذف النسخ: {e}")
@@ -170,6 +363,27 @@ class MainPresenter(IMainPresenter):
                 f"حدث خطأ أثناء حذف النسخ:\n{e}",
                 "error"
             )
+            self.view.toggle_controls(True, 'delete')
+    
+    def _on_delete_finished(self, deleted_count: int) -> None:
+        """معالجة انتهاء الحذف"""
+        self.view.toggle_controls(True, 'delete')
+        self.maintenance_worker = None
+        
+        if deleted_count > 0:
+            self.view.show_message(
+                "اكتمل الحذف", 
+                f"تم حذف {deleted_count} من النسخ بنجاح.",
+                "info"
+            )
+            self.view.refresh_backups_list()
+            self.logger.info(f"تم حذف {deleted_count} نسخة احتياطية")
+        else:
+            self.view.show_message(
+                "فشل الحذف", 
+                "لم يتم حذف أي نسخة.",
+                "warning"
+            )
     
     def add_custom_folder(self, folder_path: str) -> None:
         """إضافة مجلد مخصص"""
@@ -251,30 +465,104 @@ class MainPresenter(IMainPresenter):
         except Exception as e:
             self.logger.error(f"فشل في تحديث قائمة النسخ: {e}")
     
+    def search_backups(self, query: str) -> None:
+        """البحث عن ملف في جميع النسخ الاحتياطية"""
+        try:
+            results = self.model.search_backups(query) if len(query.strip()) >= MIN_QUERY_LENGTH else []
+            self.view.show_search_results(results)
+        except Exception as e:
+            self.logger.error(f"فشل في البحث: {e}")
+    
+    def verify_backups(self) -> None:
+        """بدء فحص سلامة النسخ الاحتياطية"""
+        try:
+            self.view.toggle_controls(False, 'verify')
+            self.view.update_progress(0, "جارٍ التحضير للفحص...", 'verify')
+            
+            self.current_worker = self.service_container.create_verify_worker()
+            
+            self.current_worker.progress_update.connect(
+                lambda p, s: self.view.update_progress(p, s, 'verify')
+            )
+            self.current_worker.finished.connect(
+                lambda msg: self._on_verify_finished(msg)
+            )
+            
+            self.current_worker.start()
+            self.logger.info("بدء فحص سلامة النسخ الاحتياطية")
+            
+        except Exception as e:
+            self.logger.error(f"فشل في بدء فحص النسخ: {e}")
+            self.view.show_message(
+                "خطأ في الفحص", 
+                f"حدث خطأ أثناء بدء فحص النسخ:\n{e}",
+                "error"
+            )
+            self.view.toggle_controls(True, 'verify')
+    
+    def _on_dry_run_finished(self, message: str) -> None:
+        """انتهاء المعاينة - التقرير معروض في صفحة النسخ، فلا تظهر رسالة إلا للخطأ"""
+        self.view.toggle_controls(True, 'backup')
+        self.current_worker = None
+        
+        if "اكتملت" in message:
+            self.view.update_progress(100, "اكتملت المعاينة - ابدأ النسخ الآن لاستخدام نتائج الفحص نفسها.", 'backup')
+        elif "إلغاء" in message:
+            self.view.update_progress(0, message, 'backup')
+        else:
+            self.view.update_progress(0, "فشلت المعاينة", 'backup')
+            self.view.show_message("خطأ في المعاينة", message, "error")
+    
+    def _on_job_finished(self, job: BackupJob) -> None:
+        """انتهاء مهمة مجدولة - عامل النسخ الرئيسي يبلغ نتيجته بنفسه إلا إذا أُلغيت المهمة قبل بدئها"""
+        self.view.update_job(job)
+        if job is self.backup_job and job.result is None:
+            self._on_backup_finished(f"فشل النسخ الاحتياطي: {job.error}" if job.error is not None
+                                     else "تم إلغاء عملية النسخ الاحتياطي قبل بدئها.")
+        elif job is not self.backup_job and job.state is JobState.COMPLETED:
+            if job.destination == self.service_container.get('backup_repository').backup_dir:
+                self.view.refresh_backups_list()
+    
     def _on_backup_finished(self, message: str) -> None:
         """معالجة انتهاء عملية النسخ"""
         self.view.toggle_controls(True, 'backup')
-        self.current_worker = None
+        self.backup_job = self.backup_job_worker = None
         
         if "اكتمل" in message:
             self.view.show_message("نجاح العملية", message, "info")
             
-            # تطبيق دوران النسخ
+            # تطبيق سياسة الاحتفاظ في خيط - قد ينتظر القفل الحصري خلف مهمة أخرى على المستودع
             try:
-                retention_count = self.view.get_retention_count()
-                deleted_count = self.model.apply_backup_rotation(retention_count)
-                if deleted_count > 0:
-                    self.logger.info(f"تم تنظيف {deleted_count} من النسخ القديمة")
+                policy = RetentionPolicy(
+                    keep_last=self.view.get_retention_count(),
+                    **self.view.get_gfs_retention()
+                )
+                self.view.toggle_controls(False, 'delete')
+                self.maintenance_worker = RetentionApplier(self.model, policy)
+                self.maintenance_worker.retention_applied.connect(
+                    lambda report: self._on_retention_applied(report)
+                )
+                self.maintenance_worker.start()
             except Exception as e:
                 self.logger.error(f"فشل في تطبيق دوران النسخ: {e}")
-            
-            self.view.refresh_backups_list()
+                self.view.toggle_controls(True, 'delete')
+                self.view.refresh_backups_list()
             
         elif "إلغاء" in message:
             self.view.show_message("تم الإلغاء", message, "warning")
         else:
             self.view.show_message("فشل العملية", message, "error")
     
+    def _on_retention_applied(self, report) -> None:
+        """معالجة انتهاء تطبيق سياسة الاحتفاظ بعد النسخ"""
+        self.view.toggle_controls(True, 'delete')
+        self.maintenance_worker = None
+        
+        if report.deleted_count > 0 or report.unreadable:
+            self.logger.info(f"تم تنظيف {report.deleted_count} من النسخ القديمة")
+            self.view.update_progress(100, report.summary(), 'backup')
+        self.view.refresh_backups_list()
+    
     def _on_restore_finished(self, message: str) -> None:
         """معالجة انتهاء عملية الاسترداد"""
         self.view.toggle_controls(True, 'restore')
@@ -285,4 +573,19 @@ class MainPresenter(IMainPresenter):
         elif "إلغاء" in message:
             self.view.show_message("تم الإلغاء", message, "warning")
         else:
-            self.view.show_message("فشل العملية", message, "error")
\ No newline at end of file
+            self.view.show_message("فشل العملية", message, "error")
+    
+    def _on_verify_finished(self, message: str) -> None:
+        """معالجة انتهاء عملية الفحص"""
+        self.view.toggle_controls(True, 'verify')
+        self.current_worker = None
+        self.view.refresh_backups_list()
+        
+        if "تالفة" in message:
+            self.view.show_message("نسخ تالفة", message, "warning")
+        elif "اكتمل" in message:
+            self.view.show_message("نجاح العملية", message, "info")
+        elif "إلغاء" in message:
+            self.view.show_message("تم الإلغاء", message, "warning")
+        else:
+            self.view.show_message("فشل العملية", message, "error")
@@ -6,22 +6,38 @@
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Dict
 
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QListWidgetItem, QFileDialog, QMessageBox, QFrame,
                              QInputDialog, QStackedWidget)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
+from PyQt5.QtCore import Qt, QTimer, QItemSelectionModel
 
 from utils.config import (TOOL_NAME, BACKUP_DIR, HOME_DIR, DEFAULT_FOLDERS)
+from core.backup_diff import CHANGE_ADDED, CHANGE_MODIFIED, CHANGE_REMOVED, format_size_delta
+from core.job_scheduler import JobState
+from core.search_index import MIN_QUERY_LENGTH
+from core.startup_timing import startup_timer
 from interfaces.ui_interfaces import IMainView
 from ui.backup_model import BackupModel
+from ui.archive_tree_model import format_size
 from ui.main_presenter import MainPresenter
+from ui.workers import (BackupsListLoader, ArchiveStatsLoader, ArchiveCatalogLoader, BackupDiffLoader,
+                        ExclusionImpactLoader)
 from ui.components.theme import DARK_THEME_STYLESHEET
 from ui.components.sidebar import Sidebar
 from ui.components.pages import (BackupPage, RestorePage, FoldersPage, 
-                                ExclusionsPage, BackupsPage, SettingsPage)
+                                ExclusionsPage, BackupsPage, BrowserPage, CompareBackupsPage,
+                                SettingsPage)
+
+
+JOB_STATE_LABELS = {
+    JobState.PENDING: "في الانتظار",
+    JobState.RUNNING: "جارية",
+    JobState.COMPLETED: "اكتملت",
+    JobState.FAILED: "فشلت",
+    JobState.CANCELLED: "أُلغيت",
+}
 
 
 class AlHirzApp(QMainWindow):
@@ -38,11 +54,22 @@ class AlHirzApp(QMainWindow):
         self.content_stack = None
         self.current_page = "backup"
         self.pages = {}
+        self.backups_loader = None
+        self.stats_loader = ArchiveStatsLoader(self.model)
+        self.catalog_loader = None
+        self.diff_loader = None
+        self.impact_loader = None
+        self._impact_refresh_requested = False
+        self._backups_loading = False
+        self._reload_backups_requested = False
         
         self.setup_environment()
         self.setup_ui()
         self.connect_signals()
         self.load_initial_data()
+        
+        # تحميل قائمة النسخ بعد ظهور النافذة حتى لا يؤخر القرص البطيء عرضها
+        QTimer.singleShot(0, self._on_window_shown)
 
     def setup_ui(self):
         """إعداد الواجهة الرئيسية"""
@@ -117,6 +144,16 @@ class AlHirzApp(QMainWindow):
         self.pages['backups'] = self.backups_page
         self.content_stack.addWidget(self.backups_page)
         
+        # صفحة تصفح النسخة
+        self.browser_page = BrowserPage(self)
+        self.pages['browser'] = self.browser_page
+        self.content_stack.addWidget(self.browser_page)
+        
+        # صفحة مقارنة النسخ
+        self.compare_page = CompareBackupsPage(self)
+        self.pages['compare'] = self.compare_page
+        self.content_stack.addWidget(self.compare_page)
+        
         # صفحة الإعدادات
         self.settings_page = SettingsPage(self)
         self.pages['settings'] = self.settings_page
@@ -126,18 +163,44 @@ class AlHirzApp(QMainWindow):
         """ربط الإشارات بالدوال"""
         # أزرار النسخ الاحتياطي
         self.backup_page.backup_btn.clicked.connect(self.presenter.start_backup)
+        self.backup_page.dry_run_btn.clicked.connect(self.presenter.start_dry_run)
         self.backup_page.cancel_backup_btn.clicked.connect(self.presenter.cancel_operation)
+        self.backup_page.pause_backup_btn.clicked.connect(lambda: self.presenter.toggle_pause('backup'))
+        self.backup_page.run_profile_btn.clicked.connect(self.presenter.start_profile_backup)
+        self.backup_page.cancel_job_btn.clicked.connect(self.presenter.cancel_selected_job)
         
         # أزرار الاسترداد
         self.restore_page.restore_btn.clicked.connect(self.presenter.start_restore)
         self.restore_page.cancel_restore_btn.clicked.connect(self.presenter.cancel_operation)
+        self.restore_page.pause_restore_btn.clicked.connect(lambda: self.presenter.toggle_pause('restore'))
         
         # أزرار المجلدات
         self.folders_page.add_folder_btn.clicked.connect(self.add_custom_folder)
         
+        # أثر الاستثناءات بعد كل تعديل
+        self.exclusions_page.impact_timer.timeout.connect(self.refresh_exclusion_impact)
+        
         # أزرار النسخ المتاحة
         self.backups_page.delete_backup_btn.clicked.connect(self.presenter.delete_backups)
         self.backups_page.refresh_btn.clicked.connect(self.presenter.refresh_backups)
+        self.backups_page.verify_btn.clicked.connect(self.presenter.verify_backups)
+        self.backups_page.search_timer.timeout.connect(
+            lambda: self.presenter.search_backups(self.backups_page.search_input.text())
+        )
+        self.backups_page.search_results.itemClicked.connect(self.select_backup_from_search)
+        self.backups_page.browse_backup_btn.clicked.connect(self.browse_selected_backup)
+        self.backups_page.backups_list.doubleClicked.connect(lambda index: self.browse_selected_backup())
+        self.backups_page.compare_backups_btn.clicked.connect(self.compare_selected_backups)
+        
+        # متصفح النسخة
+        self.browser_page.tree_view.selectionModel().currentChanged.connect(self._on_browser_current_changed)
+        self.browser_page.restore_selection_btn.clicked.connect(self._restore_browser_selection)
+        
+        # نموذج قائمة النسخ يطلب أعداد الملفات لكل صفحة يجلبها
+        backups_model = self.backups_page.backups_model
+        backups_model.request_member_counts = self.stats_loader.request
+        self.stats_loader.counts_loaded.connect(backups_model.set_member_counts)
+        backups_model.modelReset.connect(self._update_backups_status)
 
     def switch_page(self, page_id):
         """تبديل الصفحة المعروضة"""
@@ -147,12 +210,21 @@ class AlHirzApp(QMainWindow):
             "folders": 2,
             "exclusions": 3,
             "backups": 4,
-            "settings": 5
+            "browser": 5,
+            "compare": 6,
+            "settings": 7
         }
         
         if page_id in page_indices:
             self.content_stack.setCurrentIndex(page_indices[page_id])
             self.current_page = page_id
+            if page_id == "exclusions":
+                self.refresh_exclusion_impact()
+
+    def show_page(self, page_id):
+        """تبديل الصفحة من داخل التطبيق مع تحديد زرها في الشريط الجانبي"""
+        self.sidebar.sidebar_buttons[page_id].setChecked(True)
+        self.switch_page(page_id)
 
     def setup_environment(self):
         """إعداد البيئة"""
@@ -167,6 +239,11 @@ class AlHirzApp(QMainWindow):
         self.load_folder_settings()
         self.load_exclusions()
         self.load_settings()
+        self.presenter.load_backup_profiles()
+
+    def _on_window_shown(self):
+        """أول دورة لحلقة الأحداث بعد عرض النافذة"""
+        startup_timer.mark("window_shown")
         self.refresh_backups_list()
 
     # === تنفيذ IMainView ===
@@ -181,20 +258,28 @@ class AlHirzApp(QMainWindow):
     
     def get_selected_backup(self) -> Optional[Path]:
         """الحصول على النسخة المحددة للاسترداد"""
-        selected_items = self.backups_page.backups_list.selectedItems()
-        if len(selected_items) == 1:
-            return selected_items[0].data(Qt.UserRole)
+        selected_indexes = self.backups_page.backups_list.selectionModel().selectedIndexes()
+        if len(selected_indexes) == 1:
+            return selected_indexes[0].data(Qt.UserRole)
         return None
     
     def get_selected_backups_for_deletion(self) -> List[Path]:
         """الحصول على النسخ المحددة للحذف"""
-        selected_items = self.backups_page.backups_list.selectedItems()
-        return [item.data(Qt.UserRole) for item in selected_items if item.data(Qt.UserRole) is not None]
+        selected_indexes = self.backups_page.backups_list.selectionModel().selectedIndexes()
+        return [index.data(Qt.UserRole) for index in selected_indexes if index.data(Qt.UserRole) is not None]
     
     def get_retention_count(self) -> int:
         """الحصول على عدد النسخ المراد الاحتفاظ بها"""
         return self.settings_page.retention_spinbox.value()
     
+    def get_gfs_retention(self) -> Dict[str, int]:
+        """الحصول على عدد النسخ اليومية والأسبوعية والشهرية المراد الاحتفاظ بها"""
+        return {
+            'keep_daily': self.settings_page.daily_spinbox.value(),
+            'keep_weekly': self.settings_page.weekly_spinbox.value(),
+            'keep_monthly': self.settings_page.monthly_spinbox.value()
+        }
+    
     def show_message(self, title: str, message: str, message_type: str = "info") -> None:
         """عرض رسالة للمستخدم"""
         if message_type == "info":
@@ -217,27 +302,233 @@ class AlHirzApp(QMainWindow):
         elif operation_type == 'restore':
             self.restore_page.restore_progress_bar.setValue(value)
             self.restore_page.restore_status_label.setText(status)
+        elif operation_type == 'verify':
+            self.backups_page.verify_status_label.setText(f"{status} ({value}%)")
     
     def toggle_controls(self, enable: bool, operation_type: str) -> None:
         """تفعيل/تعطيل عناصر التحكم"""
         if operation_type == 'backup':
             self.backup_page.backup_btn.setEnabled(enable)
+            self.backup_page.dry_run_btn.setEnabled(enable)
             self.backup_page.cancel_backup_btn.setEnabled(not enable)
+            self.backup_page.pause_backup_btn.setEnabled(not enable)
+            self.backup_page.pause_backup_btn.setText("إيقاف مؤقت")
             self.folders_page.add_folder_btn.setEnabled(enable)
             self.restore_page.restore_btn.setEnabled(enable)
+            self.browser_page.restore_selection_btn.setEnabled(enable)
             self.backups_page.delete_backup_btn.setEnabled(enable)
             self.exclusions_page.exclusion_input.setEnabled(enable)
             self.backups_page.backups_list.setEnabled(enable)
+        elif operation_type == 'verify':
+            self.backups_page.verify_btn.setEnabled(enable)
+            self.backups_page.delete_backup_btn.setEnabled(enable)
+            self.restore_page.restore_btn.setEnabled(enable)
+            self.browser_page.restore_selection_btn.setEnabled(enable)
+            self.backup_page.backup_btn.setEnabled(enable)
+            if enable:
+                self.backups_page.verify_status_label.setText("")
+        elif operation_type == 'delete':
+            # الحذف وتطبيق الاحتفاظ يحملان القفل الحصري، فلا نسخ أو استرداد أو فحص حتى ينتهيا
+            self.backups_page.delete_backup_btn.setEnabled(enable)
+            self.backups_page.verify_btn.setEnabled(enable)
+            self.backups_page.backups_list.setEnabled(enable)
+            self.restore_page.restore_btn.setEnabled(enable)
+            self.browser_page.restore_selection_btn.setEnabled(enable)
+            self.backup_page.backup_btn.setEnabled(enable)
         else:  # restore
             self.restore_page.restore_btn.setEnabled(enable)
             self.restore_page.cancel_restore_btn.setEnabled(not enable)
+            self.restore_page.pause_restore_btn.setEnabled(not enable)
+            self.restore_page.pause_restore_btn.setText("إيقاف مؤقت")
+            self.browser_page.restore_selection_btn.setEnabled(enable)
             self.backups_page.delete_backup_btn.setEnabled(enable)
             self.backups_page.backups_list.setEnabled(enable)
             self.backup_page.backup_btn.setEnabled(enable)
     
+    def get_resource_limits(self) -> Dict[str, int]:
+        """الحصول على حدود الموارد المحددة في الإعدادات"""
+        return {
+            'read': self.settings_page.read_limit_spinbox.value(),
+            'write': self.settings_page.write_limit_spinbox.value(),
+            'cpu': self.settings_page.cpu_limit_spinbox.value(),
+        }
+    
+    def get_profiling_mode(self) -> str:
+        """الحصول على وضع قياس الأداء المحدد في الإعدادات"""
+        return self.settings_page.profiling_combo.currentData()
+    
+    def set_operation_paused(self, paused: bool, operation_type: str) -> None:
+        """تبديل زر الإيقاف المؤقت وعرض الحالة"""
+        if operation_type == 'backup':
+            pause_btn, status_label = self.backup_page.pause_backup_btn, self.backup_page.status_label
+        else:
+            pause_btn, status_label = self.restore_page.pause_restore_btn, self.restore_page.restore_status_label
+        
+        pause_btn.setText("استئناف" if paused else "إيقاف مؤقت")
+        status_label.setText("متوقف مؤقتاً - اضغط استئناف للمتابعة." if paused else "جارٍ الاستئناف...")
+    
     def refresh_backups_list(self) -> None:
-        """تحديث قائمة النسخ الاحتياطية"""
-        self.populate_backups_list()
+        """تحديث قائمة النسخ الاحتياطية في الخلفية"""
+        if self.backups_loader is not None and self.backups_loader.isRunning():
+            self._reload_backups_requested = True
+            return
+        
+        self._reload_backups_requested = False
+        self._backups_loading = True
+        self._update_backups_status()
+        
+        self.backups_loader = BackupsListLoader(self.model)
+        self.backups_loader.archives_loaded.connect(self._on_archives_loaded)
+        self.backups_loader.corrupted_loaded.connect(self._on_corrupted_backups_loaded)
+        self.backups_loader.loading_finished.connect(self._on_backups_loading_finished)
+        self.backups_loader.start()
+    
+    def show_search_results(self, results: list) -> None:
+        """عرض نتائج البحث في النسخ"""
+        results_list = self.backups_page.search_results
+        results_list.clear()
+        
+        if not self.backups_page.search_input.text().strip():
+            results_list.setVisible(False)
+            return
+        
+        results_list.setVisible(True)
+        if not results:
+            too_short = len(self.backups_page.search_input.text().strip()) < MIN_QUERY_LENGTH
+            item = QListWidgetItem(f"اكتب {MIN_QUERY_LENGTH} أحرف على الأقل للبحث." if too_short
+                                   else "لم يتم العثور على ملفات مطابقة.")
+            item.setFlags(item.flags() & ~Qt.ItemIsSelectable)
+            results_list.addItem(item)
+            return
+        
+        for result in results:
+            backup_date = datetime.fromtimestamp(result.backup_mtime).strftime('%Y-%m-%d %H:%M')
+            size_kb = result.size / 1024
+            item = QListWidgetItem(
+                f"{result.member_path}  ←  {result.backup_path.name} ({backup_date}) - {size_kb:.1f} KB"
+            )
+            item.setData(Qt.UserRole, result.backup_path)
+            results_list.addItem(item)
+    
+    def show_dry_run_report(self, report) -> None:
+        """عرض تقرير المعاينة الجاري - أكبر الملفات تُستبدل كاملة مع كل تحديث"""
+        backup_page = self.backup_page
+        backup_page.dry_run_frame.setVisible(True)
+        backup_page.dry_run_summary_label.setText(report.summary())
+        
+        largest_list = backup_page.dry_run_largest_list
+        largest_list.clear()
+        for dry_run_file in report.largest:
+            state = "جديد" if dry_run_file.is_new else "معدل"
+            largest_list.addItem(f"{format_size(dry_run_file.size)}  {dry_run_file.path}  ({state})")
+        
+        # فحص المعاينة المكتمل يصبح مصدر أثر الاستثناءات
+        if report.completed:
+            self.refresh_exclusion_impact()
+    
+    def update_job(self, job) -> None:
+        """تحديث سطر المهمة في قائمة المهام أو إضافته - المعرف في UserRole"""
+        jobs_list = self.backup_page.jobs_list
+        text = f"#{job.job_id} {job.name} - {JOB_STATE_LABELS[job.state]}"
+        if job.state is JobState.RUNNING:
+            text += f" {job.progress}% {job.status}"
+        elif job.state is JobState.FAILED and job.error is not None:
+            text += f": {job.error}"
+        
+        for row in range(jobs_list.count()):
+            item = jobs_list.item(row)
+            if item.data(Qt.UserRole) == job.job_id:
+                item.setText(text)
+                return
+        item = QListWidgetItem(text)
+        item.setData(Qt.UserRole, job.job_id)
+        jobs_list.addItem(item)
+    
+    def get_selected_job_id(self) -> Optional[int]:
+        """الحصول على معرف المهمة المحددة في قائمة المهام"""
+        item = self.backup_page.jobs_list.currentItem()
+        return item.data(Qt.UserRole) if item is not None else None
+    
+    def get_selected_backup_profile(self) -> Optional[str]:
+        """الحصول على اسم ملف التعريف المحدد لنسخه"""
+        return self.backup_page.backup_profile_combo.currentText() or None
+    
+    def set_backup_profiles(self, profile_names: List[str]) -> None:
+        """عرض أسماء ملفات التعريف المتاحة للنسخ"""
+        combo = self.backup_page.backup_profile_combo
+        combo.clear()
+        combo.addItems(profile_names)
+        self.backup_page.run_profile_btn.setEnabled(bool(profile_names))
+    
+    def refresh_exclusion_impact(self) -> None:
+        """حساب أثر الاستثناءات الحالية في الخلفية - التعديل أثناء الحساب يعيده بعد انتهائه"""
+        if self.impact_loader is not None and self.impact_loader.isRunning():
+            self._impact_refresh_requested = True
+            return
+        
+        self._impact_refresh_requested = False
+        self.impact_loader = ExclusionImpactLoader(self.model, self.get_exclusions())
+        self.impact_loader.impact_loaded.connect(self._on_exclusion_impact_loaded)
+        self.impact_loader.start()
+    
+    def select_backup_from_search(self, search_item):
+        """تحديد النسخة التي تحتوي على نتيجة البحث في قائمة النسخ"""
+        backup_path = search_item.data(Qt.UserRole)
+        if backup_path is None:
+            return
+        
+        # النسخة المخفية بالتصفية تظهر بإلغاء التصفية
+        index = self.backups_page.backups_model.index_of(backup_path)
+        if not index.isValid() and self.backups_page.backups_filter_input.text():
+            self.backups_page.backups_filter_input.clear()
+            index = self.backups_page.backups_model.index_of(backup_path)
+        if index.isValid():
+            backups_list = self.backups_page.backups_list
+            backups_list.selectionModel().setCurrentIndex(index, QItemSelectionModel.ClearAndSelect)
+            backups_list.scrollTo(index)
+
+    def browse_selected_backup(self):
+        """فتح النسخة المحددة في صفحة التصفح"""
+        backup_path = self.get_selected_backup()
+        if backup_path is None:
+            self.show_message("لم يتم الاختيار", "الرجاء اختيار نسخة احتياطية لتصفحها.", "warning")
+            return
+        self.open_backup_in_browser(backup_path)
+    
+    def open_backup_in_browser(self, backup_path: Path):
+        """قراءة فهرس النسخة في الخلفية وعرض المستوى الأعلى عند وصوله"""
+        browser_page = self.browser_page
+        browser_page.archive_path = backup_path
+        browser_page.archive_label.setText(f"محتويات: {backup_path.name}")
+        browser_page.browser_status_label.setText("جارٍ قراءة محتويات النسخة...")
+        browser_page.tree_model.set_catalog(None)
+        browser_page.preview_text.clear()
+        self.show_page('browser')
+        
+        self.catalog_loader = ArchiveCatalogLoader(self.model, backup_path)
+        self.catalog_loader.catalog_loaded.connect(self._on_catalog_loaded)
+        self.catalog_loader.loading_failed.connect(self._on_catalog_loading_failed)
+        self.catalog_loader.start()
+
+    def compare_selected_backups(self):
+        """مقارنة النسختين المحددتين - الأقدم اسماً هي الأساس لأن أسماء النسخ زمنية"""
+        selected = sorted(self.get_selected_backups_for_deletion(), key=lambda path: path.name)
+        if len(selected) != 2:
+            self.show_message("لم يتم الاختيار", "الرجاء اختيار نسختين بالضبط لمقارنتهما.", "warning")
+            return
+        old_backup, new_backup = selected
+        
+        compare_page = self.compare_page
+        compare_page.compare_label.setText(f"من {old_backup.name} إلى {new_backup.name}")
+        compare_page.compare_summary_label.setText("جارٍ مقارنة سجلي النسختين...")
+        compare_page.folders_diff_list.clear()
+        compare_page.changes_list.clear()
+        self.show_page('compare')
+        
+        self.diff_loader = BackupDiffLoader(self.model, old_backup, new_backup)
+        self.diff_loader.diff_loaded.connect(self._on_diff_loaded)
+        self.diff_loader.loading_failed.connect(self._on_diff_loading_failed)
+        self.diff_loader.start()
 
     # === دوال مساعدة ===
     
@@ -286,6 +577,33 @@ class AlHirzApp(QMainWindow):
         
         # ربط تغيير الإعداد بحفظه
         self.settings_page.ignore_hidden_checkbox.stateChanged.connect(self.save_ignore_hidden_setting)
+        
+        # قواعد الاحتفاظ تُحمل قبل ربط إشارات التغيير كحدود الموارد
+        settings = self.presenter.service_container.get('config_manager').load_settings()
+        self.settings_page.retention_spinbox.setValue(settings.backup_retention)
+        self.settings_page.daily_spinbox.setValue(settings.keep_daily)
+        self.settings_page.weekly_spinbox.setValue(settings.keep_weekly)
+        self.settings_page.monthly_spinbox.setValue(settings.keep_monthly)
+        for spinbox in (self.settings_page.retention_spinbox,
+                        self.settings_page.daily_spinbox,
+                        self.settings_page.weekly_spinbox,
+                        self.settings_page.monthly_spinbox):
+            spinbox.valueChanged.connect(self.presenter.update_retention_settings)
+        
+        # تحميل حدود الموارد قبل ربط إشارات التغيير حتى لا يُعاد حفظها
+        limits = self.presenter.service_container.get('resource_governor').limits
+        self.settings_page.read_limit_spinbox.setValue(limits.read_mb_per_sec)
+        self.settings_page.write_limit_spinbox.setValue(limits.write_mb_per_sec)
+        self.settings_page.cpu_limit_spinbox.setValue(limits.cpu_percent)
+        for spinbox in (self.settings_page.read_limit_spinbox,
+                        self.settings_page.write_limit_spinbox,
+                        self.settings_page.cpu_limit_spinbox):
+            spinbox.valueChanged.connect(self.presenter.update_resource_limits)
+        
+        profiling_mode = self.presenter.service_container.get('config_manager').get_setting('profiling_mode')
+        combo = self.settings_page.profiling_combo
+        combo.setCurrentIndex(max(combo.findData(profiling_mode), 0))
+        combo.currentIndexChanged.connect(self.presenter.update_profiling_mode)
     
     def save_ignore_hidden_setting(self):
         """حفظ إعداد تجاهل الملفات المخفية"""
@@ -312,30 +630,168 @@ class AlHirzApp(QMainWindow):
                 is_default=False
             )
 
-    def populate_backups_list(self):
-        """تحديث قائمة النسخ الاحتياطية"""
-        self.backups_page.backups_list.clear()
-        available_backups = self.model.get_available_backups()
+    def _on_archives_loaded(self, backups_info: list):
+        """تسليم القائمة للنموذج - يعرض الصفحة الأولى فقط ويجلب الباقي عند التمرير"""
+        if self.sender() is not self.backups_loader:
+            return
+        self.backups_page.backups_model.set_archives(backups_info)
+
+    def _on_corrupted_backups_loaded(self, corrupted_backups: list):
+        """تمييز النسخ التي وُجدت تالفة في آخر فحص"""
+        if self.sender() is not self.backups_loader:
+            return
+        self.backups_page.backups_model.set_corrupted(corrupted_backups)
 
-        if not available_backups:
-            item = QListWidgetItem("لا توجد نسخ احتياطية متاحة.")
-            item.setFlags(item.flags() & ~Qt.ItemIsSelectable)
-            self.backups_page.backups_list.addItem(item)
+    def _on_backups_loading_finished(self, backups_count: int):
+        """إنهاء التحميل - وإعادة التحميل إذا طُلب تحديث أثناءه"""
+        if self.sender() is not self.backups_loader:
+            return
+        self._backups_loading = False
+        self._update_backups_status()
+        
+        startup_timer.finish("backups_loaded", self.model.logger)
+        
+        if self._reload_backups_requested:
+            self.refresh_backups_list()
+
+    def _update_backups_status(self):
+        """نص الحالة أسفل القائمة: التحميل، أو عدم وجود نسخ، أو عدد النسخ المطابقة للتصفية"""
+        backups_model = self.backups_page.backups_model
+        if self._backups_loading and backups_model.total_count == 0:
+            text = "جارٍ تحميل النسخ الاحتياطية..."
+        elif backups_model.total_count == 0:
+            text = "لا توجد نسخ احتياطية متاحة."
+        elif backups_model.matching_count != backups_model.total_count:
+            text = f"{backups_model.matching_count} من {backups_model.total_count} نسخة مطابقة للتصفية."
+        else:
+            text = f"{backups_model.total_count} نسخة."
+        self.backups_page.backups_status_label.setText(text)
+
+    def _on_catalog_loaded(self, catalog):
+        """عرض المستوى الأعلى للنسخة - النسخة التي فُتحت بعدها تلغي هذه النتيجة"""
+        if self.sender() is not self.catalog_loader:
             return
+        self.browser_page.tree_model.set_catalog(catalog)
+        self.browser_page.browser_status_label.setText(f"{catalog.member_count} ملف في النسخة.")
 
-        for backup_file in available_backups:
-            file_date = datetime.fromtimestamp(backup_file.stat().st_mtime).strftime('%Y-%m-%d %H:%M')
-            size_mb = backup_file.stat().st_size / (1024*1024)
-            item = QListWidgetItem(f"{backup_file.name}  ({file_date}) - {size_mb:.2f} MB")
-            item.setData(Qt.UserRole, backup_file)
-            self.backups_page.backups_list.addItem(item)
+    def _on_catalog_loading_failed(self, message: str):
+        if self.sender() is not self.catalog_loader:
+            return
+        self.browser_page.browser_status_label.setText(message)
+
+    def _on_browser_current_changed(self, current, previous):
+        """معاينة الملف الحالي في الشجرة - يُفك ضغط بداية الملف فقط"""
+        preview_text = self.browser_page.preview_text
+        entry = self.browser_page.tree_model.entry(current)
+        if entry is None or entry.is_dir:
+            preview_text.clear()
+            return
+        
+        try:
+            preview = self.browser_page.tree_model.catalog.read_preview(entry.path)
+        except Exception as e:
+            preview_text.setPlainText(f"تعذرت معاينة الملف:\n{e}")
+            return
+        
+        text = preview.text
+        if text is None:
+            preview_text.setPlainText(f"ملف ثنائي ({preview.size} بايت) - لا تتوفر معاينة نصية.")
+            return
+        if preview.truncated:
+            text += f"\n\n… عُرض أول {len(preview.data)} بايت من {preview.size}."
+        preview_text.setPlainText(text)
+
+    def _on_diff_loaded(self, report):
+        """عرض نتيجة المقارنة - المقارنة التي طُلبت بعدها تلغي هذه النتيجة"""
+        if self.sender() is not self.diff_loader:
+            return
+        compare_page = self.compare_page
+        summary = report.summary()
+        if report.omitted_entries:
+            summary += f"\nعُرض أول {len(report.entries)} تغيير من {report.total.changed}."
+        compare_page.compare_summary_label.setText(summary)
+        
+        for folder, totals in sorted(report.folders.items(), key=lambda item: -abs(item[1].bytes_delta)):
+            compare_page.folders_diff_list.addItem(
+                f"{folder}: +{totals.added} -{totals.removed} ~{totals.modified} "
+                f"({format_size_delta(totals.bytes_delta)})"
+            )
+        
+        markers = {CHANGE_ADDED: "+", CHANGE_REMOVED: "-", CHANGE_MODIFIED: "~"}
+        lines = []
+        for entry in report.entries:
+            delta = entry.size_delta
+            suffix = "" if delta is None else f"  ({format_size_delta(delta)})"
+            lines.append(f"{markers[entry.change]} {entry.path}{suffix}")
+        compare_page.changes_list.addItems(lines)
+
+    def _on_exclusion_impact_loaded(self, report):
+        """عرض أثر كل نمط ومقترحات الاستبعاد - النتيجة القديمة تُستبدل بحساب جديد إذا عُدلت القواعد أثناءها"""
+        if self._impact_refresh_requested:
+            self.impact_loader.wait()
+            self.refresh_exclusion_impact()
+            return
+        exclusions_page = self.exclusions_page
+        suggestions_list = exclusions_page.suggestions_list
+        suggestions_list.clear()
+        if report is None:
+            for widget in exclusions_page.exclusion_widgets:
+                widget.impact_label.setText("")
+            exclusions_page.impact_summary_label.setText(
+                "لا يوجد فحص محفوظ - شغّل \"معاينة ما سيُنسخ\" من صفحة النسخ الاحتياطي ليظهر أثر كل نمط.")
+            return
+        
+        impacts = {impact.pattern: impact for impact in report.patterns}
+        for widget in exclusions_page.exclusion_widgets:
+            impact = impacts.get(widget.exclusion_text)
+            widget.impact_label.setText(
+                "" if impact is None else f"{impact.files} ملف - {format_size(impact.bytes)}")
+        
+        scanned_at = datetime.fromtimestamp(report.scanned_at).strftime('%H:%M')
+        exclusions_page.impact_summary_label.setText(f"{report.summary()} (فحص الساعة {scanned_at})")
+        for suggestion in report.suggestions:
+            item = QListWidgetItem(f"{format_size(suggestion.bytes)}  {suggestion.path}  ({suggestion.reason}) "
+                                   f"← استبعاد \"{suggestion.pattern}\"")
+            item.setData(Qt.UserRole, suggestion.pattern)
+            suggestions_list.addItem(item)
+
+    def _on_diff_loading_failed(self, message: str):
+        if self.sender() is not self.diff_loader:
+            return
+        self.compare_page.compare_summary_label.setText(message)
+
+    def _restore_browser_selection(self):
+        """استرداد العناصر المحددة في الشجرة ومتابعة التقدم في صفحة الاسترداد"""
+        backup_path = self.browser_page.archive_path
+        if backup_path is None or self.browser_page.tree_model.catalog is None:
+            self.show_message("لا توجد نسخة", "الرجاء فتح نسخة للتصفح أولاً.", "warning")
+            return
+        
+        self.presenter.start_selective_restore(
+            backup_path,
+            self.browser_page.get_selected_paths(),
+            self.browser_page.overwrite_checkbox.isChecked()
+        )
+        if self.presenter.current_worker is not None and self.presenter.current_worker.isRunning():
+            self.show_page('restore')
 
     def closeEvent(self, event):
         """معالجة إغلاق التطبيق"""
-        if hasattr(self.presenter, 'current_worker') and self.presenter.current_worker and self.presenter.current_worker.isRunning():
+        if self.backups_loader is not None:
+            self.backups_loader.wait()
+        if self.catalog_loader is not None:
+            self.catalog_loader.wait()
+        if self.diff_loader is not None:
+            self.diff_loader.wait()
+        if self.impact_loader is not None:
+            self.impact_loader.wait()
+        self.stats_loader.stop()
+        self.stats_loader.wait()
+        
+        if self.presenter.has_active_operations():
             reply = QMessageBox.question(self, 'عملية نشطة', "توجد عملية قيد التشغيل. هل تريد الخروج؟", QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
             if reply == QMessageBox.Yes:
-                self.presenter.cancel_operation()
+                self.presenter.shutdown()
                 event.accept()
             else:
                 event.ignore()
@@ -0,0 +1,292 @@
+"""
+عمال Qt - محولات رفيعة تشغل عمليات core.operations في خيط منفصل وتبث نتائجها كإشارات
+"""
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from interfaces.backup_interfaces import IBackupOrchestrator
+from interfaces.ui_interfaces import IBackupModel
+from core.backup_verifier import BackupVerifier
+from core.error_handler import ErrorHandler
+from core.job_scheduler import BackupJob
+from core.logging_system import ILogger
+from core.operations import BaseOperation, BackupOperation, DryRunOperation, RestoreOperation, VerifyOperation
+from core.profiling import RunProfiler
+from core.retention import RetentionPolicy
+
+
+class BaseWorker(QThread):
+    """عامل أساسي - يشغل العملية ويحول التقدم والنتيجة إلى إشارات Qt"""
+    progress_update = pyqtSignal(int, str)
+    finished = pyqtSignal(str)
+    error_occurred = pyqtSignal(str, str)  # (error_message, error_category)
+
+    def __init__(self, operation: BaseOperation, profiler: RunProfiler = None):
+        super().__init__()
+        self.operation = operation
+        self.profiler = profiler or RunProfiler()
+
+    @property
+    def is_running(self) -> bool:
+        return self.operation.is_running
+
+    def run(self):
+        """تشغيل العملية في الخيط وبث النتيجة - تحت القياس إذا كان مفعلاً في الإعدادات"""
+        with self.profiler.profile(type(self.operation).__name__):
+            result = self.operation.run(self.progress_update.emit)
+        self.finished.emit(result)
+
+    def run_job(self, job) -> str:
+        """تشغيل العملية داخل مهمة المجدول في خيط المهمة - التقدم يصل إلى المهمة وإلى الإشارات معاً"""
+        def report(progress: int, status: str) -> None:
+            job.report_progress(progress, status)
+            self.progress_update.emit(progress, status)
+
+        with self.profiler.profile(type(self.operation).__name__):
+            result = self.operation.run(report)
+        self.finished.emit(result)
+        return result
+
+    @property
+    def is_paused(self) -> bool:
+        return self.operation.is_paused
+
+    def stop(self) -> None:
+        """إيقاف العملية"""
+        self.operation.stop()
+
+    def pause(self) -> None:
+        """إيقاف العملية مؤقتاً"""
+        self.operation.pause()
+
+    def resume(self) -> None:
+        """استئناف العملية"""
+        self.operation.resume()
+
+
+class BackupWorker(BaseWorker):
+    """عامل النسخ الاحتياطي - مسؤولية واحدة: تنفيذ النسخ في خيط منفصل"""
+
+    def __init__(self,
+                 folders_to_backup: List[Path],
+                 backup_filepath: Path,
+                 exclusions: List[str],
+                 orchestrator: IBackupOrchestrator = None,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None,
+                 profiler: RunProfiler = None):
+        super().__init__(BackupOperation(
+            folders_to_backup, backup_filepath, exclusions,
+            orchestrator, logger, error_handler
+        ), profiler)
+
+
+class DryRunWorker(BaseWorker):
+    """عامل معاينة النسخ - مسؤولية واحدة: بث ما ستحتويه النسخة التالية أثناء الفحص"""
+    report_update = pyqtSignal(object)    # DryRunReport
+
+    def __init__(self,
+                 folders_to_backup: List[Path],
+                 exclusions: List[str],
+                 orchestrator: IBackupOrchestrator = None,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None,
+                 profiler: RunProfiler = None):
+        super().__init__(DryRunOperation(
+            folders_to_backup, exclusions, orchestrator, logger, error_handler,
+            report_callback=self.report_update.emit
+        ), profiler)
+
+
+class RestoreWorker(BaseWorker):
+    """عامل الاسترداد - مسؤولية واحدة: تنفيذ الاسترداد في خيط منفصل"""
+
+    def __init__(self,
+                 backup_to_restore: Path,
+                 orchestrator: IBackupOrchestrator = None,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None,
+                 profiler: RunProfiler = None,
+                 members: Optional[List[str]] = None,
+                 overwrite: bool = False):
+        super().__init__(RestoreOperation(
+            backup_to_restore, orchestrator, logger, error_handler, members, overwrite
+        ), profiler)
+
+
+class VerifyWorker(BaseWorker):
+    """عامل فحص السلامة - مسؤولية واحدة: فحص النسخ في خيط منفصل"""
+
+    def __init__(self,
+                 verifier: BackupVerifier,
+                 sample_percent: float = 100.0,
+                 logger: ILogger = None,
+                 error_handler: ErrorHandler = None,
+                 profiler: RunProfiler = None):
+        super().__init__(VerifyOperation(
+            verifier, sample_percent, logger, error_handler
+        ), profiler)
+
+
+class JobProgressRelay(QObject):
+    """ناقل حالة مهام المجدول - يحول تقدم المهمة وانتهاءها من خيطها إلى إشارات تصل خيط الواجهة"""
+    job_changed = pyqtSignal(object)      # BackupJob
+    job_finished = pyqtSignal(object)     # BackupJob
+
+    def watch(self, job: BackupJob) -> BackupJob:
+        """ربط المهمة بالناقل قبل جدولتها"""
+        job.progress_callback = lambda progress, status: self.job_changed.emit(job)
+        job.completion_callback = self.job_finished.emit
+        return job
+
+
+class BackupsListLoader(QThread):
+    """محمل قائمة النسخ - يقرأ النسخ وبياناتها من ذاكرة المستودع خارج خيط الواجهة"""
+    archives_loaded = pyqtSignal(list)    # List[ArchiveInfo]
+    corrupted_loaded = pyqtSignal(list)   # List[Path]
+    loading_finished = pyqtSignal(int)    # عدد النسخ
+
+    def __init__(self, model: IBackupModel):
+        super().__init__()
+        self.model = model
+
+    def run(self):
+        """قراءة القائمة أولاً ثم نتائج الفحص حتى تظهر النسخ قبل اكتمال البيانات الإضافية"""
+        backups = self.model.get_backups_info()
+        self.archives_loaded.emit(backups)
+
+        if backups:
+            self.corrupted_loaded.emit(self.model.get_corrupted_backups())
+        self.loading_finished.emit(len(backups))
+        # البحث لا يزامن الفهرس، فتُلتقط هنا النسخ التي كتبتها عمليات أخرى
+        self.model.sync_search_index()
+
+
+class ArchiveCatalogLoader(QThread):
+    """محمل فهرس النسخة للمتصفح - يقرأ الدليل المركزي خارج خيط الواجهة"""
+    catalog_loaded = pyqtSignal(object)   # ArchiveCatalog
+    loading_failed = pyqtSignal(str)
+
+    def __init__(self, model: IBackupModel, backup_path: Path):
+        super().__init__()
+        self.model = model
+        self.backup_path = backup_path
+
+    def run(self):
+        catalog = self.model.open_backup_catalog(self.backup_path)
+        if catalog is None:
+            self.loading_failed.emit(f"تعذرت قراءة محتويات النسخة {self.backup_path.name}.")
+        else:
+            self.catalog_loaded.emit(catalog)
+
+
+class ExclusionImpactLoader(QThread):
+    """محمل أثر الاستثناءات - يطبق القواعد على آخر فحص محفوظ خارج خيط الواجهة"""
+    impact_loaded = pyqtSignal(object)    # ExclusionImpactReport أو None إذا لم يوجد فحص
+
+    def __init__(self, model: IBackupModel, exclusions: List[str]):
+        super().__init__()
+        self.model = model
+        self.exclusions = exclusions
+
+    def run(self):
+        self.impact_loaded.emit(self.model.analyze_exclusions(self.exclusions))
+
+
+class BackupDiffLoader(QThread):
+    """محمل مقارنة نسختين - يقرأ السجلين ويدمجهما خارج خيط الواجهة"""
+    diff_loaded = pyqtSignal(object)      # BackupDiffReport
+    loading_failed = pyqtSignal(str)
+
+    def __init__(self, model: IBackupModel, old_backup: Path, new_backup: Path):
+        super().__init__()
+        self.model = model
+        self.old_backup = old_backup
+        self.new_backup = new_backup
+
+    def run(self):
+        report = self.model.diff_backups(self.old_backup, self.new_backup)
+        if report is None:
+            self.loading_failed.emit(f"تعذرت مقارنة {self.old_backup.name} و{self.new_backup.name}.")
+        else:
+            self.diff_loaded.emit(report)
+
+
+class BackupsDeleter(QThread):
+    """حاذف النسخ - ينتظر القفل الحصري ويحذف خارج خيط الواجهة حتى لا تتجمد أثناء نسخ جارٍ"""
+    deletion_finished = pyqtSignal(int)   # عدد المحذوفة
+
+    def __init__(self, model: IBackupModel, backup_paths: List[Path]):
+        super().__init__()
+        self.model = model
+        self.backup_paths = backup_paths
+
+    def run(self):
+        self.deletion_finished.emit(self.model.delete_backups(self.backup_paths))
+
+
+class RetentionApplier(QThread):
+    """مطبق سياسة الاحتفاظ - يدمج النسخ ويحذفها تحت القفل الحصري خارج خيط الواجهة"""
+    retention_applied = pyqtSignal(object)    # RetentionReport
+
+    def __init__(self, model: IBackupModel, policy: RetentionPolicy):
+        super().__init__()
+        self.model = model
+        self.policy = policy
+
+    def run(self):
+        self.retention_applied.emit(self.model.apply_retention_policy(self.policy))
+
+
+class ArchiveStatsLoader(QThread):
+    """محمل أعداد الملفات - خيط دائم يقرأ الفهرس المركزي للنسخ المطلوبة ويرسل النتائج على دفعات
+
+    الطلبات تأتي من نموذج القائمة عند جلب كل صفحة، فلا تُقرأ إلا النسخ التي وصل إليها المستخدم.
+    """
+    counts_loaded = pyqtSignal(dict)      # Dict[Path, int]
+
+    BATCH_SIZE = 50
+
+    def __init__(self, model: IBackupModel):
+        super().__init__()
+        self.model = model
+        self._requests: "queue.Queue[Optional[Path]]" = queue.Queue()
+        self._stop_requested = threading.Event()
+
+    def request(self, backup_paths: List[Path]) -> None:
+        """إضافة نسخ إلى طابور القراءة - يبدأ الخيط عند أول طلب"""
+        for backup_path in backup_paths:
+            self._requests.put(backup_path)
+        if not self.isRunning():
+            self.start()
+
+    def stop(self) -> None:
+        """إيقاف الخيط بعد النسخة الجارية - تُهمل الطلبات المنتظرة ثم تُضاف علامة الإيقاف لإيقاظه"""
+        self._stop_requested.set()
+        if self.isRunning():
+            self._discard_pending()
+            self._requests.put(None)
+
+    def _discard_pending(self) -> None:
+        while True:
+            try:
+                self._requests.get_nowait()
+            except queue.Empty:
+                return
+
+    def run(self):
+        counts: Dict[Path, int] = {}
+        while not self._stop_requested.is_set():
+            backup_path = self._requests.get()
+            if backup_path is None or self._stop_requested.is_set():
+                break
+            count = self.model.get_backup_member_count(backup_path)
+            if count is not None:
+                counts[backup_path] = count
+            if counts and (len(counts) >= self.BATCH_SIZE or self._requests.empty()):
+                self.counts_loaded.emit(counts)
+                counts = {}
@@ -6,8 +6,25 @@ TOOL_NAME = "الحِرز"
 ROOT_CONFIG_DIR_NAME = ".AlZanad"
 TOOL_SUBDIR_NAME = "alhirz"
 BACKUP_SUBDIR = "backups"
+BACKUP_NAME_PREFIX = "نسخة_"
 MANIFEST_FILENAME = "manifest.json"
+# مفتاح أحجام الملفات داخل السجل (المسار ← الحجم) بجانب تواريخ التعديل
+MANIFEST_SIZES_KEY = "_sizes"
 SETTINGS_FILENAME = "settings.json"
+VERIFY_CACHE_FILENAME = "verify_cache.json"
+SEARCH_INDEX_FILENAME = "search_index.db"
+AUTO_BACKUP_STATE_FILENAME = "auto_backup_state.json"
+METRICS_FILENAME = "backup_metrics.jsonl"
+TRACES_SUBDIR = "traces"
+PROFILES_SUBDIR = "profiles"
+BACKUP_PROFILES_FILENAME = "backup_profiles.json"
+PROFILE_BACKUPS_SUBDIR = "profile_backups"
+
+# أوضاع قياس الأداء - هنا لا في core.profiling حتى لا يحمّل التحقق من الإعدادات cProfile و tracemalloc
+PROFILE_OFF = "off"
+PROFILE_SAMPLING = "sampling"
+PROFILE_FULL = "full"
+PROFILING_MODES = (PROFILE_OFF, PROFILE_SAMPLING, PROFILE_FULL)
 
 HOME_DIR = Path.home()
 APP_DIR = HOME_DIR / ROOT_CONFIG_DIR_NAME / TOOL_SUBDIR_NAME
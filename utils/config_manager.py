@@ -10,17 +10,27 @@ from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, asdict
 
 from core.logging_system import ILogger, LoggerFactory
-from utils.config import APP_DIR
+from utils.config import APP_DIR, PROFILING_MODES
+from utils.settings_store import SettingsStore
 
 
 @dataclass
 class AppSettings:
     """إعدادات التطبيق - Value Object"""
     backup_retention: int = 5
+    keep_daily: int = 0            # نسخ يومية إضافية يحتفظ بها (الجد-الأب-الابن)
+    keep_weekly: int = 0
+    keep_monthly: int = 0
     default_exclusions: List[str] = None
     auto_backup_enabled: bool = False
     auto_backup_interval_hours: int = 24
     compression_level: int = 6
+    io_read_limit_mb: int = 0      # ميجابايت/ثانية - صفر بلا حد
+    io_write_limit_mb: int = 0     # ميجابايت/ثانية - صفر بلا حد
+    cpu_limit_percent: int = 100   # نسبة زمن المعالج المسموحة لخيط الضغط
+    metrics_textfile_path: str = ""  # ملف Prometheus النصي لـ node-exporter - فارغ لتعطيله
+    tracing_enabled: bool = False  # حفظ مقاطع زمنية لكل تشغيل بصيغة Chrome trace
+    profiling_mode: str = "off"    # off أو sampling أو full
     max_backup_size_mb: int = 1000
     enable_logging: bool = True
     log_level: str = "INFO"
@@ -43,6 +53,11 @@ class ConfigurationValidator:
         """التحقق من صحة عدد النسخ المحتفظ بها"""
         return isinstance(value, int) and 1 <= value <= 100
     
+    @staticmethod
+    def validate_gfs_count(value: int) -> bool:
+        """التحقق من صحة عدد النسخ اليومية أو الأسبوعية أو الشهرية"""
+        return isinstance(value, int) and 0 <= value <= 120
+    
     @staticmethod
     def validate_compression_level(value: int) -> bool:
         """التحقق من صحة مستوى الضغط"""
@@ -58,6 +73,16 @@ class ConfigurationValidator:
         """التحقق من صحة فترة النسخ التلقائي"""
         return isinstance(value, int) and 1 <= value <= 168  # أسبوع كحد أقصى
     
+    @staticmethod
+    def validate_io_limit(value: int) -> bool:
+        """التحقق من صحة حد سرعة القراءة أو الكتابة"""
+        return isinstance(value, int) and 0 <= value <= 10000
+    
+    @staticmethod
+    def validate_cpu_limit(value: int) -> bool:
+        """التحقق من صحة حصة المعالج"""
+        return isinstance(value, int) and 5 <= value <= 100
+    
     @staticmethod
     def validate_log_level(value: str) -> bool:
         """التحقق من صحة مستوى السجلات"""
@@ -75,6 +100,11 @@ class ConfigurationValidator:
         """التحقق من صحة اللغة"""
         valid_languages = ["ar", "en"]
         return isinstance(value, str) and value.lower() in valid_languages
+    
+    @staticmethod
+    def validate_profiling_mode(value: str) -> bool:
+        """التحقق من صحة وضع قياس الأداء"""
+        return isinstance(value, str) and value.lower() in PROFILING_MODES
 
 
 class ConfigurationManager:
@@ -87,9 +117,12 @@ class ConfigurationManager:
         self.logger = logger or LoggerFactory.create_default_logger()
         self.validator = ConfigurationValidator()
         self._settings = None
+        self._settings_version = None
         
         # التأكد من وجود مجلد الإعدادات
         self._ensure_config_directory()
+        # جميع مديري الإعدادات في العملية يشتركون في نسخة الذاكرة نفسها
+        self.store = SettingsStore.for_path(self.config_path)
     
     def _ensure_config_directory(self) -> None:
         """التأكد من وجود مجلد الإعدادات"""
@@ -100,17 +133,15 @@ class ConfigurationManager:
             raise
     
     def load_settings(self) -> AppSettings:
-        """تحميل الإعدادات من الملف"""
-        if self._settings is not None:
+        """تحميل الإعدادات من مخزن الذاكرة - يُعاد التحقق منها فقط إذا تغيرت أو عُدل الملف من الخارج"""
+        self.store.refresh()
+        if self._settings is not None and self._settings_version == self.store.version:
             return self._settings
         
         try:
-            if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                
+            if self.store.exists:
                 # التحقق من صحة البيانات المحملة
-                validated_data = self._validate_loaded_data(data)
+                validated_data = self._validate_loaded_data(self.store.read())
                 self._settings = AppSettings(**validated_data)
                 
                 self.logger.info("تم تحميل الإعدادات بنجاح")
@@ -120,6 +151,7 @@ class ConfigurationManager:
                 self.save_settings(self._settings)
                 self.logger.info("تم إنشاء إعدادات افتراضية")
             
+            self._settings_version = self.store.version
             return self._settings
             
         except Exception as e:
@@ -129,21 +161,18 @@ class ConfigurationManager:
             return self._settings
     
     def save_settings(self, settings: AppSettings) -> bool:
-        """حفظ الإعدادات إلى الملف"""
+        """حفظ الإعدادات - تُطبق فوراً في الذاكرة وتُكتب إلى الملف بعد تجميع التعديلات المتتالية"""
         try:
             # التحقق من صحة الإعدادات قبل الحفظ
             if not self._validate_settings(settings):
                 self.logger.error("فشل في التحقق من صحة الإعدادات")
                 return False
             
-            # تحويل إلى قاموس وحفظ
-            settings_dict = asdict(settings)
-            
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(settings_dict, f, indent=2, ensure_ascii=False)
+            self.store.replace(asdict(settings))
             
             # تحديث التخزين المؤقت
             self._settings = settings
+            self._settings_version = self.store.version
             
             self.logger.info("تم حفظ الإعدادات بنجاح")
             return True
@@ -183,6 +212,10 @@ class ConfigurationManager:
             self.logger.error(f"فشل في الحصول على الإعداد {key}: {e}")
             return default
     
+    def flush(self) -> bool:
+        """كتابة التعديلات المعلقة إلى الملف الآن"""
+        return self.store.flush()
+    
     def reset_to_defaults(self) -> bool:
         """إعادة تعيين الإعدادات إلى القيم الافتراضية"""
         try:
@@ -243,12 +276,19 @@ class ConfigurationManager:
         """التحقق من صحة جميع الإعدادات"""
         validations = [
             self.validator.validate_backup_retention(settings.backup_retention),
+            self.validator.validate_gfs_count(settings.keep_daily),
+            self.validator.validate_gfs_count(settings.keep_weekly),
+            self.validator.validate_gfs_count(settings.keep_monthly),
             self.validator.validate_compression_level(settings.compression_level),
             self.validator.validate_max_backup_size(settings.max_backup_size_mb),
             self.validator.validate_auto_backup_interval(settings.auto_backup_interval_hours),
+            self.validator.validate_io_limit(settings.io_read_limit_mb),
+            self.validator.validate_io_limit(settings.io_write_limit_mb),
+            self.validator.validate_cpu_limit(settings.cpu_limit_percent),
             self.validator.validate_log_level(settings.log_level),
             self.validator.validate_theme(settings.theme),
             self.validator.validate_language(settings.language),
+            self.validator.validate_profiling_mode(settings.profiling_mode),
         ]
         
         return all(validations)
@@ -266,18 +306,33 @@ class ConfigurationManager:
                 # التحقق من صحة القيمة حسب النوع
                 if field_name == "backup_retention" and self.validator.validate_backup_retention(value):
                     validated_data[field_name] = value
+                elif field_name in ("keep_daily", "keep_weekly", "keep_monthly"):
+                    if self.validator.validate_gfs_count(value):
+                        validated_data[field_name] = value
+                    else:
+                        self.logger.warning(f"قيمة غير صحيحة للحقل {field_name}: {value}, استخدام القيمة الافتراضية")
+                        validated_data[field_name] = default_value
                 elif field_name == "compression_level" and self.validator.validate_compression_level(value):
                     validated_data[field_name] = value
                 elif field_name == "max_backup_size_mb" and self.validator.validate_max_backup_size(value):
                     validated_data[field_name] = value
                 elif field_name == "auto_backup_interval_hours" and self.validator.validate_auto_backup_interval(value):
                     validated_data[field_name] = value
+                elif field_name in ("io_read_limit_mb", "io_write_limit_mb") and self.validator.validate_io_limit(value):
+                    validated_data[field_name] = value
+                elif field_name == "cpu_limit_percent" and self.validator.validate_cpu_limit(value):
+                    validated_data[field_name] = value
                 elif field_name == "log_level" and self.validator.validate_log_level(value):
                     validated_data[field_name] = value.upper()
                 elif field_name == "theme" and self.validator.validate_theme(value):
                     validated_data[field_name] = value.lower()
                 elif field_name == "language" and self.validator.validate_language(value):
                     validated_data[field_name] = value.lower()
+                elif field_name == "profiling_mode" and self.validator.validate_profiling_mode(value):
+                    validated_data[field_name] = value.lower()
+                elif field_name == "profiling_mode":
+                    self.logger.warning(f"قيمة غير صحيحة للحقل {field_name}: {value}, استخدام القيمة الافتراضية")
+                    validated_data[field_name] = default_value
                 elif isinstance(value, type(default_value)):
                     validated_data[field_name] = value
                 else:
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+"""
+مخزن الإعدادات في الذاكرة - Settings Store
+مسؤولية واحدة: قراءة ملف إعدادات JSON مرة واحدة، وخدمة القراءات من الذاكرة، وتجميع الكتابات في كتابة ذرية مؤجلة
+"""
+
+import atexit
+import copy
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from core.logging_system import ILogger, LoggerFactory
+
+# مهلة تجميع التعديلات المتتالية قبل كتابتها
+WRITE_DEBOUNCE_SECONDS = 0.5
+# أقل فاصل بين فحصين لتاريخ تعديل الملف بحثاً عن تعديلات خارجية
+EXTERNAL_CHECK_INTERVAL_SECONDS = 1.0
+
+# علامة حذف مفتاح ضمن التعديلات المعلقة
+_DELETED = object()
+
+
+class SettingsStore:
+    """مخزن ملف إعدادات واحد - نسخة مشتركة لكل مسار بين جميع المكونات في العملية
+
+    التعديلات تُطبق في الذاكرة فوراً وتُكتب بعد WRITE_DEBOUNCE_SECONDS من أول تعديل غير محفوظ
+    (ملف مؤقت ثم إعادة تسمية). تعديل الملف من عملية أخرى (الخدمة، سطر الأوامر، محرر نصوص)
+    يُكتشف بتاريخ التعديل، وتبقى التعديلات المحلية غير المحفوظة فوق المحتوى الجديد.
+    """
+
+    _stores: Dict[Path, "SettingsStore"] = {}
+    _registry_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, path: Path) -> "SettingsStore":
+        """المخزن المشترك للملف - يُنشأ عند أول طلب"""
+        path = Path(path)
+        with cls._registry_lock:
+            store = cls._stores.get(path)
+            if store is None:
+                store = cls._stores[path] = cls(path)
+            return store
+
+    @classmethod
+    def flush_all(cls) -> None:
+        """كتابة التعديلات المعلقة في جميع المخازن"""
+        with cls._registry_lock:
+            stores = list(cls._stores.values())
+        for store in stores:
+            store.flush()
+
+    def __init__(self,
+                 path: Path,
+                 debounce_seconds: float = WRITE_DEBOUNCE_SECONDS,
+                 check_interval: float = EXTERNAL_CHECK_INTERVAL_SECONDS,
+                 logger: ILogger = None):
+        self.path = Path(path)
+        self.debounce_seconds = debounce_seconds
+        self.check_interval = check_interval
+        self.logger = logger or LoggerFactory.create_default_logger()
+        self.version = 0
+        self._data: Dict[str, Any] = {}
+        self._pending: Dict[str, Any] = {}
+        self._disk_mtime: Optional[int] = None
+        self._last_check = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        self._load()
+
+    @property
+    def exists(self) -> bool:
+        """هل للإعدادات ملف على القرص أو تعديلات تنتظر الكتابة"""
+        with self._lock:
+            return self._disk_mtime is not None or bool(self._pending)
+
+    def refresh(self) -> None:
+        """إعادة القراءة إذا عُدل الملف من خارج العملية - الفحص محدود بفاصل check_interval"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            if self._stat_mtime() != self._disk_mtime:
+                self._load()
+
+    def read(self) -> Dict[str, Any]:
+        """نسخة من جميع الإعدادات"""
+        self.refresh()
+        with self._lock:
+            return copy.deepcopy(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """نسخة من قيمة إعداد واحد"""
+        self.refresh()
+        with self._lock:
+            return copy.deepcopy(self._data.get(key, default))
+
+    def update(self, changes: Dict[str, Any]) -> None:
+        """تعديل مفاتيح محددة - الكتابة مؤجلة"""
+        with self._lock:
+            changed = False
+            for key, value in changes.items():
+                if key in self._data and self._data[key] == value:
+                    continue
+                self._data[key] = copy.deepcopy(value)
+                self._pending[key] = self._data[key]
+                changed = True
+            if changed:
+                self._changed()
+
+    def replace(self, data: Dict[str, Any]) -> None:
+        """استبدال المستند كاملاً - المفاتيح غير الموجودة في data تُحذف"""
+        with self._lock:
+            removed = set(self._data) - set(data)
+            for key in removed:
+                del self._data[key]
+                self._pending[key] = _DELETED
+            if removed:
+                self._changed()
+            self.update(data)
+
+    def flush(self) -> bool:
+        """كتابة التعديلات المعلقة الآن"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return True
+            # تعديل خارجي لم يُكتشف بعد لا يُكتب فوقه؛ التعديلات المعلقة تُطبق على المحتوى الجديد
+            if self._stat_mtime() != self._disk_mtime:
+                self._load()
+            try:
+                self._write(self._data)
+            except (OSError, TypeError, ValueError) as e:
+                self.logger.error(f"فشل في حفظ الإعدادات في {self.path.name}: {e}")
+                return False
+            self._pending.clear()
+            return True
+
+    def _changed(self) -> None:
+        self.version += 1
+        if self._timer is None:
+            self._timer = threading.Timer(self.debounce_seconds, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _load(self) -> None:
+        """قراءة الملف وإعادة تطبيق التعديلات المحلية غير المحفوظة فوقه"""
+        mtime = self._stat_mtime()
+        data: Dict[str, Any] = {}
+        if mtime is not None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                # ملف تالف أو قيد الكتابة من محرر - تبقى الإعدادات الحالية حتى يتغير الملف مجدداً
+                self.logger.warning(f"تعذرت قراءة الإعدادات من {self.path.name}: {e}")
+                self._disk_mtime = mtime
+                return
+            if not isinstance(data, dict):
+                data = {}
+
+        for key, value in self._pending.items():
+            if value is _DELETED:
+                data.pop(key, None)
+            else:
+                data[key] = value
+
+        self._data = data
+        self._disk_mtime = mtime
+        self.version += 1
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        """كتابة ذرية: ملف مؤقت في نفس المجلد ثم إعادة تسمية"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+        self._disk_mtime = self._stat_mtime()
+
+    def _stat_mtime(self) -> Optional[int]:
+        try:
+            return self.path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+
+atexit.register(SettingsStore.flush_all)